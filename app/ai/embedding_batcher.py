@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
+
+import structlog
+
+from app.domain.ingestion.ports import IEmbeddingProvider
+from app.domain.schemas.embedding_vector import EmbeddingVector
+from app.infrastructure.observability.embedding_metrics import (
+    EmbeddingMetricsStore,
+    embedding_metrics_store,
+)
+
+logger = structlog.get_logger(__name__)
+
+_GroupKey = Tuple[int, int, str]
+
+
+@dataclass
+class _PendingBatch:
+    provider: IEmbeddingProvider
+    task: str
+    capacity: int
+    requests: List[Tuple[List[str], "asyncio.Future[List[EmbeddingVector]]"]] = field(
+        default_factory=list
+    )
+    size: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class EmbeddingMicroBatcher:
+    """
+    Merges small concurrent embed requests for the same provider/task into one
+    provider call. A batch is flushed when it reaches the provider's max batch
+    size or after ``linger_ms``, whichever comes first.
+
+    Every batch goes through ``embed_independent``, including one that ends up
+    holding a single request, so a text gets the same vector whether or not
+    other callers joined its batch. Requests that fill a batch on their own
+    skip batching and use the regular ``embed`` path.
+    """
+
+    def __init__(
+        self,
+        *,
+        semaphore: asyncio.Semaphore,
+        linger_ms: float = 5.0,
+        max_batch_size: int = 0,
+        metrics: EmbeddingMetricsStore = embedding_metrics_store,
+    ):
+        self._semaphore = semaphore
+        self._linger_seconds = max(0.0, float(linger_ms)) / 1000.0
+        self._max_batch_size = max(0, int(max_batch_size))
+        self._metrics = metrics
+        self._pending: Dict[_GroupKey, _PendingBatch] = {}
+        self._running: Set["asyncio.Task[None]"] = set()
+
+    def batch_capacity(self, provider: IEmbeddingProvider) -> int:
+        provider_max = max(1, int(getattr(provider, "max_batch_texts", 1) or 1))
+        if self._max_batch_size > 0:
+            return min(provider_max, self._max_batch_size)
+        return provider_max
+
+    async def submit(
+        self, provider: IEmbeddingProvider, texts: List[str], task: str
+    ) -> List[EmbeddingVector]:
+        capacity = self.batch_capacity(provider)
+        if capacity <= 1 or len(texts) >= capacity:
+            return await self._embed(provider, texts, task=task, independent=False)
+
+        loop = asyncio.get_running_loop()
+        key: _GroupKey = (id(loop), id(provider), task)
+        batch = self._pending.get(key)
+        if batch is not None and batch.size + len(texts) > capacity:
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = _PendingBatch(provider=provider, task=task, capacity=capacity)
+            self._pending[key] = batch
+
+        future: "asyncio.Future[List[EmbeddingVector]]" = loop.create_future()
+        batch.requests.append((list(texts), future))
+        batch.size += len(texts)
+
+        if batch.size >= capacity:
+            self._flush(key)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self._linger_seconds, self._flush, key)
+
+        # Shield so a cancelled caller does not cancel the batch for everyone else.
+        return await asyncio.shield(future)
+
+    def _flush(self, key: _GroupKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+            batch.timer = None
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: _PendingBatch) -> None:
+        unique_texts: List[str] = []
+        positions: Dict[str, int] = {}
+        for texts, _ in batch.requests:
+            for text in texts:
+                if text not in positions:
+                    positions[text] = len(unique_texts)
+                    unique_texts.append(text)
+
+        try:
+            vectors = await self._embed(
+                batch.provider, unique_texts, task=batch.task, independent=True
+            )
+        except BaseException as exc:
+            error = exc if isinstance(exc, Exception) else RuntimeError("embedding_batch_cancelled")
+            for _, future in batch.requests:
+                if not future.done():
+                    future.set_exception(error)
+                    future.exception()
+            if not isinstance(exc, Exception):
+                raise
+            return
+
+        fill_ratio = len(unique_texts) / float(batch.capacity)
+        self._metrics.record_microbatch(
+            requests=len(batch.requests), texts=len(unique_texts), fill_ratio=fill_ratio
+        )
+        logger.debug(
+            "embedding_microbatch_flushed",
+            provider=getattr(batch.provider, "provider_name", "unknown"),
+            task=batch.task,
+            requests=len(batch.requests),
+            texts=len(unique_texts),
+            capacity=batch.capacity,
+            fill_ratio=round(fill_ratio, 4),
+        )
+        for texts, future in batch.requests:
+            if not future.done():
+                future.set_result([vectors[positions[text]] for text in texts])
+
+    async def _embed(
+        self, provider: IEmbeddingProvider, texts: List[str], *, task: str, independent: bool
+    ) -> List[EmbeddingVector]:
+        async with self._semaphore:
+            if independent:
+                raw: List[Any] = await provider.embed_independent(texts, task=task)
+            else:
+                raw = await provider.embed(texts, task=task)
+        return [cast(EmbeddingVector, EmbeddingVector.coerce(vector)) for vector in raw]
@@ -1,9 +1,15 @@
 import structlog
 import threading
 import asyncio
-import time
-from collections import OrderedDict
 from typing import List, Dict, Any, Optional, cast
+from app.ai.embedding_batcher import EmbeddingMicroBatcher
+from app.domain.schemas.embedding_vector import EmbeddingVector
+from app.infrastructure.caching.embedding_cache import (
+    TwoTierEmbeddingCache,
+    build_embedding_cache_key,
+    build_embedding_cache_l2_backend,
+)
+from app.infrastructure.observability.embedding_metrics import embedding_metrics_store
 from app.infrastructure.observability.metrics import track_span
 from app.infrastructure.settings import settings
 from app.domain.ingestion.ports import IEmbeddingProvider
@@ -13,6 +19,10 @@ from app.ai.providers.jina_cloud import JinaCloudProvider
 logger = structlog.get_logger(__name__)
 
 
+class _CoalescedOwnerCancelled(RuntimeError):
+    """Raised to waiters when the caller that owned a coalesced request was cancelled."""
+
+
 class JinaEmbeddingService:
     """
     Facade Service for Embeddings.
@@ -93,20 +103,33 @@ class JinaEmbeddingService:
                 logger.warning("cloud_mode_without_api_key_fallback_local")
                 self.default_mode = "LOCAL"
 
-            # Caching for query embeddings
-            self._cache: "OrderedDict[tuple[str, str], tuple[list[float], float]]" = OrderedDict()
-            self._cache_max_size = max(
-                100, int(getattr(settings, "EMBEDDING_CACHE_MAX_SIZE", 4000))
+            # Caching for query embeddings (in-process L1 + optional shared L2)
+            self._query_cache = TwoTierEmbeddingCache(
+                max_size=max(100, int(getattr(settings, "EMBEDDING_CACHE_MAX_SIZE", 4000))),
+                ttl_seconds=max(
+                    30,
+                    int(getattr(settings, "EMBEDDING_CACHE_TTL_SECONDS", 1800) or 1800),
+                ),
+                l2=build_embedding_cache_l2_backend(
+                    getattr(settings, "EMBEDDING_CACHE_L2_BACKEND", "none")
+                ),
+                dtype=str(getattr(settings, "EMBEDDING_CACHE_DTYPE", "float32") or "float32"),
             )
-            self._cache_ttl_seconds = max(
-                30,
-                int(getattr(settings, "EMBEDDING_CACHE_TTL_SECONDS", 1800) or 1800),
-            )
-            self._cache_lock = threading.Lock()
+
+            # Single-flight map: cache key -> future of the outstanding provider call
+            self._inflight: Dict[str, "asyncio.Future[EmbeddingVector]"] = {}
 
             # Throughput controls
             self.embedding_concurrency = max(1, int(getattr(settings, "EMBEDDING_CONCURRENCY", 5)))
             self._embedding_semaphore = asyncio.Semaphore(self.embedding_concurrency)
+            self._microbatch_enabled = bool(
+                getattr(settings, "EMBEDDING_MICROBATCH_ENABLED", False)
+            )
+            self._batcher = EmbeddingMicroBatcher(
+                semaphore=self._embedding_semaphore,
+                linger_ms=float(getattr(settings, "EMBEDDING_MICROBATCH_LINGER_MS", 5.0) or 0.0),
+                max_batch_size=int(getattr(settings, "EMBEDDING_MICROBATCH_MAX_SIZE", 0) or 0),
+            )
 
             self._initialized = True
 
@@ -274,7 +297,45 @@ class JinaEmbeddingService:
                         error=str(exc),
                     )
 
-    @track_span(name="span:embedding_generation")
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._query_cache.snapshot()
+
+    @staticmethod
+    def _as_vectors(raw_embeddings: List[Any]) -> List[EmbeddingVector]:
+        return [cast(EmbeddingVector, EmbeddingVector.coerce(emb)) for emb in raw_embeddings]
+
+    @staticmethod
+    def _compact_chunk_embeddings(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for chunk in chunks:
+            if isinstance(chunk, dict) and chunk.get("embedding") is not None:
+                chunk["embedding"] = EmbeddingVector.coerce(chunk["embedding"])
+        return chunks
+
+    @staticmethod
+    def _query_cache_keys(
+        profile: Dict[str, Any], task: str, texts: List[str]
+    ) -> List[str]:
+        return [
+            build_embedding_cache_key(
+                provider=str(profile.get("provider") or ""),
+                model=str(profile.get("model") or ""),
+                dimensions=int(profile.get("dimensions") or 0),
+                task=task,
+                text=text,
+            )
+            for text in texts
+        ]
+
+    async def _store_query_embeddings(
+        self,
+        runtime_provider: IEmbeddingProvider,
+        task: str,
+        texts: List[str],
+        embeddings: List[EmbeddingVector],
+    ) -> None:
+        keys = self._query_cache_keys(runtime_provider.profile(), task, texts)
+        await self._query_cache.set_many(dict(zip(keys, embeddings)))
+
     async def embed_texts(
         self,
         texts: List[str],
@@ -282,72 +343,160 @@ class JinaEmbeddingService:
         mode: Optional[str] = None,
         provider: Optional[str] = None,
     ) -> List[List[float]]:
+        """List-of-floats contract for JSON/RPC callers; see embed_vectors for the compact form."""
+        vectors = await self.embed_vectors(texts, task=task, mode=mode, provider=provider)
+        return [vector.to_list() for vector in vectors]
+
+    @track_span(name="span:embedding_generation")
+    async def embed_vectors(
+        self,
+        texts: List[str],
+        task: str = "retrieval.passage",
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> List[EmbeddingVector]:
         if not texts:
             return []
 
+        runtime_provider = self._get_provider(mode=mode, provider=provider)
+        requested_provider_name = self._resolve_provider_name(provider)
+
         # Cache logic
         is_query_task = task == "retrieval.query"
-        final_embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        final_embeddings: List[Optional[EmbeddingVector]] = [None] * len(texts)
         missing_indices = []
         missing_texts = []
 
         if is_query_task:
-            with self._cache_lock:
-                now = time.monotonic()
-                for i, t in enumerate(texts):
-                    cache_key = (t, task)
-                    cached = self._cache.get(cache_key)
-                    if cached is not None:
-                        embedding, expires_at = cached
-                        if expires_at > now:
-                            final_embeddings[i] = embedding
-                            # Move to end (LRU)
-                            self._cache.move_to_end(cache_key)
-                            continue
-                        self._cache.pop(cache_key, None)
-                    if final_embeddings[i] is None:
-                        missing_indices.append(i)
-                        missing_texts.append(t)
+            cache_keys = self._query_cache_keys(runtime_provider.profile(), task, texts)
+            cached = await self._query_cache.get_many(cache_keys)
+            for i, (t, cache_key) in enumerate(zip(texts, cache_keys)):
+                embedding = cached.get(cache_key)
+                if embedding is not None:
+                    final_embeddings[i] = embedding
+                    continue
+                missing_indices.append(i)
+                missing_texts.append(t)
         else:
             missing_indices = list(range(len(texts)))
             missing_texts = texts
 
         if not missing_texts:
-            return cast(List[List[float]], final_embeddings)
+            return cast(List[EmbeddingVector], final_embeddings)
 
-        # Dedupe repeated query texts in the same request.
+        # Dedupe repeated texts in the same request.
         unique_texts: List[str] = []
-        unique_keys: List[tuple[str, str]] = []
-        key_to_indices: Dict[tuple[str, str], List[int]] = {}
+        text_to_indices: Dict[str, List[int]] = {}
         for idx, txt in zip(missing_indices, missing_texts):
-            key = (txt, task)
-            if key not in key_to_indices:
-                key_to_indices[key] = []
+            if txt not in text_to_indices:
+                text_to_indices[txt] = []
                 unique_texts.append(txt)
-                unique_keys.append(key)
-            key_to_indices[key].append(idx)
-
-        # Delegate to provider
-        runtime_provider = self._get_provider(mode=mode, provider=provider)
-        requested_provider_name = self._resolve_provider_name(provider)
-        try:
-            async with self._embedding_semaphore:
-                embeddings = await runtime_provider.embed(unique_texts, task=task)
+            text_to_indices[txt].append(idx)
 
-            # Update cache and merge results
-            for key, emb in zip(unique_keys, embeddings):
-                for idx in key_to_indices.get(key, []):
+        # Single-flight: identical query keys already being embedded by another
+        # caller are awaited instead of re-sent to the provider.
+        keys_by_text: Dict[str, str] = {}
+        owned: Dict[str, "asyncio.Future[EmbeddingVector]"] = {}
+        awaited: Dict[str, "asyncio.Future[EmbeddingVector]"] = {}
+        if is_query_task:
+            keys_by_text = {txt: cache_keys[text_to_indices[txt][0]] for txt in unique_texts}
+            owned, awaited = self._claim_inflight(keys_by_text)
+            unique_texts = [txt for txt in unique_texts if txt in owned]
+            if awaited:
+                embedding_metrics_store.record_coalesced_calls(len(awaited))
+
+        if unique_texts:
+            try:
+                embeddings = await self._embed_with_fallback(
+                    runtime_provider,
+                    unique_texts,
+                    task=task,
+                    mode=mode,
+                    provider=provider,
+                    requested_provider_name=requested_provider_name,
+                    texts_count=len(texts),
+                    cache_results=is_query_task,
+                )
+            except BaseException as exc:
+                self._release_inflight(owned, keys_by_text, error=exc)
+                raise
+            self._release_inflight(
+                owned, keys_by_text, results=dict(zip(unique_texts, embeddings))
+            )
+            for txt, emb in zip(unique_texts, embeddings):
+                for idx in text_to_indices.get(txt, []):
                     final_embeddings[idx] = emb
 
-                if is_query_task:
-                    with self._cache_lock:
-                        expires_at = time.monotonic() + float(self._cache_ttl_seconds)
-                        self._cache[key] = (emb, expires_at)
-                        self._cache.move_to_end(key)
-                        while len(self._cache) > self._cache_max_size:
-                            self._cache.popitem(last=False)
+        for txt, future in awaited.items():
+            try:
+                emb = await asyncio.shield(future)
+            except _CoalescedOwnerCancelled:
+                # The caller we piggybacked on went away; embed this text ourselves.
+                emb = (await self.embed_vectors([txt], task=task, mode=mode, provider=provider))[0]
+            for idx in text_to_indices.get(txt, []):
+                final_embeddings[idx] = emb
+
+        return cast(List[EmbeddingVector], final_embeddings)
+
+    def _claim_inflight(
+        self, keys_by_text: Dict[str, str]
+    ) -> tuple[
+        Dict[str, "asyncio.Future[EmbeddingVector]"], Dict[str, "asyncio.Future[EmbeddingVector]"]
+    ]:
+        loop = asyncio.get_running_loop()
+        owned: Dict[str, "asyncio.Future[EmbeddingVector]"] = {}
+        awaited: Dict[str, "asyncio.Future[EmbeddingVector]"] = {}
+        for txt, key in keys_by_text.items():
+            inflight = self._inflight.get(key)
+            if inflight is not None and not inflight.done() and inflight.get_loop() is loop:
+                awaited[txt] = inflight
+                continue
+            future: "asyncio.Future[EmbeddingVector]" = loop.create_future()
+            self._inflight[key] = future
+            owned[txt] = future
+        return owned, awaited
+
+    def _release_inflight(
+        self,
+        owned: Dict[str, "asyncio.Future[EmbeddingVector]"],
+        keys_by_text: Dict[str, str],
+        *,
+        results: Optional[Dict[str, EmbeddingVector]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        for txt, future in owned.items():
+            key = keys_by_text.get(txt)
+            if key is not None and self._inflight.get(key) is future:
+                self._inflight.pop(key, None)
+            if future.done():
+                continue
+            if results is not None and txt in results:
+                future.set_result(results[txt])
+                continue
+            if error is None or isinstance(error, asyncio.CancelledError):
+                future.set_exception(_CoalescedOwnerCancelled("coalesced_embedding_owner_cancelled"))
+            else:
+                future.set_exception(error)
+            # Mark retrieved so futures nobody awaited don't log "exception never retrieved".
+            future.exception()
 
-            return cast(List[List[float]], final_embeddings)
+    async def _embed_with_fallback(
+        self,
+        runtime_provider: IEmbeddingProvider,
+        unique_texts: List[str],
+        *,
+        task: str,
+        mode: Optional[str],
+        provider: Optional[str],
+        requested_provider_name: str,
+        texts_count: int,
+        cache_results: bool,
+    ) -> List[EmbeddingVector]:
+        try:
+            embeddings = await self._provider_embed(runtime_provider, unique_texts, task=task)
+            if cache_results:
+                await self._store_query_embeddings(runtime_provider, task, unique_texts, embeddings)
+            return embeddings
         except Exception as e:
             fallback_provider = self._resolve_ingest_fallback_provider(provider)
             should_try_fallback = (
@@ -362,38 +511,42 @@ class JinaEmbeddingService:
                     primary_provider=requested_provider_name,
                     fallback_provider=fallback_provider,
                     error=str(e),
-                    texts_count=len(texts),
+                    texts_count=texts_count,
                     task=task,
                 )
                 fallback_runtime_provider = self._get_provider(
                     mode=mode, provider=fallback_provider
                 )
-                async with self._embedding_semaphore:
-                    embeddings = await fallback_runtime_provider.embed(unique_texts, task=task)
-                for key, emb in zip(unique_keys, embeddings):
-                    for idx in key_to_indices.get(key, []):
-                        final_embeddings[idx] = emb
-                    if is_query_task:
-                        with self._cache_lock:
-                            expires_at = time.monotonic() + float(self._cache_ttl_seconds)
-                            self._cache[key] = (emb, expires_at)
-                            self._cache.move_to_end(key)
-                            while len(self._cache) > self._cache_max_size:
-                                self._cache.popitem(last=False)
+                embeddings = await self._provider_embed(
+                    fallback_runtime_provider, unique_texts, task=task
+                )
+                if cache_results:
+                    await self._store_query_embeddings(
+                        fallback_runtime_provider, task, unique_texts, embeddings
+                    )
                 logger.warning(
                     "embedding_provider_fallback_succeeded",
                     primary_provider=requested_provider_name,
                     applied_provider=fallback_provider,
-                    texts_count=len(texts),
+                    texts_count=texts_count,
                     task=task,
                 )
-                return cast(List[List[float]], final_embeddings)
+                return embeddings
 
             logger.error(
-                "embedding_generation_failed", error=str(e), texts_count=len(texts), exc_info=True
+                "embedding_generation_failed", error=str(e), texts_count=texts_count, exc_info=True
             )
             raise e
 
+    @track_span(name="span:embedding_provider_call")
+    async def _provider_embed(
+        self, runtime_provider: IEmbeddingProvider, texts: List[str], *, task: str
+    ) -> List[EmbeddingVector]:
+        if self._microbatch_enabled and task == "retrieval.query":
+            return await self._batcher.submit(runtime_provider, texts, task)
+        async with self._embedding_semaphore:
+            return self._as_vectors(await runtime_provider.embed(texts, task=task))
+
     @track_span(name="span:late_chunking")
     async def chunk_and_encode(
         self,
@@ -405,7 +558,9 @@ class JinaEmbeddingService:
         requested_provider_name = self._resolve_provider_name(provider)
         try:
             async with self._embedding_semaphore:
-                return await runtime_provider.chunk_and_encode(text)
+                return self._compact_chunk_embeddings(
+                    await runtime_provider.chunk_and_encode(text)
+                )
         except Exception as e:
             fallback_provider = self._resolve_ingest_fallback_provider(provider)
             should_try_fallback = (
@@ -424,7 +579,9 @@ class JinaEmbeddingService:
                     mode=mode, provider=fallback_provider
                 )
                 async with self._embedding_semaphore:
-                    chunks = await fallback_runtime_provider.chunk_and_encode(text)
+                    chunks = self._compact_chunk_embeddings(
+                        await fallback_runtime_provider.chunk_and_encode(text)
+                    )
                 logger.warning(
                     "chunk_and_encode_provider_fallback_succeeded",
                     primary_provider=requested_provider_name,
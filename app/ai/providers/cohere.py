@@ -39,6 +39,12 @@ class CohereCloudProvider(IEmbeddingProvider):
     def embedding_dimensions(self) -> int:
         return self._dimensions
 
+    @property
+    def max_batch_texts(self) -> int:
+        return max(
+            1, min(96, int(getattr(settings, "COHERE_MAX_TEXTS_PER_REQUEST", 96) or 96))
+        )
+
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession(
@@ -59,13 +65,7 @@ class CohereCloudProvider(IEmbeddingProvider):
             return []
         inputs = [str(text or "") for text in texts]
         input_type = "search_query" if str(task or "") == "retrieval.query" else "search_document"
-        max_texts = max(
-            1,
-            min(
-                96,
-                int(getattr(settings, "COHERE_MAX_TEXTS_PER_REQUEST", 96) or 96),
-            ),
-        )
+        max_texts = self.max_batch_texts
         vectors: List[List[float]] = []
         for idx in range(0, len(inputs), max_texts):
             batch = inputs[idx : idx + max_texts]
@@ -95,6 +95,10 @@ class JinaCloudProvider(IEmbeddingProvider):
     def embedding_dimensions(self) -> int:
         return int(self._dimensions)
 
+    @property
+    def max_batch_texts(self) -> int:
+        return int(self._configured_batch_size)
+
     def _safe_split_text(self, text: str, max_chars: int = 15000) -> List[str]:
         """
         Divide textos gigantes en partes seguras (aprox < 4000 tokens)
@@ -120,6 +124,18 @@ class JinaCloudProvider(IEmbeddingProvider):
         return final_chunks
 
     async def embed(self, texts: List[str], task: str = "retrieval.passage") -> List[List[float]]:
+        return await self._embed(texts, task=task, late_chunking=True)
+
+    async def embed_independent(
+        self, texts: List[str], task: str = "retrieval.passage"
+    ) -> List[List[float]]:
+        # late_chunking pools every input against the whole request, so unrelated
+        # texts merged by the micro-batcher must be embedded without it.
+        return await self._embed(texts, task=task, late_chunking=False)
+
+    async def _embed(
+        self, texts: List[str], *, task: str, late_chunking: bool
+    ) -> List[List[float]]:
         if not texts:
             return []
 
@@ -155,7 +171,7 @@ class JinaCloudProvider(IEmbeddingProvider):
                 "model": self._model_name,
                 "task": task,
                 "dimensions": self._dimensions,
-                "late_chunking": True,  # ACTIVAR LATE CHUNKING
+                "late_chunking": late_chunking,
                 "embedding_type": "float",
                 "truncate": True,  # Seguridad extra: truncar si algo se escapa
                 "input": batch,
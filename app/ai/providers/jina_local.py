@@ -3,8 +3,9 @@ import re
 import numpy as np
 import threading
 import asyncio
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, cast
 from app.domain.ingestion.ports import IEmbeddingProvider
+from app.domain.schemas.embedding_vector import EmbeddingVector
 from app.ai.contracts import AIModelConfig
 
 logger = structlog.get_logger(__name__)
@@ -101,8 +102,9 @@ class JinaLocalProvider(IEmbeddingProvider):
             self.model.encode, texts, task=task, batch_size=4, show_progress_bar=False
         )
 
-        if hasattr(embeddings, "tolist"):
-            return embeddings.tolist()
+        if isinstance(embeddings, np.ndarray):
+            # Keep rows as float32 buffers; lists are materialized only at the JSON boundary.
+            return cast(List[List[float]], [EmbeddingVector(row) for row in embeddings])
         return [list(e) for e in embeddings]
 
     async def chunk_and_encode(self, text: str) -> List[Dict[str, Any]]:
@@ -207,8 +209,8 @@ class JinaLocalProvider(IEmbeddingProvider):
 
             start_token = token_indices[0]
             end_token = token_indices[-1] + 1
-            pooled_vector = (
-                token_embeddings[start_token:end_token].mean(dim=0).cpu().numpy().tolist()
+            pooled_vector = EmbeddingVector(
+                token_embeddings[start_token:end_token].mean(dim=0).cpu().numpy()
             )
 
             chunks_data.append(
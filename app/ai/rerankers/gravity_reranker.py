@@ -1,8 +1,10 @@
-from typing import List, Dict, Optional, Any
-import re
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Sequence, Tuple
 
+import numpy as np
 import structlog
 from app.infrastructure.settings import settings
+from app.domain.ingestion.chunking.text_normalization import extract_section_path
 from app.domain.schemas.knowledge_schemas import (
     RAGSearchResult,
     RetrievalIntent,
@@ -182,6 +184,39 @@ GRAVITY_MATRIX = {
 # Default minimum similarity score to keep a result after reranking.
 _DEFAULT_MIN_SCORE_THRESHOLD = 0.10
 
+_LAYER_BOOSTS = {"personal": 1.15, "tenant": 1.08}
+
+
+@lru_cache(maxsize=512)
+def _heading_anchors(query_lower: str) -> Tuple[Tuple[str, str], ...]:
+    """Section anchors requested by a query, in match-priority order, with lowered copies."""
+    anchors: List[Tuple[str, str]] = []
+    for keyword, values in _HEADING_KEYWORDS.items():
+        if keyword in query_lower:
+            anchors.extend((anchor, anchor.lower()) for anchor in values)
+    return tuple(anchors)
+
+
+def _anchor_boost(anchors: Sequence[Tuple[str, str]], content: str, section_path: str) -> float:
+    if not anchors or not content:
+        return 1.0
+    body_start = content[:400].lower()
+    for anchor, anchor_lower in anchors:
+        if anchor in section_path:
+            return 5.0  # Strong boost for section match (structural intent)
+        if anchor_lower in body_start:
+            return 3.0  # Moderate boost for body match
+    return 1.0
+
+
+def _top_order(scores: np.ndarray, limit: Optional[int]) -> np.ndarray:
+    """Indices by descending score, ties in input order (same as a stable sort), cut to ``limit``."""
+    if limit and 0 < limit < scores.size:
+        kth = np.partition(-scores, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(-scores <= kth)
+        return candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+    return np.argsort(-scores, kind="stable")
+
 
 class GravityReranker:
     """
@@ -190,6 +225,10 @@ class GravityReranker:
     Applies business-rule multipliers from the GRAVITY_MATRIX on top of
     the base similarity produced by the embedding search.  Results below
     a configurable quality threshold are pruned before they reach the LLM.
+
+    Query-dependent inputs (config, weights, heading anchors) are resolved
+    once per call; the per-candidate math runs over arrays and result
+    objects are only built for the rows that survive ``max_results``.
     """
 
     def rerank(self, results: List[RAGSearchResult], intent: RetrievalIntent) -> List[RAGSearchResult]:
@@ -204,65 +243,113 @@ class GravityReranker:
         config = self._resolve_config(intent.role, intent.task)
         weights = config.get("weights", BALANCED_WEIGHTS)
         exclude_zero = config.get("exclude_zero_weight", False)
-
-        scored_results: List[RAGSearchResult] = []
-
+        anchors = _heading_anchors(intent.query.lower()) if intent.query else ()
+
+        metas: List[Dict[str, Any]] = []
+        levels: List[AuthorityLevel] = []
+        weight_values: List[Any] = []
+        similarities: List[float] = []
+        layers: List[float] = []
+        constitutional_flags: List[bool] = []
+        summary_flags: List[bool] = []
+        headings: List[float] = []
+        level_by_value: Dict[Any, AuthorityLevel] = {}
+
+        # One pass to pull the per-candidate inputs out of the result objects.
         for result in results:
-            meta = dict(result.metadata or {})
+            meta = result.metadata or {}
+            metas.append(meta)
             auth_str = meta.get("authority_level")
-            auth_level = self._parse_authority_level(auth_str)
-
-            weight = weights.get(auth_level, 1.0)
-
-            # --- Prune: zero-weight items ---
-            is_constitutional = meta.get("is_constitutional") is True
-            is_summary = (meta.get("is_raptor_summary") is True) or (meta.get("is_summary") is True)
-            if exclude_zero and weight == 0.0 and not (is_constitutional or is_summary):
-                continue
-
-            # --- Boosts (moderate, not score-destroying) ---
-            source_layer = result.source_layer or "global"
-            layer_boost = 1.0
-            if source_layer == "personal":
-                layer_boost = 1.15
-            elif source_layer == "tenant":
-                layer_boost = 1.08
-
-            constitutional_boost = 3.0 if is_constitutional else 1.0
-            raptor_boost = 1.4 if is_summary else 1.0
-
-            heading_boost = self._heading_boost(intent.query, result.content)
+            if auth_str is None or isinstance(auth_str, str):
+                level = level_by_value.get(auth_str)
+                if level is None:
+                    level = level_by_value[auth_str] = self._parse_authority_level(auth_str)
+            else:
+                level = self._parse_authority_level(auth_str)
+            levels.append(level)
+            weight_values.append(weights.get(level, 1.0))
+            layers.append(_LAYER_BOOSTS.get(result.source_layer or "global", 1.0))
+            constitutional_flags.append(meta.get("is_constitutional") is True)
+            summary_flags.append((meta.get("is_raptor_summary") is True) or (meta.get("is_summary") is True))
+            similarities.append(float(result.similarity or 0.0))
+            if anchors and result.content:
+                section_path = meta.get("section_path")
+                if not isinstance(section_path, str):
+                    section_path = extract_section_path(result.content)
+                headings.append(_anchor_boost(anchors, result.content, section_path))
+            else:
+                headings.append(1.0)
+
+        similarity = np.array(similarities, dtype=np.float64)
+        weight = np.array(weight_values, dtype=np.float64)
+        layer_boost = np.array(layers, dtype=np.float64)
+        is_constitutional = np.array(constitutional_flags, dtype=bool)
+        is_summary = np.array(summary_flags, dtype=bool)
+        heading_boost = np.array(headings, dtype=np.float64)
+
+        constitutional_boost = np.where(is_constitutional, 3.0, 1.0)
+        raptor_boost = np.where(is_summary, 1.4, 1.0)
+        boosted = heading_boost > 1.0
+
+        # --- Prune: zero-weight items, then below minimum quality threshold (RAW similarity) ---
+        keep = np.ones(len(results), dtype=bool)
+        if exclude_zero:
+            keep &= ~((weight == 0.0) & ~(is_constitutional | is_summary))
+        keep &= ~((similarity < min_score) & ~boosted)
+
+        # Ensure minimal initial score to safely multiply if it was boosted structurally
+        effective = np.where(boosted, np.maximum(similarity, 0.15), similarity)
+        multiplier = weight * layer_boost * constitutional_boost * raptor_boost * heading_boost
+        final = effective * multiplier
+
+        kept = np.flatnonzero(keep)
+        if kept.size == 0:
+            return []
+        kept_scores = final[kept]
 
-            # --- Prune: below minimum quality threshold (on the RAW similarity) ---
-            original_score = float(result.similarity or 0.0)
-            if original_score < min_score and heading_boost <= 1.0:
-                continue
+        # --- Normalize scores to [0, 1] via min-max ---
+        # The multipliers reorder the results but must NOT destroy the scale.
+        # All-equal (or single) scores become 1.0.
+        normalized = np.ones(kept.size, dtype=np.float64)
+        stamp_normalized = False
+        if kept.size > 1:
+            min_s = kept_scores.min()
+            spread = kept_scores.max() - min_s
+            if spread > 0:
+                normalized = (kept_scores - min_s) / spread
+                stamp_normalized = True
 
-            # Ensure minimal initial score to safely multiply if it was boosted structurally
-            effective_score = max(original_score, 0.15) if heading_boost > 1.0 else original_score
+        order = _top_order(kept_scores, config.get("max_results"))
 
-            multiplier = weight * layer_boost * constitutional_boost * raptor_boost * heading_boost
-            final_score = effective_score * multiplier
+        kept_indices = kept.tolist()
+        multipliers = multiplier.tolist()
+        normalized_scores = normalized.tolist()
 
+        scored_results: List[RAGSearchResult] = []
+        for position in order.tolist():
+            idx = kept_indices[position]
+            result = results[idx]
             # --- Build a NEW result instead of mutating the original ---
-            new_meta = dict(meta)
+            new_meta = dict(metas[idx])
             new_meta.update({
-                "original_similarity": original_score,
-                "gravity_weight": weight,
-                "layer_boost": layer_boost,
-                "constitutional_boost": constitutional_boost,
-                "raptor_boost": raptor_boost,
-                "heading_boost": heading_boost,
-                "authority_level": auth_level,
-                "final_multiplier": multiplier,
+                "original_similarity": similarities[idx],
+                "gravity_weight": weight_values[idx],
+                "layer_boost": layers[idx],
+                "constitutional_boost": 3.0 if constitutional_flags[idx] else 1.0,
+                "raptor_boost": 1.4 if summary_flags[idx] else 1.0,
+                "heading_boost": headings[idx],
+                "authority_level": levels[idx],
+                "final_multiplier": multipliers[idx],
             })
-
+            score = normalized_scores[position]
+            if stamp_normalized:
+                new_meta["gravity_normalized_score"] = score
             scored_results.append(
                 RAGSearchResult(
                     id=result.id,
                     content=result.content,
-                    similarity=final_score,
-                    score=final_score,
+                    similarity=score,
+                    score=score,
                     source_layer=result.source_layer,
                     metadata=new_meta,
                     source_id=result.source_id,
@@ -270,34 +357,6 @@ class GravityReranker:
                 )
             )
 
-        scored_results.sort(key=lambda x: x.similarity, reverse=True)
-
-        # --- Normalize scores to [0, 1] via min-max ---
-        # The multipliers reorder the results but must NOT destroy the scale.
-        if len(scored_results) > 1:
-            raw_scores = [r.similarity for r in scored_results]
-            max_s = max(raw_scores)
-            min_s = min(raw_scores)
-            spread = max_s - min_s
-            if spread > 0:
-                for r in scored_results:
-                    normalized = (r.similarity - min_s) / spread
-                    r.similarity = normalized
-                    r.score = normalized
-                    r.metadata["gravity_normalized_score"] = normalized
-            else:
-                # All scores equal — assign 1.0 to all
-                for r in scored_results:
-                    r.similarity = 1.0
-                    r.score = 1.0
-        elif len(scored_results) == 1:
-            scored_results[0].similarity = 1.0
-            scored_results[0].score = 1.0
-
-        matrix_limit = config.get("max_results")
-        if matrix_limit:
-            scored_results = scored_results[:matrix_limit]
-
         return scored_results
 
     def _resolve_config(self, role: AgentRole, task: TaskType) -> Dict[str, Any]:
@@ -329,29 +388,5 @@ class GravityReranker:
         """
         if not query or not content:
             return 1.0
-
-        query_lower = query.lower()
-
-        # Find which section anchors the query is asking about
-        target_anchors: list[str] = []
-        for keyword, anchors in _HEADING_KEYWORDS.items():
-            if keyword in query_lower:
-                target_anchors.extend(anchors)
-
-        if not target_anchors:
-            return 1.0
-
-        # Check if the chunk's SECTION_PATH or body matches any target anchor
-        # Extract SECTION_PATH from the content
-        section_match = re.search(r"SECTION_PATH:\s*(.+?)(?:\n|$)", content)
-        section_path = section_match.group(1).strip() if section_match else ""
-
-        for anchor in target_anchors:
-            if anchor in section_path:
-                return 5.0  # Strong boost for section match (structural intent)
-            # Also check if the anchor text appears in the first 200 chars of body
-            body_start = content[:400].lower()
-            if anchor.lower() in body_start:
-                return 3.0  # Moderate boost for body match
-
-        return 1.0
+        anchors = _heading_anchors(query.lower())
+        return _anchor_boost(anchors, content, extract_section_path(content))
@@ -6,6 +6,11 @@ import aiohttp
 import structlog
 
 from app.ai.contracts import AIModelConfig
+from app.ai.rerankers.score_cache import (
+    RerankScoreCache,
+    rerank_score_cache,
+    rerank_with_score_cache,
+)
 from app.infrastructure.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -24,12 +29,14 @@ class JinaReranker:
         model_name: str | None = None,
         rerank_url: str | None = None,
         timeout_seconds: int = 8,
+        score_cache: RerankScoreCache | None = None,
     ):
         self._api_key = api_key or AIModelConfig.JINA_API_KEY
         self._model_name = model_name or AIModelConfig.JINA_RERANK_MODEL
         self._rerank_url = rerank_url or AIModelConfig.JINA_RERANK_URL
         self._timeout_seconds = max(1, int(timeout_seconds))
         self._session: aiohttp.ClientSession | None = None
+        self._score_cache = score_cache if score_cache is not None else rerank_score_cache
 
     async def close(self) -> None:
         pass
@@ -46,11 +53,27 @@ class JinaReranker:
         if not self.is_enabled() or not query.strip() or not documents:
             return []
 
+        min_relevance = float(
+            getattr(settings, "RERANK_MIN_RELEVANCE_SCORE", _DEFAULT_RERANK_MIN_RELEVANCE)
+            or _DEFAULT_RERANK_MIN_RELEVANCE
+        )
+        return await rerank_with_score_cache(
+            cache=self._score_cache,
+            model=f"jina:{self._model_name}",
+            query=query,
+            documents=documents,
+            top_n=top_n,
+            min_relevance=min_relevance,
+            fetch_scores=lambda docs: self._fetch_scores(query, docs),
+        )
+
+    async def _fetch_scores(self, query: str, documents: list[str]) -> list[dict[str, Any]]:
+        """Raw scores for every document (no top_n cut, no relevance floor)."""
         payload = {
             "model": self._model_name,
             "query": query,
             "documents": documents,
-            "top_n": max(1, min(top_n, len(documents))),
+            "top_n": len(documents),
         }
 
         timeout = aiohttp.ClientTimeout(total=self._timeout_seconds)
@@ -69,13 +92,4 @@ class JinaReranker:
         rows = data.get("results") if isinstance(data, dict) else None
         if not isinstance(rows, list):
             return []
-
-        min_relevance = float(
-            getattr(settings, "RERANK_MIN_RELEVANCE_SCORE", _DEFAULT_RERANK_MIN_RELEVANCE)
-            or _DEFAULT_RERANK_MIN_RELEVANCE
-        )
-        return [
-            row for row in rows
-            if isinstance(row, dict)
-            and float(row.get("relevance_score", 0.0) or 0.0) >= min_relevance
-        ]
+        return [row for row in rows if isinstance(row, dict)]
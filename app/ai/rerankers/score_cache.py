@@ -0,0 +1,141 @@
+"""Bounded cache of cross-encoder relevance scores shared by the external rerankers."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional
+
+from app.infrastructure.settings import settings
+
+
+def build_rerank_score_key(*, model: str, query: str, document: str) -> str:
+    """Key a score by reranker model, exact query and document content hash."""
+    content_hash = hashlib.sha256(str(document or "").encode("utf-8")).hexdigest()
+    query_hash = hashlib.sha256(str(query or "").strip().encode("utf-8")).hexdigest()
+    return ":".join(("rr", "v1", str(model or "").strip().lower(), query_hash, content_hash))
+
+
+class RerankScoreCache:
+    """
+    LRU of raw relevance scores (before the min-relevance cut), with a TTL.
+
+    Cross-encoder scores depend only on the (query, document) pair, so a score
+    computed in one request is valid for any candidate set that contains the
+    same text again (ORCH retries, multi-query sub-queries).
+    """
+
+    def __init__(self, *, max_entries: int = 20000, ttl_seconds: float = 3600.0):
+        self._max_entries = max(1, int(max_entries))
+        self._ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: list[str]) -> dict[str, float]:
+        now = time.monotonic()
+        found: dict[str, float] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if self._ttl_seconds > 0 and now - entry[0] > self._ttl_seconds:
+                    self._entries.pop(key, None)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, items: dict[str, float]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key, score in items.items():
+                self._entries[key] = (now, float(score))
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+ScoreFetcher = Callable[[list[str]], Awaitable[Optional[list[dict[str, Any]]]]]
+
+
+async def rerank_with_score_cache(
+    *,
+    cache: Optional[RerankScoreCache],
+    model: str,
+    query: str,
+    documents: list[str],
+    top_n: int,
+    min_relevance: float,
+    fetch_scores: ScoreFetcher,
+) -> list[dict[str, Any]]:
+    """
+    ``rerank_documents`` contract on top of a score cache.
+
+    Only uncached documents are sent to ``fetch_scores`` (which must score
+    every document it receives, i.e. ``top_n=len(documents)``). Rows come back
+    as ``{"index", "relevance_score"}`` sorted best first, cut to ``top_n`` and
+    filtered by ``min_relevance`` exactly like an uncached call. A failed fetch
+    (``None`` or empty) yields ``[]``, as before.
+    """
+    keys = [build_rerank_score_key(model=model, query=query, document=doc) for doc in documents]
+    scores: dict[int, float] = {}
+    cached = cache.get_many(keys) if cache is not None else {}
+    for index, key in enumerate(keys):
+        if key in cached:
+            scores[index] = cached[key]
+
+    # Duplicate texts in one candidate set are scored once.
+    pending: dict[str, list[int]] = {}
+    for index, key in enumerate(keys):
+        if index not in scores:
+            pending.setdefault(key, []).append(index)
+
+    if pending:
+        representatives = [indexes[0] for indexes in pending.values()]
+        rows = await fetch_scores([documents[i] for i in representatives])
+        if not rows:
+            return []
+        fresh: dict[str, float] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            local = row.get("index")
+            if not isinstance(local, int) or not 0 <= local < len(representatives):
+                continue
+            score = float(row.get("relevance_score", 0.0) or 0.0)
+            key = keys[representatives[local]]
+            fresh[key] = score
+            for index in pending[key]:
+                scores[index] = score
+        if cache is not None and fresh:
+            cache.set_many(fresh)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    ranked = ranked[: max(1, min(int(top_n), len(documents)))]
+    return [
+        {"index": index, "relevance_score": score}
+        for index, score in ranked
+        if score >= min_relevance
+    ]
+
+
+def _build_default_cache() -> Optional[RerankScoreCache]:
+    if not bool(getattr(settings, "RERANK_SCORE_CACHE_ENABLED", True)):
+        return None
+    return RerankScoreCache(
+        max_entries=int(getattr(settings, "RERANK_SCORE_CACHE_MAX_ENTRIES", 20000) or 20000),
+        ttl_seconds=float(getattr(settings, "RERANK_SCORE_CACHE_TTL_SECONDS", 3600.0) or 0.0),
+    )
+
+
+rerank_score_cache = _build_default_cache()
@@ -10,6 +10,8 @@ from app.infrastructure.settings import settings
 from app.api.v1.auth import require_service_auth
 from app.api.v1.errors import ERROR_RESPONSES, ApiError
 from app.api.v1.tenant_guard import require_tenant_from_context
+from app.domain.retrieval.result_cache import index_generations
+from app.domain.retrieval.vector_similarity import entity_matrix_cache
 from app.infrastructure.supabase.client import get_async_supabase_client
 from app.infrastructure.supabase.repositories.supabase_content_repository import SupabaseContentRepository
 
@@ -59,7 +61,7 @@ class CollectionDeleteResponse(BaseModel):
 )
 async def delete_collection(collection_id: str) -> CollectionDeleteResponse:
     try:
-        require_tenant_from_context()
+        tenant_id = require_tenant_from_context()
         sb = await get_async_supabase_client()
 
         # Verify collection exists
@@ -114,6 +116,7 @@ async def delete_collection(collection_id: str) -> CollectionDeleteResponse:
 
         # 8. Delete the collection itself
         await sb.table("collections").delete().eq("id", collection_id).execute()
+        await index_generations.bump(tenant_id)
 
         logger.info(
             "collection_deep_deleted",
@@ -171,6 +174,9 @@ async def _cleanup_orphaned_graph_entities() -> None:
                 )
             },
         ).execute()
+        entity_matrix_cache.clear()
+        # Orphan purge is not tenant scoped.
+        await index_generations.bump_all()
     except Exception as e:
         # Non-critical: orphans will be cleaned on next collection delete
         logger.warning("orphan_entity_cleanup_skipped", error=str(e))
@@ -11,6 +11,7 @@ from app.api.v1.auth import require_service_auth
 from app.api.v1.errors import ERROR_RESPONSES, ApiError
 from app.api.v1.tenant_guard import require_tenant_from_context
 from app.api.dependencies import get_ingestion_trigger
+from app.domain.retrieval.result_cache import index_generations
 from app.infrastructure.caching.idempotency import get_idempotency_store, reset_idempotency_store_for_tests
 from app.workflows.ingestion.trigger import IngestionTrigger
 from app.infrastructure.supabase.repositories.supabase_content_repository import SupabaseContentRepository
@@ -306,7 +307,7 @@ async def delete_document(document_id: str, purge_chunks: Optional[bool] = True)
     source_repo = SupabaseSourceRepository()
     content_repo = SupabaseContentRepository()
     try:
-        require_tenant_from_context()
+        tenant_id = require_tenant_from_context()
         doc = await source_repo.get_by_id(document_id)
         if not doc:
             raise ApiError(status_code=404, code="DOCUMENT_NOT_FOUND", message="Document not found", details={"document_id": document_id})
@@ -314,6 +315,7 @@ async def delete_document(document_id: str, purge_chunks: Optional[bool] = True)
         if purge_chunks:
             await _deep_delete_document_artifacts(document_id, content_repo)
         await source_repo.delete_document(document_id)
+        await index_generations.bump(tenant_id)
 
         return DocumentDeleteResponse(
             status="deleted",
@@ -1,7 +1,4 @@
 import structlog
-import asyncio
-import json
-import time
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
@@ -10,6 +7,7 @@ from app.api.v1.auth import require_service_auth
 from app.api.v1.errors import ApiError
 from app.api.v1.tenant_guard import enforce_tenant_match, require_tenant_from_context
 from app.workflows.ingestion.batch_orchestrator import BatchOrchestrator
+from app.workflows.ingestion.batch_progress_hub import get_batch_progress_hub
 from app.api.dependencies import get_container
 from app.infrastructure.supabase.repositories.taxonomy_repository import TaxonomyRepository
 
@@ -273,76 +271,42 @@ async def stream_ingestion_batch(
     orchestrator: BatchOrchestrator = Depends(get_batch_orchestrator),
 ):
     tenant_ctx = enforce_tenant_match(tenant_id, "query.tenant_id")
-    _ = tenant_ctx
     safe_interval_ms = max(500, min(int(interval_ms or 1500), 15000))
-    session_timeout_seconds = 1800
+    hub = get_batch_progress_hub()
 
-    async def _event_stream():
-        current_cursor = cursor
-        started_at = time.monotonic()
-        last_heartbeat = 0.0
-        while True:
-            # Re-using BatchOrchestrator status logic
-            progress = await orchestrator.get_batch_status(batch_id=batch_id)
-            snapshot_payload = {
-                "type": "snapshot",
-                "batch_id": batch_id,
-                "cursor": progress.get("observability", {}).get("cursor"),
-                "progress": progress,
-            }
-            yield f"event: snapshot\ndata: {json.dumps(snapshot_payload, ensure_ascii=True)}\n\n"
-
-            delta = await orchestrator.query_service.get_batch_events(
-                batch_id=batch_id, cursor=current_cursor, limit=100
+    try:
+        # One poller per batch per process; viewers are fed from its snapshot and event ring.
+        channel = await hub.open(batch_id=batch_id, tenant_id=tenant_ctx, orchestrator=orchestrator)
+    except ValueError as e:
+        detail = str(e)
+        if "TENANT_MISMATCH" in detail:
+            raise ApiError(
+                status_code=400, code="TENANT_MISMATCH", message="Tenant mismatch", details=detail
             )
-            items = delta.get("items") if isinstance(delta.get("items"), list) else []
-            if items:
-                current_cursor = str(delta.get("next_cursor") or current_cursor or "")
-                delta_payload = {
-                    "type": "delta",
-                    "batch_id": batch_id,
-                    "cursor": current_cursor,
-                    "events": items,
-                    "has_more": bool(delta.get("has_more", False)),
-                }
-                yield f"event: delta\ndata: {json.dumps(delta_payload, ensure_ascii=True)}\n\n"
-
-            batch = progress.get("batch") if isinstance(progress.get("batch"), dict) else {}
-            status = str(batch.get("status") or "").lower()
-            if status in {"completed", "partial", "failed"}:
-                terminal_payload = {
-                    "type": "terminal",
-                    "batch_id": batch_id,
-                    "status": status,
-                    "cursor": current_cursor,
-                }
-                yield f"event: terminal\ndata: {json.dumps(terminal_payload, ensure_ascii=True)}\n\n"
-                return
-
-            now = time.monotonic()
-            if now - last_heartbeat >= 15.0:
-                heartbeat_payload = {
-                    "type": "heartbeat",
-                    "batch_id": batch_id,
-                    "at": int(time.time()),
-                }
-                yield f"event: heartbeat\ndata: {json.dumps(heartbeat_payload, ensure_ascii=True)}\n\n"
-                last_heartbeat = now
-
-            if now - started_at > session_timeout_seconds:
-                timeout_payload = {
-                    "type": "terminal",
-                    "batch_id": batch_id,
-                    "status": "timeout",
-                    "cursor": current_cursor,
-                }
-                yield f"event: terminal\ndata: {json.dumps(timeout_payload, ensure_ascii=True)}\n\n"
-                return
-
-            await asyncio.sleep(safe_interval_ms / 1000.0)
+        if detail == "BATCH_NOT_FOUND":
+            raise ApiError(
+                status_code=404, code="BATCH_NOT_FOUND", message="Batch not found", details=detail
+            )
+        raise ApiError(
+            status_code=400,
+            code="INVALID_BATCH_STREAM_REQUEST",
+            message="Invalid batch stream request",
+            details=detail,
+        )
+    except Exception as e:
+        logger.error("stream_batch_failed", batch_id=batch_id, error=str(e))
+        raise ApiError(
+            status_code=500, code="STREAM_BATCH_FAILED", message="Batch stream failed"
+        )
 
+    # interval_ms now only caps how often this viewer is sent frames.
     return StreamingResponse(
-        _event_stream(),
+        hub.stream(
+            channel,
+            orchestrator,
+            cursor=cursor,
+            min_interval_seconds=safe_interval_ms / 1000.0,
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
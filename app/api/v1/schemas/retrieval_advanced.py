@@ -140,6 +140,7 @@ class HybridTrace(BaseModel):
     scope_candidate_count: int | None = None
     scope_penalized_ratio: float | None = None
     score_space: str | None = None
+    cache_hit: bool = False
 
 
 class ComprehensiveTrace(HybridTrace):
@@ -1,5 +1,5 @@
 import structlog
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from app.domain.ingestion.ports import IChunkEmbeddingService, IPageLocator
 from app.domain.ingestion.chunking.identity_service import ChunkIdentityService
 from app.domain.ingestion.chunking.splitter_strategies import (
@@ -7,8 +7,10 @@ from app.domain.ingestion.chunking.splitter_strategies import (
     SemanticHeadingSplitter,
 )
 from app.domain.ingestion.structure.structure_mapper import StructureMapper
+from app.domain.schemas.embedding_vector import EmbeddingVector
 from app.domain.schemas.ingestion_schemas import IngestionMetadata
 from app.domain.ingestion.metadata.metadata_enricher import enrich_metadata
+from app.domain.ingestion.chunking.text_normalization import extract_section_path
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 import re
@@ -42,14 +44,14 @@ class LateChunkResult(BaseModel):
     """
 
     content: str = Field(min_length=1)
-    embedding: Optional[List[float]] = None
+    embedding: Optional[EmbeddingVector] = None
     char_start: int = Field(ge=0)
     char_end: int = Field(gt=0)
     heading_path: Optional[str] = None
 
     @field_validator("embedding")
     @classmethod
-    def _validate_embedding(cls, value: Optional[List[float]]) -> Optional[List[float]]:
+    def _validate_embedding(cls, value: Optional[EmbeddingVector]) -> Optional[EmbeddingVector]:
         if value is not None and not value:
             raise ValueError("embedding cannot be empty when present")
         return value
@@ -299,7 +301,7 @@ class ChunkingService:
             enriched.append(
                 LateChunkResult(
                     content=str(chunk.get("content", "")).strip(),
-                    embedding=list(chunk.get("embedding", [])),
+                    embedding=chunk.get("embedding", []),
                     char_start=start,
                     char_end=end,
                     heading_path=heading_path,
@@ -343,15 +345,17 @@ class ChunkingService:
                 embedding_indices.append(idx)
                 embedding_texts.append(contextual_texts[idx])
 
-        embeddings_by_index: Dict[int, List[float]] = {}
+        embeddings_by_index: Dict[int, EmbeddingVector] = {}
         if embedding_texts:
-            embeddings = await chunker.embed_texts(
+            embeddings = await chunker.embed_vectors(
                 embedding_texts,
                 mode=embedding_mode,
                 provider=embedding_provider,
             )
             for idx, embedding in zip(embedding_indices, embeddings):
-                embeddings_by_index[idx] = embedding
+                vector = EmbeddingVector.coerce(embedding)
+                if vector is not None:
+                    embeddings_by_index[idx] = vector
 
         results: List[LateChunkResult] = []
         for idx, (section, contextual_text) in enumerate(zip(sections, contextual_texts)):
@@ -428,7 +432,7 @@ class ChunkingService:
         char_end: int,
         page_map: List[Any],
         metadata: IngestionMetadata,
-        embedding: Optional[List[float]],
+        embedding: Optional[Sequence[float]],
         strategy_name: str,
         embedding_mode: str,
         embedding_profile: Optional[Dict[str, Any]],
@@ -481,6 +485,10 @@ class ChunkingService:
             **role_meta,
         }
         base_metadata.update(enriched_metadata)
+        # Parsed once here so retrieval-time reranking never re-scans chunk text.
+        section_path = extract_section_path(final_content)
+        if section_path:
+            base_metadata["section_path"] = section_path
 
         inferred_standards = self.identity_service.infer_document_standards(metadata)
         if inferred_standards and not str(base_metadata.get("source_standard") or "").strip():
@@ -496,7 +504,7 @@ class ChunkingService:
             "file_page_number": page_num,
             "institution_id": str(metadata.institution_id) if metadata.institution_id else None,
             "is_global": metadata.is_global,
-            "embedding": embedding,
+            "embedding": EmbeddingVector.coerce(embedding),
             "metadata": base_metadata,
         }
 
@@ -7,6 +7,8 @@ import re
 from typing import Any, Mapping, List, Optional
 from uuid import UUID, uuid4
 
+from app.domain.schemas.embedding_vector import EmbeddingVector
+
 
 def inject_anchor_token(text: str, context: Mapping[str, Any] | None, node_id: UUID | str) -> str:
     """Inject a regex-friendly visual anchor token into chunk text.
@@ -63,6 +65,9 @@ def _sanitize_label(value: str, fallback: str) -> str:
 
 def normalize_embedding(raw_embedding: Any) -> List[float]:
     """Ensures embedding is a list of floats, handling many raw formats."""
+    if isinstance(raw_embedding, EmbeddingVector):
+        return raw_embedding.to_list()
+
     if isinstance(raw_embedding, list):
         out: List[float] = []
         for value in raw_embedding:
@@ -114,3 +119,12 @@ def ensure_chunk_ids(chunks: List[Any]) -> None:
                 chunk["id"] = new_id
             else:
                 setattr(chunk, "id", new_id)
+
+
+_SECTION_PATH_RE = re.compile(r"SECTION_PATH:\s*(.+?)(?:\n|$)")
+
+
+def extract_section_path(content: str) -> str:
+    """Return the ``SECTION_PATH`` value of a chunk's parent-context header ("" if absent)."""
+    match = _SECTION_PATH_RE.search(content or "")
+    return match.group(1).strip() if match else ""
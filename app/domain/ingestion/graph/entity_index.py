@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.domain.retrieval.vector_similarity import to_vector
+
+ENTITY_VECTOR_MERGE_THRESHOLD = 0.95
+
+
+def _norm(text: Any) -> str:
+    return str(text or "").strip().casefold()
+
+
+class TenantEntityIndex:
+    """
+    In-memory view of one tenant's ``knowledge_entities`` for entity merging.
+
+    Holds the exact-name map and a growable normalized float32 matrix of entity
+    embeddings. It is loaded once (lazily, on first use) and then kept in sync
+    by the writer through ``upsert``, so each chunk only pays for its own
+    entities instead of re-downloading the tenant's whole entity table.
+    """
+
+    def __init__(self, tenant_id: Any):
+        self.tenant_id = str(tenant_id)
+        self._rows: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, int] = {}
+        self._by_id: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._valid = np.zeros(0, dtype=bool)
+        self._dimensions = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.loads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def invalidate(self) -> None:
+        """Drop the contents; the next ``ensure_loaded`` reloads from storage."""
+        self._rows = []
+        self._by_name = {}
+        self._by_id = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._valid = np.zeros(0, dtype=bool)
+        self._dimensions = 0
+        self._loaded = False
+
+    async def ensure_loaded(
+        self, loader: Callable[[], Awaitable[Sequence[Dict[str, Any]]]]
+    ) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            rows = await loader()
+            self.invalidate()
+            for row in rows:
+                if isinstance(row, dict):
+                    self.upsert(row)
+            self._loaded = True
+            self.loads += 1
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        idx = self._by_name.get(_norm(name))
+        return self._rows[idx] if idx is not None else None
+
+    def match(
+        self,
+        names: Sequence[str],
+        vectors: Dict[str, Any],
+        threshold: float = ENTITY_VECTOR_MERGE_THRESHOLD,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve entity names to existing rows: exact (casefolded) name first,
+        then best cosine >= ``threshold`` for names that have a vector.
+        """
+        matches: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        for name in names:
+            key = _norm(name)
+            idx = self._by_name.get(key)
+            if idx is not None:
+                matches[key] = self._rows[idx]
+            elif vectors.get(key) is not None:
+                pending.append(key)
+
+        if not pending or not self._valid.any():
+            return matches
+
+        queries = [to_vector(vectors[key]) for key in pending]
+        usable = [
+            i
+            for i, q in enumerate(queries)
+            if q is not None and q.size == self._dimensions and np.any(q)
+        ]
+        if not usable:
+            return matches
+        query_matrix = np.stack([queries[i] for i in usable])
+        query_matrix /= np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        scores = query_matrix @ self._matrix[: len(self._rows)].T
+        scores[:, ~self._valid[: len(self._rows)]] = -1.0
+        best = np.argmax(scores, axis=1)
+        for row_pos, query_pos in enumerate(usable):
+            col = int(best[row_pos])
+            if float(scores[row_pos, col]) >= threshold:
+                matches[pending[query_pos]] = self._rows[col]
+        return matches
+
+    def upsert(self, row: Dict[str, Any], vector: Any = None) -> None:
+        """Insert or refresh an entity row (``id``, ``name``, ...) and its vector."""
+        entity_id = str(row.get("id") or "").strip()
+        name = _norm(row.get("name"))
+        if not entity_id or not name:
+            return
+        embedding = to_vector(vector if vector is not None else row.get("embedding"))
+        stored = {k: v for k, v in row.items() if k != "embedding"}
+        stored["id"] = entity_id
+
+        idx = self._by_id.get(entity_id)
+        if idx is None:
+            idx = self._by_name.get(name)
+        if idx is None:
+            idx = len(self._rows)
+            self._rows.append(stored)
+            self._grow(idx + 1)
+        else:
+            previous_name = _norm(self._rows[idx].get("name"))
+            if previous_name != name and self._by_name.get(previous_name) == idx:
+                self._by_name.pop(previous_name, None)
+            self._rows[idx] = {**self._rows[idx], **stored}
+        self._by_name[name] = idx
+        self._by_id[entity_id] = idx
+        if embedding is not None:
+            self._set_vector(idx, embedding)
+
+    def _grow(self, size: int) -> None:
+        if size <= self._matrix.shape[0]:
+            return
+        capacity = max(size, 2 * self._matrix.shape[0], 64)
+        matrix = np.zeros((capacity, self._dimensions), dtype=np.float32)
+        matrix[: self._matrix.shape[0]] = self._matrix
+        valid = np.zeros(capacity, dtype=bool)
+        valid[: self._valid.shape[0]] = self._valid
+        self._matrix, self._valid = matrix, valid
+
+    def _set_vector(self, idx: int, vector: np.ndarray) -> None:
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return
+        if self._dimensions == 0:
+            self._dimensions = int(vector.size)
+            self._matrix = np.zeros((self._matrix.shape[0], self._dimensions), dtype=np.float32)
+        if vector.size != self._dimensions:
+            return
+        self._matrix[idx] = vector / norm
+        self._valid[idx] = True
@@ -0,0 +1,101 @@
+"""Content-addressed memoization of LLM graph extractions."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import unicodedata
+from typing import Any, Optional, Protocol
+
+_KEY_VERSION = "v1"
+_WHITESPACE_RE = re.compile(r"\s+")
+# Rough chars-per-token ratio used to report avoided prompt tokens.
+_CHARS_PER_TOKEN = 4.0
+
+
+def normalize_extraction_text(text: str) -> str:
+    """NFKC + collapsed whitespace: re-chunked or re-OCR'd copies of a chunk share a key."""
+    normalized = unicodedata.normalize("NFKC", str(text or ""))
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def build_graph_extraction_cache_key(*, text: str, prompt_version: str, model: str) -> str:
+    """Key an extraction by normalized chunk text hash, prompt version and model."""
+    digest = hashlib.sha256(normalize_extraction_text(text).encode("utf-8")).hexdigest()
+    return ":".join(
+        (
+            "gx",
+            _KEY_VERSION,
+            str(prompt_version or "").strip(),
+            str(model or "").strip().lower(),
+            digest,
+        )
+    )
+
+
+def prompt_fingerprint(*prompts: str) -> str:
+    """Short hash of the prompt templates so prompt edits invalidate cached extractions."""
+    joined = "\x1f".join(str(prompt or "") for prompt in prompts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:12]
+
+
+class IGraphExtractionCache(Protocol):
+    """Pluggable store of serialized ``ChunkGraphExtraction`` payloads."""
+
+    name: str
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]: ...
+
+    async def set(self, key: str, value: dict[str, Any]) -> None: ...
+
+
+class GraphExtractionCacheStats:
+    """Process-wide hit/miss counters plus an estimate of the LLM work avoided."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._stores = 0
+            self._errors = 0
+            self._tokens_avoided = 0.0
+            self._miss_seconds = 0.0
+
+    def record_hit(self, prompt_chars: int) -> None:
+        with self._lock:
+            self._hits += 1
+            self._tokens_avoided += max(0, int(prompt_chars)) / _CHARS_PER_TOKEN
+
+    def record_miss(self, elapsed_seconds: float) -> None:
+        with self._lock:
+            self._misses += 1
+            self._miss_seconds += max(0.0, float(elapsed_seconds))
+
+    def record_store(self) -> None:
+        with self._lock:
+            self._stores += 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            mean_miss_seconds = self._miss_seconds / self._misses if self._misses else 0.0
+            return {
+                "lookups": lookups,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "errors": self._errors,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "llm_calls_avoided": self._hits,
+                "prompt_tokens_avoided": int(self._tokens_avoided),
+                "llm_seconds_avoided": round(self._hits * mean_miss_seconds, 2),
+            }
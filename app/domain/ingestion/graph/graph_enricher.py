@@ -1,8 +1,14 @@
+import asyncio
+import math
+import time
+from collections import deque
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol
 from uuid import UUID
 import structlog
 
+from .entity_index import TenantEntityIndex
 from .graph_extractor import ChunkGraphExtraction
+from .subgraph_aggregator import DocumentSubgraph, aggregate_chunk_extractions
 from app.domain.ingestion.metadata.metadata_enricher import MetadataEnricher
 
 logger = structlog.get_logger(__name__)
@@ -29,6 +35,17 @@ class IGraphRepository(Protocol):
         tenant_id: UUID,
         embedding_mode: Optional[str] = None,
         embedding_provider: Optional[str] = None,
+        entity_index: Optional[TenantEntityIndex] = None,
+    ) -> dict[str, Any]: ...
+
+    async def upsert_document_subgraph(
+        self,
+        *,
+        subgraph: DocumentSubgraph,
+        tenant_id: UUID,
+        embedding_mode: Optional[str] = None,
+        embedding_provider: Optional[str] = None,
+        entity_index: Optional[TenantEntityIndex] = None,
     ) -> dict[str, Any]: ...
 
     async def link_chunks_to_structure(
@@ -57,12 +74,18 @@ class GraphEnrichmentService:
         log_event_emitter: Optional[LogEventEmitter] = None,
         graph_batch_size: int = 4,
         graph_log_every_n: int = 25,
+        graph_persist_window: int = 64,
+        graph_max_inflight_batches: Optional[int] = None,
+        graph_persist_queue_size: int = 8,
     ):
         self.graph_repository = graph_repository
         self.extractor = extractor
         self._log_event_emitter = log_event_emitter
         self._graph_batch_size = max(1, int(graph_batch_size or 4))
         self._graph_log_every_n = max(1, int(graph_log_every_n or 25))
+        self._graph_persist_window = max(1, int(graph_persist_window or 1))
+        self._graph_max_inflight_batches = max(0, int(graph_max_inflight_batches or 0))
+        self._graph_persist_queue_size = max(1, int(graph_persist_queue_size or 1))
         self.metadata_extractor = MetadataEnricher()
 
     async def run_enrichment(
@@ -98,27 +121,131 @@ class GraphEnrichmentService:
 
         # 2. Semantic Graph Extraction
         candidate_chunks = self._prepare_candidate_chunks(chunks, totals)
+        cache_stats = getattr(self.extractor, "cache_stats", None)
+        cache_before = cache_stats.snapshot() if cache_stats is not None else None
+        # One tenant entity view shared by every chunk of this run.
+        entity_index = TenantEntityIndex(tenant_uuid)
+        await self._run_extraction_pipeline(
+            candidate_chunks,
+            doc_id=doc_id,
+            tenant_id=tenant_id,
+            tenant_uuid=tenant_uuid,
+            totals=totals,
+            embedding_mode=embedding_mode,
+            embedding_provider=embedding_provider,
+            entity_index=entity_index,
+            log_step_callback=log_step_callback,
+        )
+        if cache_before is not None:
+            self._record_cache_metrics(doc_id, totals, cache_before, cache_stats.snapshot())
 
-        for batch_start in range(0, len(candidate_chunks), self._graph_batch_size):
-            batch = candidate_chunks[batch_start : batch_start + self._graph_batch_size]
-            batch_texts = [item[2] for item in batch]
-            batch_extractions = await self.extractor.extract_graph_batch_async(batch_texts)
-
-            for (idx, chunk_uuid, _content), extraction in zip(batch, batch_extractions):
-                if extraction.is_empty():
-                    continue
-
-                totals["chunks_with_graph"] += 1
-                stats = await self.graph_repository.upsert_knowledge_subgraph(
-                    extraction=extraction,
-                    chunk_id=chunk_uuid,
+        # 3. Link Chunks to Structure
+        if toc_entries:
+            try:
+                structure_link_stats = await self.graph_repository.link_chunks_to_structure(
                     tenant_id=tenant_uuid,
-                    embedding_mode=embedding_mode,
-                    embedding_provider=embedding_provider,
+                    source_document_id=UUID(str(doc_id)),
+                    chunks=chunks,
+                )
+                totals["structure_links_upserted"] += int(
+                    structure_link_stats.get("links_upserted", 0)
                 )
+            except Exception as exc:
+                logger.warning("chunk_structure_link_failed", doc_id=doc_id, error=str(exc))
+
+        return totals
 
-                self._update_totals(totals, stats)
+    def _resolve_inflight_batches(self) -> int:
+        if self._graph_max_inflight_batches:
+            return self._graph_max_inflight_batches
+        # Enough batches queued on the extractor semaphore to keep every LLM slot busy.
+        concurrency = int(getattr(self.extractor, "_max_concurrency", 0) or 0)
+        return max(2, math.ceil(concurrency / self._graph_batch_size) + 1)
+
+    async def _run_extraction_pipeline(
+        self,
+        candidate_chunks: List[tuple[int, UUID, str]],
+        *,
+        doc_id: str,
+        tenant_id: str,
+        tenant_uuid: UUID,
+        totals: Dict[str, int],
+        embedding_mode: Optional[str],
+        embedding_provider: Optional[str],
+        entity_index: TenantEntityIndex,
+        log_step_callback: Optional[Any],
+    ) -> None:
+        """
+        Overlap LLM extraction with graph persistence.
+
+        A sliding window of extraction batches stays in flight (the extractor
+        semaphore still bounds LLM concurrency) and finished batches are handed,
+        in chunk order, to a single persistence worker through a bounded queue.
+        With a persist window, per-chunk stats and progress are emitted as each
+        extraction finishes; only the database write is deferred to the window.
+        ``graph_persist_blocked_ms`` counts producer time spent waiting on a full
+        queue (DB-bound) and ``graph_persist_idle_ms`` persistence time spent
+        waiting for extractions (LLM-bound).
+        """
+        started = time.perf_counter()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._graph_persist_queue_size)
+        pending: list[tuple[int, UUID, ChunkGraphExtraction]] = []
+
+        async def persist_chunk(idx: int, chunk_uuid: UUID, extraction: ChunkGraphExtraction) -> None:
+            nonlocal pending
+            if extraction.is_empty():
+                return
+            totals["chunks_with_graph"] += 1
+            if self._graph_persist_window > 1:
+                pending.append((idx, chunk_uuid, extraction))
+                if len(pending) >= self._graph_persist_window:
+                    window, pending = pending, []
+                    await self._persist_window(
+                        window,
+                        doc_id=doc_id,
+                        tenant_id=tenant_id,
+                        tenant_uuid=tenant_uuid,
+                        totals=totals,
+                        embedding_mode=embedding_mode,
+                        embedding_provider=embedding_provider,
+                        entity_index=entity_index,
+                        log_step_callback=log_step_callback,
+                    )
+                return
+
+            stats = await self.graph_repository.upsert_knowledge_subgraph(
+                extraction=extraction,
+                chunk_id=chunk_uuid,
+                tenant_id=tenant_uuid,
+                embedding_mode=embedding_mode,
+                embedding_provider=embedding_provider,
+                entity_index=entity_index,
+            )
+            self._update_totals(totals, stats)
+            if log_step_callback:
+                await self._log_chunk_progress(
+                    log_step_callback,
+                    doc_id,
+                    tenant_id,
+                    idx,
+                    chunk_uuid,
+                    stats,
+                    self._graph_log_every_n,
+                )
 
+        async def report_extractions(
+            batch: list[tuple[int, UUID, str]], extractions: list[ChunkGraphExtraction]
+        ) -> None:
+            # Windowed mode: stats and progress per chunk as soon as its extraction lands,
+            # without waiting behind the window's database write.
+            for (idx, chunk_uuid, _content), extraction in zip(batch, extractions):
+                if extraction.is_empty():
+                    continue
+                extracted = {
+                    "entities_extracted": len(extraction.entities),
+                    "relations_extracted": len(extraction.relations),
+                }
+                self._update_totals(totals, extracted)
                 if log_step_callback:
                     await self._log_chunk_progress(
                         log_step_callback,
@@ -126,25 +253,156 @@ class GraphEnrichmentService:
                         tenant_id,
                         idx,
                         chunk_uuid,
-                        stats,
+                        extracted,
                         self._graph_log_every_n,
+                        persisted=False,
                     )
 
-        # 3. Link Chunks to Structure
-        if toc_entries:
-            try:
-                structure_link_stats = await self.graph_repository.link_chunks_to_structure(
-                    tenant_id=tenant_uuid,
-                    source_document_id=UUID(str(doc_id)),
-                    chunks=chunks,
+        async def produce() -> None:
+            inflight: deque = deque()
+            batch_starts = iter(range(0, len(candidate_chunks), self._graph_batch_size))
+            window_size = self._resolve_inflight_batches()
+
+            def submit_next() -> bool:
+                batch_start = next(batch_starts, None)
+                if batch_start is None:
+                    return False
+                batch = candidate_chunks[batch_start : batch_start + self._graph_batch_size]
+                task = asyncio.create_task(
+                    self.extractor.extract_graph_batch_async([item[2] for item in batch])
                 )
-                totals["structure_links_upserted"] += int(
-                    structure_link_stats.get("links_upserted", 0)
+                inflight.append((batch, task))
+                return True
+
+            try:
+                while len(inflight) < window_size and submit_next():
+                    pass
+                while inflight:
+                    batch, task = inflight.popleft()
+                    extractions = await task
+                    submit_next()
+                    totals["graph_extract_batches"] += 1
+                    if self._graph_persist_window > 1:
+                        await report_extractions(batch, extractions)
+                    wait_started = time.perf_counter()
+                    await queue.put(list(zip(batch, extractions)))
+                    totals["graph_persist_blocked_ms"] += int(
+                        (time.perf_counter() - wait_started) * 1000
+                    )
+                    totals["graph_persist_queue_max_depth"] = max(
+                        totals["graph_persist_queue_max_depth"], queue.qsize()
+                    )
+            finally:
+                for _batch, task in inflight:
+                    task.cancel()
+            await queue.put(None)
+
+        async def consume() -> None:
+            while True:
+                wait_started = time.perf_counter()
+                results = await queue.get()
+                totals["graph_persist_idle_ms"] += int((time.perf_counter() - wait_started) * 1000)
+                if results is None:
+                    break
+                for (idx, chunk_uuid, _content), extraction in results:
+                    await persist_chunk(idx, chunk_uuid, extraction)
+            if pending:
+                await self._persist_window(
+                    pending,
+                    doc_id=doc_id,
+                    tenant_id=tenant_id,
+                    tenant_uuid=tenant_uuid,
+                    totals=totals,
+                    embedding_mode=embedding_mode,
+                    embedding_provider=embedding_provider,
+                    entity_index=entity_index,
+                    log_step_callback=log_step_callback,
                 )
-            except Exception as exc:
-                logger.warning("chunk_structure_link_failed", doc_id=doc_id, error=str(exc))
 
-        return totals
+        stages = [asyncio.create_task(produce()), asyncio.create_task(consume())]
+        try:
+            await asyncio.gather(*stages)
+        except BaseException:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            raise
+        finally:
+            totals["graph_pipeline_wall_ms"] = int((time.perf_counter() - started) * 1000)
+            logger.info(
+                "graphrag_pipeline_metrics",
+                doc_id=doc_id,
+                chunks=len(candidate_chunks),
+                batches=totals["graph_extract_batches"],
+                persist_blocked_ms=totals["graph_persist_blocked_ms"],
+                persist_idle_ms=totals["graph_persist_idle_ms"],
+                queue_max_depth=totals["graph_persist_queue_max_depth"],
+                wall_ms=totals["graph_pipeline_wall_ms"],
+            )
+
+    async def _persist_window(
+        self,
+        window: list[tuple[int, UUID, ChunkGraphExtraction]],
+        *,
+        doc_id: str,
+        tenant_id: str,
+        tenant_uuid: UUID,
+        totals: Dict[str, int],
+        embedding_mode: Optional[str],
+        embedding_provider: Optional[str],
+        entity_index: TenantEntityIndex,
+        log_step_callback: Optional[Any],
+    ) -> None:
+        subgraph = aggregate_chunk_extractions(
+            [(chunk_uuid, extraction) for _idx, chunk_uuid, extraction in window]
+        )
+        stats = await self.graph_repository.upsert_document_subgraph(
+            subgraph=subgraph,
+            tenant_id=tenant_uuid,
+            embedding_mode=embedding_mode,
+            embedding_provider=embedding_provider,
+            entity_index=entity_index,
+        )
+        # Extraction counts were already added per chunk as each extraction finished.
+        self._update_totals(
+            totals,
+            {
+                key: value
+                for key, value in stats.items()
+                if key not in ("entities_extracted", "relations_extracted")
+            },
+        )
+
+        if log_step_callback:
+            await self._log_window_progress(
+                log_step_callback,
+                doc_id,
+                tenant_id,
+                first_idx=window[0][0],
+                last_idx=window[-1][0],
+                chunk_count=len(window),
+                stats=stats,
+            )
+
+    @staticmethod
+    def _record_cache_metrics(
+        doc_id: str,
+        totals: Dict[str, int],
+        before: Dict[str, Any],
+        after: Dict[str, Any],
+    ) -> None:
+        # Deltas of process-wide counters; overlapping documents share them.
+        for key in ("hits", "misses", "prompt_tokens_avoided"):
+            totals[f"graph_cache_{key}"] = int(after.get(key, 0)) - int(before.get(key, 0))
+        logger.info(
+            "graph_extraction_cache_metrics",
+            doc_id=doc_id,
+            hits=totals["graph_cache_hits"],
+            misses=totals["graph_cache_misses"],
+            prompt_tokens_avoided=totals["graph_cache_prompt_tokens_avoided"],
+            process_hit_rate=after.get("hit_rate", 0.0),
+            process_llm_seconds_avoided=after.get("llm_seconds_avoided", 0.0),
+        )
 
     def _initialize_totals(self) -> Dict[str, int]:
         return {
@@ -163,6 +421,11 @@ class GraphEnrichmentService:
             "structure_nodes_upserted": 0,
             "structure_edges_upserted": 0,
             "structure_links_upserted": 0,
+            "graph_extract_batches": 0,
+            "graph_persist_blocked_ms": 0,
+            "graph_persist_idle_ms": 0,
+            "graph_persist_queue_max_depth": 0,
+            "graph_pipeline_wall_ms": 0,
         }
 
     def _prepare_candidate_chunks(
@@ -212,6 +475,7 @@ class GraphEnrichmentService:
         chunk_uuid: UUID,
         stats: dict[str, Any],
         log_every: int,
+        persisted: bool = True,
     ):
         chunk_error_count = len(stats.get("errors", []))
         should_emit = chunk_error_count > 0 or idx == 1 or (idx % log_every) == 0
@@ -231,15 +495,57 @@ class GraphEnrichmentService:
                 relations_merged=stats.get("relations_merged", 0),
                 links_upserted=stats.get("links_upserted", 0),
                 errors=chunk_error_count,
+                persisted=persisted,
             )
 
+        if persisted:
+            message = f"Graph chunk {idx}: entities={stats.get('entities_extracted', 0)} provenance={stats.get('links_upserted', 0)}"
+        else:
+            message = f"Graph chunk {idx}: entities={stats.get('entities_extracted', 0)} relations={stats.get('relations_extracted', 0)} (persist pending)"
         await callback(
             doc_id,
-            f"Graph chunk {idx}: entities={stats.get('entities_extracted', 0)} provenance={stats.get('links_upserted', 0)}",
+            message,
             "INFO" if chunk_error_count == 0 else "WARNING",
             tenant_id=tenant_id,
         )
 
+    async def _log_window_progress(
+        self,
+        callback: LogStepCallback,
+        doc_id: str,
+        tenant_id: str,
+        *,
+        first_idx: int,
+        last_idx: int,
+        chunk_count: int,
+        stats: dict[str, Any],
+    ):
+        error_count = len(stats.get("errors", []))
+        if self._log_event_emitter is not None:
+            self._log_event_emitter(
+                logger,
+                "graphrag_window_metrics",
+                doc_id=doc_id,
+                first_chunk_index=first_idx,
+                last_chunk_index=last_idx,
+                chunks=chunk_count,
+                entities_extracted=stats.get("entities_extracted", 0),
+                relations_extracted=stats.get("relations_extracted", 0),
+                entities_inserted=stats.get("entities_inserted", 0),
+                entities_merged=stats.get("entities_merged", 0),
+                relations_inserted=stats.get("relations_inserted", 0),
+                relations_merged=stats.get("relations_merged", 0),
+                links_upserted=stats.get("links_upserted", 0),
+                errors=error_count,
+            )
+
+        await callback(
+            doc_id,
+            f"Graph chunks {first_idx}-{last_idx}: entities={stats.get('entities_extracted', 0)} provenance={stats.get('links_upserted', 0)}",
+            "INFO" if error_count == 0 else "WARNING",
+            tenant_id=tenant_id,
+        )
+
     @staticmethod
     def _resolve_embedding_mode(chunks: list[Any]) -> Optional[str]:
         for chunk in chunks:
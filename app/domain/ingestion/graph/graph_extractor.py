@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import random
 import time
@@ -37,6 +38,13 @@ except Exception:  # pragma: no cover - fallback for older branches
             return not self.nodes and not self.edges
 
 
+from .extraction_cache import (
+    GraphExtractionCacheStats,
+    IGraphExtractionCache,
+    build_graph_extraction_cache_key,
+    prompt_fingerprint,
+)
+
 logger = logging.getLogger(__name__)
 DEFAULT_GRAPH_EXTRACTION_MAX_CONCURRENCY = 6
 DEFAULT_GRAPH_EXTRACTION_RETRY_MAX_ATTEMPTS = 3
@@ -101,6 +109,56 @@ class BatchChunkGraphExtraction(BaseModel):
     chunks: list[IndexedChunkGraphExtraction] = Field(default_factory=list)
 
 
+def cached_graph_extraction(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Cache-aside decorator for ``GraphExtractor._request_graph_extraction_async``.
+
+    Cache key dimensions:
+    - normalized chunk text (SHA-256)
+    - prompt_version (configured version + prompt template fingerprint)
+    - model
+
+    Only successful LLM responses reach the store; cache read/write failures
+    are logged and counted but never fail the extraction.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: "GraphExtractor", text: str) -> ChunkGraphExtraction:
+        cache = self._extraction_cache
+        if cache is None:
+            return await func(self, text)
+
+        key = build_graph_extraction_cache_key(
+            text=text, prompt_version=self.prompt_version, model=self.model_name
+        )
+        try:
+            cached = await cache.get(key)
+        except Exception as err:
+            self.cache_stats.record_error()
+            logger.warning("graph_extraction_cache_read_failed error=%s", self._error_formatter(err))
+            cached = None
+        if cached is not None:
+            try:
+                result = ChunkGraphExtraction.model_validate(cached)
+            except Exception:
+                self.cache_stats.record_error()
+            else:
+                self.cache_stats.record_hit(len(self._SYSTEM_PROMPT) + len(text))
+                return result
+
+        started = time.perf_counter()
+        result = await func(self, text)
+        self.cache_stats.record_miss(time.perf_counter() - started)
+        try:
+            await cache.set(key, result.model_dump(mode="json"))
+            self.cache_stats.record_store()
+        except Exception as err:
+            self.cache_stats.record_error()
+            logger.warning("graph_extraction_cache_write_failed error=%s", self._error_formatter(err))
+        return result
+
+    return wrapper
+
+
 @runtime_checkable
 class IGraphExtractor(Protocol):
     def extract(self, text: str, chunk_id: Optional[UUID] = None) -> GraphExtractionResult: ...
@@ -147,8 +205,18 @@ class GraphExtractor(IGraphExtractor):
         retry_max_delay_seconds: float = DEFAULT_GRAPH_EXTRACTION_RETRY_MAX_DELAY_SECONDS,
         retry_jitter_seconds: float = DEFAULT_GRAPH_EXTRACTION_RETRY_JITTER_SECONDS,
         error_formatter: Optional[Callable[[Exception], str]] = None,
+        extraction_cache: Optional[IGraphExtractionCache] = None,
+        model_name: str = "",
+        prompt_version: str = "v1",
     ):
         self._strict_engine = strict_engine
+        self._extraction_cache = extraction_cache
+        self.model_name = str(model_name or getattr(strict_engine, "_model", "") or "")
+        self.prompt_version = (
+            f"{str(prompt_version or 'v1').strip()}:"
+            f"{prompt_fingerprint(self._SYSTEM_PROMPT, self._USER_PROMPT)}"
+        )
+        self.cache_stats = GraphExtractionCacheStats()
         self._error_formatter = error_formatter or (lambda err: str(err))
         self._max_concurrency = max(
             1, int(max_concurrency or DEFAULT_GRAPH_EXTRACTION_MAX_CONCURRENCY)
@@ -306,6 +374,15 @@ class GraphExtractor(IGraphExtractor):
         return bounded + jitter
 
     async def _extract_graph_with_retry_async(self, text: str) -> ChunkGraphExtraction:
+        try:
+            return await self._request_graph_extraction_async(text)
+        except Exception as err:
+            logger.error("graph_extraction_failed error=%s", self._error_formatter(err))
+            return ChunkGraphExtraction()
+
+    @cached_graph_extraction
+    async def _request_graph_extraction_async(self, text: str) -> ChunkGraphExtraction:
+        """LLM call with retries; raises after the last attempt so failures are never cached."""
         prompt = self._USER_PROMPT.format(text=text.strip())
         last_error: Optional[Exception] = None
 
@@ -332,11 +409,7 @@ class GraphExtractor(IGraphExtractor):
                 )
                 await asyncio.sleep(delay)
 
-        logger.error(
-            "graph_extraction_failed error=%s",
-            self._error_formatter(last_error or Exception("")),
-        )
-        return ChunkGraphExtraction()
+        raise last_error or RuntimeError("graph extraction failed")
 
     async def extract_graph_batch_async(self, texts: list[str]) -> list[ChunkGraphExtraction]:
         if not texts:
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+from .graph_extractor import ChunkGraphExtraction, Entity, Relation
+
+RelationKey = Tuple[str, str, str]
+
+
+def _norm(text: str) -> str:
+    return (text or "").strip().casefold()
+
+
+def normalize_relation_type(value: str) -> str:
+    return (value or "").strip().replace(" ", "_").replace("-", "_").upper()
+
+
+def merge_description(existing: str, incoming: str) -> str:
+    existing_clean = (existing or "").strip()
+    incoming_clean = (incoming or "").strip()
+    if not existing_clean:
+        return incoming_clean
+    if not incoming_clean or incoming_clean in existing_clean:
+        return existing_clean
+    return f"{existing_clean}\n\n{incoming_clean}"
+
+
+@dataclass
+class DocumentSubgraph:
+    """
+    Entities and relations of many chunks merged into one subgraph.
+
+    ``entity_chunks`` keeps chunk provenance per entity (normalized name) and
+    ``relation_occurrences`` counts in how many chunks each relation appeared,
+    so a single bulk write reproduces what chunk-by-chunk persistence stored.
+    """
+
+    extraction: ChunkGraphExtraction
+    entity_chunks: Dict[str, List[UUID]] = field(default_factory=dict)
+    relation_occurrences: Dict[RelationKey, int] = field(default_factory=dict)
+    chunk_ids: List[UUID] = field(default_factory=list)
+    entities_extracted: int = 0
+    relations_extracted: int = 0
+
+    def is_empty(self) -> bool:
+        return self.extraction.is_empty()
+
+
+def aggregate_chunk_extractions(
+    items: Sequence[Tuple[UUID, ChunkGraphExtraction]],
+) -> DocumentSubgraph:
+    """Dedupe entities/relations across chunks while keeping chunk provenance."""
+    entities: Dict[str, Entity] = {}
+    entity_chunks: Dict[str, List[UUID]] = {}
+    relations: Dict[RelationKey, Relation] = {}
+    relation_occurrences: Dict[RelationKey, int] = {}
+    chunk_ids: List[UUID] = []
+    entities_extracted = 0
+    relations_extracted = 0
+
+    for chunk_id, extraction in items:
+        if extraction.is_empty():
+            continue
+        chunk_ids.append(chunk_id)
+        entities_extracted += len(extraction.entities)
+        relations_extracted += len(extraction.relations)
+
+        for entity in extraction.entities:
+            key = _norm(entity.name)
+            previous = entities.get(key)
+            if previous is None:
+                entities[key] = entity
+            else:
+                entities[key] = Entity(
+                    name=previous.name,
+                    type=previous.type or entity.type,
+                    description=merge_description(previous.description, entity.description),
+                )
+            linked = entity_chunks.setdefault(key, [])
+            if chunk_id not in linked:
+                linked.append(chunk_id)
+
+        seen_in_chunk: set[RelationKey] = set()
+        for relation in extraction.relations:
+            source, target = _norm(relation.source), _norm(relation.target)
+            relation_type = normalize_relation_type(relation.relation_type)
+            if not source or not target or source == target or not relation_type:
+                continue
+            key = (source, target, relation_type)
+            previous_relation = relations.get(key)
+            if previous_relation is None:
+                relations[key] = Relation(
+                    source=relation.source,
+                    target=relation.target,
+                    relation_type=relation_type,
+                    description=relation.description,
+                    weight=relation.weight,
+                )
+            else:
+                previous_relation.description = merge_description(
+                    previous_relation.description, relation.description
+                )
+            if key not in seen_in_chunk:
+                seen_in_chunk.add(key)
+                relation_occurrences[key] = relation_occurrences.get(key, 0) + 1
+
+    return DocumentSubgraph(
+        extraction=ChunkGraphExtraction(
+            entities=list(entities.values()), relations=list(relations.values())
+        ),
+        entity_chunks=entity_chunks,
+        relation_occurrences=relation_occurrences,
+        chunk_ids=chunk_ids,
+        entities_extracted=entities_extracted,
+        relations_extracted=relations_extracted,
+    )
@@ -1,11 +1,18 @@
 import logging
+import multiprocessing
+import threading
 import numpy as np
-from typing import List, Dict, Optional, Callable, Awaitable, Any
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Callable, Awaitable, Any, AsyncIterator
 from uuid import UUID
+from sklearn.decomposition import PCA
 from sklearn.mixture import GaussianMixture
 import asyncio
-import networkx as nx
+from app.domain.ingestion.knowledge.community_graph import TenantGraph, TenantGraphBuilder
 from app.domain.ingestion.ports import ITextEmbeddingService
+from app.domain.retrieval.result_cache import index_generations
 from app.domain.schemas.raptor_schemas import ClusterResult, ClusterAssignment
 
 logger = logging.getLogger(__name__)
@@ -18,10 +25,91 @@ except ImportError:  # pragma: no cover - dependency guard
     leidenalg = None
 
 
+def _fit_gmm_bic(
+    reduced: np.ndarray, n_components: int, random_state: int, max_iter: int
+) -> tuple[int, float, Optional[GaussianMixture]]:
+    """Fit one BIC candidate. Module-level so it can run in a worker process."""
+    try:
+        gmm = GaussianMixture(
+            n_components=n_components,
+            random_state=random_state,
+            covariance_type="diag",
+            max_iter=max_iter,
+        )
+        gmm.fit(reduced)
+        return n_components, float(gmm.bic(reduced)), gmm
+    except Exception as e:
+        logger.warning(f"GMM failed for n={n_components}: {e}")
+        return n_components, float("inf"), None
+
+
+def _seed_membership(node_ids: list[str], previous_membership: dict[str, int]) -> list[int]:
+    """Leiden ``initial_membership``: previous community per node, singletons for new nodes.
+
+    Labels are compacted to ``0..m-1`` because leidenalg sizes its community
+    arrays by the largest label.
+    """
+    labels: dict[tuple[str, Any], int] = {}
+    membership: list[int] = []
+    for node_id in node_ids:
+        previous = previous_membership.get(node_id)
+        key = ("prev", previous) if previous is not None else ("new", node_id)
+        membership.append(labels.setdefault(key, len(labels)))
+    return membership
+
+
+def _align_communities(
+    groups: list[list[str]],
+    previous_members: dict[int, set[str]],
+    max_previous_id: int = -1,
+) -> dict[int, list[str]]:
+    """Give each new community the id of the previous community it overlaps most.
+
+    Matching is greedy by overlap size (one-to-one); unmatched communities get
+    fresh ids above every previous id (and above ``max_previous_id``, the
+    stored maximum) so existing and removed rows are never reused.
+    """
+    owner = {member: cid for cid, members in previous_members.items() for member in members}
+    pairs: list[tuple[int, int, int]] = []
+    for index, members in enumerate(groups):
+        overlap: dict[int, int] = {}
+        for member in members:
+            cid = owner.get(member)
+            if cid is not None:
+                overlap[cid] = overlap.get(cid, 0) + 1
+        pairs.extend((-count, index, cid) for cid, count in overlap.items())
+
+    assigned: dict[int, int] = {}
+    taken: set[int] = set()
+    for _neg_count, index, cid in sorted(pairs):
+        if index in assigned or cid in taken:
+            continue
+        assigned[index] = cid
+        taken.add(cid)
+
+    next_id = max(max(previous_members, default=-1), int(max_previous_id)) + 1
+    aligned: dict[int, list[str]] = {}
+    for index, members in enumerate(groups):
+        cid = assigned.get(index)
+        if cid is None:
+            cid = next_id
+            next_id += 1
+        aligned[cid] = members
+    return aligned
+
+
 class GMMClusteringService:
     """
     Gaussian Mixture Model clustering for semantic grouping of chunks.
     Supports soft clustering where a chunk can belong to multiple clusters.
+
+    Embeddings are projected with PCA to ``reduced_dimensions`` before the BIC
+    sweep. Candidate k values are fitted in waves of ``max_workers`` on a
+    process pool (sequentially when ``max_workers=0``) and the sweep stops once
+    ``early_stop_patience`` consecutive k fail to improve the best BIC. Every
+    fit uses ``random_state`` and the winner is taken in k order, so results do
+    not depend on pool size or completion order; the winning model is reused
+    for the assignment instead of being refitted.
     """
 
     def __init__(
@@ -30,48 +118,116 @@ class GMMClusteringService:
         max_clusters: int = 10,
         soft_threshold: float = 0.3,
         random_state: int = 42,
+        reduced_dimensions: int = 32,
+        early_stop_patience: int = 2,
+        max_workers: int = 0,
+        max_iter: int = 100,
     ):
         self.min_clusters = min_clusters
         self.max_clusters = max_clusters
         self.soft_threshold = soft_threshold
         self.random_state = random_state
-
-    def _determine_optimal_clusters(self, embeddings: np.ndarray) -> int:
-        """
-        Determine optimal number of clusters using BIC minimization.
-        """
-        n_samples = len(embeddings)
-
+        self.reduced_dimensions = max(0, int(reduced_dimensions))
+        self.early_stop_patience = max(0, int(early_stop_patience))
+        self.max_workers = max(0, int(max_workers))
+        self.max_iter = max(1, int(max_iter))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: the worker process runs an event loop and threads, fork is unsafe there.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _reset_pool(self, wait: bool = False) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the process pool; with ``wait`` block until its child processes have exited."""
+        self._reset_pool(wait=wait)
+
+    def _project(self, embeddings: np.ndarray) -> np.ndarray:
+        """PCA projection used for both model selection and assignment."""
+        data = np.asarray(embeddings, dtype=np.float64)
+        n_samples, n_features = data.shape
+        n_components = min(self.reduced_dimensions, n_features, n_samples - 1)
+        if self.reduced_dimensions <= 0 or n_components >= n_features or n_components < 1:
+            return data
+        return PCA(n_components=n_components, random_state=self.random_state).fit_transform(data)
+
+    def _candidate_range(self, n_samples: int) -> range:
         # Can't have more clusters than samples
         max_k = min(self.max_clusters, n_samples - 1)
         min_k = min(self.min_clusters, max_k)
+        return range(min_k, max(min_k, max_k) + 1)
 
-        if max_k <= min_k:
-            return min_k
-
-        best_bic = float("inf")
-        best_n = min_k
-
-        for n_components in range(min_k, max_k + 1):
+    def _fit_wave(
+        self, reduced: np.ndarray, wave: List[int]
+    ) -> List[tuple[int, float, Optional[GaussianMixture]]]:
+        pool = self._get_pool() if len(wave) > 1 else None
+        if pool is not None:
             try:
-                gmm = GaussianMixture(
-                    n_components=n_components,
-                    random_state=self.random_state,
-                    covariance_type="diag",
-                    max_iter=100,
-                )
-                gmm.fit(embeddings)
-                bic = gmm.bic(embeddings)
+                futures = [
+                    pool.submit(_fit_gmm_bic, reduced, k, self.random_state, self.max_iter)
+                    for k in wave
+                ]
+                return [future.result() for future in futures]
+            except BrokenProcessPool as e:
+                logger.warning(f"GMM process pool broken, falling back to sequential: {e}")
+                self._reset_pool()
+        return [_fit_gmm_bic(reduced, k, self.random_state, self.max_iter) for k in wave]
+
+    def _select_model(self, reduced: np.ndarray) -> tuple[int, Optional[GaussianMixture]]:
+        """
+        BIC sweep with early stopping. Returns the winning k and its fitted model.
+        """
+        candidates = list(self._candidate_range(len(reduced)))
+        wave_size = max(1, self.max_workers)
 
-                if bic < best_bic:
-                    best_bic = bic
-                    best_n = n_components
+        best_bic = float("inf")
+        best_n = candidates[0]
+        best_model: Optional[GaussianMixture] = None
+        since_improvement = 0
+        fitted = 0
+        stop = False
+
+        for start in range(0, len(candidates), wave_size):
+            for n_components, bic, model in self._fit_wave(
+                reduced, candidates[start : start + wave_size]
+            ):
+                fitted += 1
+                if model is not None and bic < best_bic:
+                    best_bic, best_n, best_model = bic, n_components, model
+                    since_improvement = 0
+                    continue
+                since_improvement += 1
+                if self.early_stop_patience and since_improvement >= self.early_stop_patience:
+                    stop = True
+                    break
+            if stop:
+                break
 
-            except Exception as e:
-                logger.warning(f"GMM failed for n={n_components}: {e}")
-                continue
+        logger.info(
+            f"Optimal cluster count: {best_n} (BIC: {best_bic:.2f}, "
+            f"fitted {fitted}/{len(candidates)}, dims={reduced.shape[1]})"
+        )
+        return best_n, best_model
 
-        logger.info(f"Optimal cluster count: {best_n} (BIC: {best_bic:.2f})")
+    def _determine_optimal_clusters(self, embeddings: np.ndarray) -> int:
+        """
+        Determine optimal number of clusters using BIC minimization.
+        """
+        best_n, _model = self._select_model(self._project(embeddings))
         return best_n
 
     def cluster(self, chunk_ids: List[UUID], embeddings: np.ndarray) -> ClusterResult:
@@ -89,17 +245,21 @@ class GMMClusteringService:
                 cluster_contents={0: chunk_ids},
             )
 
-        n_clusters = self._determine_optimal_clusters(embeddings)
+        reduced = self._project(embeddings)
+        n_clusters, gmm = self._select_model(reduced)
 
-        gmm = GaussianMixture(
-            n_components=n_clusters,
-            random_state=self.random_state,
-            covariance_type="diag",
-            max_iter=100,
-        )
-        gmm.fit(embeddings)
+        if gmm is None:
+            logger.warning("GMM failed for every candidate, keeping a single cluster")
+            return ClusterResult(
+                num_clusters=1,
+                assignments=[
+                    ClusterAssignment(chunk_id=chunk_id, cluster_id=0, probability=1.0)
+                    for chunk_id in chunk_ids
+                ],
+                cluster_contents={0: list(chunk_ids)},
+            )
 
-        proba = gmm.predict_proba(embeddings)
+        proba = gmm.predict_proba(reduced)
 
         assignments: List[ClusterAssignment] = []
         cluster_contents: Dict[int, List[UUID]] = {i: [] for i in range(n_clusters)}
@@ -126,11 +286,23 @@ class GMMClusteringService:
             cluster_contents=cluster_contents,
         )
 
+    async def acluster(self, chunk_ids: List[UUID], embeddings: np.ndarray) -> ClusterResult:
+        """``cluster`` off the event loop (the k sweep itself may use the process pool)."""
+        return await asyncio.to_thread(self.cluster, chunk_ids, embeddings)
+
 
 class ClusteringService:
     """
     Offline community detection + summarization for GraphRAG.
-    Uses NetworkX for graph assembly and Leiden (igraph/leidenalg) for partitioning.
+    Entities and relations are streamed with keyset pagination into int32 edge
+    arrays (``TenantGraphBuilder``) and handed to igraph in one call; Leiden
+    (leidenalg) runs off the event loop.
+
+    With ``incremental=True`` Leiden is seeded with the persisted level-0
+    membership, new communities are mapped back to the ids they overlap most,
+    and only communities whose member set changed are re-summarized, re-embedded
+    and upserted. Untouched ``knowledge_communities`` rows are left alone, so a
+    rebuild costs roughly in proportion to graph churn.
     """
 
     def __init__(
@@ -141,6 +313,8 @@ class ClusteringService:
         supabase_client_factory: Optional[Callable[[], Awaitable[Any]]] = None,
         resolution: float = 1.0,
         max_entities_for_prompt: int = 60,
+        incremental: bool = False,
+        graph_page_size: int = 1000,
     ):
         self._supabase = supabase_client
         self._supabase_client_factory = supabase_client_factory
@@ -148,6 +322,8 @@ class ClusteringService:
         self._llm = llm
         self._resolution = resolution
         self._max_entities_for_prompt = max_entities_for_prompt
+        self._incremental = bool(incremental)
+        self._graph_page_size = max(1, int(graph_page_size))
 
         if self._embedding_service is None:
             raise ValueError("ClusteringService requires an embedding_service instance")
@@ -161,107 +337,155 @@ class ClusteringService:
             self._supabase = await self._supabase_client_factory()
         return self._supabase
 
-    async def _fetch_tenant_graph_data(self, tenant_id: UUID) -> tuple[list[dict], list[dict]]:
+    async def _iter_keyset_pages(
+        self,
+        table: str,
+        columns: str,
+        tenant_id: UUID,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield tenant rows ordered by ``id`` using ``id > last_id`` pagination.
+
+        Unlike a single select this is not truncated by PostgREST ``max-rows``,
+        and unlike offset pagination every page is an index range scan.
+        ``columns`` must include ``id``; ``filters`` adds equality filters.
+        """
         client = await self._get_client()
         tenant_str = str(tenant_id)
-
-        entities_resp = (
-            await client.table("knowledge_entities")
-            .select("id,name,description")
-            .eq("tenant_id", tenant_str)
-            .execute()
-        )
-
-        relations_resp = (
-            await client.table("knowledge_relations")
-            .select("source_entity_id,target_entity_id,weight")
-            .eq("tenant_id", tenant_str)
-            .execute()
-        )
-
-        entities = entities_resp.data or []
-        relations = relations_resp.data or []
-        return entities, relations
-
-    @staticmethod
-    def _build_networkx_graph(entities: list[dict], relations: list[dict]) -> nx.Graph:
-        graph = nx.Graph()
-
-        for entity in entities:
-            entity_id = str(entity.get("id"))
-            if not entity_id:
-                continue
-            graph.add_node(entity_id)
-
-        for relation in relations:
-            source = str(relation.get("source_entity_id"))
-            target = str(relation.get("target_entity_id"))
-            if not source or not target or source == target:
-                continue
-
-            weight_raw = relation.get("weight", 1.0)
-            try:
-                weight = float(weight_raw or 1.0)
-            except Exception:
-                weight = 1.0
-
-            graph.add_edge(source, target, weight=max(weight, 0.0001))
-
-        return graph
+        last_id: Optional[str] = None
+        while True:
+            query = client.table(table).select(columns).eq("tenant_id", tenant_str)
+            for key, value in (filters or {}).items():
+                query = query.eq(key, value)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            response = await query.order("id").limit(self._graph_page_size).execute()
+            rows = response.data or []
+            if rows:
+                yield rows
+            if len(rows) < self._graph_page_size:
+                return
+            last_id = str(rows[-1]["id"])
+
+    async def _load_tenant_graph(self, tenant_id: UUID) -> TenantGraph:
+        builder = TenantGraphBuilder()
+        async for rows in self._iter_keyset_pages("knowledge_entities", "id", tenant_id):
+            builder.add_nodes(row.get("id") for row in rows)
+        async for rows in self._iter_keyset_pages(
+            "knowledge_relations", "id,source_entity_id,target_entity_id,weight", tenant_id
+        ):
+            builder.add_relations(rows)
+        return builder.build()
 
     @staticmethod
-    def _to_igraph(graph_nx: nx.Graph):
+    def _to_igraph(graph: TenantGraph):
         if ig is None:
             raise ImportError("python-igraph no disponible. Instala python-igraph.")
 
-        nodes = list(graph_nx.nodes())
-        node_to_index = {node_id: idx for idx, node_id in enumerate(nodes)}
-        edge_tuples = []
-        weights = []
-
-        for source, target, attrs in graph_nx.edges(data=True):
-            edge_tuples.append((node_to_index[source], node_to_index[target]))
-            weights.append(float(attrs.get("weight", 1.0)))
-
-        graph_ig = ig.Graph(n=len(nodes), edges=edge_tuples, directed=False)
-        if weights:
-            graph_ig.es["weight"] = weights
-
-        return graph_ig, nodes
+        graph_ig = ig.Graph(n=graph.number_of_nodes, edges=graph.edges, directed=False)
+        if graph.number_of_edges:
+            graph_ig.es["weight"] = graph.weights.tolist()
+        return graph_ig
+
+    async def _fetch_previous_communities(self, tenant_id: UUID) -> dict[int, set[str]]:
+        previous: dict[int, set[str]] = {}
+        async for rows in self._iter_keyset_pages(
+            "knowledge_communities", "id,community_id,members", tenant_id, filters={"level": 0}
+        ):
+            for row in rows:
+                try:
+                    community_id = int(row.get("community_id"))
+                except (TypeError, ValueError):
+                    continue
+                members = row.get("members") or []
+                previous[community_id] = {str(member) for member in members if member}
+        return previous
+
+    async def _fetch_max_community_id(self, tenant_id: UUID) -> int:
+        """Highest stored level-0 ``community_id`` of the tenant (-1 when there is none)."""
+        client = await self._get_client()
+        response = (
+            await client.table("knowledge_communities")
+            .select("community_id")
+            .eq("tenant_id", str(tenant_id))
+            .eq("level", 0)
+            .order("community_id", desc=True)
+            .limit(1)
+            .execute()
+        )
+        rows = response.data or []
+        try:
+            return int(rows[0].get("community_id")) if rows else -1
+        except (TypeError, ValueError):
+            return -1
+
+    def _partition(
+        self, graph: TenantGraph, initial_membership: Optional[list[int]] = None
+    ) -> list[int]:
+        """Leiden membership for ``graph.node_ids`` in vertex order."""
+        graph_ig = self._to_igraph(graph)
+        partition = leidenalg.find_partition(
+            graph_ig,
+            leidenalg.RBConfigurationVertexPartition,
+            initial_membership=initial_membership,
+            weights=graph_ig.es["weight"] if graph_ig.ecount() > 0 else None,
+            resolution_parameter=self._resolution,
+        )
+        return list(partition.membership)
 
-    async def compute_communities(self, tenant_id: UUID) -> dict[int, list[str]]:
+    async def compute_communities(
+        self,
+        tenant_id: UUID,
+        previous_members: Optional[dict[int, set[str]]] = None,
+        max_previous_id: int = -1,
+    ) -> dict[int, list[str]]:
+        """Partition the tenant graph.
+
+        When ``previous_members`` is given, Leiden starts from that membership
+        and the returned ids are aligned with the previous community ids;
+        new communities are numbered above ``max_previous_id``.
+        """
         if leidenalg is None:
             raise ImportError("leidenalg no disponible. Instala leidenalg.")
 
-        entities, relations = await self._fetch_tenant_graph_data(tenant_id)
-        graph_nx = self._build_networkx_graph(entities, relations)
+        graph = await self._load_tenant_graph(tenant_id)
 
-        if graph_nx.number_of_nodes() == 0:
+        if graph.number_of_nodes == 0:
             logger.warning("No entities found for tenant=%s", tenant_id)
             return {}
 
-        if graph_nx.number_of_edges() == 0:
+        if graph.number_of_edges == 0:
             logger.warning("No relations found for tenant=%s", tenant_id)
             return {}
 
-        graph_ig, node_ids = self._to_igraph(graph_nx)
-        partition = leidenalg.find_partition(
-            graph_ig,
-            leidenalg.RBConfigurationVertexPartition,
-            weights=graph_ig.es["weight"] if graph_ig.ecount() > 0 else None,
-            resolution_parameter=self._resolution,
-        )
+        node_ids = graph.node_ids
+        initial_membership = None
+        if previous_members:
+            previous_membership = {
+                member: cid for cid, members in previous_members.items() for member in members
+            }
+            initial_membership = _seed_membership(node_ids, previous_membership)
 
-        community_map: dict[int, list[str]] = {}
-        for vertex_index, community_id in enumerate(partition.membership):
-            community_map.setdefault(int(community_id), []).append(node_ids[vertex_index])
+        membership = await asyncio.to_thread(self._partition, graph, initial_membership)
+
+        grouped: dict[int, list[str]] = {}
+        for vertex_index, community_id in enumerate(membership):
+            grouped.setdefault(int(community_id), []).append(node_ids[vertex_index])
+
+        if previous_members:
+            community_map = _align_communities(
+                list(grouped.values()), previous_members, max_previous_id
+            )
+        else:
+            community_map = grouped
 
         logger.info(
-            "Leiden complete tenant=%s nodes=%s edges=%s communities=%s",
+            "Leiden complete tenant=%s nodes=%s edges=%s communities=%s seeded=%s",
             tenant_id,
-            graph_nx.number_of_nodes(),
-            graph_nx.number_of_edges(),
+            graph.number_of_nodes,
+            graph.number_of_edges,
             len(community_map),
+            initial_membership is not None,
         )
         return community_map
 
@@ -373,17 +597,101 @@ class ClusteringService:
             response = await client.table("knowledge_communities").insert(batch).execute()
             inserted += len(response.data or [])
 
+        # Cached retrieval results may carry the communities just replaced.
+        await index_generations.bump(tenant_id)
         logger.info("Persisted communities tenant=%s count=%s", tenant_id, inserted)
         return inserted
 
-    async def rebuild_communities(self, tenant_id: UUID) -> dict[str, int]:
-        partition_map = await self.compute_communities(tenant_id)
+    async def persist_changed_communities(
+        self,
+        tenant_id: UUID,
+        communities: dict[int, dict],
+        removed_ids: set[int],
+    ) -> int:
+        """Upsert changed level-0 communities and drop vanished ones; other rows are untouched."""
+        client = await self._get_client()
+        tenant_str = str(tenant_id)
+        updated_at = datetime.now(timezone.utc).isoformat()
+
+        rows = [{**payload, "updated_at": updated_at} for payload in communities.values()]
+        batch_size = 100
+        upserted = 0
+        for idx in range(0, len(rows), batch_size):
+            batch = rows[idx : idx + batch_size]
+            response = (
+                await client.table("knowledge_communities")
+                .upsert(batch, on_conflict="tenant_id,community_id,level")
+                .execute()
+            )
+            upserted += len(response.data or [])
+
+        # Delete after upserting so readers never see a tenant without communities.
+        if removed_ids:
+            await (
+                client.table("knowledge_communities")
+                .delete()
+                .eq("tenant_id", tenant_str)
+                .eq("level", 0)
+                .in_("community_id", sorted(removed_ids))
+                .execute()
+            )
+        if rows or removed_ids:
+            await index_generations.bump(tenant_id)
+
+        logger.info(
+            "Persisted changed communities tenant=%s upserted=%s removed=%s",
+            tenant_id,
+            upserted,
+            len(removed_ids),
+        )
+        return upserted
+
+    async def rebuild_communities(
+        self, tenant_id: UUID, incremental: Optional[bool] = None
+    ) -> dict[str, int]:
+        use_incremental = self._incremental if incremental is None else bool(incremental)
+        previous_members = await self._fetch_previous_communities(tenant_id) if use_incremental else {}
+
+        if not previous_members:
+            partition_map = await self.compute_communities(tenant_id)
+            if not partition_map:
+                return {"communities_detected": 0, "communities_persisted": 0}
+
+            payloads = await self.summarize_communities(tenant_id, partition_map)
+            persisted = await self.persist_communities(tenant_id, payloads)
+            return {
+                "communities_detected": len(partition_map),
+                "communities_persisted": persisted,
+            }
+
+        max_previous_id = await self._fetch_max_community_id(tenant_id)
+        partition_map = await self.compute_communities(tenant_id, previous_members, max_previous_id)
         if not partition_map:
             return {"communities_detected": 0, "communities_persisted": 0}
 
-        payloads = await self.summarize_communities(tenant_id, partition_map)
-        persisted = await self.persist_communities(tenant_id, payloads)
+        changed = {
+            cid: members
+            for cid, members in partition_map.items()
+            if set(members) != previous_members.get(cid)
+        }
+        removed_ids = set(previous_members) - set(partition_map)
+
+        payloads = await self.summarize_communities(tenant_id, changed)
+        # A changed community that produced no payload would keep a stale row.
+        removed_ids |= {cid for cid in changed if cid not in payloads and cid in previous_members}
+        persisted = await self.persist_changed_communities(tenant_id, payloads, removed_ids)
+
+        logger.info(
+            "Incremental community rebuild tenant=%s communities=%s changed=%s removed=%s",
+            tenant_id,
+            len(partition_map),
+            len(changed),
+            len(removed_ids),
+        )
         return {
             "communities_detected": len(partition_map),
             "communities_persisted": persisted,
+            "communities_changed": len(changed),
+            "communities_unchanged": len(partition_map) - len(changed),
+            "communities_removed": len(removed_ids),
         }
@@ -0,0 +1,110 @@
+"""Integer-indexed tenant graph for community detection, built page by page.
+
+Entity ids are mapped to dense ``int32`` vertex indices as pages arrive and
+edges are kept as NumPy arrays, so the graph handed to igraph is never
+materialized as Python objects (no intermediate NetworkX graph).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+
+MIN_EDGE_WEIGHT = 0.0001
+
+
+@dataclass(frozen=True)
+class TenantGraph:
+    node_ids: list[str]
+    edges: np.ndarray  # (m, 2) int32 vertex indices, undirected, source < target
+    weights: np.ndarray  # (m,) float32
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def number_of_edges(self) -> int:
+        return int(self.edges.shape[0])
+
+
+class TenantGraphBuilder:
+    """Accumulates entity and relation pages into edge arrays.
+
+    Semantics match the previous ``nx.Graph`` assembly: self-loops are
+    dropped, parallel and reversed edges collapse into one edge (the last
+    weight wins), weights are floored at ``MIN_EDGE_WEIGHT`` and relations may
+    introduce endpoints that were not listed as entities.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self._node_ids: list[str] = []
+        self._sources: list[np.ndarray] = []
+        self._targets: list[np.ndarray] = []
+        self._weights: list[np.ndarray] = []
+
+    def _vertex(self, node_id: str) -> int:
+        index = self._index.get(node_id)
+        if index is None:
+            index = len(self._node_ids)
+            self._index[node_id] = index
+            self._node_ids.append(node_id)
+        return index
+
+    def add_nodes(self, node_ids: Iterable[Any]) -> None:
+        for node_id in node_ids:
+            if node_id:
+                self._vertex(str(node_id))
+
+    def add_relations(self, rows: Iterable[dict]) -> None:
+        sources: list[int] = []
+        targets: list[int] = []
+        weights: list[float] = []
+        for row in rows:
+            source = row.get("source_entity_id")
+            target = row.get("target_entity_id")
+            if not source or not target or source == target:
+                continue
+            try:
+                weight = float(row.get("weight", 1.0) or 1.0)
+            except (TypeError, ValueError):
+                weight = 1.0
+            sources.append(self._vertex(str(source)))
+            targets.append(self._vertex(str(target)))
+            weights.append(weight)
+
+        if sources:
+            self._sources.append(np.asarray(sources, dtype=np.int32))
+            self._targets.append(np.asarray(targets, dtype=np.int32))
+            self._weights.append(np.asarray(weights, dtype=np.float32))
+
+    def build(self) -> TenantGraph:
+        if not self._sources:
+            return TenantGraph(
+                node_ids=list(self._node_ids),
+                edges=np.empty((0, 2), dtype=np.int32),
+                weights=np.empty(0, dtype=np.float32),
+            )
+
+        sources = np.concatenate(self._sources)
+        targets = np.concatenate(self._targets)
+        weights = np.maximum(np.concatenate(self._weights), np.float32(MIN_EDGE_WEIGHT))
+
+        low = np.minimum(sources, targets)
+        high = np.maximum(sources, targets)
+        keys = low.astype(np.int64) * len(self._node_ids) + high.astype(np.int64)
+        # np.unique keeps the first occurrence; scan reversed so the last write wins.
+        _unique, reversed_index = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(keys.shape[0] - 1 - reversed_index)
+
+        edges = np.empty((keep.shape[0], 2), dtype=np.int32)
+        edges[:, 0] = low[keep]
+        edges[:, 1] = high[keep]
+        return TenantGraph(
+            node_ids=list(self._node_ids),
+            edges=edges,
+            weights=np.ascontiguousarray(weights[keep], dtype=np.float32),
+        )
@@ -0,0 +1,125 @@
+"""
+Incremental RAPTOR helpers: per-cluster centroid statistics and assignment.
+
+Every summary node built by ``RaptorProcessor`` stores the normalized centroid
+of its children embeddings, the member count and the mean cosine distance of
+members to the centroid (``radius``). New nodes are attached to the closest
+existing cluster when they fall inside ``radius * drift_factor``; a cluster is
+split off when absorbing its new members would move the centroid more than
+``split_threshold`` (cosine distance).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.domain.retrieval.vector_similarity import normalize_rows, to_vector
+
+DEFAULT_CLUSTER_RADIUS = 0.25
+
+
+@dataclass
+class ClusterStats:
+    centroid: np.ndarray  # unit-norm float32
+    count: int
+    radius: float
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Any]) -> Optional["ClusterStats"]:
+        rows = [v for v in (to_vector(vector) for vector in vectors) if v is not None]
+        if not rows or len({row.shape for row in rows}) != 1:
+            return None
+        matrix = normalize_rows(np.vstack(rows))
+        centroid = _unit(matrix.mean(axis=0))
+        radius = float(np.mean(1.0 - matrix @ centroid))
+        return cls(centroid=centroid, count=len(rows), radius=max(0.0, radius))
+
+    @classmethod
+    def from_node(cls, node: Any) -> Optional["ClusterStats"]:
+        """Stats persisted on a summary node; legacy nodes fall back to their own embedding."""
+        stats = dict(getattr(node, "cluster_stats", None) or {})
+        centroid = to_vector(stats.get("centroid"))
+        if centroid is None:
+            centroid = to_vector(getattr(node, "embedding", None))
+        if centroid is None:
+            return None
+        try:
+            count = int(stats.get("count") or len(getattr(node, "children_ids", None) or []) or 1)
+            radius = float(stats.get("radius", DEFAULT_CLUSTER_RADIUS))
+        except (TypeError, ValueError):
+            count, radius = 1, DEFAULT_CLUSTER_RADIUS
+        return cls(centroid=_unit(centroid), count=max(1, count), radius=max(0.0, radius))
+
+    def merged(self, vectors: Sequence[Any]) -> "ClusterStats":
+        """Stats after absorbing ``vectors``; the radius is a count-weighted running mean."""
+        rows = [v for v in (to_vector(vector) for vector in vectors) if v is not None]
+        rows = [row for row in rows if row.shape == self.centroid.shape]
+        if not rows:
+            return self
+        matrix = normalize_rows(np.vstack(rows))
+        total = self.count + len(rows)
+        centroid = _unit(self.centroid * self.count + matrix.sum(axis=0))
+        spread = float(np.mean(1.0 - matrix @ centroid))
+        radius = (self.radius * self.count + spread * len(rows)) / total
+        return ClusterStats(centroid=centroid, count=total, radius=max(0.0, radius))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "centroid": self.centroid.astype(np.float32).tolist(),
+            "count": int(self.count),
+            "radius": round(float(self.radius), 6),
+        }
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0.0 else vector
+
+
+def centroid_shift(before: ClusterStats, after: ClusterStats) -> float:
+    """Cosine distance between two centroids."""
+    return float(1.0 - np.dot(before.centroid, after.centroid))
+
+
+def assign_to_clusters(
+    vectors: Sequence[Any],
+    clusters: Sequence[ClusterStats],
+    *,
+    drift_factor: float = 2.0,
+    min_radius: float = 0.05,
+) -> List[Optional[int]]:
+    """
+    Index of the nearest cluster per vector, or ``None`` when the vector lies
+    outside ``max(radius * drift_factor, min_radius)`` of every cluster.
+    """
+    if not clusters:
+        return [None for _ in vectors]
+    centroids = np.vstack([cluster.centroid for cluster in clusters])
+    limits = np.array(
+        [max(cluster.radius * drift_factor, min_radius) for cluster in clusters], dtype=np.float32
+    )
+    out: List[Optional[int]] = []
+    for vector in vectors:
+        row = to_vector(vector)
+        if row is None or row.shape[0] != centroids.shape[1]:
+            out.append(None)
+            continue
+        distances = 1.0 - centroids @ _unit(row)
+        best = int(np.argmin(distances))
+        out.append(best if distances[best] <= limits[best] else None)
+    return out
+
+
+def nearest_cluster(vector: Any, clusters: Sequence[ClusterStats]) -> Optional[int]:
+    """Nearest cluster regardless of radius (used to home stragglers)."""
+    row = to_vector(vector)
+    if row is None or not clusters:
+        return None
+    centroids = np.vstack([cluster.centroid for cluster in clusters])
+    if row.shape[0] != centroids.shape[1]:
+        return None
+    return int(np.argmax(centroids @ _unit(row)))
@@ -8,23 +8,60 @@ Implements hierarchical summarization of base chunks using:
 """
 
 import logging
+import time
 import numpy as np
 import asyncio
+from dataclasses import asdict, dataclass
 from typing import Any, List, Optional, Dict
 from uuid import UUID, uuid4
 
 from app.domain.schemas.raptor_schemas import BaseChunk, SummaryNode, RaptorTreeResult
 from app.domain.ingestion.ports import IRaptorRepository, ITextEmbeddingService
 from .clustering_service import GMMClusteringService
+from .raptor_incremental import (
+    ClusterStats,
+    assign_to_clusters,
+    centroid_shift,
+    nearest_cluster,
+)
 from .summarization_service import SummarizationAgent
 
 logger = logging.getLogger(__name__)
 DEFAULT_RAPTOR_SUMMARIZATION_MAX_CONCURRENCY = 8
+DEFAULT_RAPTOR_PIPELINE_QUEUE_SIZE = 16
+DEFAULT_RAPTOR_EMBED_BATCH_SIZE = 32
+DEFAULT_RAPTOR_SAVE_BATCH_SIZE = 50
+
+_STAGE_DONE = object()
 
 
 # Prompts moved to app.core.prompt_registry.PromptRegistry
 
 
+@dataclass
+class RaptorLevelMetrics:
+    """Per-level timings of the summarize -> embed pipeline and the level save."""
+
+    level: int
+    clusters: int
+    summarized: int = 0
+    failed: int = 0
+    summarize_ms_total: float = 0.0
+    summarize_ms_max: float = 0.0
+    embed_batches: int = 0
+    embed_ms: float = 0.0
+    save_batches: int = 0
+    save_ms: float = 0.0
+    max_summary_queue_depth: int = 0
+    wall_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            key: round(value, 2) if isinstance(value, float) else value
+            for key, value in asdict(self).items()
+        }
+
+
 # =============================================================================
 # RAPTOR PROCESSOR (Main Orchestrator)
 # =============================================================================
@@ -49,6 +86,13 @@ class RaptorProcessor:
         max_depth: int = 3,
         summarization_max_concurrency: int = DEFAULT_RAPTOR_SUMMARIZATION_MAX_CONCURRENCY,
         structural_mode_enabled: bool = True,
+        pipeline_queue_size: int = DEFAULT_RAPTOR_PIPELINE_QUEUE_SIZE,
+        embed_batch_size: int = DEFAULT_RAPTOR_EMBED_BATCH_SIZE,
+        save_batch_size: int = DEFAULT_RAPTOR_SAVE_BATCH_SIZE,
+        incremental_enabled: bool = False,
+        incremental_drift_factor: float = 2.0,
+        incremental_split_threshold: float = 0.15,
+        incremental_min_new_cluster_size: int = 2,
     ):
         self.repository = repository
         self.embedding_service = embedding_service
@@ -64,6 +108,14 @@ class RaptorProcessor:
                 int(summarization_max_concurrency or DEFAULT_RAPTOR_SUMMARIZATION_MAX_CONCURRENCY),
             )
         )
+        self.pipeline_queue_size = max(1, int(pipeline_queue_size or 1))
+        self.embed_batch_size = max(1, int(embed_batch_size or 1))
+        self.save_batch_size = max(1, int(save_batch_size or 1))
+        # Centroid stats are only kept on nodes when trees are updated incrementally.
+        self.incremental_enabled = bool(incremental_enabled)
+        self.incremental_drift_factor = max(0.0, float(incremental_drift_factor))
+        self.incremental_split_threshold = max(0.0, float(incremental_split_threshold))
+        self.incremental_min_new_cluster_size = max(1, int(incremental_min_new_cluster_size or 1))
 
     async def _asummarize_cluster(self, cluster_texts: List[str]) -> tuple[str, str]:
         async with self._summarization_semaphore:
@@ -79,77 +131,171 @@ class RaptorProcessor:
         collection_id: Optional[UUID],
         level_source_standard: Optional[str],
         embedding_mode: Optional[str],
+        level_metrics: Optional[Dict[int, RaptorLevelMetrics]] = None,
     ) -> List[BaseChunk]:
+        """
+        Summarize and embed one level as a streaming pipeline, then persist it.
+
+        Each finished summary goes straight to the embedding stage, which takes
+        whatever is queued (up to ``embed_batch_size``) per call; a bounded
+        queue between the stages applies backpressure, so a slow LLM call only
+        delays its own cluster. Nodes are written in ``save_summary_nodes``
+        batches only once the whole level has embedded, so a failing embedding
+        call leaves no partial level behind (incremental updates upsert over
+        existing parents, which a delete-on-failure could not restore).
+        Returned nodes keep the ``level_items`` order.
+        """
         if not level_items:
             return []
 
-        summarize_tasks = [
-            asyncio.create_task(self._asummarize_cluster(item["cluster_texts"]))
-            for item in level_items
-        ]
-        summarize_results = await asyncio.gather(*summarize_tasks, return_exceptions=True)
-
-        valid_items: List[tuple[Dict[str, Any], str, str]] = []
-        for item, summary_result in zip(level_items, summarize_results):
-            if isinstance(summary_result, BaseException):
+        metrics = RaptorLevelMetrics(level=current_level, clusters=len(level_items))
+        if level_metrics is not None:
+            level_metrics[current_level] = metrics
+        started = time.perf_counter()
+        summary_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        built: List[tuple[int, SummaryNode, BaseChunk]] = []
+
+        async def summarize_one(index: int, item: Dict[str, Any]) -> None:
+            item_started = time.perf_counter()
+            try:
+                summary_result = await self._asummarize_cluster(item["cluster_texts"])
+            except Exception as exc:
+                metrics.failed += 1
                 logger.warning(
                     "raptor_cluster_summarization_failed level=%s cluster=%s error=%s",
                     current_level,
                     item.get("cluster_id"),
-                    str(summary_result),
+                    str(exc),
                 )
-                continue
+                return
+            finally:
+                elapsed_ms = (time.perf_counter() - item_started) * 1000
+                metrics.summarize_ms_total += elapsed_ms
+                metrics.summarize_ms_max = max(metrics.summarize_ms_max, elapsed_ms)
             if not isinstance(summary_result, tuple) or len(summary_result) != 2:
+                metrics.failed += 1
                 logger.warning(
                     "raptor_cluster_summarization_invalid_result level=%s cluster=%s",
                     current_level,
                     item.get("cluster_id"),
                 )
-                continue
+                return
+            metrics.summarized += 1
             title, summary = summary_result
-            valid_items.append((item, title, summary))
-
-        if not valid_items:
-            return []
+            await summary_queue.put((index, item, title, summary))
+            metrics.max_summary_queue_depth = max(
+                metrics.max_summary_queue_depth, summary_queue.qsize()
+            )
 
-        summary_texts = [summary for _, _, summary in valid_items]
-        embeddings = await self.embedding_service.embed_texts(summary_texts, mode=embedding_mode)
-
-        summary_nodes: List[SummaryNode] = []
-        next_level_nodes: List[BaseChunk] = []
-        for (item, title, summary), summary_embedding in zip(valid_items, embeddings):
-            summary_node_id = uuid4()
-            summary_node = SummaryNode(
-                id=summary_node_id,
-                content=summary,
-                title=title,
-                embedding=summary_embedding,
-                level=current_level,
-                children_ids=item["children_ids"],
-                children_summary_ids=item.get("children_summary_ids", []),
-                tenant_id=tenant_id,
-                source_document_id=source_document_id,
-                collection_id=collection_id,
-                source_standard=level_source_standard,
-                section_ref=item.get("section_ref"),
-                section_node_id=item.get("section_node_id"),
+        async def summarize_stage() -> None:
+            await asyncio.gather(
+                *(summarize_one(index, item) for index, item in enumerate(level_items))
             )
-            summary_nodes.append(summary_node)
-            next_level_nodes.append(
-                BaseChunk(
-                    id=summary_node_id,
-                    content=summary_node.content,
-                    embedding=list(summary_embedding),
-                    tenant_id=tenant_id,
-                    source_standard=level_source_standard,
-                    section_ref=item.get("section_ref"),
-                    section_node_id=item.get("section_node_id"),
-                    is_summary_node=True,
+            await summary_queue.put(_STAGE_DONE)
+
+        async def embed_stage() -> None:
+            done = False
+            while not done:
+                entry = await summary_queue.get()
+                if entry is _STAGE_DONE:
+                    break
+                batch = [entry]
+                while len(batch) < self.embed_batch_size:
+                    try:
+                        entry = summary_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if entry is _STAGE_DONE:
+                        done = True
+                        break
+                    batch.append(entry)
+
+                embed_started = time.perf_counter()
+                embeddings = await self.embedding_service.embed_texts(
+                    [summary for _, _, _, summary in batch], mode=embedding_mode
+                )
+                metrics.embed_batches += 1
+                metrics.embed_ms += (time.perf_counter() - embed_started) * 1000
+
+                for (index, item, title, summary), summary_embedding in zip(batch, embeddings):
+                    summary_node = SummaryNode(
+                        id=item.get("node_id") or uuid4(),
+                        content=summary,
+                        title=title,
+                        embedding=summary_embedding,
+                        level=current_level,
+                        children_ids=item["children_ids"],
+                        children_summary_ids=item.get("children_summary_ids", []),
+                        tenant_id=tenant_id,
+                        source_document_id=item.get("source_document_id", source_document_id),
+                        collection_id=collection_id,
+                        source_standard=item.get("source_standard", level_source_standard),
+                        section_ref=item.get("section_ref"),
+                        section_node_id=item.get("section_node_id"),
+                        cluster_stats=item.get("cluster_stats") or {},
+                    )
+                    built.append(
+                        (
+                            index,
+                            summary_node,
+                            BaseChunk(
+                                id=summary_node.id,
+                                content=summary_node.content,
+                                embedding=list(summary_embedding),
+                                tenant_id=tenant_id,
+                                source_standard=summary_node.source_standard,
+                                section_ref=item.get("section_ref"),
+                                section_node_id=item.get("section_node_id"),
+                                is_summary_node=True,
+                            ),
+                        )
+                    )
+
+        stages = [
+            asyncio.create_task(summarize_stage()),
+            asyncio.create_task(embed_stage()),
+        ]
+        try:
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                for stage in stages:
+                    stage.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                raise
+
+            built.sort(key=lambda entry: entry[0])
+            summary_nodes = [summary_node for _, summary_node, _ in built]
+            for start in range(0, len(summary_nodes), self.save_batch_size):
+                save_started = time.perf_counter()
+                await self.repository.save_summary_nodes(
+                    summary_nodes[start : start + self.save_batch_size]
                 )
+                metrics.save_batches += 1
+                metrics.save_ms += (time.perf_counter() - save_started) * 1000
+        finally:
+            metrics.wall_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                "raptor_level_pipeline %s",
+                " ".join(f"{key}={value}" for key, value in metrics.as_dict().items()),
             )
 
-        await self.repository.save_summary_nodes(summary_nodes)
-        return next_level_nodes
+        return [node for _, _, node in built]
+
+    def _stats_dict(self, vectors: List[Any]) -> Dict[str, Any]:
+        if not self.incremental_enabled:
+            return {}
+        stats = ClusterStats.from_vectors(vectors)
+        return stats.as_dict() if stats is not None else {}
+
+    async def _cluster_nodes(self, nodes: List[BaseChunk]) -> Any:
+        """Cluster a level off the event loop."""
+        embeddings = np.vstack([np.asarray(c.embedding) for c in nodes])
+        chunk_ids = [c.id for c in nodes]
+        acluster = getattr(self.clustering, "acluster", None)
+        if acluster is not None:
+            return await acluster(chunk_ids, embeddings)
+        return await asyncio.to_thread(self.clustering.cluster, chunk_ids, embeddings)
 
     @staticmethod
     def _group_nodes_by_structure(
@@ -172,6 +318,7 @@ class RaptorProcessor:
         source_document_id: Optional[UUID],
         collection_id: Optional[UUID],
         embedding_mode: Optional[str],
+        level_metrics: Optional[Dict[int, RaptorLevelMetrics]] = None,
     ) -> List[BaseChunk]:
         groups = self._group_nodes_by_structure(current_level_nodes)
         if not groups:
@@ -206,6 +353,7 @@ class RaptorProcessor:
                     "children_summary_ids": children_summary_ids,
                     "section_ref": section_ref,
                     "section_node_id": section_node_id,
+                    "cluster_stats": self._stats_dict([item.embedding for item in section_nodes]),
                 }
             )
 
@@ -217,6 +365,7 @@ class RaptorProcessor:
             collection_id=collection_id,
             level_source_standard=level_source_standard,
             embedding_mode=embedding_mode,
+            level_metrics=level_metrics,
         )
 
     async def build_tree(
@@ -246,6 +395,7 @@ class RaptorProcessor:
                 root_node_id=uuid4(), total_nodes_created=0, max_depth=0, levels={}
             )
 
+        level_metrics: Dict[int, RaptorLevelMetrics] = {}
         levels: Dict[int, List[UUID]] = {0: [c.id for c in base_chunks]}
         current_level_nodes = base_chunks
         current_level = 0
@@ -271,6 +421,7 @@ class RaptorProcessor:
                     source_document_id=source_document_id,
                     collection_id=collection_id,
                     embedding_mode=embedding_mode,
+                    level_metrics=level_metrics,
                 )
                 if structural_nodes:
                     structural_bootstrap_done = True
@@ -284,12 +435,8 @@ class RaptorProcessor:
                     )
                     continue
 
-            # Extract embeddings for clustering
-            embeddings = np.array([c.embedding for c in current_level_nodes])
-            chunk_ids = [c.id for c in current_level_nodes]
-
             # Cluster
-            cluster_result = self.clustering.cluster(chunk_ids, embeddings)
+            cluster_result = await self._cluster_nodes(current_level_nodes)
 
             if cluster_result.num_clusters <= 1:
                 logger.info("Converged to single cluster, stopping")
@@ -324,6 +471,13 @@ class RaptorProcessor:
                             for cid in cluster_chunk_ids
                             if bool(getattr(node_lookup.get(str(cid)), "is_summary_node", False))
                         ],
+                        "cluster_stats": self._stats_dict(
+                            [
+                                node_lookup[str(cid)].embedding
+                                for cid in cluster_chunk_ids
+                                if str(cid) in node_lookup
+                            ]
+                        ),
                     }
                 )
 
@@ -335,6 +489,7 @@ class RaptorProcessor:
                 collection_id=collection_id,
                 level_source_standard=level_source_standard,
                 embedding_mode=embedding_mode,
+                level_metrics=level_metrics,
             )
             total_created += len(new_level_nodes)
 
@@ -343,14 +498,271 @@ class RaptorProcessor:
 
             logger.info(f"Level {current_level}: Created {len(new_level_nodes)} summary nodes")
 
-        # The last remaining node is the root
-        root_id = current_level_nodes[0].id if current_level_nodes else base_chunks[0].id
+        # Nodes left at the last level; a single one is the root
+        top_level_ids = [node.id for node in current_level_nodes or base_chunks]
+
+        return RaptorTreeResult(
+            root_node_id=top_level_ids[0],
+            top_level_ids=top_level_ids,
+            total_nodes_created=total_created,
+            max_depth=current_level,
+            levels=levels,
+            level_metrics={
+                level: metrics.as_dict() for level, metrics in level_metrics.items()
+            },
+        )
+
+    def _plan_incremental_level(
+        self,
+        *,
+        pending: List[BaseChunk],
+        changed: List[BaseChunk],
+        parents: List[SummaryNode],
+        source_document_id: Optional[UUID] = None,
+    ) -> tuple[List[Dict[str, Any]], List[BaseChunk]]:
+        """
+        Attach ``pending`` nodes to ``parents`` and list the parents to re-summarize.
+
+        Returns the level items for updated parents (same node id, previous
+        summary plus new/changed children as input) and the orphans that must
+        form new clusters. An updated parent owned by another document now
+        summarizes content of ``source_document_id`` as well, so it becomes
+        collection-scoped (no owning document).
+        """
+        parent_of: Dict[str, SummaryNode] = {}
+        for parent in parents:
+            for child_id in parent.children_ids:
+                parent_of[str(child_id)] = parent
+
+        refreshed: Dict[str, List[BaseChunk]] = {}
+        for node in changed:
+            parent = parent_of.get(str(node.id))
+            if parent is not None:
+                refreshed.setdefault(str(parent.id), []).append(node)
+
+        # Structural (section-bound) clusters belong to one document only.
+        candidates: List[tuple[SummaryNode, ClusterStats]] = []
+        for parent in parents:
+            if parent.section_ref:
+                continue
+            stats = ClusterStats.from_node(parent)
+            if stats is not None:
+                candidates.append((parent, stats))
+        candidate_stats = [stats for _, stats in candidates]
+
+        assignment = assign_to_clusters(
+            [node.embedding for node in pending],
+            candidate_stats,
+            drift_factor=self.incremental_drift_factor,
+        )
+        orphan_indexes = [index for index, target in enumerate(assignment) if target is None]
+        if len(orphan_indexes) < self.incremental_min_new_cluster_size:
+            for index in orphan_indexes:
+                assignment[index] = nearest_cluster(pending[index].embedding, candidate_stats)
+
+        additions: Dict[int, List[BaseChunk]] = {}
+        orphans: List[BaseChunk] = []
+        for node, target in zip(pending, assignment):
+            if target is None:
+                orphans.append(node)
+            else:
+                additions.setdefault(target, []).append(node)
+
+        merged_stats: Dict[str, ClusterStats] = {}
+        for target, members in list(additions.items()):
+            parent, stats = candidates[target]
+            merged = stats.merged([node.embedding for node in members])
+            if (
+                len(members) >= self.incremental_min_new_cluster_size
+                and centroid_shift(stats, merged) > self.incremental_split_threshold
+            ):
+                orphans.extend(members)
+                del additions[target]
+                continue
+            merged_stats[str(parent.id)] = merged
+
+        added_by_parent = {
+            str(candidates[target][0].id): members for target, members in additions.items()
+        }
+        items: List[Dict[str, Any]] = []
+        for parent in parents:
+            key = str(parent.id)
+            added = added_by_parent.get(key, [])
+            updated = refreshed.get(key, [])
+            if not added and not updated:
+                continue
+            stats = merged_stats.get(key) or ClusterStats.from_node(parent)
+            cluster_stats: Dict[str, Any] = {}
+            if self.incremental_enabled:
+                cluster_stats = stats.as_dict() if stats is not None else dict(parent.cluster_stats)
+            owner = parent.source_document_id
+            if owner is not None and str(owner) != str(source_document_id):
+                owner = None
+            items.append(
+                {
+                    "node_id": parent.id,
+                    "cluster_id": key,
+                    "cluster_texts": [parent.content]
+                    + [node.content for node in added + updated if node.content],
+                    "children_ids": list(parent.children_ids) + [node.id for node in added],
+                    "children_summary_ids": list(parent.children_summary_ids)
+                    + [node.id for node in added if node.is_summary_node],
+                    "section_ref": parent.section_ref,
+                    "section_node_id": parent.section_node_id,
+                    "source_document_id": owner,
+                    "source_standard": parent.source_standard,
+                    "cluster_stats": cluster_stats,
+                }
+            )
+        return items, orphans
+
+    async def _new_cluster_items(self, orphans: List[BaseChunk]) -> List[Dict[str, Any]]:
+        if len(orphans) < self.incremental_min_new_cluster_size:
+            return []
+        node_lookup = {str(node.id): node for node in orphans}
+        cluster_result = await self._cluster_nodes(orphans)
+        items: List[Dict[str, Any]] = []
+        for cluster_id, member_ids in cluster_result.cluster_contents.items():
+            members = [node_lookup[str(cid)] for cid in member_ids if str(cid) in node_lookup]
+            texts = [node.content for node in members if node.content]
+            if not texts:
+                continue
+            items.append(
+                {
+                    "cluster_id": f"new-{cluster_id}",
+                    "cluster_texts": texts,
+                    "children_ids": [node.id for node in members],
+                    "children_summary_ids": [node.id for node in members if node.is_summary_node],
+                    "cluster_stats": self._stats_dict([node.embedding for node in members]),
+                }
+            )
+        return items
+
+    async def update_tree(
+        self,
+        base_chunks: List[BaseChunk],
+        tenant_id: UUID,
+        collection_id: UUID,
+        source_document_id: Optional[UUID] = None,
+        embedding_mode: Optional[str] = None,
+    ) -> RaptorTreeResult:
+        """
+        Merge a document's base chunks into the collection's existing RAPTOR tree.
+
+        New nodes join the nearest existing cluster of the level above when
+        they fall inside its radius; only clusters that gained or changed
+        children, and their ancestors, are re-summarized (from the previous
+        summary plus the new children). Nodes outside every radius, or
+        additions that would shift a centroid beyond
+        ``incremental_split_threshold``, become new clusters. Falls back to
+        ``build_tree`` when the collection has no clustered tree to attach to.
+
+        The update does not re-cluster the top of the tree, so the collection
+        can end up with several top-level nodes: ``top_level_ids`` lists them
+        all, and ``root_node_id`` is the root only when that list has one entry.
+        """
+        if not base_chunks:
+            return await self.build_tree(base_chunks=base_chunks, tenant_id=tenant_id)
+
+        existing = await self.repository.get_collection_summary_nodes(tenant_id, collection_id)
+        nodes_by_level: Dict[int, List[SummaryNode]] = {}
+        for node in existing:
+            nodes_by_level.setdefault(int(node.level), []).append(node)
+
+        structural = self.structural_mode_enabled and bool(
+            self._group_nodes_by_structure(base_chunks)
+        )
+        attach_level = 2 if structural else 1
+        if not any(not node.section_ref for node in nodes_by_level.get(attach_level, [])):
+            logger.info(
+                "raptor_incremental_full_build collection=%s existing_nodes=%s",
+                collection_id,
+                len(existing),
+            )
+            return await self.build_tree(
+                base_chunks=base_chunks,
+                tenant_id=tenant_id,
+                source_document_id=source_document_id,
+                collection_id=collection_id,
+                embedding_mode=embedding_mode,
+            )
+
+        level_metrics: Dict[int, RaptorLevelMetrics] = {}
+        levels: Dict[int, List[UUID]] = {0: [c.id for c in base_chunks]}
+        level_source_standard = getattr(base_chunks[0], "source_standard", None)
+        total_created = 0
+        resummarized = 0
+        current_level = 0
+        pending: List[BaseChunk] = list(base_chunks)
+        changed: List[BaseChunk] = []
 
+        if structural:
+            structural_nodes = await self._build_structural_level(
+                current_level_nodes=base_chunks,
+                current_level=1,
+                tenant_id=tenant_id,
+                source_document_id=source_document_id,
+                collection_id=collection_id,
+                embedding_mode=embedding_mode,
+                level_metrics=level_metrics,
+            )
+            total_created += len(structural_nodes)
+            levels[1] = [n.id for n in structural_nodes]
+            pending = structural_nodes
+            current_level = 1
+
+        while (pending or changed) and current_level < self.max_depth:
+            parent_level = current_level + 1
+            items, orphans = self._plan_incremental_level(
+                pending=pending,
+                changed=changed,
+                parents=nodes_by_level.get(parent_level, []),
+                source_document_id=source_document_id,
+            )
+            updated_ids = {str(item["node_id"]) for item in items}
+            items.extend(await self._new_cluster_items(orphans))
+            if not items:
+                break
+
+            level_nodes = await self._build_summary_nodes_for_level(
+                level_items=items,
+                current_level=parent_level,
+                tenant_id=tenant_id,
+                source_document_id=source_document_id,
+                collection_id=collection_id,
+                level_source_standard=level_source_standard,
+                embedding_mode=embedding_mode,
+                level_metrics=level_metrics,
+            )
+            changed = [node for node in level_nodes if str(node.id) in updated_ids]
+            pending = [node for node in level_nodes if str(node.id) not in updated_ids]
+            resummarized += len(changed)
+            total_created += len(pending)
+            levels[parent_level] = [node.id for node in level_nodes]
+            current_level = parent_level
+
+        logger.info(
+            "raptor_incremental_update collection=%s base_chunks=%s resummarized=%s created=%s depth=%s",
+            collection_id,
+            len(base_chunks),
+            resummarized,
+            total_created,
+            current_level,
+        )
+        # The collection's top level mixes nodes touched here with untouched ones.
+        top = max([level for level, ids in levels.items() if ids] + list(nodes_by_level))
+        top_level_ids = list(
+            dict.fromkeys(levels.get(top, []) + [node.id for node in nodes_by_level.get(top, [])])
+        )
         return RaptorTreeResult(
-            root_node_id=root_id,
+            root_node_id=top_level_ids[0],
+            top_level_ids=top_level_ids,
             total_nodes_created=total_created,
             max_depth=current_level,
             levels=levels,
+            level_metrics={
+                level: metrics.as_dict() for level, metrics in level_metrics.items()
+            },
         )
 
     # _persist_summary_node moved to IRaptorRepository implementation
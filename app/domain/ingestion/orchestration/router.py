@@ -12,6 +12,7 @@ from typing import Any
 import fitz
 import structlog
 
+from app.domain.ingestion.structure.pdf_context import PdfDocumentContext, PdfPageView, pdf_context
 from app.domain.ingestion.structure.structure_analyzer import PdfStructureAnalyzer
 
 logger = structlog.get_logger(__name__)
@@ -54,6 +55,17 @@ class IngestionTask:
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class PageAnalysis:
+    """Per-page routing analysis before the document-wide cost guard."""
+
+    page_number: int
+    decision: RoutingDecision
+    text: str
+    page_bbox: dict[str, Any]
+    region_bbox: dict[str, Any] | None = None
+
+
 @dataclass(frozen=True)
 class VisualRoutingCostGuard:
     """Cost guardrails to prevent over-routing full documents to VLM."""
@@ -79,7 +91,7 @@ class DocumentStructureRouter:
         self._image_dpi = image_dpi
         self._cost_guard = cost_guard or VisualRoutingCostGuard()
 
-    def analyze_page(self, page: fitz.Page) -> RoutingDecision:
+    def analyze_page(self, page: fitz.Page | PdfPageView) -> RoutingDecision:
         """Classify page as TEXT_STANDARD or VISUAL_COMPLEX."""
 
         signals = self._analyzer.extract_signals(page)
@@ -137,33 +149,90 @@ class DocumentStructureRouter:
         )
 
     def route_document(
-        self, file_path: str, temp_image_dir: str | None = None
+        self, file_path: str | PdfDocumentContext, temp_image_dir: str | None = None
     ) -> list[IngestionTask]:
         """Create page-level ingestion tasks (text or visual)."""
 
+        with pdf_context(file_path) as context:
+            analyses = self.analyze_pages(context)
+            return self.build_tasks(context, analyses, temp_image_dir=temp_image_dir)
+
+    @staticmethod
+    def page_count(file_path: str) -> int:
+        """Return the number of pages of a PDF."""
+
+        with fitz.open(file_path) as doc:
+            return len(doc)
+
+    def analyze_pages(
+        self,
+        file_path: str | PdfDocumentContext,
+        start: int = 0,
+        end: int | None = None,
+    ) -> list[PageAnalysis]:
+        """
+        Analyze pages ``[start, end)`` independently of each other.
+
+        Output only depends on each page, so ranges can be analyzed in separate
+        processes and concatenated in page order before ``build_tasks``.
+        """
+
+        analyses: list[PageAnalysis] = []
+        with pdf_context(file_path) as context:
+            stop = len(context) if end is None else min(int(end), len(context))
+            for page_idx in range(max(0, int(start)), stop):
+                page = context.page(page_idx)
+                decision = self.analyze_page(page)
+                analyses.append(
+                    PageAnalysis(
+                        page_number=page_idx + 1,
+                        decision=decision,
+                        text=page.body_text(),
+                        page_bbox=self._analyzer.page_bbox_metadata(page=page),
+                        region_bbox=(
+                            self._analyzer.page_bbox_metadata(page=page, region=decision.region)
+                            if decision.region is not None
+                            else None
+                        ),
+                    )
+                )
+        return analyses
+
+    def build_tasks(
+        self,
+        file_path: str | PdfDocumentContext,
+        analyses: list[PageAnalysis],
+        temp_image_dir: str | None = None,
+    ) -> list[IngestionTask]:
+        """Apply the visual cost guard in page order and render visual pages."""
+
         tasks: list[IngestionTask] = []
         output_dir = Path(temp_image_dir or Path(gettempdir()) / "cire_rag_visual_router")
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        with fitz.open(file_path) as doc:
-            total_pages = len(doc)
-            visual_budget = self._compute_visual_budget(total_pages=total_pages)
-            visual_used = 0
+        total_pages = len(analyses)
+        visual_budget = self._compute_visual_budget(total_pages=total_pages)
+        visual_used = 0
+        context: PdfDocumentContext | None = (
+            file_path if isinstance(file_path, PdfDocumentContext) else None
+        )
+        owns_context = context is None
 
-            for page_idx in range(total_pages):
-                page = doc.load_page(page_idx)
-                page_number = page_idx + 1
-                decision = self.analyze_page(page)
+        try:
+            for analysis in sorted(analyses, key=lambda item: item.page_number):
+                page_number = analysis.page_number
                 decision = self._apply_cost_guard(
-                    decision=decision,
+                    decision=analysis.decision,
                     visual_used=visual_used,
                     visual_budget=visual_budget,
                 )
 
                 if decision.strategy == ProcessingStrategy.VISUAL_COMPLEX:
                     visual_used += 1
+                    if context is None:
+                        context = PdfDocumentContext.open(file_path)
                     image_path = self._render_visual_page(
-                        page=page,
+                        page=context.page(page_number - 1),
                         output_dir=output_dir,
                         page_number=page_number,
                         region=decision.region,
@@ -175,55 +244,37 @@ class DocumentStructureRouter:
                         raw_content=str(image_path),
                         metadata={
                             "page": page_number,
-                            "bbox": self._analyzer.page_bbox_metadata(
-                                page=page, region=decision.region
+                            "bbox": (
+                                analysis.region_bbox
+                                if decision.region is not None and analysis.region_bbox
+                                else analysis.page_bbox
                             ),
                             "router_score": decision.score,
                             "router_reasons": decision.reasons,
                         },
                     )
                 else:
-                    # 1. Usar extracción por bloques con ordenamiento visual (Reading Order fix)
-                    # Filtramos márgenes (8% superior/inferior) directamente en el router
-                    page_rect = page.rect
-                    y_margin = page_rect.height * 0.08
-
-                    blocks = page.get_text("blocks", sort=True)
-                    page_blocks = []
-
-                    for b in blocks:
-                        # b = (x0, y0, x1, y1, "text", block_no, block_type)
-                        block_rect = fitz.Rect(b[:4])
-                        block_text = b[4].replace("\x00", "").strip()
-
-                        # Ignorar encabezados/pies de página ruidosos
-                        if block_rect.y1 < y_margin or block_rect.y0 > (
-                            page_rect.height - y_margin
-                        ):
-                            continue
-
-                        if block_text:
-                            page_blocks.append(block_text)
-
-                    page_text = "\n\n".join(page_blocks)
                     task = IngestionTask(
                         page_number=page_number,
                         strategy=decision.strategy,
                         content_type=decision.content_type.value,
-                        raw_content=page_text,
+                        raw_content=analysis.text,
                         metadata={
                             "page": page_number,
-                            "bbox": self._analyzer.page_bbox_metadata(page=page),
+                            "bbox": analysis.page_bbox,
                             "router_score": decision.score,
                             "router_reasons": decision.reasons,
                         },
                     )
 
                 tasks.append(task)
+        finally:
+            if owns_context and context is not None:
+                context.close()
 
         logger.info(
             "document_routed",
-            file_path=file_path,
+            file_path=file_path.name if isinstance(file_path, PdfDocumentContext) else file_path,
             total_pages=len(tasks),
             visual_budget=self._compute_visual_budget(total_pages=len(tasks)),
             visual_pages=sum(1 for t in tasks if t.strategy == ProcessingStrategy.VISUAL_COMPLEX),
@@ -234,15 +285,14 @@ class DocumentStructureRouter:
 
     def _render_visual_page(
         self,
-        page: fitz.Page,
+        page: fitz.Page | PdfPageView,
         output_dir: Path,
         page_number: int,
         region: fitz.Rect | None,
     ) -> Path:
         """Render visual page/region as PNG for downstream VLM ingestion."""
 
-        matrix = fitz.Matrix(self._image_dpi / 72.0, self._image_dpi / 72.0)
-        pixmap = page.get_pixmap(matrix=matrix, alpha=False, clip=region)
+        pixmap = PdfPageView.of(page).pixmap(self._image_dpi, clip=region)
         output_path = output_dir / f"page_{page_number:04d}.png"
         pixmap.save(str(output_path))
         return output_path
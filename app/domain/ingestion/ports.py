@@ -5,10 +5,13 @@ from uuid import UUID
 if TYPE_CHECKING:
     from app.domain.schemas.knowledge_schemas import RAGSearchResult, RetrievalIntent
     from .graph.graph_extractor import ChunkGraphExtraction
+    from .graph.entity_index import TenantEntityIndex
+    from .graph.subgraph_aggregator import DocumentSubgraph
     from app.domain.schemas.ingestion_schemas import IngestionMetadata
     from app.domain.ingestion.entities import IngestionSource
     from app.domain.schemas import SourceDocument
     from app.domain.schemas.raptor_schemas import SummaryNode
+    from app.domain.schemas.embedding_vector import EmbeddingVector
 
 
 class IContentRepository(ABC):
@@ -64,6 +67,10 @@ class IRaptorRepository(ABC):
     async def save_summary_nodes(self, nodes: List[Any]) -> None:
         pass
 
+    async def get_collection_summary_nodes(self, tenant_id: Any, collection_id: Any) -> List[Any]:
+        """Summary nodes (level >= 1) of a collection, for incremental tree updates."""
+        return []
+
 
 class ISourceRepository(ABC):
     @abstractmethod
@@ -134,6 +141,17 @@ class IEmbeddingProvider(ABC):
             "dimensions": int(self.embedding_dimensions),
         }
 
+    @property
+    def max_batch_texts(self) -> int:
+        """Texts per provider request; 1 disables merging of independent callers."""
+        return 1
+
+    async def embed_independent(
+        self, texts: List[str], task: str = "retrieval.passage"
+    ) -> List[List[float]]:
+        """Embed texts so each vector depends only on its own text (safe to merge callers)."""
+        return await self.embed(texts, task=task)
+
 
 class IPageLocator(Protocol):
     def get_page_number(self, char_idx: int, page_map: List[Dict[str, Any]]) -> int: ...
@@ -155,6 +173,14 @@ class IChunkEmbeddingService(Protocol):
         provider: Optional[str] = None,
     ) -> List[List[float]]: ...
 
+    async def embed_vectors(
+        self,
+        texts: List[str],
+        task: str = "retrieval.passage",
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> List["EmbeddingVector"]: ...
+
 
 class ITextEmbeddingService(Protocol):
     async def embed_texts(
@@ -174,6 +200,17 @@ class IGraphRepository(ABC):
         tenant_id: UUID,
         chunk_id: Optional[UUID] = None,
         entity_embeddings: Optional[Dict[str, List[float]]] = None,
+        entity_index: Optional["TenantEntityIndex"] = None,
+    ) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def upsert_document_subgraph(
+        self,
+        subgraph: "DocumentSubgraph",
+        tenant_id: UUID,
+        entity_embeddings: Optional[Dict[str, List[float]]] = None,
+        entity_index: Optional["TenantEntityIndex"] = None,
     ) -> Dict[str, Any]:
         pass
 
@@ -0,0 +1,194 @@
+"""Single-open PDF context shared by routing, ToC discovery and text extraction."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import fitz
+
+
+class PdfPageView:
+    """
+    Lazily memoized extraction results for one page.
+
+    All text views (words, blocks, header text) come from a single
+    ``TextPage``, so a page's text layer is parsed once no matter how many
+    consumers ask for it.
+    """
+
+    def __init__(self, page: fitz.Page):
+        self.page = page
+        self._textpage: Any = None
+        self._words: list | None = None
+        self._blocks: list | None = None
+        self._body_text: str | None = None
+        self._drawings: list | None = None
+        self._tables: list[fitz.Rect] | None = None
+        self._pixmaps: dict[tuple, fitz.Pixmap] = {}
+
+    @classmethod
+    def of(cls, page: "fitz.Page | PdfPageView") -> "PdfPageView":
+        return page if isinstance(page, PdfPageView) else cls(page)
+
+    @property
+    def number(self) -> int:
+        return int(self.page.number)
+
+    @property
+    def rect(self) -> fitz.Rect:
+        return self.page.rect
+
+    def textpage(self) -> Any:
+        if self._textpage is None:
+            self._textpage = self.page.get_textpage(flags=fitz.TEXTFLAGS_WORDS)
+        return self._textpage
+
+    def words(self) -> list:
+        if self._words is None:
+            self._words = self.page.get_text("words", textpage=self.textpage())
+        return self._words
+
+    def blocks(self) -> list:
+        """Text blocks in reading order (``sort=True``)."""
+        if self._blocks is None:
+            self._blocks = self.page.get_text("blocks", textpage=self.textpage(), sort=True)
+        return self._blocks
+
+    def text_within(self, clip: fitz.Rect) -> str:
+        """
+        Words lying fully inside ``clip``, without re-parsing the page.
+
+        Matches ``page.get_text(clip=clip)`` up to whitespace: words come in
+        the same (block, line, word) order and words that only straddle the
+        clip are left out.
+        """
+        clip = fitz.Rect(clip)
+        selected = [word for word in self.words() if clip.contains(fitz.Rect(word[:4]))]
+        selected.sort(key=lambda word: (word[5], word[6], word[7]))
+        return " ".join(str(word[4]) for word in selected)
+
+    def body_text(self) -> str:
+        """Block text in reading order, skipping the top/bottom page margins."""
+        if self._body_text is None:
+            # Usar extracción por bloques con ordenamiento visual (Reading Order fix)
+            # y descartar encabezados/pies de página ruidosos.
+            page_rect = self.rect
+            y_margin = page_rect.height * 0.08  # 8% de margen
+            page_blocks = []
+            for b in self.blocks():
+                # b = (x0, y0, x1, y1, "text", block_no, block_type)
+                block_rect = fitz.Rect(b[:4])
+                block_text = b[4].replace("\x00", "").strip()
+                if block_rect.y1 < y_margin or block_rect.y0 > (page_rect.height - y_margin):
+                    continue
+                if block_text:
+                    page_blocks.append(block_text)
+            self._body_text = "\n\n".join(page_blocks)
+        return self._body_text
+
+    def drawings(self) -> list:
+        if self._drawings is None:
+            self._drawings = self.page.get_drawings()
+        return self._drawings
+
+    def table_bboxes(self) -> list[fitz.Rect]:
+        if self._tables is None:
+            bboxes: list[fitz.Rect] = []
+            if hasattr(self.page, "find_tables"):
+                try:
+                    tables = self.page.find_tables()
+                except Exception:
+                    tables = None
+                for table in getattr(tables, "tables", []) or []:
+                    bbox = getattr(table, "bbox", None)
+                    if bbox is None:
+                        continue
+                    rect = fitz.Rect(bbox)
+                    if rect.width > 30 and rect.height > 30:
+                        bboxes.append(rect)
+            self._tables = bboxes
+        return self._tables
+
+    def pixmap(self, dpi: int, clip: fitz.Rect | None = None) -> fitz.Pixmap:
+        key = (int(dpi), tuple(clip) if clip is not None else None)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            matrix = fitz.Matrix(dpi / 72.0, dpi / 72.0)
+            pixmap = self.page.get_pixmap(matrix=matrix, alpha=False, clip=clip)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+
+class PdfDocumentContext:
+    """
+    One open ``fitz.Document`` plus a bounded cache of page views.
+
+    Pass it (instead of a path) to ``DocumentStructureRouter``,
+    ``TocDiscoveryService`` and ``PdfParserService`` so one ingestion opens and
+    parses the file once. Only the ``max_cached_pages`` most recent page views
+    are kept, which bounds peak memory on long documents while still sharing
+    work between consumers that walk the same page back to back.
+    """
+
+    def __init__(self, document: fitz.Document, *, max_cached_pages: int = 8):
+        self.document = document
+        self.max_cached_pages = max(1, int(max_cached_pages))
+        self._pages: OrderedDict[int, PdfPageView] = OrderedDict()
+        self._toc: list | None = None
+
+    @classmethod
+    def open(cls, source: Any, *, max_cached_pages: int = 8) -> "PdfDocumentContext":
+        return cls(fitz.open(source), max_cached_pages=max_cached_pages)
+
+    def __enter__(self) -> "PdfDocumentContext":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pages.clear()
+        if not self.document.is_closed:
+            self.document.close()
+
+    @property
+    def name(self) -> str:
+        return str(self.document.name or "")
+
+    @property
+    def page_count(self) -> int:
+        return len(self.document)
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def page(self, index: int) -> PdfPageView:
+        view = self._pages.get(index)
+        if view is not None:
+            self._pages.move_to_end(index)
+            return view
+        view = PdfPageView(self.document.load_page(index))
+        self._pages[index] = view
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+        return view
+
+    def get_toc(self) -> list:
+        if self._toc is None:
+            self._toc = self.document.get_toc()
+        return self._toc
+
+
+@contextmanager
+def pdf_context(source: Any) -> Iterator[PdfDocumentContext]:
+    """Yield ``source`` if it is already a context, otherwise open (and close) one."""
+    if isinstance(source, PdfDocumentContext):
+        yield source
+        return
+    context = PdfDocumentContext.open(source)
+    try:
+        yield context
+    finally:
+        context.close()
@@ -7,6 +7,8 @@ from typing import Any
 
 import fitz
 
+from app.domain.ingestion.structure.pdf_context import PdfPageView
+
 
 @dataclass(frozen=True)
 class StructureSignals:
@@ -39,14 +41,15 @@ class PdfStructureAnalyzer:
         "annex",
     )
 
-    def extract_signals(self, page: fitz.Page) -> StructureSignals:
+    def extract_signals(self, page: fitz.Page | PdfPageView) -> StructureSignals:
         """Compute fast structural features for a single page."""
 
-        horizontal_lines, vertical_lines, rect_count = self._count_vector_primitives(page)
-        words = page.get_text("words")
-        words_count, chars_count, short_token_ratio, distinct_x_bins, char_density = self._compute_text_features(page, words)
-        has_keyword, keyword = self._detect_visual_keyword(page)
-        table_bboxes = self._detect_table_regions(page)
+        view = PdfPageView.of(page)
+        horizontal_lines, vertical_lines, rect_count = self._count_vector_primitives(view)
+        words = view.words()
+        words_count, chars_count, short_token_ratio, distinct_x_bins, char_density = self._compute_text_features(view, words)
+        has_keyword, keyword = self._detect_visual_keyword(view)
+        table_bboxes = self._detect_table_regions(view)
 
         return StructureSignals(
             horizontal_lines=horizontal_lines,
@@ -63,14 +66,14 @@ class PdfStructureAnalyzer:
         )
 
     @staticmethod
-    def _count_vector_primitives(page: fitz.Page) -> tuple[int, int, int]:
+    def _count_vector_primitives(page: PdfPageView) -> tuple[int, int, int]:
         """Count horizontal/vertical vector lines and rectangles."""
 
         horizontal_lines = 0
         vertical_lines = 0
         rect_count = 0
 
-        for drawing in page.get_drawings():
+        for drawing in page.drawings():
             for item in drawing.get("items", []):
                 op = item[0]
                 if op == "l":
@@ -91,7 +94,7 @@ class PdfStructureAnalyzer:
 
     @staticmethod
     def _compute_text_features(
-        page: fitz.Page,
+        page: PdfPageView,
         words: list[tuple[float, float, float, float, str, int, int, int]],
     ) -> tuple[int, int, float, int, float]:
         """Compute simple lexical/layout features with O(n) complexity."""
@@ -115,12 +118,12 @@ class PdfStructureAnalyzer:
 
         return words_count, chars_count, short_token_ratio, len(x_bins), char_density
 
-    def _detect_visual_keyword(self, page: fitz.Page) -> tuple[bool, str | None]:
+    def _detect_visual_keyword(self, page: PdfPageView) -> tuple[bool, str | None]:
         """Detect table/figure anchors in the page header."""
 
         header_height = page.rect.height * 0.25
         header_clip = fitz.Rect(0, 0, page.rect.width, header_height)
-        header_text = page.get_text("text", clip=header_clip).lower()
+        header_text = page.text_within(header_clip).lower()
 
         for keyword in self.VISUAL_KEYWORDS:
             if keyword in header_text:
@@ -129,30 +132,13 @@ class PdfStructureAnalyzer:
         return False, None
 
     @staticmethod
-    def _detect_table_regions(page: fitz.Page) -> list[fitz.Rect]:
+    def _detect_table_regions(page: PdfPageView) -> list[fitz.Rect]:
         """Detect table regions using PyMuPDF table finder when available."""
 
-        if not hasattr(page, "find_tables"):
-            return []
-
-        try:
-            tables = page.find_tables()
-        except Exception:
-            return []
-
-        bboxes: list[fitz.Rect] = []
-        for table in getattr(tables, "tables", []):
-            bbox = getattr(table, "bbox", None)
-            if bbox is None:
-                continue
-            rect = fitz.Rect(bbox)
-            if rect.width > 30 and rect.height > 30:
-                bboxes.append(rect)
-
-        return bboxes
+        return page.table_bboxes()
 
     @staticmethod
-    def page_bbox_metadata(page: fitz.Page, region: fitz.Rect | None = None) -> dict[str, Any]:
+    def page_bbox_metadata(page: fitz.Page | PdfPageView, region: fitz.Rect | None = None) -> dict[str, Any]:
         """Return serializable bbox metadata for frontend highlights."""
 
         rect = region or page.rect
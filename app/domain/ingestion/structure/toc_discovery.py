@@ -5,6 +5,8 @@ import fitz  # PyMuPDF
 from pydantic import BaseModel
 import structlog
 
+from app.domain.ingestion.structure.pdf_context import PdfDocumentContext
+
 logger = structlog.get_logger(__name__)
 
 class TocEntry(BaseModel):
@@ -28,8 +30,11 @@ class TocDiscoveryService:
         Fails open (returns empty structure) on any error.
         """
         try:
-            doc = fitz.open(file_path_or_stream)
-            toc: List[List] = doc.get_toc()
+            if isinstance(file_path_or_stream, PdfDocumentContext):
+                toc: List[List] = file_path_or_stream.get_toc()
+            else:
+                with fitz.open(file_path_or_stream) as doc:
+                    toc = doc.get_toc()
             
             # fitz.get_toc() returns list of [lvl, title, page_num]
             # lvl is 1-based hierarchy level.
@@ -0,0 +1,233 @@
+"""Response-level cache of ranked retrieval results, versioned per tenant index."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional, Protocol
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Heavy per-row payload that is re-read from storage on a hit instead of cached.
+_PAYLOAD_KEYS = ("content", "embedding")
+_REHYDRATABLE_SOURCE_TYPE = "content_chunk"
+
+
+def normalize_query(query: str) -> str:
+    """Unicode-normalized, case-folded query with collapsed whitespace."""
+    text = unicodedata.normalize("NFKC", str(query or ""))
+    return " ".join(text.casefold().split())
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {str(key): _canonical(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(item) for item in value]
+        if all(isinstance(item, (str, int, float, bool)) or item is None for item in items):
+            # Filter lists behave as sets (standards, clause refs, source ids).
+            return sorted(items, key=lambda item: (item is None, str(item)))
+        return items
+    if isinstance(value, str):
+        return value.strip()
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return str(value)
+
+
+def canonicalize_scope(scope: Dict[str, Any]) -> str:
+    """Stable JSON for a scope/filter mapping (key order and list order ignored)."""
+    cleaned = {
+        key: val
+        for key, val in (scope or {}).items()
+        if val is not None and val != {} and val != [] and val != ""
+    }
+    return json.dumps(_canonical(cleaned), sort_keys=True, separators=(",", ":"), default=str)
+
+
+def build_result_cache_key(
+    *,
+    query: str,
+    scope: Dict[str, Any],
+    k: int,
+    fetch_k: int,
+    rerank_mode: str,
+    generation: int,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Key on everything that changes the ranked output, including the index generation."""
+    parts = [
+        "ret",
+        "v1",
+        normalize_query(query),
+        canonicalize_scope(scope),
+        str(int(k)),
+        str(int(fetch_k)),
+        str(rerank_mode or "").strip().lower(),
+        canonicalize_scope(options or {}),
+        str(int(generation)),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class IndexGenerationStore(Protocol):
+    """Generation counters shared by every process that reads or writes the index."""
+
+    async def incr(self, key: str) -> int: ...
+
+    async def get_many(self, keys: List[str]) -> List[int]: ...
+
+
+_EPOCH_KEY = "*"
+
+
+class IndexGenerationRegistry:
+    """
+    Per-tenant counter of index mutations.
+
+    Ingestion, deletion, collection cleanup and community rebuilds call
+    ``bump`` for the tenant they touched (``bump_all`` when the change is not tenant scoped). Cache
+    keys embed the current generation, so older entries simply stop matching.
+    Writers (workers) and readers (API) are separate processes, so the
+    counters must live in a shared ``IndexGenerationStore`` for bumps to
+    reach the result cache. Without one the counters are per process, which
+    is only correct when a single process both ingests and serves queries.
+    ``current`` returns ``None`` when the shared store cannot be read, and
+    callers then bypass the cache instead of trusting a stale generation.
+    """
+
+    def __init__(self, shared: Optional[IndexGenerationStore] = None) -> None:
+        self._generations: Dict[str, int] = {}
+        self._lock = Lock()
+        self.shared = shared
+
+    def attach_shared_store(self, shared: Optional[IndexGenerationStore]) -> None:
+        self.shared = shared
+
+    def _bump_local(self, key: str) -> int:
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            return self._generations[key]
+
+    async def current(self, tenant_id: Any) -> Optional[int]:
+        key = str(tenant_id or "").strip()
+        if self.shared is None:
+            with self._lock:
+                return self._generations.get(_EPOCH_KEY, 0) + self._generations.get(key, 0)
+        try:
+            epoch, generation = await self.shared.get_many([_EPOCH_KEY, key])
+        except Exception as exc:
+            logger.warning("index_generation_read_failed", tenant_id=key, error=str(exc))
+            return None
+        return int(epoch) + int(generation)
+
+    async def bump(self, tenant_id: Any) -> None:
+        key = str(tenant_id or "").strip()
+        if not key:
+            await self.bump_all()
+            return
+        await self._bump(key)
+
+    async def bump_all(self) -> None:
+        await self._bump(_EPOCH_KEY)
+
+    async def _bump(self, key: str) -> None:
+        self._bump_local(key)
+        if self.shared is None:
+            return
+        try:
+            await self.shared.incr(key)
+        except Exception as exc:
+            # Readers keep serving until the result cache TTL expires.
+            logger.warning("index_generation_bump_failed", key=key, error=str(exc))
+
+
+@dataclass
+class CachedRetrieval:
+    """Ranked rows without their payload, plus the trace of the run that produced them."""
+
+    rows: List[Dict[str, Any]]
+    trace: Dict[str, Any] = field(default_factory=dict)
+    generation: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_rows(
+        cls, rows: List[Dict[str, Any]], trace: Dict[str, Any], generation: int
+    ) -> "CachedRetrieval":
+        skeletons: List[Dict[str, Any]] = []
+        for row in rows:
+            skeleton = copy.deepcopy({key: val for key, val in row.items() if key != "embedding"})
+            if str(row.get("source_type") or _REHYDRATABLE_SOURCE_TYPE) == _REHYDRATABLE_SOURCE_TYPE:
+                for key in _PAYLOAD_KEYS:
+                    skeleton.pop(key, None)
+            skeletons.append(skeleton)
+        return cls(rows=skeletons, trace=copy.deepcopy(trace), generation=int(generation))
+
+    def payload_ids(self) -> List[str]:
+        """IDs of rows whose content must be fetched again."""
+        return [str(row.get("id") or "") for row in self.rows if "content" not in row]
+
+    def rehydrate(self, payloads: Dict[str, Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Ranked rows with content restored; ``None`` if any chunk is gone."""
+        out: List[Dict[str, Any]] = []
+        for skeleton in self.rows:
+            row = copy.deepcopy(skeleton)
+            if "content" not in row:
+                payload = payloads.get(str(row.get("id") or ""))
+                if payload is None:
+                    return None
+                row["content"] = payload.get("content", "")
+            out.append(row)
+        return out
+
+
+class RetrievalResultCache:
+    """LRU of ``CachedRetrieval`` entries with a TTL."""
+
+    def __init__(self, *, max_entries: int = 512, ttl_seconds: float = 120.0):
+        self._max_entries = max(1, int(max_entries))
+        self._ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[str, CachedRetrieval]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedRetrieval]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self._ttl_seconds <= 0 or time.monotonic() - entry.created_at <= self._ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                return entry
+            if entry is not None:
+                self._entries.pop(key, None)
+            return None
+
+    def put(self, key: str, entry: CachedRetrieval) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+index_generations = IndexGenerationRegistry()
@@ -1,8 +1,7 @@
 import asyncio
 import json
-import math
 import re
-from typing import Any, Optional
+from typing import Any
 from uuid import UUID
 
 import structlog
@@ -10,42 +9,11 @@ from langchain_core.language_models.chat_models import BaseChatModel
 
 from app.domain.ingestion.ports import ITextEmbeddingService
 from app.domain.retrieval.ports import IGraphRetrievalRepository
+from app.domain.retrieval.vector_similarity import EmbeddingMatrix, entity_matrix_cache
 
 logger = structlog.get_logger(__name__)
 
 
-def _to_float_list(value: Any) -> Optional[list[float]]:
-    if value is None:
-        return None
-    if isinstance(value, list):
-        try:
-            return [float(v) for v in value]
-        except Exception:
-            return None
-    if isinstance(value, str):
-        raw = value.strip()
-        if raw.startswith("[") and raw.endswith("]"):
-            raw = raw[1:-1]
-        if not raw:
-            return None
-        try:
-            return [float(token.strip()) for token in raw.split(",") if token.strip()]
-        except Exception:
-            return None
-    return None
-
-
-def _cosine_similarity(vec_a: Optional[list[float]], vec_b: Optional[list[float]]) -> float:
-    if not vec_a or not vec_b or len(vec_a) != len(vec_b):
-        return -1.0
-    dot = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(a * a for a in vec_a))
-    norm_b = math.sqrt(sum(b * b for b in vec_b))
-    if norm_a == 0.0 or norm_b == 0.0:
-        return -1.0
-    return dot / (norm_a * norm_b)
-
-
 class LocalGraphSearch:
     """Local graph retrieval with entity anchoring and 1-hop traversal."""
 
@@ -130,26 +98,22 @@ class LocalGraphSearch:
             logger.debug("local_rpc_anchor_match_fallback", error=str(exc))
 
         try:
-            entity_rows = await self._graph_repository.list_entities_with_embeddings(tenant_id)
-            if not entity_rows:
+            entity_matrix = await entity_matrix_cache.get_or_load(
+                tenant_id,
+                lambda: self._graph_repository.list_entities_with_embeddings(tenant_id),
+            )
+            if not len(entity_matrix):
                 return []
 
             vectors = await self._embedding.embed_texts(entities, task="retrieval.query")
             if not vectors:
                 return []
 
-            scored: list[tuple[float, dict]] = []
-            for row in entity_rows:
-                row_vec = _to_float_list(row.get("embedding"))
-                if not row_vec:
-                    continue
-                best_score = max(_cosine_similarity(query_vec, row_vec) for query_vec in vectors)
-                if best_score >= self._anchor_similarity_threshold:
-                    scored.append((best_score, row))
-
-            scored.sort(key=lambda item: item[0], reverse=True)
             dedup: dict[str, dict] = {}
-            for _, row in scored[:12]:
+            for row_idx, _ in entity_matrix.top_k(
+                vectors, 12, threshold=self._anchor_similarity_threshold
+            ):
+                row = entity_matrix.rows[row_idx]
                 dedup[str(row.get("id"))] = row
             return list(dedup.values())
         except Exception as exc:
@@ -341,16 +305,8 @@ class GlobalGraphSearch:
         if not rows:
             return {"context": "", "community_ids": [], "citations": []}
 
-        scored_rows: list[tuple[float, dict]] = []
-        for row in rows:
-            community_vec = _to_float_list(row.get("embedding"))
-            if not community_vec:
-                continue
-            score = _cosine_similarity(query_vector, community_vec)
-            scored_rows.append((score, row))
-
-        scored_rows.sort(key=lambda item: item[0], reverse=True)
-        winners = [row for _, row in scored_rows[:top_k]]
+        community_matrix = EmbeddingMatrix(rows)
+        winners = [community_matrix.rows[idx] for idx, _ in community_matrix.top_k([query_vector], top_k)]
         if not winners:
             return {"context": "", "community_ids": [], "citations": []}
 
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def to_vector(value: Any) -> Optional[np.ndarray]:
+    """Parse a pgvector/JSON/list embedding into a float32 array (None if unusable)."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            raw = value.strip()
+            if raw.startswith("[") and raw.endswith("]"):
+                raw = raw[1:-1]
+            if not raw.strip():
+                return None
+            array = np.array(raw.split(","), dtype=np.float32)
+        else:
+            array = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 1 or array.size == 0:
+        return None
+    return array
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("embedding matrix must be 2-dimensional")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, best first (argpartition + small sort)."""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.size:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(scores.size)
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+def cosine_similarity(vec_a: Any, vec_b: Any) -> float:
+    """Cosine similarity of two vectors; -1.0 when either is missing, empty or mismatched."""
+    a = to_vector(vec_a)
+    b = to_vector(vec_b)
+    if a is None or b is None or a.shape != b.shape:
+        return -1.0
+    norm_a = float(np.linalg.norm(a))
+    norm_b = float(np.linalg.norm(b))
+    if norm_a == 0.0 or norm_b == 0.0:
+        return -1.0
+    return float(np.dot(a, b) / (norm_a * norm_b))
+
+
+class EmbeddingMatrix:
+    """
+    Rows with embeddings stacked once into a normalized float32 matrix.
+
+    Rows whose embedding is missing, zero or of a different dimension than the
+    first usable one are kept (so indices line up with ``rows``) but never match.
+    ``rows`` drop the raw ``vector_key`` value; the matrix is the only copy.
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], vector_key: str = "embedding"):
+        parsed = [to_vector(row.get(vector_key)) for row in rows]
+        self.rows: List[Dict[str, Any]] = [
+            {key: val for key, val in row.items() if key != vector_key} for row in rows
+        ]
+        dims = next((v.size for v in parsed if v is not None), 0)
+        matrix = np.zeros((len(parsed), dims), dtype=np.float32)
+        valid = np.zeros(len(parsed), dtype=bool)
+        for idx, vector in enumerate(parsed):
+            if vector is not None and vector.size == dims and np.any(vector):
+                matrix[idx] = vector
+                valid[idx] = True
+        self.matrix = normalize_rows(matrix)
+        self.valid = valid
+        self.dimensions = int(dims)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes)
+
+    def similarities(self, queries: Sequence[Any]) -> np.ndarray:
+        """``(len(queries), len(rows))`` cosine scores; -1.0 for unusable pairs."""
+        out = np.full((len(queries), len(self.rows)), -1.0, dtype=np.float32)
+        if not self.rows or not len(queries):
+            return out
+        parsed = [to_vector(q) for q in queries]
+        usable = [
+            i for i, v in enumerate(parsed) if v is not None and v.size == self.dimensions and np.any(v)
+        ]
+        if not usable:
+            return out
+        query_matrix = normalize_rows(np.stack([parsed[i] for i in usable]))
+        scores = query_matrix @ self.matrix.T
+        scores[:, ~self.valid] = -1.0
+        out[usable] = scores
+        return out
+
+    def best_matches(self, queries: Sequence[Any]) -> List[Tuple[int, float]]:
+        """Best row index and score for each query (-1, -1.0 when nothing matches)."""
+        scores = self.similarities(queries)
+        if scores.shape[1] == 0:
+            return [(-1, -1.0) for _ in range(scores.shape[0])]
+        best = np.argmax(scores, axis=1)
+        result: List[Tuple[int, float]] = []
+        for query_idx, row_idx in enumerate(best.tolist()):
+            score = float(scores[query_idx, row_idx])
+            result.append((row_idx, score) if score > -1.0 else (-1, -1.0))
+        return result
+
+    def top_k(
+        self, queries: Sequence[Any], k: int, threshold: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """Top ``k`` rows by their best score across all queries, best first."""
+        scores = self.similarities(queries)
+        if scores.size == 0:
+            return []
+        best = scores.max(axis=0)
+        keep = self.valid & (best > -1.0)
+        if threshold is not None:
+            keep &= best >= threshold
+        candidates = np.flatnonzero(keep)
+        order = top_k_indices(best[candidates], k)
+        return [(int(candidates[i]), float(best[candidates[i]])) for i in order]
+
+
+class TenantEmbeddingMatrixCache:
+    """
+    Per-tenant ``EmbeddingMatrix`` cache (LRU over tenants, TTL per entry).
+
+    Eviction is bounded both by tenant count and by the total ``nbytes`` of the
+    cached matrices; a single matrix larger than ``max_bytes`` is not cached.
+    Writers call ``invalidate`` after upserting entities for a tenant. The TTL
+    bounds staleness for readers in other processes that do not see those
+    invalidations.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tenants: int = 32,
+        ttl_seconds: float = 300.0,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self._max_tenants = max(1, int(max_tenants))
+        self._ttl_seconds = float(ttl_seconds)
+        self._max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, Tuple[float, EmbeddingMatrix]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1].nbytes
+
+    def get(self, tenant_id: Any) -> Optional[EmbeddingMatrix]:
+        key = str(tenant_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._ttl_seconds > 0 and time.monotonic() - entry[0] > self._ttl_seconds:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, tenant_id: Any, matrix: EmbeddingMatrix) -> None:
+        key = str(tenant_id)
+        with self._lock:
+            self._pop(key)
+            if matrix.nbytes > self._max_bytes:
+                return
+            self._entries[key] = (time.monotonic(), matrix)
+            self._bytes += matrix.nbytes
+            while len(self._entries) > self._max_tenants or self._bytes > self._max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, tenant_id: Any) -> None:
+        with self._lock:
+            self._pop(str(tenant_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    async def get_or_load(
+        self,
+        tenant_id: Any,
+        loader: Callable[[], Awaitable[Sequence[Dict[str, Any]]]],
+        vector_key: str = "embedding",
+    ) -> EmbeddingMatrix:
+        cached = self.get(tenant_id)
+        if cached is not None:
+            return cached
+        matrix = EmbeddingMatrix(await loader(), vector_key=vector_key)
+        self.put(tenant_id, matrix)
+        return matrix
+
+
+entity_matrix_cache = TenantEmbeddingMatrixCache()
@@ -9,6 +9,8 @@ from typing import List, Dict, Optional, Any
 from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 
+from app.domain.schemas.embedding_vector import EmbeddingVector
+
 class ContentChunk(BaseModel):
     """
     Domain entity for a piece of processed content.
@@ -17,7 +19,7 @@ class ContentChunk(BaseModel):
     sourceId: UUID = Field(alias="source_id")
     content: str
     semanticContext: str = Field(alias="semantic_context")
-    embedding: List[float]
+    embedding: EmbeddingVector
     filePageNumber: int = Field(alias="file_page_number")
     chunkIndex: int = Field(alias="chunk_index")
     metadata: Dict[str, Any] = {}
@@ -0,0 +1,136 @@
+"""
+Compact embedding value type.
+
+Embeddings are held as contiguous NumPy buffers (float32 by default, float16
+when the caller opts in) instead of boxed Python float lists. A 1024-d vector
+costs 4 KB (2 KB in float16) instead of ~32 KB, and the GC has one object to
+track instead of a thousand. Convert with ``to_list()`` / ``to_float_list()``
+only at the JSON/Supabase boundary.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Iterator, Optional, Union, overload
+
+import numpy as np
+from pydantic_core import core_schema
+
+_SUPPORTED_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+def resolve_embedding_dtype(name: Optional[str]) -> Any:
+    return _SUPPORTED_DTYPES.get(str(name or "float32").strip().lower(), np.float32)
+
+
+class EmbeddingVector(Sequence[float]):
+    """Immutable 1-d embedding backed by a NumPy buffer; behaves as a Sequence[float]."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Any, dtype: Any = np.float32):
+        data = np.ascontiguousarray(values, dtype=dtype).reshape(-1)
+        data.flags.writeable = False
+        self._data = data
+
+    @classmethod
+    def coerce(cls, value: Any, dtype: Any = None) -> Optional["EmbeddingVector"]:
+        """Wrap lists/arrays; reuse the instance when it already matches ``dtype``."""
+        if value is None:
+            return None
+        if isinstance(value, EmbeddingVector):
+            if dtype is None or value.dtype == np.dtype(dtype):
+                return value
+            return cls(value._data, dtype=dtype)
+        return cls(value, dtype=dtype or np.float32)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._data.nbytes)
+
+    def as_array(self) -> np.ndarray:
+        """Read-only float32 view (float16 storage is upcast on read)."""
+        if self._data.dtype == np.float32:
+            return self._data
+        return self._data.astype(np.float32)
+
+    def to_list(self) -> list[float]:
+        return self.as_array().tolist()
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        array = self.as_array()
+        if dtype is not None and np.dtype(dtype) != array.dtype:
+            return array.astype(dtype)
+        if copy:
+            return array.copy()
+        return array
+
+    def __len__(self) -> int:
+        return int(self._data.shape[0])
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[float]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, list[float]]:
+        if isinstance(index, slice):
+            return self._data[index].astype(np.float32).tolist()
+        return float(self._data[index])
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EmbeddingVector):
+            other_data = other._data
+        elif isinstance(other, (list, tuple, np.ndarray)):
+            other_data = np.asarray(other, dtype=self._data.dtype).reshape(-1)
+        else:
+            return NotImplemented
+        return bool(np.array_equal(self._data, other_data))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (EmbeddingVector, (self._data, self._data.dtype))
+
+    def __repr__(self) -> str:
+        return f"EmbeddingVector(dims={len(self)}, dtype={self._data.dtype})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> Any:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            json_schema_input_schema=core_schema.list_schema(core_schema.float_schema()),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value.to_list(), when_used="json"
+            ),
+        )
+
+    @classmethod
+    def _validate(cls, value: Any) -> "EmbeddingVector":
+        if isinstance(value, (str, bytes)):
+            raise ValueError("embedding must be a sequence of floats")
+        try:
+            return cls(value) if not isinstance(value, EmbeddingVector) else value
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"invalid embedding: {exc}") from exc
+
+
+def to_float_list(value: Any) -> Optional[list[float]]:
+    """JSON/Supabase boundary: materialize any embedding representation as list[float]."""
+    if value is None:
+        return None
+    if isinstance(value, EmbeddingVector):
+        return value.to_list()
+    if isinstance(value, np.ndarray):
+        return value.astype(np.float32).reshape(-1).tolist()
+    if isinstance(value, list):
+        return value
+    return [float(v) for v in value]
@@ -9,6 +9,8 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field, ConfigDict
 from uuid import UUID
 
+from app.domain.schemas.embedding_vector import EmbeddingVector
+
 
 class BaseChunk(BaseModel):
     """A base-level chunk from JinaLateChunker (Level 0)."""
@@ -17,7 +19,7 @@ class BaseChunk(BaseModel):
 
     id: UUID
     content: str
-    embedding: List[float]
+    embedding: EmbeddingVector
     tenant_id: UUID
     source_standard: Optional[str] = None
     section_ref: Optional[str] = None
@@ -55,7 +57,7 @@ class SummaryNode(BaseModel):
     id: Optional[UUID] = None  # Assigned after persistence
     content: str
     title: str
-    embedding: Optional[List[float]] = None
+    embedding: Optional[EmbeddingVector] = None
     level: int
     children_ids: List[UUID]
     tenant_id: UUID
@@ -65,12 +67,18 @@ class SummaryNode(BaseModel):
     section_ref: Optional[str] = None
     section_node_id: Optional[UUID] = None
     children_summary_ids: List[UUID] = Field(default_factory=list)
+    # Centroid/count/radius of the children embeddings, used by incremental updates.
+    cluster_stats: Dict[str, Any] = Field(default_factory=dict)
 
 
 class RaptorTreeResult(BaseModel):
     """Result of building a complete RAPTOR tree."""
 
+    # The tree's root only when ``top_level_ids`` has a single entry; otherwise the
+    # first of several top-level nodes (max depth reached before converging).
     root_node_id: UUID
+    top_level_ids: List[UUID] = Field(default_factory=list)
     total_nodes_created: int
     max_depth: int
     levels: Dict[int, List[UUID]]  # {level: [node_ids]}
+    level_metrics: Dict[int, Dict[str, Any]] = Field(default_factory=dict)  # pipeline stage timings
@@ -3,7 +3,17 @@ import structlog
 from typing import Callable, Dict, Any, Optional
 
 from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.caching.index_generation_store import configure_index_generations
 from app.infrastructure.queue.base_worker import BaseWorkerProcessor
+from app.infrastructure.queue.job_notifications import (
+    JobWakeupHub,
+    build_job_notification_listener,
+)
+from app.infrastructure.queue.stale_job_sweeper import (
+    StaleJobSweeper,
+    build_stale_sweep_leader_lock,
+)
+from app.infrastructure.settings import settings
 from app.workflows.community.rebuild_communities import RebuildCommunitiesUseCase
 from app.workflows.ingestion.contracts import (
     JobLoopProcessorProtocol,
@@ -27,8 +37,15 @@ class CommunityWorker:
         self.use_case = use_case or RebuildCommunitiesUseCase()
         self.job_processor = TenantScopedJobProcessor()
         self.job_type = "community_rebuild"
+        self.wakeup_hub = JobWakeupHub(
+            safety_poll_interval_seconds=float(
+                getattr(settings, "WORKER_JOB_NOTIFY_SAFETY_POLL_SECONDS", 30.0) or 30.0
+            )
+        )
         self.processor_factory = processor_factory or (
-            lambda store, poller_id: BaseWorkerProcessor(store, poller_id=poller_id)
+            lambda store, poller_id: BaseWorkerProcessor(
+                store, poller_id=poller_id, wakeup_hub=self.wakeup_hub
+            )
         )
 
     async def handle_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
@@ -46,8 +63,27 @@ class CommunityWorker:
 
     async def start(self):
         logger.info("starting_community_worker")
+        configure_index_generations()
+        listener = build_job_notification_listener(self.wakeup_hub)
+        if listener is not None:
+            await listener.start()
+        sweeper_task: Optional[asyncio.Task] = None
+        if isinstance(self.job_store, SupabaseJobStore):
+            sweeper = StaleJobSweeper(
+                self.job_store,
+                leader_lock=build_stale_sweep_leader_lock(
+                    retry_seconds=self.job_store.worker_requeue_stale_interval_seconds
+                ),
+            )
+            sweeper_task = asyncio.create_task(sweeper.run())
         processor = self.processor_factory(self.job_store, 1)
-        await processor.run_job_loop(self.job_type, self.handle_job, poll_interval=5)
+        try:
+            await processor.run_job_loop(self.job_type, self.handle_job, poll_interval=5)
+        finally:
+            if sweeper_task is not None:
+                sweeper_task.cancel()
+            if listener is not None:
+                await listener.stop()
 
 
 if __name__ == "__main__":
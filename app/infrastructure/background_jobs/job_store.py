@@ -4,7 +4,7 @@ import random
 import time
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from app.infrastructure.settings import settings
 from app.infrastructure.supabase.client import (
@@ -16,6 +16,9 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+_HEARTBEAT_ID_CHUNK_SIZE = 200
+_BATCH_CLAIM_RETRY_SECONDS = 60.0
+
 
 class SupabaseJobStore:
     """
@@ -23,6 +26,14 @@ class SupabaseJobStore:
     Encapsulates polling logic, error handling, retries, and heartbeats.
     """
 
+    # None until fetch_next_jobs has been tried; False when the RPC is missing on this database.
+    _batch_claim_rpc_available: Optional[bool] = None
+    # Set once fetch_next_jobs succeeded: the lease column exists and claimed jobs carry a lease.
+    # Never cleared, so leases keep being renewed while batch claims are backed off.
+    _lease_column_available: bool = False
+    # Monotonic time before which batch claims are skipped after an unclassified RPC error.
+    _batch_claim_retry_at: float = 0.0
+
     def __init__(self):
         self._client = None
         self.worker_job_heartbeat_seconds = max(
@@ -37,7 +48,15 @@ class SupabaseJobStore:
             30,
             int(getattr(settings, "WORKER_REQUEUE_STALE_PROCESSING_SECONDS", 120) or 120),
         )
-        self._last_stale_requeue_at: dict[str, float] = {}
+        # One process-level heartbeat renews every tracked job id in a single UPDATE.
+        self._heartbeat_refs: Dict[str, int] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.heartbeat_updates = 0
+        # Leases must outlive a few missed heartbeats before another worker may reclaim the job.
+        self.worker_job_lease_seconds = max(
+            int(self.worker_job_heartbeat_seconds * 3),
+            int(getattr(settings, "WORKER_JOB_LEASE_SECONDS", 90) or 90),
+        )
 
     async def get_client(self):
         if self._client is None:
@@ -45,6 +64,58 @@ class SupabaseJobStore:
         return self._client
 
     async def fetch_next_job(self, job_type: str) -> Optional[Dict[str, Any]]:
+        jobs = await self._claim_jobs_rpc(
+            "fetch_next_job", {"p_job_type": str(job_type)}, job_type=job_type
+        )
+        return jobs[0] if jobs else None
+
+    async def fetch_next_jobs(
+        self,
+        job_type: str,
+        n: int,
+        lease_seconds: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Claim up to ``n`` pending (or lease-expired) jobs in one RPC.
+
+        Falls back to a single ``fetch_next_job`` claim when the
+        ``fetch_next_jobs`` RPC fails. A missing RPC (migration not applied)
+        disables batch claims for the process; any other non-transient failure
+        skips them for ``_BATCH_CLAIM_RETRY_SECONDS`` before probing again.
+        """
+        limit = max(1, int(n))
+        if (
+            SupabaseJobStore._batch_claim_rpc_available is False
+            or time.monotonic() < SupabaseJobStore._batch_claim_retry_at
+        ):
+            job = await self.fetch_next_job(job_type)
+            return [job] if job else []
+        lease = max(1, int(lease_seconds or self.worker_job_lease_seconds))
+        try:
+            jobs = await self._claim_jobs_rpc(
+                "fetch_next_jobs",
+                {"p_job_type": str(job_type), "p_limit": limit, "p_lease_seconds": lease},
+                job_type=job_type,
+            )
+        except Exception as exc:
+            if "PGRST202" in str(exc):
+                # Migration not applied on this database: single claims until restart.
+                SupabaseJobStore._batch_claim_rpc_available = False
+            elif not self.is_transient_supabase_transport_error(exc):
+                SupabaseJobStore._batch_claim_retry_at = (
+                    time.monotonic() + _BATCH_CLAIM_RETRY_SECONDS
+                )
+            logger.warning(
+                "worker_fetch_next_jobs_rpc_failed_falling_back job_type=%s error=%s", job_type, exc
+            )
+            job = await self.fetch_next_job(job_type)
+            return [job] if job else []
+        SupabaseJobStore._batch_claim_rpc_available = True
+        SupabaseJobStore._lease_column_available = True
+        return jobs
+
+    async def _claim_jobs_rpc(
+        self, rpc_name: str, params: Dict[str, Any], *, job_type: str
+    ) -> List[Dict[str, Any]]:
         max_retries = max(
             0,
             int(getattr(settings, "WORKER_SUPABASE_TRANSIENT_MAX_RETRIES", 3) or 3),
@@ -57,16 +128,11 @@ class SupabaseJobStore:
         for attempt in range(max_retries + 1):
             try:
                 client = await self.get_client()
-                response = await client.rpc(
-                    "fetch_next_job", {"p_job_type": str(job_type)}
-                ).execute()
+                response = await client.rpc(rpc_name, params).execute()
                 if response is None:
-                    raise RuntimeError("supabase_empty_response:fetch_next_job")
+                    raise RuntimeError(f"supabase_empty_response:{rpc_name}")
                 jobs = response.data if isinstance(response.data, list) else []
-                if not jobs:
-                    return None
-                first = jobs[0]
-                return first if isinstance(first, dict) else None
+                return [job for job in jobs if isinstance(job, dict)]
             except Exception as exc:
                 is_transient = self.is_transient_supabase_transport_error(exc) or (
                     "supabase_empty_response" in str(exc)
@@ -75,7 +141,7 @@ class SupabaseJobStore:
                     raise
                 await self._reset_supabase_client_after_transport_error(
                     error=exc,
-                    operation="fetch_next_job",
+                    operation=rpc_name,
                     attempt=attempt + 1,
                     max_attempts=max_retries + 1,
                     job_type=job_type,
@@ -85,7 +151,7 @@ class SupabaseJobStore:
                 delay = min(base_delay * (2**attempt), 3.0) + random.uniform(0.0, 0.12)
                 await asyncio.sleep(delay)
 
-        return None
+        return []
 
     async def load_source_document(self, source_document_id: str) -> Optional[Dict[str, Any]]:
         max_retries = max(
@@ -175,13 +241,8 @@ class SupabaseJobStore:
                 f"batch_progress_update_failed batch_id={batch_id} success={success} error={exc}"
             )
 
-    async def maybe_requeue_stale_processing_jobs(self, *, job_type: str, poller_id: int) -> None:
-        now_monotonic = time.monotonic()
-        last = float(self._last_stale_requeue_at.get(job_type, 0.0))
-        if now_monotonic - last < float(self.worker_requeue_stale_interval_seconds):
-            return
-        self._last_stale_requeue_at[job_type] = now_monotonic
-
+    async def requeue_stale_processing_jobs(self, *, swept_by: str) -> int:
+        """Requeue ``processing`` jobs of every type whose heartbeat stopped, in one UPDATE."""
         cutoff = datetime.now(timezone.utc) - timedelta(
             seconds=self.worker_requeue_stale_processing_seconds
         )
@@ -193,12 +254,11 @@ class SupabaseJobStore:
                     {
                         "status": "pending",
                         "error_message": (
-                            f"stale_processing_requeued_by_worker(poller={poller_id},"
+                            f"stale_processing_requeued_by_worker(sweeper={swept_by},"
                             f"cutoff_seconds={self.worker_requeue_stale_processing_seconds})"
                         ),
                     }
                 )
-                .eq("job_type", str(job_type))
                 .eq("status", "processing")
                 .lt("updated_at", cutoff.isoformat())
                 .execute()
@@ -206,47 +266,78 @@ class SupabaseJobStore:
             rows = response.data if isinstance(response.data, list) else []
             if rows:
                 logger.warning(
-                    "worker_requeued_stale_processing_jobs poller=%s job_type=%s count=%s cutoff_seconds=%s",
-                    poller_id,
-                    job_type,
+                    "worker_requeued_stale_processing_jobs sweeper=%s count=%s cutoff_seconds=%s",
+                    swept_by,
                     len(rows),
                     self.worker_requeue_stale_processing_seconds,
                 )
+            return len(rows)
         except Exception as exc:
             logger.warning(
-                "worker_requeue_stale_processing_jobs_failed poller=%s job_type=%s error=%s",
-                poller_id,
-                job_type,
+                "worker_requeue_stale_processing_jobs_failed sweeper=%s error=%s",
+                swept_by,
                 exc,
             )
+            return 0
 
-    async def with_job_heartbeat(self, job_id: str):
-        stop_signal = asyncio.Event()
-        task = asyncio.create_task(self._job_heartbeat_loop(job_id=job_id, stop_signal=stop_signal))
-        return stop_signal, task
+    def track_job_heartbeat(self, job_id: str) -> None:
+        """Keep ``job_id`` alive in the process heartbeat until a matching untrack."""
+        job_id = str(job_id or "")
+        if not job_id:
+            return
+        self._heartbeat_refs[job_id] = self._heartbeat_refs.get(job_id, 0) + 1
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(self._process_heartbeat_loop())
+
+    def untrack_job_heartbeat(self, job_id: str) -> None:
+        job_id = str(job_id or "")
+        refs = self._heartbeat_refs.get(job_id, 0) - 1
+        if refs > 0:
+            self._heartbeat_refs[job_id] = refs
+        else:
+            self._heartbeat_refs.pop(job_id, None)
 
-    async def stop_job_heartbeat(self, stop_signal: asyncio.Event, task: asyncio.Task) -> None:
-        stop_signal.set()
-        task.cancel()
-        with suppress(asyncio.CancelledError):
-            await task
+    async def close_heartbeat(self) -> None:
+        task, self._heartbeat_task = self._heartbeat_task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
 
-    async def _job_heartbeat_loop(self, job_id: str, stop_signal: asyncio.Event) -> None:
-        while not stop_signal.is_set():
+    async def _process_heartbeat_loop(self) -> None:
+        # Exits once nothing is tracked; the next track_job_heartbeat starts it again.
+        while self._heartbeat_refs:
             await asyncio.sleep(self.worker_job_heartbeat_seconds)
-            if stop_signal.is_set():
+            job_ids = list(self._heartbeat_refs)
+            if not job_ids:
                 break
             try:
-                client = await self.get_client()
-                await (
-                    client.table("job_queue")
-                    .update({"updated_at": datetime.now(timezone.utc).isoformat()})
-                    .eq("id", str(job_id))
-                    .eq("status", "processing")
-                    .execute()
-                )
+                await self.renew_job_leases(job_ids)
             except Exception as exc:
-                logger.warning("worker_job_heartbeat_failed job_id=%s error=%s", job_id, exc)
+                logger.warning(
+                    "worker_job_heartbeat_failed jobs=%s error=%s", len(job_ids), exc
+                )
+
+    async def renew_job_leases(self, job_ids: List[str]) -> None:
+        """Heartbeat ``processing`` jobs in one UPDATE, extending their lease when leases exist."""
+        ids = [str(job_id) for job_id in job_ids if job_id]
+        if not ids:
+            return
+        client = await self.get_client()
+        now = datetime.now(timezone.utc)
+        heartbeat: Dict[str, Any] = {"updated_at": now.isoformat()}
+        if SupabaseJobStore._lease_column_available:
+            # The lease column ships with fetch_next_jobs; renew it with the heartbeat.
+            heartbeat["lease_expires_at"] = (
+                now + timedelta(seconds=self.worker_job_lease_seconds)
+            ).isoformat()
+        # Chunked so the id filter stays within PostgREST URL limits.
+        for start in range(0, len(ids), _HEARTBEAT_ID_CHUNK_SIZE):
+            chunk = ids[start : start + _HEARTBEAT_ID_CHUNK_SIZE]
+            query = client.table("job_queue").update(heartbeat)
+            query = query.eq("id", chunk[0]) if len(chunk) == 1 else query.in_("id", chunk)
+            await query.eq("status", "processing").execute()
+            self.heartbeat_updates += 1
 
     async def _reset_supabase_client_after_transport_error(
         self,
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Protocol
+
+import numpy as np
+import structlog
+
+from app.domain.schemas.embedding_vector import EmbeddingVector, resolve_embedding_dtype
+from app.infrastructure.caching.sqlite_ttl_store import SqliteTtlStore
+from app.infrastructure.observability.embedding_metrics import (
+    EmbeddingMetricsStore,
+    embedding_metrics_store,
+)
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+_KEY_VERSION = "v1"
+
+
+def build_embedding_cache_key(
+    *,
+    provider: str,
+    model: str,
+    dimensions: int,
+    task: str,
+    text: str,
+) -> str:
+    """Key a cached vector by embedding profile so vectors never mix across profiles."""
+    digest = hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()
+    return ":".join(
+        (
+            "emb",
+            _KEY_VERSION,
+            str(provider or "").strip().lower(),
+            str(model or "").strip().lower(),
+            str(int(dimensions or 0)),
+            str(task or "").strip().lower(),
+            digest,
+        )
+    )
+
+
+def _encode_vector(vector: Iterable[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _decode_vector(raw: Any) -> Optional[EmbeddingVector]:
+    if raw is None:
+        return None
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    if not isinstance(raw, (bytes, bytearray)) or not raw:
+        return None
+    return EmbeddingVector(np.frombuffer(raw, dtype=np.float32))
+
+
+class EmbeddingCacheBackend(Protocol):
+    name: str
+
+    async def get_many(self, keys: list[str]) -> dict[str, EmbeddingVector]: ...
+
+    async def set_many(self, items: dict[str, EmbeddingVector]) -> None: ...
+
+
+class _SqliteEmbeddingCacheBackend:
+    """On-disk L2 shared by every process on the same host (WAL mode)."""
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        max_rows: int,
+        metrics: EmbeddingMetricsStore = embedding_metrics_store,
+    ):
+        self._store = SqliteTtlStore(
+            path,
+            table="embedding_cache",
+            value_column="vector",
+            ttl_seconds=ttl_seconds,
+            max_rows=max_rows,
+        )
+        self._metrics = metrics
+
+    def _get_many_sync(self, keys: list[str]) -> dict[str, EmbeddingVector]:
+        out: dict[str, EmbeddingVector] = {}
+        for key, raw in self._store.get_many(keys).items():
+            vector = _decode_vector(raw)
+            if vector is not None:
+                out[key] = vector
+        return out
+
+    async def get_many(self, keys: list[str]) -> dict[str, EmbeddingVector]:
+        if not keys:
+            return {}
+        return await asyncio.to_thread(self._get_many_sync, keys)
+
+    async def set_many(self, items: dict[str, EmbeddingVector]) -> None:
+        if not items:
+            return
+        encoded = {key: _encode_vector(vec) for key, vec in items.items()}
+        evicted = await asyncio.to_thread(self._store.set_many, encoded)
+        self._metrics.record_l2_evictions(evicted)
+
+
+class _RedisEmbeddingCacheBackend:
+    """Cluster-wide L2 shared by API replicas and workers; eviction is Redis TTL/maxmemory."""
+
+    name = "redis"
+
+    def __init__(self, redis_client: Any, ttl_seconds: int, prefix: str = ""):
+        self._redis = redis_client
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._prefix = str(prefix or "")
+
+    async def get_many(self, keys: list[str]) -> dict[str, EmbeddingVector]:
+        if not keys:
+            return {}
+        raw_values = await self._redis.mget([self._prefix + key for key in keys])
+        out: dict[str, EmbeddingVector] = {}
+        for key, raw in zip(keys, raw_values or []):
+            vector = _decode_vector(raw)
+            if vector is not None:
+                out[key] = vector
+        return out
+
+    async def set_many(self, items: dict[str, EmbeddingVector]) -> None:
+        if not items:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, vec in items.items():
+            pipe.set(self._prefix + key, _encode_vector(vec), ex=self._ttl_seconds)
+        await pipe.execute()
+
+
+class TwoTierEmbeddingCache:
+    """
+    In-process LRU (L1) in front of an optional shared backend (L2).
+    L1 holds compact EmbeddingVector buffers (float32, or float16 when configured).
+    L2 failures are logged and counted but never fail the embedding call.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: int,
+        l2: Optional[EmbeddingCacheBackend] = None,
+        dtype: str = "float32",
+        metrics: EmbeddingMetricsStore = embedding_metrics_store,
+    ):
+        self._max_size = max(1, int(max_size))
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._dtype = resolve_embedding_dtype(dtype)
+        self._l1: "OrderedDict[str, tuple[EmbeddingVector, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._l2 = l2
+        self._metrics = metrics
+
+    @property
+    def l2_backend_name(self) -> str:
+        return str(getattr(self._l2, "name", "none")) if self._l2 is not None else "none"
+
+    def __len__(self) -> int:
+        return len(self._l1)
+
+    def _l1_get_many(self, keys: list[str]) -> dict[str, EmbeddingVector]:
+        out: dict[str, EmbeddingVector] = {}
+        expired = 0
+        with self._lock:
+            now = time.monotonic()
+            for key in keys:
+                cached = self._l1.get(key)
+                if cached is None:
+                    continue
+                vector, expires_at = cached
+                if expires_at > now:
+                    out[key] = vector
+                    self._l1.move_to_end(key)
+                    continue
+                self._l1.pop(key, None)
+                expired += 1
+        self._metrics.record_l1_evictions(expired)
+        return out
+
+    def _l1_put_many(self, items: dict[str, EmbeddingVector]) -> None:
+        evicted = 0
+        with self._lock:
+            expires_at = time.monotonic() + float(self._ttl_seconds)
+            for key, vector in items.items():
+                compact = EmbeddingVector.coerce(vector, dtype=self._dtype)
+                if compact is None:
+                    continue
+                self._l1[key] = (compact, expires_at)
+                self._l1.move_to_end(key)
+            while len(self._l1) > self._max_size:
+                self._l1.popitem(last=False)
+                evicted += 1
+        self._metrics.record_l1_evictions(evicted)
+
+    async def get_many(self, keys: list[str]) -> dict[str, EmbeddingVector]:
+        unique_keys = list(dict.fromkeys(keys))
+        found = self._l1_get_many(unique_keys)
+        l1_hits = len(found)
+        l2_hits = 0
+        missing = [key for key in unique_keys if key not in found]
+        if missing and self._l2 is not None:
+            try:
+                from_l2 = await self._l2.get_many(missing)
+            except Exception as exc:
+                self._metrics.record_l2_error()
+                logger.warning(
+                    "embedding_cache_l2_read_failed", backend=self.l2_backend_name, error=str(exc)
+                )
+                from_l2 = {}
+            if from_l2:
+                l2_hits = len(from_l2)
+                found.update(from_l2)
+                self._l1_put_many(from_l2)
+        self._metrics.record_cache_lookup(
+            l1_hits=l1_hits,
+            l2_hits=l2_hits,
+            misses=len(unique_keys) - l1_hits - l2_hits,
+        )
+        return found
+
+    async def set_many(self, items: dict[str, EmbeddingVector]) -> None:
+        if not items:
+            return
+        self._l1_put_many(items)
+        if self._l2 is None:
+            return
+        try:
+            await self._l2.set_many(items)
+            self._metrics.record_l2_writes(len(items))
+        except Exception as exc:
+            self._metrics.record_l2_error()
+            logger.warning(
+                "embedding_cache_l2_write_failed", backend=self.l2_backend_name, error=str(exc)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._l1.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        stats = self._metrics.snapshot()
+        stats["cache_l1_size"] = len(self._l1)
+        stats["cache_l1_max_size"] = self._max_size
+        stats["cache_l1_dtype"] = np.dtype(self._dtype).name
+        stats["cache_l2_backend"] = self.l2_backend_name
+        return stats
+
+
+def build_embedding_cache_l2_backend(backend: Optional[str] = None) -> Optional[EmbeddingCacheBackend]:
+    selected = str(backend or getattr(settings, "EMBEDDING_CACHE_L2_BACKEND", "none") or "none")
+    selected = selected.strip().lower()
+    ttl_seconds = int(getattr(settings, "EMBEDDING_CACHE_L2_TTL_SECONDS", 86400) or 86400)
+
+    if selected in {"", "none", "off", "disabled"}:
+        return None
+
+    if selected == "sqlite":
+        path = str(
+            getattr(settings, "EMBEDDING_CACHE_SQLITE_PATH", "") or ".cache/embedding_cache.sqlite3"
+        )
+        max_rows = int(getattr(settings, "EMBEDDING_CACHE_SQLITE_MAX_ROWS", 200000) or 200000)
+        logger.info("embedding_cache_l2_initialized", backend="sqlite", path=path)
+        return _SqliteEmbeddingCacheBackend(path, ttl_seconds=ttl_seconds, max_rows=max_rows)
+
+    if selected == "redis":
+        redis_url = str(settings.REDIS_URL or "").strip()
+        if not redis_url:
+            logger.warning("embedding_cache_l2_redis_url_missing")
+            return None
+        try:
+            from redis import asyncio as redis_async
+
+            client = redis_async.from_url(redis_url, decode_responses=False)
+        except Exception as exc:
+            logger.warning("embedding_cache_l2_redis_unavailable", error=str(exc))
+            return None
+        prefix = str(getattr(settings, "EMBEDDING_CACHE_REDIS_PREFIX", "cire:") or "")
+        logger.info("embedding_cache_l2_initialized", backend="redis")
+        return _RedisEmbeddingCacheBackend(client, ttl_seconds=ttl_seconds, prefix=prefix)
+
+    logger.warning("embedding_cache_l2_backend_unknown", backend=selected)
+    return None
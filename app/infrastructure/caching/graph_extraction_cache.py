@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import structlog
+
+from app.domain.ingestion.graph.extraction_cache import IGraphExtractionCache
+from app.infrastructure.caching.sqlite_ttl_store import SqliteTtlStore
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class _MemoryGraphExtractionCacheBackend:
+    """Per-process LRU; survives retries within one worker but not restarts."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _SqliteGraphExtractionCacheBackend:
+    """On-disk store shared by every worker process on the host (WAL mode)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, ttl_seconds: int, max_rows: int):
+        self._store = SqliteTtlStore(
+            path,
+            table="graph_extraction_cache",
+            value_column="payload",
+            value_type="TEXT",
+            ttl_seconds=ttl_seconds,
+            max_rows=max_rows,
+        )
+
+    def _get_sync(self, key: str) -> Optional[dict[str, Any]]:
+        raw = self._store.get_many([key]).get(key)
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        return payload if isinstance(payload, dict) else None
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        await asyncio.to_thread(self._store.set_many, {key: payload})
+
+
+def build_graph_extraction_cache(backend: Optional[str] = None) -> Optional[IGraphExtractionCache]:
+    selected = str(backend or getattr(settings, "GRAPH_EXTRACTION_CACHE_BACKEND", "sqlite") or "none")
+    selected = selected.strip().lower()
+
+    if selected in {"", "none", "off", "disabled"}:
+        return None
+
+    if selected == "memory":
+        max_entries = int(getattr(settings, "GRAPH_EXTRACTION_CACHE_MAX_ROWS", 200000) or 200000)
+        return _MemoryGraphExtractionCacheBackend(max_entries=max_entries)
+
+    if selected == "sqlite":
+        path = str(
+            getattr(settings, "GRAPH_EXTRACTION_CACHE_SQLITE_PATH", "")
+            or ".cache/graph_extraction_cache.sqlite3"
+        )
+        ttl_seconds = int(getattr(settings, "GRAPH_EXTRACTION_CACHE_TTL_SECONDS", 2592000) or 2592000)
+        max_rows = int(getattr(settings, "GRAPH_EXTRACTION_CACHE_MAX_ROWS", 200000) or 200000)
+        logger.info("graph_extraction_cache_initialized", backend="sqlite", path=path)
+        return _SqliteGraphExtractionCacheBackend(path, ttl_seconds=ttl_seconds, max_rows=max_rows)
+
+    logger.warning("graph_extraction_cache_backend_unknown", backend=selected)
+    return None
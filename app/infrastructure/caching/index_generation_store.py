@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+import structlog
+
+from app.domain.retrieval.result_cache import IndexGenerationStore, index_generations
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class _RedisIndexGenerationStore:
+    """Per-tenant generations as Redis integers: ``INCR`` on writes, one ``MGET`` per lookup."""
+
+    def __init__(self, redis_client: Any, prefix: str = ""):
+        self._redis = redis_client
+        self._prefix = str(prefix or "")
+
+    async def incr(self, key: str) -> int:
+        return int(await self._redis.incr(self._prefix + key))
+
+    async def get_many(self, keys: List[str]) -> List[int]:
+        values = await self._redis.mget([self._prefix + key for key in keys])
+        return [int(value or 0) for value in (values or [None] * len(keys))]
+
+
+def build_index_generation_store(backend: Optional[str] = None) -> Optional[IndexGenerationStore]:
+    selected = str(
+        backend or getattr(settings, "RETRIEVAL_RESULT_CACHE_GENERATION_BACKEND", "redis") or "redis"
+    ).strip().lower()
+    if selected in {"", "local", "none", "off"}:
+        return None
+    if selected != "redis":
+        logger.warning("index_generation_backend_unknown", backend=selected)
+        return None
+    redis_url = str(settings.REDIS_URL or "").strip()
+    if not redis_url:
+        logger.warning("index_generation_redis_url_missing")
+        return None
+    try:
+        from redis import asyncio as redis_async
+
+        client = redis_async.from_url(redis_url, decode_responses=True)
+    except Exception as exc:
+        logger.warning("index_generation_redis_unavailable", error=str(exc))
+        return None
+    prefix = str(
+        getattr(settings, "RETRIEVAL_RESULT_CACHE_REDIS_PREFIX", "cire:index_generation:") or ""
+    )
+    logger.info("index_generation_store_initialized", backend="redis")
+    return _RedisIndexGenerationStore(client, prefix=prefix)
+
+
+def configure_index_generations() -> None:
+    """Attach the shared generation store in processes that read or bump generations.
+
+    With the cache enabled and a ``redis`` backend that cannot be built, the
+    cache is turned off for this process rather than keyed on local counters
+    that other processes never bump.
+    """
+    if not bool(getattr(settings, "RETRIEVAL_RESULT_CACHE_ENABLED", False)):
+        return
+    backend = str(getattr(settings, "RETRIEVAL_RESULT_CACHE_GENERATION_BACKEND", "redis") or "redis")
+    store = build_index_generation_store(backend)
+    if store is None and backend.strip().lower() not in {"", "local", "none", "off"}:
+        logger.warning("retrieval_result_cache_disabled", reason="shared_generation_store_unavailable")
+        settings.RETRIEVAL_RESULT_CACHE_ENABLED = False
+        return
+    index_generations.attach_shared_store(store)
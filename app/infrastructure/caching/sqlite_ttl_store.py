@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class SqliteTtlStore:
+    """Key-value table with per-row expiry, shared by every process on the host (WAL mode).
+
+    Expired rows are never returned. Every ``PRUNE_EVERY_N_WRITES`` writes the
+    store drops expired rows and then the soonest-expiring ones above
+    ``max_rows``. Calls are blocking; async callers run them in a thread.
+    """
+
+    PRUNE_EVERY_N_WRITES = 256
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        table: str,
+        value_column: str = "value",
+        value_type: str = "BLOB",
+        ttl_seconds: int,
+        max_rows: int,
+    ):
+        self.path = str(path)
+        self._table = table
+        self._value_column = value_column
+        self._value_type = value_type
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._max_rows = max(1, int(max_rows))
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} ("
+                f"key TEXT PRIMARY KEY, {self._value_column} {self._value_type} NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self._table}_expires_at "
+                f"ON {self._table} (expires_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT key, {self._value_column} FROM {self._table} "
+                f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*keys, time.time()),
+            ).fetchall()
+        return {str(key): value for key, value in rows}
+
+    def set_many(self, items: dict[str, Any]) -> int:
+        """Store ``items`` with a fresh TTL; returns the rows evicted by a prune, if one ran."""
+        if not items:
+            return 0
+        expires_at = time.time() + float(self._ttl_seconds)
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, {self._value_column}, expires_at) "
+                "VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()],
+            )
+            self._writes_since_prune += len(items)
+            evicted = 0
+            if self._writes_since_prune >= self.PRUNE_EVERY_N_WRITES:
+                self._writes_since_prune = 0
+                evicted = self._prune_locked(conn)
+            conn.commit()
+        return evicted
+
+    def _prune_locked(self, conn: sqlite3.Connection) -> int:
+        evicted = conn.execute(
+            f"DELETE FROM {self._table} WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        total = int(conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0])
+        overflow = total - self._max_rows
+        if overflow > 0:
+            evicted += conn.execute(
+                f"DELETE FROM {self._table} WHERE key IN ("
+                f"SELECT key FROM {self._table} ORDER BY expires_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        return max(0, int(evicted))
@@ -5,6 +5,9 @@ Centralizes service instantiation and dependency injection.
 Prevents static singletons in Domain nodes.
 """
 
+from typing import Optional
+
+from app.domain.retrieval.ports import IAtomicRetrievalRepository, IRetrievalRepository
 from app.workflows.retrieval.grounded_retrieval import GroundedRetrievalWorkflow
 from app.infrastructure.document_parsers.pdf_parser import PdfParserService
 from app.domain.ingestion.orchestration.router import DocumentStructureRouter
@@ -16,6 +19,7 @@ from app.ai.rerankers.jina_reranker import JinaReranker
 from app.infrastructure.supabase.repositories.atomic_engine import AtomicRetrievalEngine
 from app.ai.tools.retrieval import RetrievalTools
 from app.infrastructure.network.downloader import DocumentDownloadService
+from app.infrastructure.caching.index_generation_store import configure_index_generations
 from app.infrastructure.state_management.state_manager import IngestionStateManager
 from app.workflows.retrieval.retrieval_broker import RetrievalBroker
 from app.workflows.ingestion.trigger import IngestionTrigger
@@ -32,6 +36,7 @@ from app.infrastructure.supabase.repositories.supabase_retrieval_repository impo
 from app.infrastructure.supabase.repositories.supabase_atomic_retrieval_repository import (
     SupabaseAtomicRetrievalRepository,
 )
+from app.infrastructure.local_index.repository import LocalRetrievalRepository
 from app.infrastructure.settings import settings
 from app.domain.ingestion.orchestration.router import VisualRoutingCostGuard
 
@@ -58,6 +63,7 @@ class CognitiveContainer:
         self._state_manager = None
         self._retrieval_broker = None
         self._atomic_retrieval_repository = None
+        self._local_retrieval_repository: Optional[LocalRetrievalRepository] = None
         self._authority_reranker = None
         self._semantic_reranker = None
         self._atomic_engine = None
@@ -108,9 +114,22 @@ class CognitiveContainer:
         return self._embedding_service
 
     @property
-    def retrieval_repository(self) -> SupabaseRetrievalRepository:
+    def local_retrieval_repository(self) -> Optional[LocalRetrievalRepository]:
+        if str(settings.RETRIEVAL_BACKEND or "").strip().lower() != "local":
+            return None
+        if self._local_retrieval_repository is None:
+            self._local_retrieval_repository = LocalRetrievalRepository.from_snapshot(
+                settings.LOCAL_INDEX_SNAPSHOT_PATH,
+                ann=bool(settings.LOCAL_INDEX_ANN_ENABLED),
+            )
+        return self._local_retrieval_repository
+
+    @property
+    def retrieval_repository(self) -> IRetrievalRepository:
         if self._retrieval_repository is None:
-            self._retrieval_repository = SupabaseRetrievalRepository()
+            self._retrieval_repository = (
+                self.local_retrieval_repository or SupabaseRetrievalRepository()
+            )
         return self._retrieval_repository
 
     @property
@@ -120,9 +139,11 @@ class CognitiveContainer:
         return self._retrieval_tools
 
     @property
-    def atomic_retrieval_repository(self) -> SupabaseAtomicRetrievalRepository:
+    def atomic_retrieval_repository(self) -> IAtomicRetrievalRepository:
         if self._atomic_retrieval_repository is None:
-            self._atomic_retrieval_repository = SupabaseAtomicRetrievalRepository()
+            self._atomic_retrieval_repository = (
+                self.local_retrieval_repository or SupabaseAtomicRetrievalRepository()
+            )
         return self._atomic_retrieval_repository
 
     @property
@@ -202,6 +223,7 @@ class CognitiveContainer:
         return self._retrieval_broker
 
     async def startup(self) -> None:
+        configure_index_generations()
         _ = self.retrieval_broker
 
     async def shutdown(self) -> None:
@@ -0,0 +1,222 @@
+"""Process pool for CPU-bound PDF parse stages, kept off the worker event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+import structlog
+
+from app.domain.ingestion.orchestration.router import (
+    DocumentStructureRouter,
+    IngestionTask,
+    PageAnalysis,
+)
+from app.domain.ingestion.structure.pdf_context import PdfDocumentContext
+from app.domain.ingestion.structure.toc_discovery import TocDiscoveryService, TocResult
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def shard_page_ranges(total_pages: int, shards: int, min_pages: int = 1) -> List[Tuple[int, int]]:
+    """Split ``[0, total_pages)`` into at most ``shards`` contiguous ranges."""
+    if total_pages <= 0:
+        return []
+    min_pages = max(1, int(min_pages))
+    count = max(1, min(int(shards), math.ceil(total_pages / min_pages)))
+    size = math.ceil(total_pages / count)
+    return [(start, min(start + size, total_pages)) for start in range(0, total_pages, size)]
+
+
+def _route_single_pass(
+    router: DocumentStructureRouter,
+    toc_service: Optional[TocDiscoveryService],
+    file_path: str,
+    max_pages: Optional[int] = None,
+) -> Tuple[int, Optional[Tuple[List[IngestionTask], Optional[TocResult]]]]:
+    """Page count plus, when it fits in one pass, tasks and ToC from the same open document."""
+    with PdfDocumentContext.open(file_path) as context:
+        total_pages = len(context)
+        if max_pages is not None and total_pages > max_pages:
+            return total_pages, None
+        tasks = router.route_document(context)
+        toc = toc_service.discover_toc(context) if toc_service is not None else None
+    return total_pages, (tasks, toc)
+
+
+def _extract_text_single_pass(
+    parser: Any, file_path: str, max_pages: Optional[int] = None
+) -> Tuple[int, Optional[dict]]:
+    """Page count plus, when it fits in one pass, the page-mapped text of the same open document."""
+    try:
+        context = PdfDocumentContext.open(file_path)
+    except Exception:
+        # The parser logs the open failure and returns None.
+        return 0, parser.extract_text_with_page_map(file_path)
+    with context:
+        total_pages = len(context)
+        if max_pages is not None and total_pages > max_pages:
+            return total_pages, None
+        return total_pages, parser.extract_text_with_page_map(context)
+
+
+def _analyze_range(
+    router: DocumentStructureRouter,
+    toc_service: Optional[TocDiscoveryService],
+    file_path: str,
+    start: int,
+    end: int,
+) -> Tuple[List[PageAnalysis], Optional[TocResult]]:
+    with PdfDocumentContext.open(file_path) as context:
+        analyses = router.analyze_pages(context, start, end)
+        toc = toc_service.discover_toc(context) if toc_service is not None else None
+    return analyses, toc
+
+
+class PdfCpuExecutor:
+    """
+    Runs PyMuPDF passes (routing, text extraction, ToC) in worker processes.
+
+    Large PDFs are sharded by page range across the pool and the partial
+    results are concatenated in page order, so outputs are identical to the
+    sequential path. ``max_workers=0`` keeps everything in a thread, which
+    still frees the event loop (heartbeats, pollers) but does not scale.
+    """
+
+    def __init__(self, max_workers: int = 2, shard_min_pages: int = 16):
+        self.max_workers = max(0, int(max_workers))
+        self.shard_min_pages = max(1, int(shard_min_pages))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: the parent runs an event loop and threads, fork is unsafe there.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool; fall back to a thread if the pool breaks."""
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(fn, *args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool as exc:
+            logger.warning("pdf_cpu_pool_broken_fallback_thread", error=str(exc))
+            self._reset_pool()
+            return await asyncio.to_thread(fn, *args)
+
+    def _single_pass_max_pages(self) -> Optional[int]:
+        """Largest page count that ``_ranges`` keeps in one shard (``None``: no limit)."""
+        return None if self.max_workers <= 1 else self.shard_min_pages
+
+    def _ranges(self, total_pages: int) -> List[Tuple[int, int]]:
+        return shard_page_ranges(total_pages, max(1, self.max_workers), self.shard_min_pages)
+
+    async def route_document(
+        self, router: DocumentStructureRouter, file_path: str
+    ) -> List[IngestionTask]:
+        """Sharded ``DocumentStructureRouter.route_document``."""
+        tasks, _toc = await self.route_and_discover_toc(router, None, file_path)
+        return tasks
+
+    async def route_and_discover_toc(
+        self,
+        router: DocumentStructureRouter,
+        toc_service: Optional[TocDiscoveryService],
+        file_path: str,
+    ) -> Tuple[List[IngestionTask], Optional[TocResult]]:
+        """
+        Route pages and read the ToC sharing one ``PdfDocumentContext`` per process.
+
+        Each page is parsed once for signals and text; the ToC is read from the
+        first shard's already open document. Documents that fit in one shard
+        are counted, routed and ToC-scanned with a single open; larger ones
+        are counted by that same call and then opened once per shard.
+        """
+        total_pages, single_pass = await self.run(
+            _route_single_pass, router, toc_service, file_path, self._single_pass_max_pages()
+        )
+        if single_pass is not None:
+            return single_pass
+        ranges = self._ranges(total_pages)
+
+        shards = await asyncio.gather(
+            *(
+                self.run(
+                    _analyze_range,
+                    router,
+                    toc_service if index == 0 else None,
+                    file_path,
+                    start,
+                    end,
+                )
+                for index, (start, end) in enumerate(ranges)
+            )
+        )
+        analyses = [analysis for shard, _toc in shards for analysis in shard]
+        logger.info("pdf_routing_sharded", pages=total_pages, shards=len(ranges))
+        # Cost guard is sequential over pages; rendering only touches visual pages.
+        tasks = await self.run(router.build_tasks, file_path, analyses)
+        return tasks, shards[0][1]
+
+    async def extract_text_with_page_map(self, parser: Any, file_path: str) -> Optional[dict]:
+        """Sharded ``PdfParserService.extract_text_with_page_map``."""
+        max_pages = self._single_pass_max_pages()
+        total_pages, single_pass = await self.run(
+            _extract_text_single_pass, parser, file_path, max_pages
+        )
+        if max_pages is None or total_pages <= max_pages:
+            return single_pass
+        ranges = self._ranges(total_pages)
+
+        shards = await asyncio.gather(
+            *(self.run(parser.extract_page_texts, file_path, start, end) for start, end in ranges)
+        )
+        if any(shard is None for shard in shards):
+            return None
+        pages = [page for _total, shard_pages in shards for page in shard_pages]
+        return parser.assemble_text_with_page_map(pages, total_pages=total_pages)
+
+    async def discover_toc(self, toc_service: TocDiscoveryService, file_path: str) -> TocResult:
+        return await self.run(toc_service.discover_toc, file_path)
+
+
+_executor: Optional[PdfCpuExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_cpu_executor() -> PdfCpuExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = PdfCpuExecutor(
+                max_workers=int(getattr(settings, "INGEST_CPU_POOL_WORKERS", 2) or 0),
+                shard_min_pages=int(getattr(settings, "INGEST_PDF_SHARD_MIN_PAGES", 16) or 16),
+            )
+        return _executor
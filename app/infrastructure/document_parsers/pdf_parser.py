@@ -3,6 +3,8 @@ import structlog
 import re
 import aiohttp
 from app.infrastructure.settings import settings
+from app.domain.ingestion.structure.pdf_context import PdfDocumentContext
+from app.infrastructure.document_parsers.cpu_executor import get_pdf_cpu_executor
 
 logger = structlog.get_logger(__name__)
 
@@ -147,7 +149,8 @@ class PdfParserService:
             if cloud is not None:
                 return cloud
             logger.warning("cloud_reader_failed_fallback_local", source_path=source_path or "")
-        return self.extract_markdown_with_structure(file_path)
+        # PyMuPDF/pymupdf4llm are CPU-bound: keep them off the worker event loop.
+        return await get_pdf_cpu_executor().run(self.extract_markdown_with_structure, file_path)
 
     async def _extract_markdown_cloud_reader(
         self, source_path: Optional[str]
@@ -188,84 +191,87 @@ class PdfParserService:
             "total_pages": 1,
         }
 
-    def extract_text_with_page_map(self, file_path: str) -> Optional[Dict[str, Any]]:
+    def extract_text_with_page_map(
+        self, file_path: "str | PdfDocumentContext"
+    ) -> Optional[Dict[str, Any]]:
         """
         Legacy: Extracts full text and builds a map of character offsets to page numbers.
         :param file_path: Path to the local PDF file.
         :return: Dict with 'full_text' and 'page_map' or None if extraction fails.
         """
-        try:
-            import fitz  # PyMuPDF
-        except ImportError as e:
-            logger.error("pymupdf_not_installed", error=str(e))
+        extracted = self.extract_page_texts(file_path)
+        if extracted is None:
             return None
+        total_pages, pages = extracted
+        return self.assemble_text_with_page_map(pages, total_pages=total_pages)
+
+    def extract_page_texts(
+        self, file_path: "str | PdfDocumentContext", start: int = 0, end: Optional[int] = None
+    ) -> Optional[tuple[int, List[tuple[int, str]]]]:
+        """
+        Raw block text of pages ``[start, end)`` as ``(total_pages, [(page, text)])``.
 
+        Pages are independent, so ranges can be extracted in parallel and
+        concatenated in page order before ``assemble_text_with_page_map``.
+        """
         try:
-            doc = fitz.open(file_path)
+            context = (
+                file_path
+                if isinstance(file_path, PdfDocumentContext)
+                else PdfDocumentContext.open(file_path)
+            )
         except Exception as e:
-            logger.error("pdf_open_failed", file_path=file_path, error=str(e))
+            logger.error("pdf_open_failed", file_path=str(file_path), error=str(e))
             return None
 
-        full_text = ""
-        current_char = 0
-        page_map = []
-        page_texts_raw: list[str] = []
-        page_numbers: list[int] = []
+        pages: list[tuple[int, str]] = []
 
         try:
-            for page_num in range(doc.page_count):
-                page = doc.load_page(page_num)
-                
-                # 1. Usar extracción por bloques con ordenamiento visual (Reading Order fix)
-                # Ignoramos los márgenes (10% superior e inferior) para evitar headers/footers
-                page_rect = page.rect
-                y_margin = page_rect.height * 0.08  # 8% de margen
-                
-                blocks = page.get_text("blocks", sort=True)
-                page_blocks = []
-                
-                for b in blocks:
-                    # b = (x0, y0, x1, y1, "text", block_no, block_type)
-                    block_rect = fitz.Rect(b[:4])
-                    block_text = b[4].replace("\x00", "").strip()
-                    
-                    # Filtrar bloques que estén muy arriba o muy abajo (Boilerplate/Noise)
-                    if block_rect.y1 < y_margin or block_rect.y0 > (page_rect.height - y_margin):
-                        continue
-                        
-                    if block_text:
-                        page_blocks.append(block_text)
-
-                page_text = "\n\n".join(page_blocks)
+            stop = len(context) if end is None else min(int(end), len(context))
+            for page_num in range(max(0, int(start)), stop):
+                # Bloques en orden de lectura sin márgenes superior/inferior (8%)
+                page_text = context.page(page_num).body_text()
                 if not page_text.strip():
                     continue
 
-                page_texts_raw.append(page_text)
-                page_numbers.append(page_num + 1)
+                pages.append((page_num + 1, page_text))
 
-            cleaned_page_texts = self._strip_repeated_page_boilerplate(page_texts_raw)
-            for page_num, cleaned_text in zip(page_numbers, cleaned_page_texts):
-                page_text = str(cleaned_text or "").strip()
-                if not page_text:
-                    continue
+            return len(context), pages
+        except Exception as e:
+            logger.error("pdf_extraction_failed", file_path=str(file_path), error=str(e))
+            return None
+        finally:
+            if context is not file_path:
+                context.close()
 
-                # Heuristic: ensure basic paragraph spacing if missing
-                if "\n\n" not in page_text:
-                    page_text = page_text.replace("\n", "\n\n")
+    def assemble_text_with_page_map(
+        self, pages: List[tuple[int, str]], total_pages: int
+    ) -> Dict[str, Any]:
+        """Strip repeated boilerplate across pages and build `full_text` + `page_map`."""
+        full_text = ""
+        current_char = 0
+        page_map = []
+        page_numbers = [page_num for page_num, _text in pages]
+        page_texts_raw = [text for _page_num, text in pages]
 
-                start = current_char
-                end = start + len(page_text)
-                page_map.append({"page": page_num, "start": start, "end": end})
+        cleaned_page_texts = self._strip_repeated_page_boilerplate(page_texts_raw)
+        for page_num, cleaned_text in zip(page_numbers, cleaned_page_texts):
+            page_text = str(cleaned_text or "").strip()
+            if not page_text:
+                continue
 
-                full_text += page_text + "\n\n"  # Safe separation between pages
-                current_char = len(full_text)
+            # Heuristic: ensure basic paragraph spacing if missing
+            if "\n\n" not in page_text:
+                page_text = page_text.replace("\n", "\n\n")
 
-            return {"full_text": full_text, "page_map": page_map, "total_pages": len(doc)}
-        except Exception as e:
-            logger.error("pdf_extraction_failed", file_path=file_path, error=str(e))
-            return None
-        finally:
-            doc.close()
+            start = current_char
+            end = start + len(page_text)
+            page_map.append({"page": page_num, "start": start, "end": end})
+
+            full_text += page_text + "\n\n"  # Safe separation between pages
+            current_char = len(full_text)
+
+        return {"full_text": full_text, "page_map": page_map, "total_pages": total_pages}
 
     def get_page_number(self, char_idx: int, page_map: List[Dict]) -> int:
         """Finds the page number for a given character index using the provided map."""
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+(?:[.\-/][0-9a-z]+)*")
+
+# Postgres 'spanish' dictionary stopwords (subset that matters for ranking).
+SPANISH_STOPWORDS: FrozenSet[str] = frozenset(
+    """
+    a al algo algunas algunos ante antes como con contra cual cuando de del desde donde
+    durante e el ella ellas ellos en entre era es esa esas ese eso esos esta estas este
+    esto estos fue fueron ha han hasta hay la las le les lo los mas me mi mis mucho muy
+    nada ni no nos o otra otras otro otros para pero poco por porque que quien se sea
+    segun ser si sin sobre son su sus tambien tanto te tiene tienen todo todos tu un una
+    uno unos y ya
+    """.split()
+)
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str, stopwords: FrozenSet[str] = frozenset()) -> List[str]:
+    tokens = _TOKEN_RE.findall(_fold(text or ""))
+    if not stopwords:
+        return tokens
+    return [t for t in tokens if t not in stopwords]
+
+
+class WebSearchQuery:
+    """
+    Minimal ``websearch_to_tsquery`` reading: terms are ANDed, ``or`` separates
+    alternatives, ``-term`` excludes and quoted phrases contribute their terms.
+    """
+
+    def __init__(self, groups: List[List[str]], excluded: List[str]):
+        self.groups = [g for g in groups if g]
+        self.excluded = excluded
+
+    @property
+    def terms(self) -> List[str]:
+        seen: Dict[str, None] = {}
+        for group in self.groups:
+            for term in group:
+                seen.setdefault(term, None)
+        return list(seen)
+
+    @classmethod
+    def parse(
+        cls, query: str, stopwords: FrozenSet[str] = frozenset(), *, websearch: bool = True
+    ) -> "WebSearchQuery":
+        if not websearch:
+            return cls([tokenize(query, stopwords)], [])
+        groups: List[List[str]] = [[]]
+        excluded: List[str] = []
+        for raw in re.findall(r'"[^"]*"|\S+', query or ""):
+            if raw.lower() == "or":
+                groups.append([])
+                continue
+            negate = raw.startswith("-") and len(raw) > 1
+            tokens = tokenize(raw.strip('"').lstrip("-"), stopwords)
+            if negate:
+                excluded.extend(tokens)
+            else:
+                groups[-1].extend(tokens)
+        return cls(groups, excluded)
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over a fixed document list.
+
+    Stands in for the Postgres ``fts`` (spanish) and ``fts_exact`` (simple)
+    columns. There is no Snowball stemmer, so inflected forms only match when
+    they share the same surface token.
+    """
+
+    def __init__(
+        self,
+        documents: Sequence[str],
+        *,
+        stopwords: FrozenSet[str] = frozenset(),
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.stopwords = stopwords
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.size = len(documents)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc_idx, text in enumerate(documents):
+            counts = Counter(tokenize(text, stopwords))
+            lengths[doc_idx] = float(sum(counts.values()))
+            for term, tf in counts.items():
+                docs, tfs = postings.setdefault(term, ([], []))
+                docs.append(doc_idx)
+                tfs.append(tf)
+        self._lengths = lengths
+        self._avg_length = float(lengths.mean()) if self.size else 0.0
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (np.asarray(docs, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            for term, (docs, tfs) in postings.items()
+        }
+
+    def _term_scores(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        posting = self._postings.get(term)
+        if posting is None:
+            return None
+        docs, tfs = posting
+        df = float(len(docs))
+        idf = math.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1.0 - self.b + self.b * self._lengths[docs] / max(self._avg_length, 1e-9))
+        return docs, idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+    def search(self, query: WebSearchQuery) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(matched_mask, scores)`` over all documents for a parsed query."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=bool)
+        term_scores = {term: self._term_scores(term) for term in query.terms}
+        for term, found in term_scores.items():
+            if found is not None:
+                scores[found[0]] += found[1]
+
+        for group in query.groups:
+            group_mask = np.ones(self.size, dtype=bool)
+            for term in dict.fromkeys(group):
+                term_mask = np.zeros(self.size, dtype=bool)
+                found = term_scores.get(term)
+                if found is not None:
+                    term_mask[found[0]] = True
+                group_mask &= term_mask
+            matched |= group_mask
+        for term in query.excluded:
+            posting = self._postings.get(term)
+            if posting is not None:
+                matched[posting[0]] = False
+        return matched, scores
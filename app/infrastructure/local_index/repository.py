@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.domain.retrieval.config import retrieval_settings
+from app.domain.retrieval.vector_similarity import top_k_indices
+from app.infrastructure.local_index.bm25 import SPANISH_STOPWORDS, BM25Index, WebSearchQuery
+from app.infrastructure.local_index.vector_index import VectorIndex
+from app.infrastructure.observability.context_vars import get_tenant_id
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+_IDENTIFIER_RE = re.compile(
+    r"([A-Za-z]+[-./]?[0-9]+|[0-9]+[A-Za-z]+|iso\s*[0-9]{3,5}|cl[aá]usula\s*[0-9]+(?:\.[0-9]+)*)",
+    re.IGNORECASE,
+)
+_SUMMARY_RESOLVE_MAX_DEPTH = 5
+
+
+def _norm_id(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _as_rank(score: np.ndarray) -> np.ndarray:
+    # BM25 is unbounded; squash to [0, 1) so it stays comparable with ts_rank_cd
+    # and cosine similarity in the fused "similarity" column.
+    return score / (1.0 + score)
+
+
+def _stack_embeddings(rows: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    dims = 0
+    for row in rows:
+        embedding = row.get("embedding")
+        if embedding is not None and len(embedding) > 0:
+            dims = len(embedding)
+            break
+    matrix = np.zeros((len(rows), dims), dtype=np.float32)
+    present = np.zeros(len(rows), dtype=bool)
+    for idx, row in enumerate(rows):
+        embedding = row.get("embedding")
+        if embedding is None or len(embedding) != dims or dims == 0:
+            continue
+        matrix[idx] = np.asarray(embedding, dtype=np.float32)
+        present[idx] = True
+    return matrix, present
+
+
+def _clean_record(row: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    return {key: row.get(key) for key in keys}
+
+
+_CHUNK_KEYS = (
+    "id",
+    "content",
+    "semantic_context",
+    "file_page_number",
+    "source_id",
+    "tenant_id",
+    "is_global",
+    "collection_id",
+    "source_standard",
+    "metadata",
+)
+_SUMMARY_KEYS = (
+    "id",
+    "content",
+    "title",
+    "level",
+    "tenant_id",
+    "collection_id",
+    "properties",
+    "children_ids",
+)
+
+
+class LocalRetrievalRepository:
+    """
+    In-process stand-in for the Supabase retrieval RPCs.
+
+    Implements both ``IAtomicRetrievalRepository`` and ``IRetrievalRepository``
+    over an exact (optionally HNSW) vector index plus BM25 indexes for the
+    ``fts``/``fts_exact`` legs, reproducing the tenant, global, collection and
+    source-standard scoping and the weighted RRF fusion of
+    ``retrieve_hybrid_optimized``. Intended for offline profiling of the
+    retrieval pipeline and for small tenants that run without Postgres.
+
+    Chunk rows carry ``id, content, semantic_context, file_page_number,
+    source_id, tenant_id, is_global, collection_id, source_standard, metadata,
+    embedding``; summary rows carry ``id, content, title, level, tenant_id,
+    collection_id, properties, children_ids, embedding``.
+    """
+
+    def __init__(
+        self,
+        chunks: Sequence[Dict[str, Any]],
+        summaries: Sequence[Dict[str, Any]] = (),
+        *,
+        ann: bool = False,
+    ):
+        self._chunks = [_clean_record(row, _CHUNK_KEYS) for row in chunks]
+        self._summaries = [_clean_record(row, _SUMMARY_KEYS) for row in summaries]
+        for row in self._chunks:
+            row["id"] = str(row.get("id") or "")
+            row["metadata"] = row["metadata"] if isinstance(row.get("metadata"), dict) else {}
+            row["source_standard"] = str(row.get("source_standard") or "").strip().lower()
+        for row in self._summaries:
+            row["id"] = str(row.get("id") or "")
+            row["level"] = int(row.get("level") or 0)
+
+        chunk_matrix, chunk_present = _stack_embeddings(chunks)
+        summary_matrix, summary_present = _stack_embeddings(summaries)
+        self._chunk_vectors = VectorIndex(chunk_matrix, present=chunk_present, ann=ann)
+        self._summary_vectors = VectorIndex(summary_matrix, present=summary_present, ann=ann)
+
+        texts = [
+            f"{row.get('content') or ''} {row.get('semantic_context') or ''}"
+            for row in self._chunks
+        ]
+        self._fts = BM25Index(texts, stopwords=SPANISH_STOPWORDS)
+        self._fts_exact = BM25Index(texts)
+
+        self._chunk_pos = {row["id"]: idx for idx, row in enumerate(self._chunks)}
+        self._summary_pos = {row["id"]: idx for idx, row in enumerate(self._summaries)}
+        self._tenant = np.array([_norm_id(r.get("tenant_id")) for r in self._chunks], dtype=object)
+        self._collection = np.array(
+            [_norm_id(r.get("collection_id")) for r in self._chunks], dtype=object
+        )
+        self._source = np.array([_norm_id(r.get("source_id")) for r in self._chunks], dtype=object)
+        self._is_global = np.array([bool(r.get("is_global")) for r in self._chunks], dtype=bool)
+
+        logger.info(
+            "local_retrieval_index_ready",
+            chunks=len(self._chunks),
+            summaries=len(self._summaries),
+            dimensions=self._chunk_vectors.dimensions,
+            ann=self._chunk_vectors.ann_enabled,
+        )
+
+    # ------------------------------------------------------------------ snapshot
+
+    @classmethod
+    def from_snapshot(cls, path: str | Path, *, ann: bool = False) -> "LocalRetrievalRepository":
+        with np.load(str(path), allow_pickle=False) as data:
+            version = int(data["version"][0]) if "version" in data else 0
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported local index snapshot version: {version}")
+            chunks = json.loads(bytes(data["chunk_records"]).decode("utf-8"))
+            summaries = json.loads(bytes(data["summary_records"]).decode("utf-8"))
+            chunk_matrix = data["chunk_embeddings"]
+            chunk_present = data["chunk_present"]
+            summary_matrix = data["summary_embeddings"]
+            summary_present = data["summary_present"]
+            for row, vector, present in zip(chunks, chunk_matrix, chunk_present):
+                row["embedding"] = vector if present else None
+            for row, vector, present in zip(summaries, summary_matrix, summary_present):
+                row["embedding"] = vector if present else None
+        return cls(chunks, summaries, ann=ann)
+
+    def save_snapshot(self, path: str | Path) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        def _records(rows: List[Dict[str, Any]]) -> np.ndarray:
+            raw = json.dumps(rows, ensure_ascii=False, default=str).encode("utf-8")
+            return np.frombuffer(raw, dtype=np.uint8)
+
+        with target.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                version=np.array([SNAPSHOT_VERSION], dtype=np.int32),
+                chunk_records=_records(self._chunks),
+                chunk_embeddings=self._chunk_vectors.matrix,
+                chunk_present=self._chunk_vectors.present,
+                summary_records=_records(self._summaries),
+                summary_embeddings=self._summary_vectors.matrix,
+                summary_present=self._summary_vectors.present,
+            )
+
+    # ------------------------------------------------------------------ helpers
+
+    def _scope_mask(
+        self,
+        *,
+        tenant_id: Any = None,
+        is_global: Optional[bool] = None,
+        collection_id: Any = None,
+        source_ids: Optional[Iterable[Any]] = None,
+        scope_terms: Sequence[str] = (),
+    ) -> np.ndarray:
+        mask = np.ones(len(self._chunks), dtype=bool)
+        if tenant_id:
+            mask &= self._tenant == _norm_id(tenant_id)
+        if is_global is not None:
+            mask &= self._is_global == bool(is_global)
+        if collection_id:
+            mask &= self._collection == _norm_id(collection_id)
+        if source_ids is not None:
+            allowed = {_norm_id(s) for s in source_ids}
+            mask &= np.fromiter((s in allowed for s in self._source), dtype=bool, count=mask.size)
+        if scope_terms:
+            for idx in np.flatnonzero(mask):
+                row_scope = self._chunks[idx]["source_standard"]
+                if not row_scope or not any(t == row_scope or t in row_scope for t in scope_terms):
+                    mask[idx] = False
+        return mask
+
+    def _fts_hits(
+        self, index: BM25Index, query: WebSearchQuery, mask: np.ndarray, limit: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        matched, scores = index.search(query)
+        rows = np.flatnonzero(matched & mask)
+        ranks = _as_rank(scores[rows])
+        order = top_k_indices(ranks, limit)
+        return rows[order], ranks[order]
+
+    def _rpc_metadata(self, idx: int, *, with_scope: bool = True) -> Dict[str, Any]:
+        row = self._chunks[idx]
+        metadata: Dict[str, Any] = {
+            "semantic_context": row.get("semantic_context"),
+            "file_page_number": row.get("file_page_number"),
+            "source_id": row.get("source_id"),
+        }
+        if with_scope:
+            metadata["source_standard"] = row["source_standard"] or None
+        return metadata
+
+    @staticmethod
+    def _resolve_required_tenant(filter_conditions: Dict[str, Any]) -> str:
+        from_filter = str((filter_conditions or {}).get("tenant_id") or "").strip()
+        from_ctx = str(get_tenant_id() or "").strip()
+        tenant_id = from_filter or from_ctx
+        if not tenant_id:
+            raise ValueError("TENANT_CONTEXT_REQUIRED")
+        if from_filter and from_ctx and from_filter != from_ctx:
+            raise ValueError("TENANT_MISMATCH")
+        return tenant_id
+
+    # ------------------------------------------------- IAtomicRetrievalRepository
+
+    async def retrieve_hybrid_optimized(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        match_count = max(int(payload.get("match_count") or 40), 1)
+        threshold = float(payload.get("match_threshold") or 0.0)
+        rrf_k = int(payload.get("rrf_k") or 60)
+        vector_weight = float(payload.get("vector_weight", 0.7) or 0.0)
+        fts_weight = float(payload.get("fts_weight", 0.3) or 0.0)
+        cleaned_query = str(payload.get("query_text") or "").strip()
+        identifier_mode = bool(cleaned_query) and bool(_IDENTIFIER_RE.search(cleaned_query))
+
+        vector_w = max(vector_weight, 0.0)
+        if identifier_mode:
+            fts_es_w = min(max(fts_weight, 0.0), 0.2)
+            fts_exact_w = max(fts_weight * 1.6, 0.45)
+            literal_w = 0.35
+        else:
+            fts_es_w = max(fts_weight, 0.0)
+            fts_exact_w = min(max(fts_weight, 0.0), 0.2)
+            literal_w = 0.05
+
+        raw_terms = list(payload.get("source_standards") or [])
+        if str(payload.get("source_standard") or "").strip():
+            raw_terms.append(payload["source_standard"])
+        scope_terms = sorted({str(t).strip().lower() for t in raw_terms if str(t or "").strip()})
+        mask = self._scope_mask(
+            tenant_id=payload.get("tenant_id"),
+            is_global=payload.get("is_global"),
+            collection_id=payload.get("collection_id"),
+            scope_terms=scope_terms,
+        )
+
+        legs: List[Tuple[float, np.ndarray, np.ndarray]] = []
+        query_embedding = payload.get("query_embedding")
+        if query_embedding is not None and len(query_embedding) > 0:
+            rows, sims = self._chunk_vectors.search(
+                query_embedding,
+                mask,
+                match_count,
+                threshold=threshold,
+                ef_search=int(payload.get("hnsw_ef_search") or 80),
+            )
+            legs.append((vector_w, rows, sims))
+        if cleaned_query:
+            legs.append(
+                (fts_es_w,)
+                + self._fts_hits(
+                    self._fts,
+                    WebSearchQuery.parse(cleaned_query, SPANISH_STOPWORDS),
+                    mask,
+                    match_count,
+                )
+            )
+            legs.append(
+                (fts_exact_w,)
+                + self._fts_hits(
+                    self._fts_exact, WebSearchQuery.parse(cleaned_query), mask, match_count
+                )
+            )
+        if identifier_mode:
+            needle = cleaned_query.lower()
+            literal: List[int] = []
+            for idx in np.flatnonzero(mask):
+                row = self._chunks[idx]
+                haystacks = (row.get("content"), row.get("semantic_context"), row["source_standard"])
+                if any(needle in str(h or "").lower() for h in haystacks):
+                    literal.append(int(idx))
+                    if len(literal) >= match_count:
+                        break
+            legs.append(
+                (literal_w, np.asarray(literal, dtype=np.int64), np.ones(len(literal), np.float32))
+            )
+
+        fused: Dict[int, List[float]] = {}
+        for weight, rows, ranks in legs:
+            for pos, (idx, rank) in enumerate(zip(rows.tolist(), ranks.tolist()), start=1):
+                entry = fused.setdefault(idx, [0.0, 0.0])
+                entry[0] = max(entry[0], float(rank))
+                entry[1] += weight / (rrf_k + pos)
+
+        ordered = sorted(fused.items(), key=lambda item: (-item[1][1], -item[1][0]))
+        return [
+            {
+                "id": self._chunks[idx]["id"],
+                "content": self._chunks[idx].get("content") or "",
+                "metadata": self._rpc_metadata(idx),
+                "similarity": similarity,
+                "score": score,
+                "source_layer": "hybrid",
+                "source_type": "content_chunk",
+            }
+            for idx, (similarity, score) in ordered[:match_count]
+        ]
+
+    async def search_vectors_only(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        mask = self._scope_mask(source_ids=payload.get("source_ids") or [])
+        rows, sims = self._chunk_vectors.search(
+            payload.get("query_embedding") or [],
+            mask,
+            int(payload.get("match_count") or 0),
+            threshold=float(payload.get("match_threshold") or 0.0),
+        )
+        out: list[dict[str, Any]] = []
+        for idx, similarity in zip(rows.tolist(), sims.tolist()):
+            metadata = self._rpc_metadata(idx, with_scope=False)
+            metadata["source_file"] = "unknown"
+            out.append(
+                {
+                    "id": self._chunks[idx]["id"],
+                    "content": self._chunks[idx].get("content") or "",
+                    "metadata": metadata,
+                    "similarity": float(similarity),
+                }
+            )
+        return out
+
+    async def search_fts_only(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        query = WebSearchQuery.parse(str(payload.get("query_text") or ""), SPANISH_STOPWORDS)
+        mask = self._scope_mask(source_ids=payload.get("source_ids") or [])
+        rows, ranks = self._fts_hits(self._fts, query, mask, int(payload.get("match_count") or 0))
+        return [
+            {
+                "id": self._chunks[idx]["id"],
+                "content": self._chunks[idx].get("content") or "",
+                "metadata": self._rpc_metadata(idx, with_scope=False),
+                "rank": float(rank),
+            }
+            for idx, rank in zip(rows.tolist(), ranks.tolist())
+        ]
+
+    async def fetch_chunks_by_ids(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        for chunk_id in chunk_ids:
+            idx = self._chunk_pos.get(str(chunk_id))
+            if idx is None:
+                continue
+            row = self._chunks[idx]
+            metadata = dict(row["metadata"])
+            out.append(
+                {
+                    "id": row["id"],
+                    "content": str(row.get("content") or ""),
+                    "metadata": metadata,
+                    "similarity": 0.0,
+                    "score": 0.0,
+                    "source_layer": "graph_grounded",
+                    "source_type": "content_chunk",
+                    "source_id": str(row.get("source_id") or metadata.get("source_id") or ""),
+                }
+            )
+        return out
+
+    # ------------------------------------------------------ IRetrievalRepository
+
+    def _match_knowledge_scored(
+        self,
+        vector: List[float],
+        filter_conditions: Dict[str, Any],
+        query_text: Optional[str],
+    ) -> List[Tuple[float, str, int]]:
+        tenant_id = self._resolve_required_tenant(filter_conditions)
+        filters = filter_conditions or {}
+        is_global = filters.get("is_global")
+        source_id = filters.get("source_id")
+        mask = self._scope_mask(
+            tenant_id=tenant_id,
+            is_global=None if is_global is None else bool(is_global),
+            collection_id=filters.get("collection_id"),
+            source_ids=[source_id] if source_id else None,
+        )
+        rows = np.flatnonzero(mask & self._chunk_vectors.present)
+        if rows.size == 0:
+            return []
+        v_scores = self._chunk_vectors.similarities(vector, rows)
+        threshold = float(retrieval_settings.MATCH_THRESHOLD_DEFAULT)
+        if query_text is None:
+            keep = v_scores > threshold
+            return [(float(s), self._chunks[i]["id"], int(i)) for i, s in zip(rows[keep], v_scores[keep])]
+
+        matched, raw = self._fts.search(
+            WebSearchQuery.parse(query_text, SPANISH_STOPWORDS, websearch=False)
+        )
+        t_scores = np.where(matched[rows], _as_rank(raw[rows]), 0.0)
+        combined = v_scores * 0.7 + np.minimum(t_scores, 1.0) * 0.3
+        keep = (combined > threshold) | (t_scores > 0.05)
+        return [
+            (float(s), self._chunks[i]["id"], int(i)) for i, s in zip(rows[keep], combined[keep])
+        ]
+
+    def _knowledge_row(self, similarity: float, idx: int) -> Dict[str, Any]:
+        row = self._chunks[idx]
+        return {
+            "id": row["id"],
+            "content": row.get("content") or "",
+            "similarity": similarity,
+            "metadata": dict(row["metadata"]),
+            "institution_id": row.get("tenant_id"),
+        }
+
+    async def match_knowledge(
+        self,
+        vector: List[float],
+        filter_conditions: Dict[str, Any],
+        limit: int,
+        query_text: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        scored = self._match_knowledge_scored(vector, filter_conditions, query_text)
+        scored.sort(key=lambda item: -item[0])
+        return [self._knowledge_row(sim, idx) for sim, _, idx in scored[: max(limit, 0)]]
+
+    async def match_knowledge_paginated(
+        self,
+        vector: List[float],
+        filter_conditions: Dict[str, Any],
+        limit: int,
+        query_text: Optional[str] = None,
+        cursor_score: Optional[float] = None,
+        cursor_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        scored = self._match_knowledge_scored(vector, filter_conditions, query_text)
+        if cursor_score is not None:
+            cursor = str(cursor_id or "")
+            scored = [
+                item
+                for item in scored
+                if item[0] < cursor_score or (item[0] == cursor_score and item[1] > cursor)
+            ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [self._knowledge_row(sim, idx) for sim, _, idx in scored[: max(limit, 0)]]
+
+    async def match_summaries(
+        self,
+        vector: List[float],
+        tenant_id: str,
+        limit: int,
+        collection_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        tenant_ctx = str(get_tenant_id() or "").strip()
+        tenant_req = str(tenant_id or "").strip()
+        if not tenant_req:
+            raise ValueError("TENANT_CONTEXT_REQUIRED")
+        if tenant_ctx and tenant_ctx != tenant_req:
+            raise ValueError("TENANT_MISMATCH")
+
+        mask = np.fromiter(
+            (
+                _norm_id(row.get("tenant_id")) == _norm_id(tenant_req)
+                and row["level"] > 0
+                and (not collection_id or _norm_id(row.get("collection_id")) == _norm_id(collection_id))
+                for row in self._summaries
+            ),
+            dtype=bool,
+            count=len(self._summaries),
+        )
+        rows, sims = self._summary_vectors.search(vector, mask, limit, threshold=0.4)
+        return [
+            {
+                "id": self._summaries[idx]["id"],
+                "content": self._summaries[idx].get("content") or "",
+                "title": self._summaries[idx].get("title"),
+                "level": self._summaries[idx]["level"],
+                "similarity": float(similarity),
+                "properties": self._summaries[idx].get("properties") or {},
+            }
+            for idx, similarity in zip(rows.tolist(), sims.tolist())
+        ]
+
+    async def resolve_summaries_to_chunk_ids(self, summary_ids: List[str]) -> List[str]:
+        leaf_chunk_ids: set[str] = set()
+        current = list({str(s) for s in summary_ids or []})
+        depth = 0
+        while current and depth < _SUMMARY_RESOLVE_MAX_DEPTH:
+            depth += 1
+            children: set[str] = set()
+            for summary_id in current:
+                idx = self._summary_pos.get(summary_id)
+                if idx is None:
+                    continue
+                for child in self._summaries[idx].get("children_ids") or []:
+                    child_id = str(child).strip()
+                    if child_id:
+                        children.add(child_id)
+            if not children:
+                break
+            child_summaries = {
+                child
+                for child in children
+                if child in self._summary_pos and self._summaries[self._summary_pos[child]]["level"] > 0
+            }
+            leaf_chunk_ids.update(children - child_summaries)
+            current = list(child_summaries)
+        return list(leaf_chunk_ids)
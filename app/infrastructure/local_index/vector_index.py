@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from app.domain.retrieval.vector_similarity import normalize_rows, top_k_indices
+
+logger = structlog.get_logger(__name__)
+
+try:
+    import hnswlib
+except ImportError:  # pragma: no cover - dependency guard
+    hnswlib = None
+
+
+class VectorIndex:
+    """
+    Cosine search over a normalized float32 matrix.
+
+    Exact search is a single matrix-vector product restricted to the candidate
+    rows. When ``hnswlib`` is installed and ``ann=True`` an HNSW graph is built
+    as well; it is only used when the candidate set is a large share of the
+    corpus, which is where ANN beats a filtered exact scan.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        *,
+        present: Optional[np.ndarray] = None,
+        ann: bool = False,
+        ann_min_candidate_ratio: float = 0.5,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+    ):
+        self.matrix = normalize_rows(embeddings)
+        self.size = int(self.matrix.shape[0])
+        self.dimensions = int(self.matrix.shape[1]) if self.size else 0
+        self.present = (
+            np.asarray(present, dtype=bool)
+            if present is not None
+            else np.ones(self.size, dtype=bool)
+        )
+        self._ann_min_candidate_ratio = float(ann_min_candidate_ratio)
+        self._hnsw: Any = None
+        if ann and self.size:
+            self._hnsw = self._build_hnsw(hnsw_m, hnsw_ef_construction)
+
+    @property
+    def ann_enabled(self) -> bool:
+        return self._hnsw is not None
+
+    def _build_hnsw(self, m: int, ef_construction: int) -> Any:
+        if hnswlib is None:
+            logger.warning("local_index_hnsw_unavailable", reason="hnswlib_not_installed")
+            return None
+        labels = np.flatnonzero(self.present)
+        if labels.size == 0:
+            return None
+        index = hnswlib.Index(space="ip", dim=self.dimensions)
+        index.init_index(max_elements=int(labels.size), M=int(m), ef_construction=int(ef_construction))
+        index.add_items(self.matrix[labels], labels)
+        return index
+
+    def similarities(self, query: Sequence[float], rows: np.ndarray) -> np.ndarray:
+        vector = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        return self.matrix[rows] @ vector
+
+    def search(
+        self,
+        query: Sequence[float],
+        candidates: np.ndarray,
+        k: int,
+        *,
+        threshold: Optional[float] = None,
+        ef_search: int = 80,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(row_indices, similarities)`` of the top ``k`` candidate rows."""
+        rows = np.flatnonzero(np.asarray(candidates, dtype=bool) & self.present)
+        if rows.size == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        if self._hnsw is not None and rows.size >= self._ann_min_candidate_ratio * self.size:
+            found = self._search_hnsw(query, rows, k, ef_search)
+            if found is not None:
+                idx, sims = found
+                if threshold is not None:
+                    keep = sims > threshold
+                    idx, sims = idx[keep], sims[keep]
+                return idx, sims
+
+        sims = self.similarities(query, rows)
+        if threshold is not None:
+            keep = sims > threshold
+            rows, sims = rows[keep], sims[keep]
+        order = top_k_indices(sims, k)
+        return rows[order], sims[order]
+
+    def _search_hnsw(
+        self, query: Sequence[float], rows: np.ndarray, k: int, ef_search: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        allowed = np.zeros(self.size, dtype=bool)
+        allowed[rows] = True
+        k = min(int(k), int(rows.size))
+        self._hnsw.set_ef(max(int(ef_search), k))
+        vector = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))
+        try:
+            labels, distances = self._hnsw.knn_query(
+                vector, k=k, filter=lambda label: bool(allowed[label])
+            )
+        except RuntimeError:
+            # hnswlib cannot return k filtered neighbours; fall back to exact scan.
+            return None
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
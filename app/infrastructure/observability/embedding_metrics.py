@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+
+@dataclass
+class _EmbeddingServiceMetrics:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    l1_evictions: int = 0
+    l2_evictions: int = 0
+    l2_writes: int = 0
+    l2_errors: int = 0
+    coalesced_calls: int = 0
+    microbatches: int = 0
+    microbatch_requests: int = 0
+    microbatch_texts: int = 0
+    microbatch_fill_ratio_sum: float = 0.0
+    microbatch_last_fill_ratio: float = 0.0
+
+
+class EmbeddingMetricsStore:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._metrics = _EmbeddingServiceMetrics()
+
+    def record_cache_lookup(self, *, l1_hits: int, l2_hits: int, misses: int) -> None:
+        with self._lock:
+            self._metrics.l1_hits += int(l1_hits)
+            self._metrics.l2_hits += int(l2_hits)
+            self._metrics.misses += int(misses)
+
+    def record_l1_evictions(self, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._metrics.l1_evictions += int(count)
+
+    def record_l2_evictions(self, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._metrics.l2_evictions += int(count)
+
+    def record_l2_writes(self, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._metrics.l2_writes += int(count)
+
+    def record_l2_error(self) -> None:
+        with self._lock:
+            self._metrics.l2_errors += 1
+
+    def record_coalesced_calls(self, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._metrics.coalesced_calls += int(count)
+
+    def record_microbatch(self, *, requests: int, texts: int, fill_ratio: float) -> None:
+        with self._lock:
+            self._metrics.microbatches += 1
+            self._metrics.microbatch_requests += int(requests)
+            self._metrics.microbatch_texts += int(texts)
+            self._metrics.microbatch_fill_ratio_sum += float(fill_ratio)
+            self._metrics.microbatch_last_fill_ratio = float(fill_ratio)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics = _EmbeddingServiceMetrics()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            m = self._metrics
+            lookups = m.l1_hits + m.l2_hits + m.misses
+            hits = m.l1_hits + m.l2_hits
+            return {
+                "cache_l1_hits": m.l1_hits,
+                "cache_l2_hits": m.l2_hits,
+                "cache_misses": m.misses,
+                "cache_hit_ratio": round(hits / lookups, 4) if lookups > 0 else 0.0,
+                "cache_l1_evictions": m.l1_evictions,
+                "cache_l2_evictions": m.l2_evictions,
+                "cache_l2_writes": m.l2_writes,
+                "cache_l2_errors": m.l2_errors,
+                "coalesced_calls": m.coalesced_calls,
+                "microbatches": m.microbatches,
+                "microbatch_requests": m.microbatch_requests,
+                "microbatch_texts": m.microbatch_texts,
+                "microbatch_avg_fill_ratio": (
+                    round(m.microbatch_fill_ratio_sum / m.microbatches, 4)
+                    if m.microbatches > 0
+                    else 0.0
+                ),
+                "microbatch_last_fill_ratio": round(m.microbatch_last_fill_ratio, 4),
+            }
+
+
+embedding_metrics_store = EmbeddingMetricsStore()
@@ -52,7 +52,7 @@ def track_span(name: str):
 
 
 def _log_span(name: str, duration_ms: float, result: Any, kwargs: Dict):
-    if str(name) == "span:embedding_generation":
+    if str(name) in {"span:embedding_generation", "span:embedding_provider_call"}:
         min_ms = float(getattr(settings, "METRICS_EMBEDDING_SPAN_MIN_MS", 800.0) or 800.0)
         if float(duration_ms) < min_ms:
             return
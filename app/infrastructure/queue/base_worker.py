@@ -1,20 +1,37 @@
 import asyncio
 import time
 import structlog
-from typing import Any, Dict, Optional, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Dict, Optional, Callable, Coroutine
 from app.infrastructure.background_jobs.job_store import SupabaseJobStore
 from app.infrastructure.observability.ingestion_logging import compact_error, emit_event
+from app.infrastructure.queue.job_notifications import JobWakeupHub
+
+if TYPE_CHECKING:
+    from app.infrastructure.queue.job_lease_dispatcher import JobLeaseDispatcher
 
 logger = structlog.get_logger(__name__)
 
 class BaseWorkerProcessor:
     """
     Template for processing jobs from SupabaseJobStore.
-    Handles polling, heartbeats, and error management.
+    Handles polling, heartbeat registration, and error management.
+    Heartbeats and the stale-job sweep run once per process (see
+    ``SupabaseJobStore.track_job_heartbeat`` and ``StaleJobSweeper``).
+
+    With a ``wakeup_hub`` idle pollers sleep until a job of their type is
+    enqueued (LISTEN/NOTIFY) instead of re-polling every ``poll_interval``.
+    ``run_queue_loop`` consumes jobs leased by a shared ``JobLeaseDispatcher``
+    instead of fetching them itself.
     """
-    def __init__(self, job_store: SupabaseJobStore, poller_id: int):
+    def __init__(
+        self,
+        job_store: SupabaseJobStore,
+        poller_id: int,
+        wakeup_hub: Optional[JobWakeupHub] = None,
+    ):
         self.job_store = job_store
         self.poller_id = poller_id
+        self.wakeup_hub = wakeup_hub
 
     async def run_job_loop(
         self,
@@ -28,9 +45,13 @@ class BaseWorkerProcessor:
         consecutive_errors = 0
         while True:
             try:
+                # Read before the fetch so a notify racing an empty fetch still wakes us.
+                generation = self.wakeup_hub.generation(job_type) if self.wakeup_hub else 0
                 processed = await self._process_one_job(job_type, handler)
                 if processed:
                     consecutive_errors = 0
+                elif self.wakeup_hub is not None:
+                    await self.wakeup_hub.wait(job_type, generation, poll_interval)
                 else:
                     await asyncio.sleep(poll_interval)
             except Exception as exc:
@@ -39,25 +60,50 @@ class BaseWorkerProcessor:
                 # Cooldown logic could be here or handled by the caller
                 await asyncio.sleep(poll_interval)
 
+    async def run_queue_loop(
+        self,
+        job_type: str,
+        handler: Callable[[Dict[str, Any]], Coroutine[Any, Any, Dict[str, Any]]],
+        dispatcher: "JobLeaseDispatcher",
+    ):
+        """
+        Loop for processing jobs already claimed by the per-process dispatcher.
+        """
+        while True:
+            job = await dispatcher.next_job()
+            try:
+                await self._handle_job(job_type, job, handler)
+            except Exception as exc:
+                logger.error("worker_loop_error", job_type=job_type, poller_id=self.poller_id, error=str(exc), exc_info=True)
+            finally:
+                dispatcher.job_done()
+
     async def _process_one_job(
         self,
         job_type: str,
         handler: Callable[[Dict[str, Any]], Coroutine[Any, Any, Dict[str, Any]]]
     ) -> bool:
-        await self.job_store.maybe_requeue_stale_processing_jobs(
-            job_type=job_type, poller_id=self.poller_id
-        )
-        
         job = await self.job_store.fetch_next_job(job_type=job_type)
+        if self.wakeup_hub is not None:
+            self.wakeup_hub.record_fetch(job_type, picked=bool(job))
         if not job:
             return False
 
+        await self._handle_job(job_type, job, handler)
+        return True
+
+    async def _handle_job(
+        self,
+        job_type: str,
+        job: Dict[str, Any],
+        handler: Callable[[Dict[str, Any]], Coroutine[Any, Any, Dict[str, Any]]]
+    ) -> None:
         job_id = str(job.get("id") or "")
         payload = job.get("payload") if isinstance(job.get("payload"), dict) else {}
         
         logger.info("processing_job_start", job_type=job_type, job_id=job_id, poller_id=self.poller_id)
         
-        stop_signal, heartbeat_task = await self.job_store.with_job_heartbeat(job_id=job_id)
+        self.job_store.track_job_heartbeat(job_id)
         start_time = time.perf_counter()
         
         try:
@@ -74,7 +120,6 @@ class BaseWorkerProcessor:
                         job_type=job_type, 
                         job_id=job_id, 
                         duration_ms=duration_ms)
-            return True
             
         except Exception as exc:
             duration_ms = round((time.perf_counter() - start_time) * 1000.0, 2)
@@ -97,7 +142,6 @@ class BaseWorkerProcessor:
                          error=error_msg, 
                          duration_ms=duration_ms, 
                          exc_info=True)
-            return True
             
         finally:
-            await self.job_store.stop_job_heartbeat(stop_signal=stop_signal, task=heartbeat_task)
+            self.job_store.untrack_job_heartbeat(job_id)
@@ -0,0 +1,130 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+import structlog
+
+from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.queue.job_notifications import JobWakeupHub
+
+logger = structlog.get_logger(__name__)
+
+
+class JobLeaseDispatcher:
+    """Single per-process claimer for one job type feeding local workers.
+
+    Workers take jobs from an internal ``asyncio.Queue``. The dispatcher keeps
+    at most ``concurrency + batch_size`` jobs claimed (running or queued) and
+    claims a whole batch per ``fetch_next_jobs`` RPC once that many slots are
+    free, or earlier when the local queue runs dry so no worker idles. Jobs
+    waiting in the local queue are leased too, so they are registered with
+    the process heartbeat from claim until a worker takes them over.
+    """
+
+    def __init__(
+        self,
+        job_store: SupabaseJobStore,
+        job_type: str,
+        concurrency: int,
+        *,
+        batch_size: int = 0,
+        lease_seconds: Optional[int] = None,
+        wakeup_hub: Optional[JobWakeupHub] = None,
+        poll_interval: float = 2.0,
+    ):
+        self.job_store = job_store
+        self.job_type = job_type
+        self.concurrency = max(1, int(concurrency))
+        self.batch_size = max(1, int(batch_size or self.concurrency))
+        self.capacity = self.concurrency + self.batch_size
+        self.lease_seconds = lease_seconds
+        self.wakeup_hub = wakeup_hub
+        self.poll_interval = max(0.05, float(poll_interval))
+        self._jobs: asyncio.Queue = asyncio.Queue()
+        self._outstanding = 0
+        self._slots_changed = asyncio.Event()
+
+    async def next_job(self) -> Dict[str, Any]:
+        job = await self._jobs.get()
+        # The worker registers its own heartbeat before its first await.
+        self.job_store.untrack_job_heartbeat(str(job.get("id") or ""))
+        self._slots_changed.set()
+        return job
+
+    def job_done(self) -> None:
+        self._jobs.task_done()
+        self._outstanding = max(0, self._outstanding - 1)
+        self._slots_changed.set()
+
+    def _claimable(self) -> int:
+        free = self.capacity - self._outstanding
+        if free >= self.batch_size:
+            return self.batch_size
+        return free if free > 0 and self._jobs.empty() else 0
+
+    async def _wait_for_slots(self) -> int:
+        while True:
+            claimable = self._claimable()
+            if claimable:
+                return claimable
+            self._slots_changed.clear()
+            await self._slots_changed.wait()
+
+    async def run(self) -> None:
+        consecutive_errors = 0
+        while True:
+            wanted = await self._wait_for_slots()
+            try:
+                # Read before the fetch so a notify racing an empty fetch still wakes us.
+                generation = self.wakeup_hub.generation(self.job_type) if self.wakeup_hub else 0
+                jobs = await self.job_store.fetch_next_jobs(
+                    self.job_type, wanted, lease_seconds=self.lease_seconds
+                )
+                consecutive_errors = 0
+            except Exception as exc:
+                consecutive_errors += 1
+                logger.error(
+                    "job_dispatcher_fetch_error",
+                    job_type=self.job_type,
+                    consecutive_errors=consecutive_errors,
+                    error=str(exc),
+                    exc_info=True,
+                )
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if self.wakeup_hub is not None:
+                self.wakeup_hub.record_fetch(self.job_type, picked=len(jobs))
+            for job in jobs:
+                self._outstanding += 1
+                self.job_store.track_job_heartbeat(str(job.get("id") or ""))
+                self._jobs.put_nowait(job)
+
+            if len(jobs) >= wanted:
+                continue
+            # Database queue drained: idle until a notify or the poll interval.
+            if self.wakeup_hub is not None:
+                await self.wakeup_hub.wait(self.job_type, generation, self.poll_interval)
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    async def release_unstarted(self) -> int:
+        """Hand jobs that were claimed but never started back to the queue (shutdown)."""
+        released = 0
+        while not self._jobs.empty():
+            job = self._jobs.get_nowait()
+            self._jobs.task_done()
+            self._outstanding = max(0, self._outstanding - 1)
+            job_id = str(job.get("id") or "")
+            self.job_store.untrack_job_heartbeat(job_id)
+            if not job_id:
+                continue
+            try:
+                await self.job_store.requeue_job_for_retry(
+                    job_id=job_id, error_message="released_unstarted_on_worker_shutdown"
+                )
+                released += 1
+            except Exception as exc:
+                logger.warning(
+                    "job_dispatcher_release_failed", job_type=self.job_type, job_id=job_id, error=str(exc)
+                )
+        return released
@@ -0,0 +1,209 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, Dict, Optional
+
+import structlog
+
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+JOB_QUEUE_NOTIFY_CHANNEL = "job_queue_pending"
+
+
+class JobWakeupHub:
+    """Per-process fan-out of "job enqueued" signals to idle pollers.
+
+    Each job type has a generation counter. A poller reads the generation
+    before its fetch and, when the fetch comes back empty, waits for the
+    generation to move, so a notification that lands between the empty fetch
+    and the wait is never lost. A typed notification wakes a single idle
+    poller (one enqueued row, one claim); an untyped one wakes all of them.
+    When no listener is connected pollers fall back to their regular poll
+    interval; when one is, they only poll at the slow
+    ``safety_poll_interval_seconds``.
+    """
+
+    def __init__(self, safety_poll_interval_seconds: float = 30.0):
+        self.safety_poll_interval_seconds = max(1.0, float(safety_poll_interval_seconds))
+        self.listening = False
+        self._generations: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self._enqueued_at: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, float] = {
+            "notifications": 0,
+            "fetch_rpcs": 0,
+            "idle_fetch_rpcs": 0,
+            "jobs_picked": 0,
+            "wakeups": 0,
+            "timeouts": 0,
+        }
+        self._pickup_latencies_ms: Deque[float] = deque(maxlen=512)
+        self._started_at = time.monotonic()
+
+    def generation(self, job_type: str) -> int:
+        return self._generations.get(job_type, 0)
+
+    def notify(self, job_type: Optional[str] = None, enqueued_at: Optional[float] = None) -> None:
+        """Wake one poller of ``job_type``, or every poller of every type when ``None``."""
+        self._stats["notifications"] += 1
+        targets = [job_type] if job_type else list(set(self._generations) | set(self._waiters))
+        for target in targets:
+            self._generations[target] = self.generation(target) + 1
+            if enqueued_at is not None:
+                self._enqueued_at.setdefault(target, deque(maxlen=1024)).append(float(enqueued_at))
+            waiters = self._waiters.get(target)
+            while waiters:
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                waiter.set_result(True)
+                if job_type:
+                    break
+
+    async def wait(self, job_type: str, since: int, fallback_interval_seconds: float) -> bool:
+        """Sleep until ``job_type`` is notified after generation ``since``; False on timeout."""
+        if self.generation(job_type) != since:
+            self._stats["wakeups"] += 1
+            return True
+        timeout = self.safety_poll_interval_seconds if self.listening else fallback_interval_seconds
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(job_type, deque())
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            return False
+        finally:
+            with suppress(ValueError):
+                waiters.remove(waiter)
+        self._stats["wakeups"] += 1
+        return True
+
+    def record_fetch(self, job_type: str, picked: int) -> None:
+        """Count one fetch RPC that claimed ``picked`` jobs (a bool works for single fetches)."""
+        self._stats["fetch_rpcs"] += 1
+        if not picked:
+            self._stats["idle_fetch_rpcs"] += 1
+            return
+        self._stats["jobs_picked"] += int(picked)
+        pending = self._enqueued_at.get(job_type)
+        for _ in range(int(picked)):
+            if not pending:
+                break
+            # Oldest outstanding notification for this type; wall clock because it comes from Postgres clock_timestamp().
+            self._pickup_latencies_ms.append(max(0.0, (time.time() - pending.popleft()) * 1000.0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = max(1e-9, time.monotonic() - self._started_at)
+        latencies = sorted(self._pickup_latencies_ms)
+        snapshot: Dict[str, Any] = {key: int(value) for key, value in self._stats.items()}
+        snapshot["listening"] = self.listening
+        snapshot["idle_fetch_rpcs_per_min"] = round(self._stats["idle_fetch_rpcs"] * 60.0 / elapsed, 2)
+        if latencies:
+            snapshot["pickup_latency_p50_ms"] = round(latencies[len(latencies) // 2], 1)
+            snapshot["pickup_latency_p95_ms"] = round(latencies[int(0.95 * (len(latencies) - 1))], 1)
+        return snapshot
+
+
+class InMemoryJobNotificationSource:
+    """Listener stand-in for tests and single-process setups: ``publish`` plays the NOTIFY."""
+
+    def __init__(self, hub: JobWakeupHub):
+        self.hub = hub
+
+    async def start(self) -> None:
+        self.hub.listening = True
+
+    async def stop(self) -> None:
+        self.hub.listening = False
+
+    def publish(self, job_type: Optional[str] = None) -> None:
+        self.hub.notify(job_type, enqueued_at=time.time())
+
+
+class PostgresJobNotificationListener:
+    """One ``LISTEN job_queue_pending`` connection per process, taken from ``DatabaseManager``.
+
+    Payloads are ``<job_type>|<epoch seconds>`` (see the job_queue notify
+    trigger). On connection loss the hub is marked as not listening, so pollers
+    go back to regular polling until the listener reconnects.
+    """
+
+    def __init__(
+        self,
+        hub: JobWakeupHub,
+        channel: str = JOB_QUEUE_NOTIFY_CHANNEL,
+        reconnect_max_delay_seconds: float = 30.0,
+    ):
+        self.hub = hub
+        self.channel = channel
+        self.reconnect_max_delay_seconds = max(1.0, float(reconnect_max_delay_seconds))
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.hub.listening = False
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @staticmethod
+    def parse_payload(payload: str) -> tuple[Optional[str], Optional[float]]:
+        job_type, _, enqueued_at = str(payload or "").partition("|")
+        try:
+            epoch = float(enqueued_at) if enqueued_at else None
+        except ValueError:
+            epoch = None
+        return (job_type.strip() or None), epoch
+
+    async def _run(self) -> None:
+        from app.infrastructure.supabase.postgres_pool import DatabaseManager
+
+        attempt = 0
+        while True:
+            delay = 0.5
+            try:
+                async with DatabaseManager.get_connection() as conn:
+                    await conn.execute(f"LISTEN {self.channel}")
+                    self.hub.listening = True
+                    attempt = 0
+                    logger.info("job_notification_listener_connected", channel=self.channel)
+                    # Anything enqueued while we were disconnected: let every poller re-check once.
+                    self.hub.notify(None)
+                    async for notification in conn.notifies():
+                        job_type, enqueued_at = self.parse_payload(notification.payload)
+                        self.hub.notify(job_type, enqueued_at=enqueued_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                attempt += 1
+                delay = min(self.reconnect_max_delay_seconds, 0.5 * (2**attempt))
+                logger.warning(
+                    "job_notification_listener_disconnected",
+                    channel=self.channel,
+                    attempt=attempt,
+                    retry_in_seconds=delay,
+                    error=str(exc),
+                )
+            finally:
+                self.hub.listening = False
+            await asyncio.sleep(delay)
+
+
+def build_job_notification_listener(hub: JobWakeupHub) -> Any:
+    """Postgres listener when enabled and a database URL is configured, else ``None``."""
+    if not bool(getattr(settings, "WORKER_JOB_NOTIFY_ENABLED", True)):
+        return None
+    if not (getattr(settings, "DATABASE_URL", None) or getattr(settings, "SUPABASE_DB_URL", None)):
+        logger.info("job_notification_listener_disabled", reason="no_database_url")
+        return None
+    return PostgresJobNotificationListener(hub)
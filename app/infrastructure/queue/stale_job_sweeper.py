@@ -0,0 +1,121 @@
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+
+from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# pg_advisory_lock key shared by every worker process of the cluster.
+JOB_QUEUE_STALE_SWEEP_LOCK_KEY = 7_105_202_610_160_025
+
+
+class InMemoryLeaderLock:
+    """Leader-lock stand-in for tests and single-host setups: one holder per instance."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+
+    async def run_while_leader(self, body: Callable[[], Awaitable[None]]) -> None:
+        async with self._lock:
+            await body()
+
+
+class PostgresAdvisoryLeaderLock:
+    """Session-level ``pg_try_advisory_lock`` held on one ``DatabaseManager`` connection.
+
+    Followers retry every ``retry_seconds``. The leader pings its session at
+    the same pace; when the connection drops the server releases the lock,
+    the body is cancelled and another process can take over.
+    """
+
+    def __init__(self, key: int = JOB_QUEUE_STALE_SWEEP_LOCK_KEY, retry_seconds: float = 15.0):
+        self.key = int(key)
+        self.retry_seconds = max(1.0, float(retry_seconds))
+
+    async def run_while_leader(self, body: Callable[[], Awaitable[None]]) -> None:
+        from app.infrastructure.supabase.postgres_pool import DatabaseManager
+
+        while True:
+            try:
+                async with DatabaseManager.get_connection() as conn:
+                    cursor = await conn.execute("SELECT pg_try_advisory_lock(%s)", (self.key,))
+                    row = await cursor.fetchone()
+                    if row and row[0]:
+                        logger.info("stale_sweep_leader_acquired", lock_key=self.key)
+                        try:
+                            await self._lead(conn, body)
+                        finally:
+                            with suppress(Exception):
+                                await conn.execute("SELECT pg_advisory_unlock(%s)", (self.key,))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("stale_sweep_leader_lock_failed", lock_key=self.key, error=str(exc))
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _lead(self, conn: Any, body: Callable[[], Awaitable[None]]) -> None:
+        body_task = asyncio.create_task(body())
+        try:
+            while not body_task.done():
+                await asyncio.wait({body_task}, timeout=self.retry_seconds)
+                if not body_task.done():
+                    # Raises once the session (and with it the lock) is gone.
+                    await conn.execute("SELECT 1")
+            body_task.result()
+        finally:
+            body_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await body_task
+
+
+class StaleJobSweeper:
+    """Requeues ``processing`` jobs whose heartbeat stopped, once per interval.
+
+    With a leader lock only the current leader of the cluster sweeps; without
+    one every worker process sweeps on its own (still once per process rather
+    than once per poller).
+    """
+
+    def __init__(
+        self,
+        job_store: SupabaseJobStore,
+        leader_lock: Optional[Any] = None,
+        interval_seconds: Optional[float] = None,
+        swept_by: Optional[str] = None,
+    ):
+        self.job_store = job_store
+        self.leader_lock = leader_lock
+        self.interval_seconds = max(
+            0.01, float(interval_seconds or job_store.worker_requeue_stale_interval_seconds)
+        )
+        self.swept_by = swept_by or f"{socket.gethostname()}:{os.getpid()}"
+        self.sweeps = 0
+        self.requeued = 0
+
+    async def run(self) -> None:
+        if self.leader_lock is None:
+            await self._sweep_loop()
+        else:
+            await self.leader_lock.run_while_leader(self._sweep_loop)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            self.requeued += await self.job_store.requeue_stale_processing_jobs(swept_by=self.swept_by)
+            self.sweeps += 1
+            await asyncio.sleep(self.interval_seconds)
+
+
+def build_stale_sweep_leader_lock(retry_seconds: float) -> Optional[PostgresAdvisoryLeaderLock]:
+    """Advisory-lock leader election when enabled and a database URL is configured, else ``None``."""
+    if not bool(getattr(settings, "WORKER_STALE_SWEEP_LEADER_ELECTION", True)):
+        return None
+    if not (getattr(settings, "DATABASE_URL", None) or getattr(settings, "SUPABASE_DB_URL", None)):
+        logger.info("stale_sweep_leader_election_disabled", reason="no_database_url")
+        return None
+    return PostgresAdvisoryLeaderLock(retry_seconds=retry_seconds)
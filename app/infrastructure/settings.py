@@ -98,9 +98,24 @@ class Settings(BaseSettings):
     WORKER_JOB_HEARTBEAT_SECONDS: float = 20.0
     WORKER_REQUEUE_STALE_INTERVAL_SECONDS: int = 15
     WORKER_REQUEUE_STALE_PROCESSING_SECONDS: int = 900
+    WORKER_JOB_FETCH_BATCH_SIZE: int = 0  # 0 = claim up to the job type's worker concurrency per RPC
+    WORKER_JOB_LEASE_SECONDS: int = 90
+    WORKER_STALE_SWEEP_LEADER_ELECTION: bool = True
+    WORKER_JOB_NOTIFY_ENABLED: bool = True
+    WORKER_JOB_NOTIFY_SAFETY_POLL_SECONDS: float = 30.0
+    WORKER_QUEUE_STATS_LOG_SECONDS: int = 300
     EMBEDDING_CONCURRENCY: int = 5
     EMBEDDING_CACHE_MAX_SIZE: int = 4000
     EMBEDDING_CACHE_TTL_SECONDS: int = 1800
+    EMBEDDING_MICROBATCH_ENABLED: bool = True
+    EMBEDDING_MICROBATCH_LINGER_MS: float = 5.0
+    EMBEDDING_MICROBATCH_MAX_SIZE: int = 0  # 0 = provider max (JINA_BATCH_SIZE / Cohere max texts)
+    EMBEDDING_CACHE_DTYPE: str = "float32"  # float32 | float16 (L1 storage only)
+    EMBEDDING_CACHE_L2_BACKEND: str = "none"  # none | sqlite | redis
+    EMBEDDING_CACHE_L2_TTL_SECONDS: int = 86400
+    EMBEDDING_CACHE_SQLITE_PATH: str = ".cache/embedding_cache.sqlite3"
+    EMBEDDING_CACHE_SQLITE_MAX_ROWS: int = 200000
+    EMBEDDING_CACHE_REDIS_PREFIX: str = "cire:"
     JINA_EMBED_RETRY_MAX_ATTEMPTS: int = 5
     JINA_EMBED_RETRY_BASE_DELAY_SECONDS: float = 0.4
     JINA_EMBED_RETRY_MAX_DELAY_SECONDS: float = 10.0
@@ -125,6 +140,8 @@ class Settings(BaseSettings):
     COMMUNITY_REBUILD_ENABLED: bool = False
     COMMUNITY_REBUILD_INTERVAL_SECONDS: int = 3600
     COMMUNITY_REBUILD_TENANTS: str = ""
+    COMMUNITY_REBUILD_INCREMENTAL: bool = True
+    COMMUNITY_GRAPH_PAGE_SIZE: int = 1000
 
     # Storage
     RAG_STORAGE_BUCKET: str = "private_assets"
@@ -149,14 +166,22 @@ class Settings(BaseSettings):
     ATOMIC_CLAUSE_QUERY_RRF_FTS_WEIGHT: float = 0.75
     ATOMIC_RRF_K: int = 60
     ATOMIC_MAX_SOURCE_IDS: int = 5000
+    RETRIEVAL_BACKEND: str = "supabase"  # supabase | local (in-process index from snapshot)
+    LOCAL_INDEX_SNAPSHOT_PATH: str = ".cache/local_index.npz"
+    LOCAL_INDEX_ANN_ENABLED: bool = False  # HNSW via hnswlib when installed
     QA_LITERAL_SEMANTIC_FALLBACK_ENABLED: bool = True
     QA_LITERAL_SEMANTIC_MIN_KEYWORD_OVERLAP: int = 2
     QA_LITERAL_SEMANTIC_MIN_SIMILARITY: float = 0.3
     INGEST_PARSER_MODE: str = "local"  # local | cloud
+    INGEST_CPU_POOL_WORKERS: int = 2  # 0 = run parse stages in a thread
+    INGEST_PDF_SHARD_MIN_PAGES: int = 16
     JINA_READER_URL_TEMPLATE: Optional[str] = None  # e.g. https://r.jina.ai/http://host/{path}
     RERANK_MODE: str = "hybrid"  # local | jina | hybrid
     RERANK_MAX_CANDIDATES: int = 50
     RERANK_MIN_RELEVANCE_SCORE: float = 0.15  # Cross-encoder score floor
+    RERANK_SCORE_CACHE_ENABLED: bool = True
+    RERANK_SCORE_CACHE_MAX_ENTRIES: int = 20000
+    RERANK_SCORE_CACHE_TTL_SECONDS: float = 3600.0
     GRAVITY_MIN_SCORE_THRESHOLD: float = 0.10  # Raw similarity floor before gravity multipliers
     RETRIEVAL_MULTI_QUERY_MAX_PARALLEL: int = 4
     RETRIEVAL_MULTI_QUERY_SUBQUERY_TIMEOUT_MS: int = 8000
@@ -164,11 +189,25 @@ class Settings(BaseSettings):
     RETRIEVAL_MULTI_QUERY_DROP_SCOPE_PENALIZED_BRANCHES: bool = True
     RETRIEVAL_MULTI_QUERY_SCOPE_PENALTY_DROP_THRESHOLD: float = 0.95
     RETRIEVAL_PLAN_MAX_BRANCH_EXPANSIONS: int = 2
+    RETRIEVAL_RESULT_CACHE_ENABLED: bool = False  # needs a shared generation backend when workers ingest
+    RETRIEVAL_RESULT_CACHE_GENERATION_BACKEND: str = "redis"  # redis (shared, REDIS_URL) | local (single process)
+    RETRIEVAL_RESULT_CACHE_REDIS_PREFIX: str = "cire:index_generation:"
+    RETRIEVAL_RESULT_CACHE_TTL_SECONDS: float = 120.0  # upper bound on staleness if a bump is lost
+    RETRIEVAL_RESULT_CACHE_MAX_ENTRIES: int = 512
     RETRIEVAL_PLAN_EARLY_EXIT_SCOPE_PENALTY: float = 0.8
     RETRIEVAL_COVERAGE_GRAPH_EXPANSION_ENABLED: bool = True
     RETRIEVAL_COVERAGE_GRAPH_EXPANSION_MAX_HOPS: int = 2
     RAPTOR_STRUCTURAL_MODE_ENABLED: bool = True
     RAPTOR_SUMMARIZATION_MAX_CONCURRENCY: int = 8
+    RAPTOR_GMM_REDUCED_DIMENSIONS: int = 32  # PCA target before the BIC sweep (0 = raw embeddings)
+    RAPTOR_GMM_EARLY_STOP_PATIENCE: int = 2  # stop after N k values without BIC improvement (0 = full sweep)
+    RAPTOR_GMM_POOL_WORKERS: int = 2  # process pool for the k sweep (0 = sequential, still off the event loop)
+    RAPTOR_PIPELINE_QUEUE_SIZE: int = 16  # bound of the summarize->embed queue per level
+    RAPTOR_EMBED_BATCH_SIZE: int = 32
+    RAPTOR_SAVE_BATCH_SIZE: int = 50
+    RAPTOR_INCREMENTAL_ENABLED: bool = False  # merge new documents into the collection tree (stores centroids on nodes)
+    RAPTOR_INCREMENTAL_DRIFT_FACTOR: float = 2.0  # join a cluster within radius * factor
+    RAPTOR_INCREMENTAL_SPLIT_THRESHOLD: float = 0.15  # max centroid cosine shift before splitting
     AUTHORITY_CLASSIFIER_MODE: str = "rules"  # rules | embedding_first
 
     # Scope Resolution (Agnostic)
@@ -192,9 +231,17 @@ class Settings(BaseSettings):
     VISUAL_CACHE_KEY_V2_ENABLED: bool = True
     VISUAL_CACHE_BATCH_PREFETCH_ENABLED: bool = True
 
+    # Batch progress SSE hub (one poller per active batch per API process)
+    INGESTION_PROGRESS_HUB_POLL_INTERVAL_MS: int = 1500
+    INGESTION_PROGRESS_HUB_EVENT_BUFFER_SIZE: int = 2000
+    INGESTION_PROGRESS_HUB_IDLE_GRACE_SECONDS: float = 30.0
+
     # Deferred enrichment pipeline
     INGESTION_ENRICHMENT_ASYNC_ENABLED: bool = True
     INGESTION_GRAPH_BATCH_SIZE: int = 4
+    INGESTION_GRAPH_PERSIST_WINDOW: int = 64
+    INGESTION_GRAPH_MAX_INFLIGHT_BATCHES: int = 0  # 0 = derive from GRAPH_EXTRACTION_MAX_CONCURRENCY
+    INGESTION_GRAPH_PERSIST_QUEUE_SIZE: int = 8  # extracted batches buffered ahead of persistence
     GRAPH_EXTRACTION_BATCH_MAX_CHARS: int = 6000
     GRAPH_EXTRACTION_BATCH_MAX_ESTIMATED_TOKENS: int = 1500
     GRAPH_EXTRACTION_SINGLE_CHUNK_MAX_CHARS: int = 6000
@@ -203,6 +250,11 @@ class Settings(BaseSettings):
     GRAPH_EXTRACTION_RETRY_BASE_DELAY_SECONDS: float = 0.8
     GRAPH_EXTRACTION_RETRY_MAX_DELAY_SECONDS: float = 8.0
     GRAPH_EXTRACTION_RETRY_JITTER_SECONDS: float = 0.35
+    GRAPH_EXTRACTION_CACHE_BACKEND: str = "sqlite"  # none | memory | sqlite (per-host, on disk)
+    GRAPH_EXTRACTION_CACHE_SQLITE_PATH: str = ".cache/graph_extraction_cache.sqlite3"
+    GRAPH_EXTRACTION_CACHE_TTL_SECONDS: int = 2592000
+    GRAPH_EXTRACTION_CACHE_MAX_ROWS: int = 200000
+    GRAPH_EXTRACTION_CACHE_PROMPT_VERSION: str = "v1"  # bump to invalidate cached extractions
     INGEST_SKIP_STRUCTURAL_EMBEDDING: bool = True
     INGESTION_VISUAL_ASYNC_ENABLED: bool = True
     METRICS_EMBEDDING_SPAN_MIN_MS: float = 800.0
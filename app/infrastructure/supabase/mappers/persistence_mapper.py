@@ -9,6 +9,8 @@ Ensures paridad with TypeScript PersistenceMapper.
 from typing import Dict, Any, List
 from uuid import UUID
 
+from app.domain.schemas.embedding_vector import to_float_list
+
 
 class PersistenceMapper:
     """
@@ -92,7 +94,7 @@ class PersistenceMapper:
         result = {
             "source_id": str(source_id) if source_id else None,
             "content": get(chunk, ["content"], ""),
-            "embedding": get(chunk, ["embedding"], []),
+            "embedding": to_float_list(get(chunk, ["embedding"], [])),
             "chunk_index": get(chunk, ["chunkIndex", "chunk_index"], 0),
             "file_page_number": get(chunk, ["filePageNumber", "file_page_number"], 1),
             "metadata": final_metadata,
@@ -119,7 +121,7 @@ class PersistenceMapper:
             "title": getattr(node, "title"),
             "content": getattr(node, "content"),
             "properties": getattr(node, "properties", {}),
-            "embedding": getattr(node, "embedding", None),
+            "embedding": to_float_list(getattr(node, "embedding", None)),
         }
 
     @staticmethod
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from app.domain.retrieval.result_cache import index_generations
 from app.infrastructure.observability.context_vars import get_tenant_id
 from app.infrastructure.supabase.client import get_async_supabase_client
 
@@ -13,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 
 class ManualIngestionQueryService:
+    # None = unknown, False = get_batch_events_page RPC missing on this database.
+    _batch_events_rpc_available: Optional[bool] = None
+
     @staticmethod
     def _tenant_from_context() -> str:
         return str(get_tenant_id() or "").strip()
@@ -156,6 +160,7 @@ class ManualIngestionQueryService:
         await (
             client.table("ingestion_batches").delete().eq("collection_id", collection_id).execute()
         )
+        await index_generations.bump(tenant)
 
         return {
             "status": "cleaned",
@@ -442,6 +447,59 @@ class ManualIngestionQueryService:
     def _event_cursor(created_at: str, event_id: str) -> str:
         return f"{created_at}|{event_id}"
 
+    @staticmethod
+    def _batch_event_item(row: Dict[str, Any], filename: str) -> Dict[str, Any]:
+        return {
+            "event_id": str(row.get("id") or "").strip(),
+            "created_at": str(row.get("created_at") or "").strip(),
+            "doc_id": str(row.get("source_document_id") or "").strip(),
+            "filename": str(filename or ""),
+            "status": str(row.get("status") or ""),
+            "message": str(row.get("message") or ""),
+            "phase_metadata": row.get("metadata") if isinstance(row.get("metadata"), dict) else {},
+        }
+
+    async def _fetch_batch_events_page(
+        self,
+        client: Any,
+        batch_id: str,
+        parsed_cursor: tuple[datetime, str] | None,
+        limit: int,
+    ) -> tuple[List[Dict[str, Any]], bool] | None:
+        """Keyset page via ``get_batch_events_page``; ``None`` means use the scan fallback."""
+        if ManualIngestionQueryService._batch_events_rpc_available is False:
+            return None
+        after_id: str | None = None
+        if parsed_cursor is not None:
+            try:
+                after_id = str(UUID(parsed_cursor[1]))
+            except ValueError:
+                after_id = None
+        try:
+            response = await client.rpc(
+                "get_batch_events_page",
+                {
+                    "p_batch_id": str(batch_id),
+                    "p_after_created_at": parsed_cursor[0].isoformat() if parsed_cursor else None,
+                    "p_after_id": after_id,
+                    "p_limit": int(limit),
+                },
+            ).execute()
+        except Exception as exc:
+            if "PGRST202" in str(exc):
+                # Migration not applied on this database: stop trying until restart.
+                ManualIngestionQueryService._batch_events_rpc_available = False
+            logger.warning("get_batch_events_page RPC failed, falling back to scan: %s", exc)
+            return None
+
+        rows = [row for row in (response.data or []) if isinstance(row, dict)]
+        items = [
+            item
+            for item in (self._batch_event_item(row, str(row.get("filename") or "")) for row in rows)
+            if item["created_at"] and item["event_id"]
+        ]
+        return items[:limit], len(items) > limit
+
     async def get_batch_events(
         self,
         batch_id: str,
@@ -449,6 +507,7 @@ class ManualIngestionQueryService:
         cursor: str | None = None,
         limit: int = 100,
     ) -> Dict[str, Any]:
+        """Batch events strictly after ``cursor`` (``created_at|id``), oldest first."""
         client = await get_async_supabase_client()
         safe_limit = max(1, min(int(limit or 100), 500))
 
@@ -466,6 +525,35 @@ class ManualIngestionQueryService:
         if tenant_ctx and str(batch.get("tenant_id") or "") != tenant_ctx:
             raise ValueError("TENANT_MISMATCH:get_batch_events")
 
+        parsed_cursor = self._parse_cursor(cursor)
+        keyset_page = await self._fetch_batch_events_page(client, batch_id, parsed_cursor, safe_limit)
+        if keyset_page is not None:
+            page, has_more = keyset_page
+        else:
+            page, has_more = await self._scan_batch_events(client, batch_id, parsed_cursor, safe_limit)
+
+        next_cursor = cursor
+        if page:
+            tail = page[-1]
+            next_cursor = self._event_cursor(
+                str(tail.get("created_at") or ""), str(tail.get("event_id") or "")
+            )
+
+        return {
+            "batch": batch,
+            "items": page,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+
+    async def _scan_batch_events(
+        self,
+        client: Any,
+        batch_id: str,
+        parsed_cursor: tuple[datetime, str] | None,
+        safe_limit: int,
+    ) -> tuple[List[Dict[str, Any]], bool]:
+        """Client-side fallback for databases without ``get_batch_events_page``."""
         docs_res = (
             await client.table("source_documents")
             .select("id,filename,status,created_at,batch_id")
@@ -486,14 +574,8 @@ class ManualIngestionQueryService:
             doc_ids.append(doc_id)
 
         if not doc_ids:
-            return {
-                "batch": batch,
-                "items": [],
-                "next_cursor": cursor,
-                "has_more": False,
-            }
+            return [], False
 
-        parsed_cursor = self._parse_cursor(cursor)
         query = (
             client.table("ingestion_events")
             .select("id,source_document_id,message,status,created_at,metadata")
@@ -531,36 +613,10 @@ class ManualIngestionQueryService:
                     continue
             doc_id = str(row.get("source_document_id") or "").strip()
             doc = doc_map.get(doc_id, {})
-            filtered.append(
-                {
-                    "event_id": event_id,
-                    "created_at": created_at,
-                    "doc_id": doc_id,
-                    "filename": str(doc.get("filename") or ""),
-                    "status": str(row.get("status") or ""),
-                    "message": str(row.get("message") or ""),
-                    "phase_metadata": row.get("metadata")
-                    if isinstance(row.get("metadata"), dict)
-                    else {},
-                }
-            )
+            filtered.append(self._batch_event_item(row, str(doc.get("filename") or "")))
 
         filtered.sort(key=_sort_key)
-        page = filtered[:safe_limit]
-        has_more = len(filtered) > safe_limit
-        next_cursor = cursor
-        if page:
-            tail = page[-1]
-            next_cursor = self._event_cursor(
-                str(tail.get("created_at") or ""), str(tail.get("event_id") or "")
-            )
-
-        return {
-            "batch": batch,
-            "items": page,
-            "next_cursor": next_cursor,
-            "has_more": has_more,
-        }
+        return filtered[:safe_limit], len(filtered) > safe_limit
 
     async def list_active_batches(self, tenant_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         tenant_scoped = self._enforce_tenant_match(tenant_id, "list_active_batches")
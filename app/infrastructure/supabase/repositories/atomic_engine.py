@@ -156,6 +156,10 @@ class AtomicRetrievalEngine:
             graph_options=kwargs,
         )
 
+    async def fetch_chunks_by_ids(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
+        """Current rows for ``chunk_ids`` (used to rehydrate cached rankings)."""
+        return await self._retrieval_repository.fetch_chunks_by_ids(chunk_ids)
+
     async def preflight_hybrid_rpc_contract(self) -> dict[str, Any]:
         """Health-check: just verify the RPC is callable. Fail fast if not."""
         return {
@@ -1,6 +1,7 @@
 from typing import List, Dict, Any, Optional
 import structlog
 from app.domain.ingestion.ports import IContentRepository
+from app.domain.retrieval.result_cache import index_generations
 from app.infrastructure.observability.context_vars import get_tenant_id
 from app.infrastructure.settings import settings
 from app.infrastructure.supabase.client import get_async_supabase_client
@@ -72,6 +73,7 @@ class SupabaseContentRepository(IContentRepository):
 
                 await asyncio.sleep(0.1)  # Breather
 
+            await index_generations.bump(tenant_id)
             emit_event(
                 logger,
                 "legacy_chunk_cleanup_completed",
@@ -1,11 +1,14 @@
 import logging
-import math
 from typing import Any, Optional, Dict, List
 from uuid import UUID, NAMESPACE_URL, uuid5
 
 from app.infrastructure.supabase.client import get_async_supabase_client
 from app.domain.ingestion.ports import IGraphRepository
 from app.domain.ingestion.graph.graph_extractor import ChunkGraphExtraction, Entity, Relation
+from app.domain.ingestion.graph.entity_index import TenantEntityIndex
+from app.domain.ingestion.graph.subgraph_aggregator import DocumentSubgraph
+from app.domain.retrieval.result_cache import index_generations
+from app.domain.retrieval.vector_similarity import entity_matrix_cache
 
 logger = logging.getLogger(__name__)
 
@@ -60,43 +63,6 @@ class SupabaseGraphRepository(IGraphRepository):
             return existing_clean
         return f"{existing_clean}\n\n{incoming_clean}"
 
-    @staticmethod
-    def _to_float_list(vector_value: Any) -> Optional[list[float]]:
-        if vector_value is None:
-            return None
-
-        if isinstance(vector_value, list):
-            try:
-                return [float(v) for v in vector_value]
-            except Exception:
-                return None
-
-        if isinstance(vector_value, str):
-            raw = vector_value.strip()
-            if raw.startswith("[") and raw.endswith("]"):
-                raw = raw[1:-1]
-            if not raw:
-                return None
-            try:
-                return [float(part.strip()) for part in raw.split(",") if part.strip()]
-            except Exception:
-                return None
-
-        return None
-
-    @staticmethod
-    def _cosine_similarity(vec_a: Optional[list[float]], vec_b: Optional[list[float]]) -> float:
-        if not vec_a or not vec_b or len(vec_a) != len(vec_b):
-            return -1.0
-
-        dot = sum(a * b for a, b in zip(vec_a, vec_b))
-        norm_a = math.sqrt(sum(a * a for a in vec_a))
-        norm_b = math.sqrt(sum(b * b for b in vec_b))
-
-        if norm_a == 0.0 or norm_b == 0.0:
-            return -1.0
-        return dot / (norm_a * norm_b)
-
     async def _bulk_insert_with_fallback(
         self, table: str, rows: list[dict], select_cols: str = "*"
     ) -> list[dict]:
@@ -203,6 +169,16 @@ class SupabaseGraphRepository(IGraphRepository):
             self._client = await get_async_supabase_client()
         return self._client
 
+    async def _list_tenant_entities(self, tenant_str: str) -> list[dict]:
+        client = await self._get_client()
+        response = (
+            await client.table("knowledge_entities")
+            .select("id,name,type,description,embedding")
+            .eq("tenant_id", tenant_str)
+            .execute()
+        )
+        return [row for row in response.data or [] if isinstance(row, dict)]
+
     @staticmethod
     def _dedupe_entities(entities: list[Entity]) -> list[Entity]:
         merged: dict[str, Entity] = {}
@@ -332,7 +308,20 @@ class SupabaseGraphRepository(IGraphRepository):
         tenant_id: UUID,
         chunk_id: Optional[UUID] = None,
         entity_embeddings: Optional[Dict[str, List[float]]] = None,
+        entity_index: Optional[TenantEntityIndex] = None,
+        embedding_mode: Optional[str] = None,
+        embedding_provider: Optional[str] = None,
     ) -> Dict[str, Any]:
+        """
+        Persist one chunk's entities, relations and provenance.
+
+        ``entity_index`` lets a caller processing many chunks of the same tenant
+        share one in-memory entity view: it is loaded on the first client-side
+        fallback and updated in place afterwards, so later chunks do not
+        re-download ``knowledge_entities``. ``embedding_mode`` and
+        ``embedding_provider`` describe the chunk embedding profile and are
+        accepted for GraphEnrichmentService compatibility.
+        """
         stats = {
             "nodes_upserted": 0,
             "edges_upserted": 0,
@@ -365,30 +354,190 @@ class SupabaseGraphRepository(IGraphRepository):
             entity_embeddings=entity_embeddings,
         )
         if rpc_stats is not None:
+            entity_matrix_cache.invalidate(tenant_id)
+            await index_generations.bump(tenant_id)
+            if entity_index is not None:
+                # Merges happened server-side; reload on the next fallback.
+                entity_index.invalidate()
             return rpc_stats
 
         # 2. Fallback to client-side logic
+        entity_chunks = (
+            {self._norm(entity.name): [chunk_id] for entity in entities} if chunk_id else {}
+        )
+        await self._upsert_subgraph_client_side(
+            entities=entities,
+            relations=normalized_relations,
+            tenant_id=tenant_id,
+            entity_embeddings=entity_embeddings,
+            entity_index=entity_index,
+            entity_chunks=entity_chunks,
+            relation_occurrences={},
+            stats=stats,
+        )
+        return stats
+
+    async def _upsert_document_subgraph_atomic_rpc(
+        self,
+        subgraph: DocumentSubgraph,
+        entities: list[Entity],
+        relations: list[Relation],
+        tenant_id: UUID,
+        entity_embeddings: dict[str, list[float]],
+    ) -> Optional[dict[str, Any]]:
         client = await self._get_client()
-        tenant_str = str(tenant_id)
-        chunk_str = str(chunk_id) if chunk_id else None
 
-        existing_response = (
-            await client.table("knowledge_entities")
-            .select("id,name,type,description,embedding")
-            .eq("tenant_id", tenant_str)
-            .execute()
-        )
-        existing_rows = existing_response.data or []
-
-        existing_by_name = {self._norm(row.get("name", "")): row for row in existing_rows}
-        existing_with_vectors = [
-            {
-                **row,
-                "_vector": self._to_float_list(row.get("embedding")),
-                "_norm_name": self._norm(row.get("name", "")),
+        entities_payload: list[dict[str, Any]] = []
+        for entity in entities:
+            norm_name = self._norm(entity.name)
+            entities_payload.append(
+                {
+                    "name": entity.name,
+                    "type": entity.type,
+                    "description": entity.description,
+                    "embedding": entity_embeddings.get(norm_name),
+                    "chunk_ids": [str(chunk) for chunk in subgraph.entity_chunks.get(norm_name, [])],
+                }
+            )
+
+        relations_payload: list[dict[str, Any]] = []
+        for relation in relations:
+            key = (self._norm(relation.source), self._norm(relation.target), relation.relation_type)
+            relations_payload.append(
+                {
+                    "source": relation.source,
+                    "target": relation.target,
+                    "relation_type": relation.relation_type,
+                    "description": relation.description,
+                    "weight": max(1, min(10, int(relation.weight))),
+                    "occurrences": int(subgraph.relation_occurrences.get(key, 1)),
+                }
+            )
+
+        rpc_params = {
+            "p_tenant_id": str(tenant_id),
+            "p_entities": entities_payload,
+            "p_relations": relations_payload,
+        }
+
+        try:
+            response = await client.rpc(
+                "upsert_knowledge_document_subgraph_atomic", rpc_params
+            ).execute()
+            rows = response.data or []
+            if not rows:
+                return None
+
+            row = rows[0] if isinstance(rows, list) else rows
+            if not isinstance(row, dict):
+                return None
+
+            return {
+                "nodes_upserted": int(row.get("nodes_upserted", 0)),
+                "edges_upserted": int(row.get("edges_upserted", 0)),
+                "links_upserted": int(row.get("links_upserted", 0)),
+                "entities_inserted": int(row.get("entities_inserted", 0)),
+                "entities_merged": int(row.get("entities_merged", 0)),
+                "relations_inserted": int(row.get("relations_inserted", 0)),
+                "relations_merged": int(row.get("relations_merged", 0)),
+                "errors": row.get("errors", []),
             }
-            for row in existing_rows
-        ]
+        except Exception as exc:
+            logger.warning(
+                "Atomic document subgraph RPC failed, fallback to client-side upsert: %s", exc
+            )
+            return None
+
+    async def upsert_document_subgraph(
+        self,
+        subgraph: DocumentSubgraph,
+        tenant_id: UUID,
+        entity_embeddings: Optional[Dict[str, List[float]]] = None,
+        entity_index: Optional[TenantEntityIndex] = None,
+        embedding_mode: Optional[str] = None,
+        embedding_provider: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist the merged subgraph of many chunks in one RPC or a few bulk calls.
+
+        Entities and relations are already deduplicated across chunks; chunk
+        provenance travels in ``subgraph.entity_chunks`` and relation weights
+        grow by ``subgraph.relation_occurrences``, matching chunk-by-chunk writes.
+        """
+        stats = {
+            "nodes_upserted": 0,
+            "edges_upserted": 0,
+            "links_upserted": 0,
+            "entities_extracted": subgraph.entities_extracted,
+            "relations_extracted": subgraph.relations_extracted,
+            "entities_inserted": 0,
+            "entities_merged": 0,
+            "relations_inserted": 0,
+            "relations_merged": 0,
+            "errors": [],
+        }
+
+        if subgraph.is_empty():
+            return stats
+
+        entities = self._dedupe_entities(subgraph.extraction.entities)
+        relations = self._normalize_relations(subgraph.extraction.relations)
+        entity_embeddings = entity_embeddings or {}
+
+        rpc_stats = await self._upsert_document_subgraph_atomic_rpc(
+            subgraph=subgraph,
+            entities=entities,
+            relations=relations,
+            tenant_id=tenant_id,
+            entity_embeddings=entity_embeddings,
+        )
+        if rpc_stats is not None:
+            entity_matrix_cache.invalidate(tenant_id)
+            await index_generations.bump(tenant_id)
+            if entity_index is not None:
+                entity_index.invalidate()
+            stats.update(rpc_stats)
+            return stats
+
+        await self._upsert_subgraph_client_side(
+            entities=entities,
+            relations=relations,
+            tenant_id=tenant_id,
+            entity_embeddings=entity_embeddings,
+            entity_index=entity_index,
+            entity_chunks=subgraph.entity_chunks,
+            relation_occurrences=subgraph.relation_occurrences,
+            stats=stats,
+        )
+        return stats
+
+
+    async def _upsert_subgraph_client_side(
+        self,
+        *,
+        entities: list[Entity],
+        relations: list[Relation],
+        tenant_id: UUID,
+        entity_embeddings: Dict[str, List[float]],
+        entity_index: Optional[TenantEntityIndex],
+        entity_chunks: Dict[str, List[UUID]],
+        relation_occurrences: Dict[tuple[str, str, str], int],
+        stats: Dict[str, Any],
+    ) -> None:
+        """
+        Client-side merge of a (possibly multi-chunk) subgraph in bulk calls.
+
+        ``entity_chunks`` maps a normalized entity name to the chunks it must be
+        linked to; ``relation_occurrences`` holds how many chunks mentioned each
+        relation (default 1), which is added to the weight of merged relations.
+        """
+        client = await self._get_client()
+        tenant_str = str(tenant_id)
+
+        index = entity_index if entity_index is not None else TenantEntityIndex(tenant_id)
+        await index.ensure_loaded(lambda: self._list_tenant_entities(tenant_str))
+        # Exact name first, then a batched >= 0.95 cosine match for the rest.
+        matches = index.match([entity.name for entity in entities], entity_embeddings)
 
         update_rows: list[dict] = []
         insert_rows: list[dict] = []
@@ -397,18 +546,7 @@ class SupabaseGraphRepository(IGraphRepository):
         for entity in entities:
             norm_name = self._norm(entity.name)
             entity_vector = entity_embeddings.get(norm_name)
-            matched = existing_by_name.get(norm_name)
-
-            if matched is None and entity_vector:
-                best_similarity = -1.0
-                best_match = None
-                for candidate in existing_with_vectors:
-                    similarity = self._cosine_similarity(entity_vector, candidate.get("_vector"))
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_match = candidate
-                if best_match is not None and best_similarity >= 0.95:
-                    matched = best_match
+            matched = matches.get(norm_name)
 
             try:
                 if matched is not None:
@@ -453,6 +591,7 @@ class SupabaseGraphRepository(IGraphRepository):
             select_cols="id,name",
         )
 
+        written_by_name = {self._norm(row["name"]): row for row in update_rows + insert_rows}
         for row in updated_entities + inserted_entities:
             if not isinstance(row, dict):
                 continue
@@ -461,7 +600,11 @@ class SupabaseGraphRepository(IGraphRepository):
             if not entity_name or not entity_id:
                 continue
             entity_id_by_name[self._norm(entity_name)] = entity_id
+            written = written_by_name.get(self._norm(entity_name), {})
+            index.upsert({**written, "id": entity_id, "name": entity_name})
 
+        entity_matrix_cache.invalidate(tenant_id)
+        await index_generations.bump(tenant_id)
         stats["nodes_upserted"] = len(updated_entities) + len(inserted_entities)
         stats["entities_merged"] = len(updated_entities)
         stats["entities_inserted"] = len(inserted_entities)
@@ -487,6 +630,7 @@ class SupabaseGraphRepository(IGraphRepository):
                     if not entity_name or not entity_id:
                         continue
                     entity_id_by_name[self._norm(entity_name)] = entity_id
+                    index.upsert({"id": entity_id, "name": entity_name})
             except Exception as resolve_err:
                 logger.warning(
                     "No se pudieron resolver entidades faltantes post-upsert: %s", resolve_err
@@ -494,8 +638,9 @@ class SupabaseGraphRepository(IGraphRepository):
 
         relation_candidates: list[Relation] = []
         seen_relations: set[tuple[str, str, str]] = set()
+        occurrences_by_key: dict[tuple[str, str, str], int] = {}
 
-        for relation in normalized_extraction.relations:
+        for relation in relations:
             source_name = self._norm(relation.source)
             target_name = self._norm(relation.target)
             relation_type = (
@@ -516,6 +661,9 @@ class SupabaseGraphRepository(IGraphRepository):
             if key in seen_relations:
                 continue
             seen_relations.add(key)
+            occurrences_by_key[key] = max(
+                1, int(relation_occurrences.get((source_name, target_name, relation_type), 1))
+            )
 
             relation_candidates.append(
                 Relation(
@@ -561,6 +709,7 @@ class SupabaseGraphRepository(IGraphRepository):
             for relation in relation_candidates:
                 key = (relation.source, relation.target, relation.relation_type)
                 existing_rel = existing_rel_map.get(key)
+                occurrences = occurrences_by_key.get(key, 1)
 
                 if existing_rel:
                     current_weight = float(existing_rel.get("weight") or 0)
@@ -575,7 +724,7 @@ class SupabaseGraphRepository(IGraphRepository):
                             "target_entity_id": relation.target,
                             "relation_type": relation.relation_type,
                             "description": merged_description,
-                            "weight": current_weight + 1,
+                            "weight": current_weight + occurrences,
                         }
                     )
                 else:
@@ -586,7 +735,7 @@ class SupabaseGraphRepository(IGraphRepository):
                             "target_entity_id": relation.target,
                             "relation_type": relation.relation_type,
                             "description": relation.description,
-                            "weight": relation.weight,
+                            "weight": relation.weight + occurrences - 1,
                             "metadata": {},
                         }
                     )
@@ -606,19 +755,23 @@ class SupabaseGraphRepository(IGraphRepository):
         stats["relations_merged"] = len(updated_relations)
         stats["relations_inserted"] = len(inserted_relations)
 
-        if chunk_str:
-            valid_entity_ids = {
-                entity_id
-                for entity_id in set(entity_id_by_name.values())
-                if self._uuid_text(entity_id)
-            }
+        provenance_pairs: set[tuple[str, str]] = set()
+        for norm_name, chunk_ids in entity_chunks.items():
+            entity_id = self._uuid_text(entity_id_by_name.get(norm_name))
+            if not entity_id:
+                continue
+            for linked_chunk_id in chunk_ids:
+                chunk_str = self._uuid_text(linked_chunk_id)
+                if chunk_str:
+                    provenance_pairs.add((entity_id, chunk_str))
+        if provenance_pairs:
             provenance_rows = [
                 {
                     "tenant_id": tenant_str,
                     "entity_id": entity_id,
                     "chunk_id": chunk_str,
                 }
-                for entity_id in valid_entity_ids
+                for entity_id, chunk_str in sorted(provenance_pairs)
             ]
 
             linked = await self._bulk_upsert_with_fallback(
@@ -629,8 +782,6 @@ class SupabaseGraphRepository(IGraphRepository):
             )
             stats["links_upserted"] = len(linked)
 
-        return stats
-
     @staticmethod
     def _structure_node_id(source_document_id: UUID, section_ref: str) -> str:
         return str(uuid5(NAMESPACE_URL, f"doc-structure:{source_document_id}:{section_ref}"))
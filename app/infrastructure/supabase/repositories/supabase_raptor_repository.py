@@ -2,6 +2,9 @@ import logging
 from uuid import UUID, NAMESPACE_URL, uuid5
 
 from app.domain.ingestion.ports import IRaptorRepository
+from app.domain.retrieval.result_cache import index_generations
+from app.domain.retrieval.vector_similarity import entity_matrix_cache, to_vector
+from app.domain.schemas.embedding_vector import to_float_list
 from app.domain.schemas.raptor_schemas import SummaryNode
 
 logger = logging.getLogger(__name__)
@@ -51,7 +54,7 @@ class SupabaseRaptorRepository(IRaptorRepository):
             "node_type": "Concepto",
             "title": node.title,
             "content": node.content,
-            "embedding": node.embedding,
+            "embedding": to_float_list(node.embedding),
             "level": node.level,
             "collection_id": str(node.collection_id) if node.collection_id else None,
             "children_ids": [str(cid) for cid in node.children_ids],
@@ -65,9 +68,14 @@ class SupabaseRaptorRepository(IRaptorRepository):
                 "children_summary_ids": [str(cid) for cid in node.children_summary_ids],
             },
         }
+        if node.cluster_stats:
+            data["properties"]["cluster_stats"] = node.cluster_stats
 
-        if node.source_document_id:
-            data["source_document_id"] = str(node.source_document_id)
+        # Always present: upserts only write the columns named in the batch, and a
+        # parent re-scoped to the collection must clear its previous owner.
+        data["source_document_id"] = (
+            str(node.source_document_id) if node.source_document_id else None
+        )
         return data
 
     @staticmethod
@@ -90,7 +98,7 @@ class SupabaseRaptorRepository(IRaptorRepository):
             "name": name,
             "type": "RAPTOR_SUMMARY",
             "description": node.content,
-            "embedding": node.embedding,
+            "embedding": to_float_list(node.embedding),
             "metadata": {
                 "raptor_level": node.level,
                 "is_raptor_summary": True,
@@ -148,6 +156,9 @@ class SupabaseRaptorRepository(IRaptorRepository):
 
         entity_rows = [self._to_kg_entity_row(node) for node in nodes]
         await client.table("knowledge_entities").upsert(entity_rows, on_conflict="id").execute()
+        for tenant_id in {str(node.tenant_id) for node in nodes}:
+            entity_matrix_cache.invalidate(tenant_id)
+            await index_generations.bump(tenant_id)
 
         relation_rows: list[dict] = []
         for node in nodes:
@@ -160,6 +171,65 @@ class SupabaseRaptorRepository(IRaptorRepository):
                 .execute()
             )
 
+    async def get_collection_summary_nodes(
+        self, tenant_id: UUID | str, collection_id: UUID | str, page_size: int = 500
+    ) -> list[SummaryNode]:
+        """Load a collection's summary nodes (level >= 1), paginated by id."""
+        client = await self.get_client()
+        rows: list[dict] = []
+        offset = 0
+        while True:
+            response = await (
+                client.table("regulatory_nodes")
+                .select(
+                    "id,tenant_id,title,content,embedding,level,children_ids,"
+                    "source_document_id,collection_id,properties"
+                )
+                .eq("tenant_id", str(tenant_id))
+                .eq("collection_id", str(collection_id))
+                .gte("level", 1)
+                .order("id")
+                .range(offset, offset + page_size - 1)
+                .execute()
+            )
+            batch = response.data or []
+            rows.extend(batch)
+            if len(batch) < page_size:
+                break
+            offset += page_size
+
+        nodes = [node for node in (self._from_regulatory_node_row(row) for row in rows) if node]
+        logger.debug("Loaded %s summary nodes for collection %s", len(nodes), collection_id)
+        return nodes
+
+    @staticmethod
+    def _from_regulatory_node_row(row: dict) -> SummaryNode | None:
+        properties = row.get("properties") or {}
+        if not properties.get("is_summary"):
+            return None
+        try:
+            embedding = to_vector(row.get("embedding"))
+            section_node_id = properties.get("section_node_id")
+            return SummaryNode(
+                id=row["id"],
+                content=str(row.get("content") or ""),
+                title=str(row.get("title") or ""),
+                embedding=embedding,
+                level=int(row.get("level") or properties.get("raptor_level") or 1),
+                children_ids=list(row.get("children_ids") or []),
+                tenant_id=row["tenant_id"],
+                source_document_id=row.get("source_document_id"),
+                collection_id=row.get("collection_id"),
+                source_standard=properties.get("source_standard"),
+                section_ref=properties.get("section_ref"),
+                section_node_id=section_node_id or None,
+                children_summary_ids=list(properties.get("children_summary_ids") or []),
+                cluster_stats=dict(properties.get("cluster_stats") or {}),
+            )
+        except Exception as e:
+            logger.warning("Skipping unreadable summary node %s: %s", row.get("id"), e)
+            return None
+
     async def backfill_collection_id(self, source_document_id: str, collection_id: str) -> None:
         if not source_document_id or not collection_id:
             return
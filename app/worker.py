@@ -1,6 +1,6 @@
 import asyncio
 import structlog
-from typing import Any, Callable, Coroutine, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, Optional
 
 from app.workflows.ingestion.processor import DocumentProcessor
 from app.infrastructure.settings import settings
@@ -8,8 +8,18 @@ from app.domain.ingestion.orchestration.policies import IngestionPolicy
 from app.infrastructure.supabase.adapters.metadata_adapter import SupabaseMetadataAdapter
 from app.infrastructure.container import CognitiveContainer
 from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.caching.index_generation_store import configure_index_generations
 from app.infrastructure.background_jobs.tenant_concurrency_manager import TenantConcurrencyManager
 from app.infrastructure.queue.base_worker import BaseWorkerProcessor
+from app.infrastructure.queue.job_lease_dispatcher import JobLeaseDispatcher
+from app.infrastructure.queue.job_notifications import (
+    JobWakeupHub,
+    build_job_notification_listener,
+)
+from app.infrastructure.queue.stale_job_sweeper import (
+    StaleJobSweeper,
+    build_stale_sweep_leader_lock,
+)
 from app.infrastructure.supabase.repositories.taxonomy_repository import TaxonomyRepository
 from app.workflows.ingestion.dispatcher import IngestionDispatcher
 from app.workflows.ingestion.job_dispatcher import WorkerJobDispatcher
@@ -19,6 +29,9 @@ from app.infrastructure.background_jobs.community_scheduler import (
     CommunityScheduler,
 )
 
+if TYPE_CHECKING:
+    from app.domain.ingestion.knowledge.clustering_service import GMMClusteringService
+
 logger = structlog.get_logger(__name__)
 
 
@@ -59,6 +72,27 @@ class IngestionWorker:
             0,
             int(getattr(settings, "WORKER_SOURCE_LOOKUP_MAX_REQUEUES", 3) or 3),
         )
+        self.job_fetch_batch_size = max(
+            0,
+            int(getattr(settings, "WORKER_JOB_FETCH_BATCH_SIZE", 0) or 0),
+        )
+        self.lease_dispatchers: list[JobLeaseDispatcher] = []
+        self.queue_stats_log_seconds = max(
+            0,
+            int(getattr(settings, "WORKER_QUEUE_STATS_LOG_SECONDS", 300) or 0),
+        )
+        self.wakeup_hub = JobWakeupHub(
+            safety_poll_interval_seconds=float(
+                getattr(settings, "WORKER_JOB_NOTIFY_SAFETY_POLL_SECONDS", 30.0) or 30.0
+            )
+        )
+        self.job_listener = build_job_notification_listener(self.wakeup_hub)
+        self.stale_sweeper = StaleJobSweeper(
+            self.job_store,
+            leader_lock=build_stale_sweep_leader_lock(
+                retry_seconds=self.job_store.worker_requeue_stale_interval_seconds
+            ),
+        )
 
         self.concurrency_manager = concurrency_manager or TenantConcurrencyManager(
             per_tenant_limit=self.worker_per_tenant_concurrency
@@ -66,6 +100,9 @@ class IngestionWorker:
         self._global_semaphore = asyncio.Semaphore(self.worker_concurrency)
         self._enrichment_semaphore = asyncio.Semaphore(self.enrichment_concurrency)
 
+        # Owns a spawn process pool when RAPTOR_GMM_POOL_WORKERS > 0; stopped with the worker.
+        self.gmm_clustering: Optional["GMMClusteringService"] = None
+
         self.dispatcher = dispatcher or IngestionDispatcher()
         self.policy = policy or IngestionPolicy()
         self.processor = processor
@@ -78,6 +115,7 @@ class IngestionWorker:
             from app.infrastructure.supabase.repositories.supabase_raptor_repository import (
                 SupabaseRaptorRepository,
             )
+            from app.domain.ingestion.knowledge.clustering_service import GMMClusteringService
             from app.domain.ingestion.knowledge.raptor_processor import RaptorProcessor
             from app.domain.ingestion.knowledge.summarization_service import SummarizationAgent
             from app.ai.generation import get_llm
@@ -86,9 +124,15 @@ class IngestionWorker:
                 resolved_container = CognitiveContainer()
 
             raptor_repo = SupabaseRaptorRepository()
+            self.gmm_clustering = GMMClusteringService(
+                reduced_dimensions=int(getattr(settings, "RAPTOR_GMM_REDUCED_DIMENSIONS", 32) or 0),
+                early_stop_patience=int(getattr(settings, "RAPTOR_GMM_EARLY_STOP_PATIENCE", 2) or 0),
+                max_workers=int(getattr(settings, "RAPTOR_GMM_POOL_WORKERS", 2) or 0),
+            )
             raptor_processor = RaptorProcessor(
                 repository=raptor_repo,
                 embedding_service=resolved_container.embedding_service,
+                clustering_service=self.gmm_clustering,
                 summarization_service=SummarizationAgent(
                     llm=get_llm(temperature=0.3, capability="SUMMARIZATION")
                 ),
@@ -99,6 +143,16 @@ class IngestionWorker:
                 structural_mode_enabled=bool(
                     getattr(settings, "RAPTOR_STRUCTURAL_MODE_ENABLED", True)
                 ),
+                pipeline_queue_size=int(getattr(settings, "RAPTOR_PIPELINE_QUEUE_SIZE", 16) or 16),
+                embed_batch_size=int(getattr(settings, "RAPTOR_EMBED_BATCH_SIZE", 32) or 32),
+                save_batch_size=int(getattr(settings, "RAPTOR_SAVE_BATCH_SIZE", 50) or 50),
+                incremental_enabled=bool(getattr(settings, "RAPTOR_INCREMENTAL_ENABLED", False)),
+                incremental_drift_factor=float(
+                    getattr(settings, "RAPTOR_INCREMENTAL_DRIFT_FACTOR", 2.0) or 2.0
+                ),
+                incremental_split_threshold=float(
+                    getattr(settings, "RAPTOR_INCREMENTAL_SPLIT_THRESHOLD", 0.15) or 0.15
+                ),
             )
             self.processor = DocumentProcessor(
                 repository=resolved_container.source_repository,
@@ -129,11 +183,15 @@ class IngestionWorker:
 
     async def start(self):
         await self.job_store.get_client()
+        configure_index_generations()
         logger.info(
             "starting_ingestion_worker",
             concurrency=self.worker_concurrency,
             per_tenant=self.worker_per_tenant_concurrency,
+            job_notify=self.job_listener is not None,
         )
+        if self.job_listener is not None:
+            await self.job_listener.start()
 
         # Poller tasks
         poller_tasks = []
@@ -157,15 +215,41 @@ class IngestionWorker:
                 await self.community_scheduler.tick()
                 await asyncio.sleep(1)
 
+        async def queue_stats_loop():
+            while self.is_running:
+                await asyncio.sleep(self.queue_stats_log_seconds)
+                logger.info("worker_queue_stats", **self._queue_stats())
+
         scheduler_task = asyncio.create_task(scheduler_loop())
+        background_tasks = [scheduler_task, asyncio.create_task(self.stale_sweeper.run())]
+        if self.queue_stats_log_seconds > 0:
+            background_tasks.append(asyncio.create_task(queue_stats_loop()))
 
         try:
-            await asyncio.gather(*poller_tasks, scheduler_task)
+            await asyncio.gather(*poller_tasks, *background_tasks)
         finally:
             self.is_running = False
             for t in poller_tasks:
                 t.cancel()
-            scheduler_task.cancel()
+            for t in background_tasks:
+                t.cancel()
+            await asyncio.gather(*poller_tasks, *background_tasks, return_exceptions=True)
+            for dispatcher in self.lease_dispatchers:
+                await dispatcher.release_unstarted()
+            await self.job_store.close_heartbeat()
+            if self.job_listener is not None:
+                await self.job_listener.stop()
+            if self.gmm_clustering is not None:
+                await asyncio.to_thread(self.gmm_clustering.shutdown)
+            logger.info("worker_queue_stats", **self._queue_stats())
+
+    def _queue_stats(self) -> Dict[str, Any]:
+        return {
+            **self.wakeup_hub.snapshot(),
+            "heartbeat_updates": self.job_store.heartbeat_updates,
+            "stale_sweeps": self.stale_sweeper.sweeps,
+            "stale_requeued": self.stale_sweeper.requeued,
+        }
 
     def _build_poller_tasks(
         self,
@@ -174,17 +258,26 @@ class IngestionWorker:
         concurrency: int,
         handler: Callable[[Dict[str, Any]], Coroutine[Any, Any, Dict[str, Any]]],
     ) -> list[asyncio.Task]:
-        tasks: list[asyncio.Task] = []
+        """One lease dispatcher claiming jobs in batches plus ``concurrency`` local workers."""
+        dispatcher = JobLeaseDispatcher(
+            self.job_store,
+            job_type,
+            concurrency,
+            batch_size=self.job_fetch_batch_size,
+            wakeup_hub=self.wakeup_hub,
+            poll_interval=self.worker_poll_interval,
+        )
+        self.lease_dispatchers.append(dispatcher)
+        tasks: list[asyncio.Task] = [asyncio.create_task(dispatcher.run())]
         for i in range(concurrency):
-            processor = BaseWorkerProcessor(self.job_store, poller_id=i + 1)
+            processor = BaseWorkerProcessor(
+                self.job_store, poller_id=i + 1, wakeup_hub=self.wakeup_hub
+            )
             tasks.append(
-                asyncio.create_task(
-                    processor.run_job_loop(job_type, handler, self.worker_poll_interval)
-                )
+                asyncio.create_task(processor.run_queue_loop(job_type, handler, dispatcher))
             )
         return tasks
 
-
 if __name__ == "__main__":
     worker = IngestionWorker()
     try:
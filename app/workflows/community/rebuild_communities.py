@@ -4,6 +4,7 @@ import structlog
 from app.domain.ingestion.knowledge.clustering_service import ClusteringService
 from app.ai.embeddings import JinaEmbeddingService
 from app.ai.generation import get_llm
+from app.infrastructure.settings import settings
 from app.infrastructure.supabase.client import get_async_supabase_client
 from app.infrastructure.supabase.repositories.community_job_repository import CommunityJobRepository
 
@@ -26,6 +27,8 @@ class RebuildCommunitiesUseCase:
             embedding_service=JinaEmbeddingService.get_instance(),
             llm=get_llm(temperature=0.2, capability="CHAT"),
             supabase_client_factory=get_async_supabase_client,
+            incremental=bool(getattr(settings, "COMMUNITY_REBUILD_INCREMENTAL", True)),
+            graph_page_size=int(getattr(settings, "COMMUNITY_GRAPH_PAGE_SIZE", 1000) or 1000),
         )
         self.repository = repository or CommunityJobRepository()
 
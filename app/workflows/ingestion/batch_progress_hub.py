@@ -0,0 +1,376 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.infrastructure.observability.context_vars import tenant_id_ctx
+from app.infrastructure.settings import settings
+from app.infrastructure.supabase.queries.ingestion_query_service import ManualIngestionQueryService
+from app.workflows.ingestion.batch_orchestrator import BatchOrchestrator
+
+logger = structlog.get_logger(__name__)
+
+TERMINAL_BATCH_STATUSES = {"completed", "partial", "failed"}
+_EVENTS_PER_FRAME = 100
+_HEARTBEAT_SECONDS = 15.0
+
+CursorKey = Tuple[datetime, str]
+
+
+def _cursor_key(cursor: Optional[str]) -> Optional[CursorKey]:
+    return ManualIngestionQueryService._parse_cursor(cursor)
+
+
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=True)}\n\n"
+
+
+class _BatchChannel:
+    """Latest snapshot plus a ring buffer of events for one batch, shared by its viewers."""
+
+    def __init__(self, batch_id: str, tenant_id: str, event_buffer_size: int):
+        self.batch_id = batch_id
+        self.tenant_id = tenant_id
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.events: Deque[Tuple[CursorKey, str, Dict[str, Any]]] = deque(maxlen=event_buffer_size)
+        self.evicted_key: Optional[CursorKey] = None
+        self.cursor: Optional[str] = None
+        self.terminal_status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.failure: Optional[BaseException] = None
+        self.closed = False
+        self.version = 0
+        self.subscribers = 0
+        self.subscribers_peak = 0
+        self.idle_since = time.monotonic()
+        self.polls = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self._first_snapshot = asyncio.Event()
+
+    def changed(self) -> asyncio.Event:
+        return self._changed
+
+    def publish(self) -> None:
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        self._first_snapshot.set()
+
+    async def wait_ready(self) -> None:
+        await self._first_snapshot.wait()
+
+    def append_events(self, items: List[Dict[str, Any]], next_cursor: Optional[str]) -> None:
+        for item in items:
+            cursor = f"{item.get('created_at')}|{item.get('event_id')}"
+            key = _cursor_key(cursor)
+            if key is None:
+                continue
+            if len(self.events) == self.events.maxlen:
+                self.evicted_key = self.events[0][0]
+            self.events.append((key, cursor, item))
+        if next_cursor:
+            self.cursor = str(next_cursor)
+
+    def missed_by(self, key: Optional[CursorKey]) -> bool:
+        """True when events after ``key`` have already been evicted from the ring."""
+        return self.evicted_key is not None and (key is None or key < self.evicted_key)
+
+    def events_after(self, key: Optional[CursorKey]) -> List[Tuple[CursorKey, str, Dict[str, Any]]]:
+        return [entry for entry in self.events if key is None or entry[0] > key]
+
+    def attach(self) -> None:
+        self.subscribers += 1
+        self.subscribers_peak = max(self.subscribers_peak, self.subscribers)
+
+    def detach(self) -> None:
+        self.subscribers = max(0, self.subscribers - 1)
+        if self.subscribers == 0:
+            self.idle_since = time.monotonic()
+
+
+class BatchProgressHub:
+    """Per-process fan-out of batch progress to SSE viewers.
+
+    One poller per active batch reads ``get_batch_status`` and the event feed
+    and publishes the latest snapshot plus a bounded ring of events; every
+    viewer of that batch is served from memory. Database load is therefore
+    proportional to active batches, not to connected dashboards. Viewers that
+    resume from a cursor older than the ring, or fall behind it while
+    streaming, are caught up from the database before rejoining the shared
+    feed.
+    """
+
+    def __init__(
+        self,
+        poll_interval_seconds: float = 1.5,
+        event_buffer_size: int = 2000,
+        idle_grace_seconds: float = 30.0,
+        max_event_pages_per_poll: int = 5,
+        session_timeout_seconds: float = 1800.0,
+    ):
+        self.poll_interval_seconds = max(0.01, float(poll_interval_seconds))
+        self.event_buffer_size = max(1, int(event_buffer_size))
+        self.idle_grace_seconds = max(0.0, float(idle_grace_seconds))
+        self.max_event_pages_per_poll = max(1, int(max_event_pages_per_poll))
+        self.session_timeout_seconds = float(session_timeout_seconds)
+        self._channels: Dict[str, _BatchChannel] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_batches": len(self._channels),
+            "subscribers": sum(channel.subscribers for channel in self._channels.values()),
+            "polls": sum(channel.polls for channel in self._channels.values()),
+        }
+
+    async def open(
+        self, batch_id: str, tenant_id: str, orchestrator: BatchOrchestrator
+    ) -> _BatchChannel:
+        """Join (or start) the batch channel and wait for its first snapshot.
+
+        Raises the poller's ``ValueError`` (``BATCH_NOT_FOUND``,
+        ``TENANT_MISMATCH:...``) so callers can reject before streaming.
+        """
+        batch_key = str(batch_id)
+        tenant = str(tenant_id or "").strip()
+        channel = self._channels.get(batch_key)
+        if channel is None or channel.closed:
+            channel = _BatchChannel(batch_key, tenant, self.event_buffer_size)
+            self._channels[batch_key] = channel
+            channel.task = asyncio.create_task(self._poll(channel, orchestrator))
+
+        await channel.wait_ready()
+        if channel.failure is not None:
+            raise channel.failure
+        if channel.error:
+            raise ValueError(channel.error)
+        batch = (channel.snapshot or {}).get("batch") or {}
+        batch_tenant = str(batch.get("tenant_id") or "").strip()
+        if tenant and batch_tenant and tenant != batch_tenant:
+            raise ValueError("TENANT_MISMATCH:stream_ingestion_batch")
+        return channel
+
+    async def _poll(self, channel: _BatchChannel, orchestrator: BatchOrchestrator) -> None:
+        # Runs in a copy of the opening request's context; pin the batch tenant explicitly.
+        if channel.tenant_id:
+            tenant_id_ctx.set(channel.tenant_id)
+        failures = 0
+        try:
+            while True:
+                try:
+                    progress = await orchestrator.get_batch_status(batch_id=channel.batch_id)
+                    for _ in range(self.max_event_pages_per_poll):
+                        delta = await orchestrator.query_service.get_batch_events(
+                            batch_id=channel.batch_id, cursor=channel.cursor, limit=_EVENTS_PER_FRAME
+                        )
+                        items = delta.get("items") if isinstance(delta.get("items"), list) else []
+                        channel.append_events(items, delta.get("next_cursor"))
+                        if not items or not delta.get("has_more"):
+                            break
+                    failures = 0
+                except ValueError as exc:
+                    channel.error = str(exc)
+                    channel.publish()
+                    return
+                except Exception as exc:
+                    if channel.snapshot is None:
+                        # Nobody has been served yet: fail the opening request instead of hanging it.
+                        channel.failure = exc
+                        return
+                    failures += 1
+                    logger.warning(
+                        "batch_progress_hub_poll_failed",
+                        batch_id=channel.batch_id,
+                        failures=failures,
+                        error=str(exc),
+                    )
+                    await asyncio.sleep(min(self.poll_interval_seconds * (2**failures), 30.0))
+                    continue
+
+                channel.polls += 1
+                channel.snapshot = progress
+                batch = progress.get("batch") if isinstance(progress.get("batch"), dict) else {}
+                status = str(batch.get("status") or "").lower()
+                if status in TERMINAL_BATCH_STATUSES:
+                    channel.terminal_status = status
+                channel.publish()
+                if channel.terminal_status:
+                    return
+
+                if (
+                    channel.subscribers == 0
+                    and time.monotonic() - channel.idle_since > self.idle_grace_seconds
+                ):
+                    return
+                await asyncio.sleep(self.poll_interval_seconds)
+        finally:
+            channel.closed = True
+            channel.publish()
+            if self._channels.get(channel.batch_id) is channel:
+                del self._channels[channel.batch_id]
+            logger.info(
+                "batch_progress_hub_channel_closed",
+                batch_id=channel.batch_id,
+                polls=channel.polls,
+                subscribers_peak=channel.subscribers_peak,
+                terminal_status=channel.terminal_status,
+                error=channel.error,
+            )
+
+    async def stream(
+        self,
+        channel: _BatchChannel,
+        orchestrator: BatchOrchestrator,
+        cursor: Optional[str] = None,
+        min_interval_seconds: float = 0.0,
+    ) -> AsyncIterator[str]:
+        """SSE frames for one viewer: snapshot on change, event deltas after ``cursor``, terminal."""
+        batch_id = channel.batch_id
+        current_cursor = cursor
+        sent_key = _cursor_key(cursor)
+        started_at = time.monotonic()
+        last_heartbeat = 0.0
+        seen_version = -1
+        last_wake = 0.0
+        channel.attach()
+        try:
+            while True:
+                if channel.missed_by(sent_key):
+                    # Resume point (or a slow viewer) fell behind the ring: catch up from the database.
+                    while True:
+                        delta = await orchestrator.query_service.get_batch_events(
+                            batch_id=batch_id, cursor=current_cursor, limit=_EVENTS_PER_FRAME
+                        )
+                        items = delta.get("items") if isinstance(delta.get("items"), list) else []
+                        if not items:
+                            # Nothing past the cursor in the feed: the ring holds the rest.
+                            sent_key = channel.evicted_key
+                            break
+                        current_cursor = str(delta.get("next_cursor") or current_cursor or "")
+                        sent_key = _cursor_key(current_cursor)
+                        yield _sse(
+                            "delta",
+                            {
+                                "type": "delta",
+                                "batch_id": batch_id,
+                                "cursor": current_cursor,
+                                "events": items,
+                                "has_more": bool(delta.get("has_more", False)),
+                            },
+                        )
+                        if not delta.get("has_more") or not channel.missed_by(sent_key):
+                            break
+
+                changed = channel.changed()
+                if channel.version != seen_version and channel.snapshot is not None:
+                    seen_version = channel.version
+                    progress = channel.snapshot
+                    yield _sse(
+                        "snapshot",
+                        {
+                            "type": "snapshot",
+                            "batch_id": batch_id,
+                            "cursor": progress.get("observability", {}).get("cursor"),
+                            "progress": progress,
+                        },
+                    )
+
+                pending = channel.events_after(sent_key)
+                for start in range(0, len(pending), _EVENTS_PER_FRAME):
+                    frame = pending[start : start + _EVENTS_PER_FRAME]
+                    sent_key, current_cursor = frame[-1][0], frame[-1][1]
+                    yield _sse(
+                        "delta",
+                        {
+                            "type": "delta",
+                            "batch_id": batch_id,
+                            "cursor": current_cursor,
+                            "events": [item for _key, _cursor, item in frame],
+                            "has_more": start + _EVENTS_PER_FRAME < len(pending),
+                        },
+                    )
+
+                if channel.error:
+                    yield _sse(
+                        "error", {"type": "error", "batch_id": batch_id, "error": channel.error}
+                    )
+                    return
+
+                if channel.terminal_status:
+                    if channel.missed_by(sent_key) or channel.events_after(sent_key):
+                        # Events arrived while this viewer was still sending; drain them first.
+                        continue
+                    yield _sse(
+                        "terminal",
+                        {
+                            "type": "terminal",
+                            "batch_id": batch_id,
+                            "status": channel.terminal_status,
+                            "cursor": current_cursor,
+                        },
+                    )
+                    return
+
+                now = time.monotonic()
+                if now - last_heartbeat >= _HEARTBEAT_SECONDS:
+                    yield _sse(
+                        "heartbeat", {"type": "heartbeat", "batch_id": batch_id, "at": int(time.time())}
+                    )
+                    last_heartbeat = now
+
+                if now - started_at > self.session_timeout_seconds:
+                    yield _sse(
+                        "terminal",
+                        {
+                            "type": "terminal",
+                            "batch_id": batch_id,
+                            "status": "timeout",
+                            "cursor": current_cursor,
+                        },
+                    )
+                    return
+
+                if channel.closed:
+                    # Poller idled out or was cancelled; a reconnect starts a fresh one.
+                    return
+
+                wait_seconds = max(0.0, _HEARTBEAT_SECONDS - (time.monotonic() - last_heartbeat))
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=wait_seconds)
+                except asyncio.TimeoutError:
+                    continue
+                # Coalesce bursts: at most one wake-up per min_interval_seconds for this viewer.
+                throttle = min_interval_seconds - (time.monotonic() - last_wake)
+                if throttle > 0:
+                    await asyncio.sleep(throttle)
+                last_wake = time.monotonic()
+        finally:
+            channel.detach()
+
+
+_hub: Optional[BatchProgressHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_batch_progress_hub() -> BatchProgressHub:
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = BatchProgressHub(
+                poll_interval_seconds=float(
+                    getattr(settings, "INGESTION_PROGRESS_HUB_POLL_INTERVAL_MS", 1500) or 1500
+                )
+                / 1000.0,
+                event_buffer_size=int(
+                    getattr(settings, "INGESTION_PROGRESS_HUB_EVENT_BUFFER_SIZE", 2000) or 2000
+                ),
+                idle_grace_seconds=float(
+                    getattr(settings, "INGESTION_PROGRESS_HUB_IDLE_GRACE_SECONDS", 30) or 0
+                ),
+            )
+        return _hub
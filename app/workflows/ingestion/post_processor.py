@@ -20,6 +20,9 @@ from app.domain.ingestion.graph.graph_extractor import GraphExtractor
 from app.domain.ingestion.visual.context_service import VisualContextService
 from app.domain.ingestion.metadata.metadata_enricher import MetadataEnricher
 from app.domain.ingestion.chunking.text_normalization import normalize_embedding, ensure_chunk_ids
+from app.domain.retrieval.result_cache import index_generations
+from app.domain.schemas.embedding_vector import EmbeddingVector
+from app.infrastructure.caching.graph_extraction_cache import build_graph_extraction_cache
 from app.infrastructure.observability.ingestion_logging import compact_error, emit_event
 from app.ai.generation import get_strict_engine
 from app.infrastructure.settings import settings
@@ -72,9 +75,22 @@ class PostIngestionPipelineService:
                     getattr(settings, "GRAPH_EXTRACTION_RETRY_JITTER_SECONDS", 0.35) or 0.35
                 ),
                 error_formatter=compact_error,
+                extraction_cache=build_graph_extraction_cache(),
+                prompt_version=str(
+                    getattr(settings, "GRAPH_EXTRACTION_CACHE_PROMPT_VERSION", "v1") or "v1"
+                ),
             ),
             log_event_emitter=emit_event,
             graph_batch_size=max(1, int(getattr(settings, "INGESTION_GRAPH_BATCH_SIZE", 4) or 4)),
+            graph_persist_window=max(
+                1, int(getattr(settings, "INGESTION_GRAPH_PERSIST_WINDOW", 64) or 64)
+            ),
+            graph_max_inflight_batches=int(
+                getattr(settings, "INGESTION_GRAPH_MAX_INFLIGHT_BATCHES", 0) or 0
+            ),
+            graph_persist_queue_size=max(
+                1, int(getattr(settings, "INGESTION_GRAPH_PERSIST_QUEUE_SIZE", 8) or 8)
+            ),
             graph_log_every_n=max(
                 1,
                 int(getattr(settings, "INGESTION_GRAPH_CHUNK_LOG_EVERY_N", 25) or 25),
@@ -100,6 +116,7 @@ class PostIngestionPipelineService:
             raise RuntimeError(
                 f"Audit Persistence Failure: strategies produced chunks but repository persisted 0 for doc_id={doc_id}"
             )
+        await index_generations.bump(tenant_id)
         return persisted_count
 
     @staticmethod
@@ -197,16 +214,34 @@ class PostIngestionPipelineService:
             if not base_chunks:
                 return
 
-            tree_result = await self.raptor_processor.build_tree(
-                base_chunks=base_chunks,
-                tenant_id=UUID(tenant_id)
-                if tenant_id
-                else UUID("00000000-0000-0000-0000-000000000000"),
-                source_document_id=UUID(doc_id),
-                collection_id=UUID(collection_id) if collection_id else None,
-                embedding_mode=self.graph_enrichment_service._resolve_embedding_mode(result.chunks),
+            raptor_tenant_id = (
+                UUID(tenant_id) if tenant_id else UUID("00000000-0000-0000-0000-000000000000")
             )
+            embedding_mode = self.graph_enrichment_service._resolve_embedding_mode(result.chunks)
+            if collection_id and bool(getattr(settings, "RAPTOR_INCREMENTAL_ENABLED", False)):
+                tree_result = await self.raptor_processor.update_tree(
+                    base_chunks=base_chunks,
+                    tenant_id=raptor_tenant_id,
+                    collection_id=UUID(collection_id),
+                    source_document_id=UUID(doc_id),
+                    embedding_mode=embedding_mode,
+                )
+            else:
+                tree_result = await self.raptor_processor.build_tree(
+                    base_chunks=base_chunks,
+                    tenant_id=raptor_tenant_id,
+                    source_document_id=UUID(doc_id),
+                    collection_id=UUID(collection_id) if collection_id else None,
+                    embedding_mode=embedding_mode,
+                )
 
+            logger.info(
+                "raptor_tree_built",
+                doc_id=doc_id,
+                nodes=tree_result.total_nodes_created,
+                top_level_nodes=len(tree_result.top_level_ids),
+                level_metrics=tree_result.level_metrics,
+            )
             if collection_id:
                 await self.raptor_repo.backfill_collection_id(doc_id, collection_id)
 
@@ -253,7 +288,8 @@ class PostIngestionPipelineService:
         rows = await self.content_repo.get_chunks_by_source_id(doc_id)
         for row in rows:
             if isinstance(row, dict):
-                row["embedding"] = normalize_embedding(row.get("embedding"))
+                vector = normalize_embedding(row.get("embedding"))
+                row["embedding"] = EmbeddingVector(vector) if vector else None
         return rows
 
     async def _load_source_document_metadata(self, doc_id: str) -> Dict[str, Any]:
@@ -4,12 +4,14 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
 from app.ai.contracts import AIModelConfig
+from app.domain.schemas.embedding_vector import EmbeddingVector
 from app.domain.schemas.ingestion_schemas import IngestionMetadata
 from app.domain.ingestion.entities import IngestionSource
 from app.domain.ingestion.types import IngestionStatus
 from app.domain.ingestion.orchestration.strategy_registry import register_strategy
 from app.domain.ingestion.structure.structure_mapper import StructureMapper
 from app.infrastructure.container import CognitiveContainer
+from app.infrastructure.document_parsers.cpu_executor import get_pdf_cpu_executor
 from app.infrastructure.document_parsers.pdf_parser import PdfParserService
 from app.domain.ingestion.structure.toc_discovery import TocDiscoveryService
 from app.domain.ingestion.chunking import ChunkingService
@@ -72,8 +74,11 @@ class CurriculumContentStrategy(IngestionStrategy):
         parser: PdfParserService = container.pdf_parser_service
         router: DocumentStructureRouter = container.document_structure_router
         toc_service: TocDiscoveryService = container.toc_discovery_service
+        cpu_executor = get_pdf_cpu_executor()
 
         # 1. Route pages with fast heuristics (TEXT_STANDARD vs VISUAL_COMPLEX)
+        # The ToC is read in the same pass over the document when routing runs.
+        toc_result = None
         file_path = source.get_file_path()
         if not file_path:
             raise ValueError("CurriculumContentStrategy requires a local file path.")
@@ -101,7 +106,9 @@ class CurriculumContentStrategy(IngestionStrategy):
                 text_tasks = []
                 visual_tasks = []
             else:
-                page_tasks = router.route_document(file_path)
+                page_tasks, toc_result = await cpu_executor.route_and_discover_toc(
+                    router, toc_service, file_path
+                )
                 text_tasks = [
                     task
                     for task in page_tasks
@@ -115,7 +122,9 @@ class CurriculumContentStrategy(IngestionStrategy):
                 ]
                 full_text, page_map = self._build_text_payload(text_tasks)
         else:
-            page_tasks = router.route_document(file_path)
+            page_tasks, toc_result = await cpu_executor.route_and_discover_toc(
+                router, toc_service, file_path
+            )
             text_tasks = [
                 task
                 for task in page_tasks
@@ -145,7 +154,8 @@ class CurriculumContentStrategy(IngestionStrategy):
         toc_structure = None
         toc_entries = None
         try:
-            toc_result = toc_service.discover_toc(file_path)
+            if toc_result is None:
+                toc_result = await cpu_executor.discover_toc(toc_service, file_path)
             if toc_result and toc_result.has_structure:
                 logger.info("toc_discovered", entries_count=len(toc_result.entries))
                 toc_structure = toc_result.dict()
@@ -299,6 +309,7 @@ class FastCurriculumContentStrategy(CurriculumContentStrategy):
         chunker = JinaEmbeddingService.get_instance()
         parser: PdfParserService = container.pdf_parser_service
         toc_service: TocDiscoveryService = container.toc_discovery_service
+        cpu_executor = get_pdf_cpu_executor()
 
         # 1. Extract Text
         file_path = source.get_file_path()
@@ -333,7 +344,7 @@ class FastCurriculumContentStrategy(CurriculumContentStrategy):
         toc_structure = None
         toc_entries = None
         try:
-            toc_result = toc_service.discover_toc(file_path)
+            toc_result = await cpu_executor.discover_toc(toc_service, file_path)
             if toc_result and toc_result.has_structure:
                 logger.info("toc_discovered", entries_count=len(toc_result.entries))
                 toc_structure = toc_result.dict()
@@ -382,9 +393,9 @@ class FastCurriculumContentStrategy(CurriculumContentStrategy):
             embed_indices.append(idx)
             embed_texts.append(chunk_text)
 
-        embeddings_by_index: dict[int, list[float]] = {}
+        embeddings_by_index: dict[int, EmbeddingVector] = {}
         if embed_texts:
-            embeddings = await chunker.embed_texts(
+            embeddings = await chunker.embed_vectors(
                 embed_texts,
                 mode=embedding_mode,
                 provider=embedding_provider_applied,
@@ -12,6 +12,7 @@ from app.domain.ingestion.types import IngestionStatus
 from app.infrastructure.supabase.repositories.supabase_content_repository import SupabaseContentRepository
 from app.infrastructure.supabase.repositories.supabase_source_repository import SupabaseSourceRepository
 from app.ai.embeddings import JinaEmbeddingService
+from app.infrastructure.document_parsers.cpu_executor import get_pdf_cpu_executor
 from app.infrastructure.document_parsers.pdf_parser import PdfParserService
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -55,7 +56,9 @@ class InstitutionalOrchestrator:
                 "error": f"File not found: {file_path}",
             }
 
-        extraction = self.parser.extract_text_with_page_map(file_path)
+        extraction = await get_pdf_cpu_executor().extract_text_with_page_map(
+            self.parser, file_path
+        )
         if not extraction:
             return {
                 "status": IngestionStatus.FAILED.value,
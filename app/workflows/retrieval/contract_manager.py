@@ -305,6 +305,7 @@ class ContractManager:
                 scope_candidate_count=scope_candidate_count,
                 scope_penalized_ratio=scope_penalized_ratio,
                 score_space=score_space,
+                cache_hit=bool(trace_payload.get("cache_hit", False)),
             ),
         )
 
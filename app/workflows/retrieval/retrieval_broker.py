@@ -1,3 +1,4 @@
+import copy
 import structlog
 import time
 import math
@@ -28,6 +29,12 @@ from app.domain.retrieval.scoping import (
 )
 from app.domain.retrieval.context_resolution import resolve_retrieval_filters
 from app.domain.retrieval.planning import coerce_query_plan
+from app.domain.retrieval.result_cache import (
+    CachedRetrieval,
+    RetrievalResultCache,
+    build_result_cache_key,
+    index_generations,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -46,6 +53,7 @@ class RetrievalBroker:
         semantic_reranker: ISemanticReranker | None = None,
         cohere_reranker: ISemanticReranker | None = None,
         atomic_engine: AtomicRetrievalEngine | None = None,
+        result_cache: RetrievalResultCache | None = None,
     ):
         self.repository = repository
         self.reranker = authority_reranker or GravityReranker()
@@ -55,6 +63,10 @@ class RetrievalBroker:
         self.iterative_strategy = IterativeRetrievalStrategy(repository)
         self.atomic_engine = atomic_engine or AtomicRetrievalEngine()
         self.scope_service = RetrievalScopeService()
+        self.result_cache = result_cache or RetrievalResultCache(
+            max_entries=int(getattr(settings, "RETRIEVAL_RESULT_CACHE_MAX_ENTRIES", 512) or 512),
+            ttl_seconds=float(getattr(settings, "RETRIEVAL_RESULT_CACHE_TTL_SECONDS", 120.0) or 0.0),
+        )
 
     async def close(self) -> None:
         try:
@@ -142,6 +154,16 @@ class RetrievalBroker:
         }
         total_started = time.perf_counter()
 
+        cache_key, cache_generation = await self._result_cache_key(
+            query, scope_context, filter_conditions, k, fetch_k, enable_reranking, iterative, strategy_kwargs
+        )
+        if cache_key:
+            cached = await self._load_cached_result(cache_key, total_started)
+            if cached is not None:
+                ranked, cached_trace = cached
+                return {"items": ranked, "trace": cached_trace} if return_trace else ranked
+            trace_payload["cache_hit"] = False
+
         try:
             retrieval_started = time.perf_counter()
             
@@ -175,6 +197,12 @@ class RetrievalBroker:
 
             trace_payload["timings_ms"]["rerank"] = round((time.perf_counter() - rerank_started) * 1000, 2)
             trace_payload["timings_ms"]["total"] = round((time.perf_counter() - total_started) * 1000, 2)
+
+            if cache_key and ranked:
+                self.result_cache.put(
+                    cache_key,
+                    CachedRetrieval.from_rows(ranked, trace_payload, generation=cache_generation),
+                )
             
             return {"items": ranked, "trace": trace_payload} if return_trace else ranked
 
@@ -182,6 +210,75 @@ class RetrievalBroker:
             logger.error("broker_retrieval_failed", error=str(e), query=query)
             raise e
 
+    async def _result_cache_key(
+        self,
+        query: str,
+        scope_context: Dict[str, Any],
+        filter_conditions: Dict[str, Any],
+        k: int,
+        fetch_k: int,
+        enable_reranking: bool,
+        iterative: bool,
+        strategy_kwargs: Dict[str, Any],
+    ) -> tuple[Optional[str], int]:
+        """Cache key for this call plus the tenant index generation it was built on."""
+        if not bool(getattr(settings, "RETRIEVAL_RESULT_CACHE_ENABLED", False)):
+            return None, 0
+        tenant_id = str(filter_conditions.get("tenant_id") or scope_context.get("tenant_id") or "").strip()
+        if not tenant_id:
+            return None, 0
+        generation = await index_generations.current(tenant_id)
+        if generation is None:
+            # Shared generation store unreachable: cannot tell whether entries are stale.
+            return None, 0
+        key = build_result_cache_key(
+            query=query,
+            scope={"scope": scope_context, "filters": filter_conditions},
+            k=k,
+            fetch_k=fetch_k,
+            rerank_mode=self._rerank_mode() if enable_reranking else "off",
+            generation=generation,
+            options={
+                "engine_mode": self._engine_mode(),
+                "iterative": bool(iterative),
+                **strategy_kwargs,
+            },
+        )
+        return key, generation
+
+    async def _load_cached_result(
+        self, cache_key: str, total_started: float
+    ) -> Optional[tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """Rehydrate chunk payloads for a cached ranking; ``None`` on miss or stale entry."""
+        entry = self.result_cache.get(cache_key)
+        if entry is None:
+            return None
+        payload_ids = entry.payload_ids()
+        payloads: Dict[str, Dict[str, Any]] = {}
+        if payload_ids:
+            try:
+                rows = await self.atomic_engine.fetch_chunks_by_ids(payload_ids)
+            except Exception as exc:
+                logger.warning("retrieval_cache_rehydrate_failed", error=str(exc))
+                return None
+            payloads = {str(row.get("id") or ""): row for row in rows or [] if isinstance(row, dict)}
+        ranked = entry.rehydrate(payloads)
+        if ranked is None:
+            # A cached chunk disappeared without a generation bump (e.g. another process).
+            self.result_cache.discard(cache_key)
+            return None
+
+        trace = copy.deepcopy(entry.trace)
+        trace["cache_hit"] = True
+        trace["result_cache"] = {
+            "generation": entry.generation,
+            "age_ms": round((time.monotonic() - entry.created_at) * 1000, 2),
+            "rehydrated": len(payload_ids),
+        }
+        trace["timings_ms"] = {"total": round((time.perf_counter() - total_started) * 1000, 2)}
+        logger.debug("retrieval_cache_hit", generation=entry.generation, items=len(ranked))
+        return ranked, trace
+
     async def _execute_iterative_strategy(self, query, filters, k, fetch_k, trace, **kwargs):
         engine = JinaEmbeddingService.get_instance()
         vectors = await engine.embed_texts([query], task="retrieval.query")
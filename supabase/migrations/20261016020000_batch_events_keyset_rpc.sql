@@ -0,0 +1,65 @@
+-- ============================================================================
+-- MIGRATION: Keyset-paginated ingestion event feed per batch
+--   get_batch_events passed every document id of a batch in an IN filter and
+--   re-sorted limit*5 rows in Python to emulate a (created_at, id) cursor.
+--   This RPC filters by batch server-side and pages with a composite
+--   (created_at, id) > (cursor) predicate backed by a matching index.
+--   Returns up to p_limit + 1 rows so callers can derive has_more.
+--   Two indexes back the two plans the planner can pick: walk events in
+--   (created_at, id) order probing source_documents by pk (large/active
+--   batches), or seek per batch document on (source_document_id, created_at, id)
+--   (small batches in a busy table).
+-- ============================================================================
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_events_source_created_id
+    ON public.ingestion_events (source_document_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_events_created_id
+    ON public.ingestion_events (created_at, id);
+
+CREATE OR REPLACE FUNCTION public.get_batch_events_page(
+    p_batch_id uuid,
+    p_after_created_at timestamptz DEFAULT NULL,
+    p_after_id uuid DEFAULT NULL,
+    p_limit int DEFAULT 100
+)
+RETURNS TABLE (
+    id uuid,
+    source_document_id uuid,
+    filename text,
+    message text,
+    status text,
+    created_at timestamptz,
+    metadata jsonb
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT
+        e.id,
+        e.source_document_id,
+        d.filename,
+        e.message,
+        e.status,
+        e.created_at,
+        e.metadata
+    FROM public.ingestion_events e
+    JOIN public.source_documents d ON d.id = e.source_document_id
+    WHERE d.batch_id = p_batch_id
+      -- Row comparison without an OR branch so it stays an index range condition.
+      AND (e.created_at, e.id) > (
+          COALESCE(p_after_created_at, '-infinity'::timestamptz),
+          COALESCE(p_after_id, '00000000-0000-0000-0000-000000000000'::uuid)
+      )
+    ORDER BY e.created_at ASC, e.id ASC
+    LIMIT GREATEST(1, LEAST(COALESCE(p_limit, 100), 500)) + 1;
+$$;
+
+REVOKE ALL ON FUNCTION public.get_batch_events_page(uuid, timestamptz, uuid, int) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.get_batch_events_page(uuid, timestamptz, uuid, int) TO service_role;
+
+COMMIT;
@@ -0,0 +1,37 @@
+-- ============================================================================
+-- MIGRATION: NOTIFY workers when job_queue rows become pending
+--   Workers polled fetch_next_job every WORKER_POLL_INTERVAL_SECONDS from every
+--   poller, even when the queue was empty. Each worker process now holds one
+--   LISTEN job_queue_pending connection and wakes its idle pollers on these
+--   notifications; polling remains only as a slow safety net.
+--   Payload: '<job_type>|<epoch seconds of the transition>' so workers can
+--   measure pickup latency. Requeues (stale sweep, transient retries) notify
+--   too, since they also move a row back to pending.
+-- ============================================================================
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.notify_job_queue_pending()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.status = 'pending'
+       AND (TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM NEW.status) THEN
+        PERFORM pg_notify(
+            'job_queue_pending',
+            NEW.job_type || '|' || extract(epoch FROM clock_timestamp())::text
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_job_queue_notify_pending ON public.job_queue;
+
+CREATE TRIGGER trg_job_queue_notify_pending
+    AFTER INSERT OR UPDATE OF status ON public.job_queue
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_job_queue_pending();
+
+COMMIT;
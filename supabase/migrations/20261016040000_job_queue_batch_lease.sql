@@ -0,0 +1,66 @@
+-- ============================================================================
+-- MIGRATION: Lease-based batch claims for job_queue
+--   fetch_next_job claimed one row per RPC and every poller ran its own loop.
+--   Workers now run one dispatcher per job type that claims up to p_limit rows
+--   in a single statement and hands them to local workers.
+--   Claimed rows carry lease_expires_at; the worker heartbeat renews it. Rows
+--   still 'processing' after their lease expired (crashed worker) are claimable
+--   again by the same RPC, without waiting for the stale-processing sweep.
+-- ============================================================================
+
+BEGIN;
+
+ALTER TABLE public.job_queue ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_type_status_created_at
+    ON public.job_queue (job_type, status, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_processing_lease
+    ON public.job_queue (job_type, lease_expires_at)
+    WHERE status = 'processing';
+
+CREATE OR REPLACE FUNCTION public.fetch_next_jobs(
+    p_job_type VARCHAR,
+    p_limit INT DEFAULT 1,
+    p_lease_seconds INT DEFAULT 90
+)
+RETURNS TABLE (
+    id UUID,
+    job_type VARCHAR,
+    payload JSONB,
+    tenant_id UUID,
+    lease_expires_at TIMESTAMP WITH TIME ZONE
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH picked AS (
+        -- One locking SELECT: FOR UPDATE is not allowed on UNION inputs.
+        SELECT q.id
+        FROM public.job_queue q
+        WHERE (p_job_type IS NULL OR q.job_type = p_job_type)
+          AND (
+              q.status = 'pending'
+              OR (q.status = 'processing' AND q.lease_expires_at < NOW())
+          )
+        ORDER BY q.created_at ASC
+        LIMIT GREATEST(1, LEAST(COALESCE(p_limit, 1), 100))
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE public.job_queue
+    SET status = 'processing',
+        updated_at = NOW(),
+        lease_expires_at = NOW() + make_interval(secs => GREATEST(1, COALESCE(p_lease_seconds, 90)))
+    FROM picked
+    WHERE job_queue.id = picked.id
+    RETURNING job_queue.id, job_queue.job_type, job_queue.payload, job_queue.tenant_id, job_queue.lease_expires_at;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.fetch_next_jobs(VARCHAR, INT, INT) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.fetch_next_jobs(VARCHAR, INT, INT) TO service_role;
+
+COMMIT;
@@ -0,0 +1,183 @@
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+PROJECT_ROOT = _project_root()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Local stand-in for get_batch_events_page (supabase/migrations/20261016020000_batch_events_keyset_rpc.sql).
+# CROSS JOIN pins SQLite to the plan the (created_at, id) index exists for: walk events in
+# cursor order and probe the document by primary key, stopping after limit + 1 matches.
+KEYSET_SQL = """
+SELECT e.id, e.source_document_id, d.filename, e.message, e.status, e.created_at, e.metadata
+FROM ingestion_events e
+CROSS JOIN source_documents d ON d.id = e.source_document_id
+WHERE d.batch_id = ?
+  AND (e.created_at, e.id) > (?, ?)
+ORDER BY e.created_at, e.id
+LIMIT ?
+"""
+
+
+def _build_db(documents: int, events_per_doc: int, noise_batches: int, seed: int) -> tuple[sqlite3.Connection, str]:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE source_documents (id TEXT PRIMARY KEY, batch_id TEXT, filename TEXT, created_at TEXT);
+        CREATE INDEX idx_source_documents_batch ON source_documents(batch_id);
+        CREATE TABLE ingestion_events (
+            id TEXT PRIMARY KEY, source_document_id TEXT, message TEXT, status TEXT,
+            created_at TEXT, metadata TEXT
+        );
+        CREATE INDEX idx_ingestion_events_source_id ON ingestion_events(source_document_id);
+        CREATE INDEX idx_ingestion_events_source_created_id
+            ON ingestion_events(source_document_id, created_at, id);
+        CREATE INDEX idx_ingestion_events_created_id ON ingestion_events(created_at, id);
+        """
+    )
+    target = str(uuid.UUID(int=rng.getrandbits(128)))
+    batches = [target] + [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(noise_batches)]
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    docs, events = [], []
+    for batch_index, batch_id in enumerate(batches):
+        for d in range(documents):
+            doc_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            docs.append((doc_id, batch_id, f"doc-{batch_index}-{d}.pdf", start.isoformat()))
+            for e in range(events_per_doc):
+                # Coarse timestamps: many events share a created_at, as worker bursts do.
+                at = start + timedelta(seconds=rng.randint(0, documents * events_per_doc // 20))
+                events.append(
+                    (str(uuid.UUID(int=rng.getrandbits(128))), doc_id, f"stage {e}", "INFO", at.isoformat(), "{}")
+                )
+    conn.executemany("INSERT INTO source_documents VALUES (?, ?, ?, ?)", docs)
+    conn.executemany("INSERT INTO ingestion_events VALUES (?, ?, ?, ?, ?, ?)", events)
+    conn.commit()
+    return conn, target
+
+
+def _parse_cursor(cursor: str | None) -> tuple[str, str] | None:
+    if not cursor or "|" not in cursor:
+        return None
+    ts, event_id = cursor.split("|", 1)
+    return ts, event_id
+
+
+def _legacy_page(conn: sqlite3.Connection, batch_id: str, cursor: str | None, limit: int) -> tuple[list, bool, int]:
+    """Previous client-side emulation: all doc ids in IN(), gte(created_at), limit*5, sort in Python."""
+    docs = conn.execute(
+        "SELECT id, filename FROM source_documents WHERE batch_id = ? ORDER BY created_at", (batch_id,)
+    ).fetchall()
+    fetched = len(docs)
+    doc_map = dict(docs)
+    parsed = _parse_cursor(cursor)
+    placeholders = ",".join("?" * len(doc_map))
+    sql = f"SELECT id, source_document_id, message, status, created_at, metadata FROM ingestion_events WHERE source_document_id IN ({placeholders})"
+    params: list[Any] = list(doc_map)
+    if parsed is not None:
+        sql += " AND created_at >= ?"
+        params.append(parsed[0])
+    sql += " ORDER BY created_at LIMIT ?"
+    params.append(limit * 5)
+    rows = conn.execute(sql, params).fetchall()
+    fetched += len(rows)
+    items = []
+    for row in rows:
+        key = (datetime.fromisoformat(row[4]), row[0])
+        if parsed is not None and key <= (datetime.fromisoformat(parsed[0]), parsed[1]):
+            continue
+        items.append((key, row, doc_map.get(row[1], "")))
+    items.sort(key=lambda item: item[0])
+    return [item[1] for item in items[:limit]], len(items) > limit, fetched
+
+
+def _keyset_page(conn: sqlite3.Connection, batch_id: str, cursor: str | None, limit: int) -> tuple[list, bool, int]:
+    parsed = _parse_cursor(cursor)
+    after_ts, after_id = parsed if parsed else ("", "")  # sorts before every row, like -infinity
+    rows = conn.execute(KEYSET_SQL, (batch_id, after_ts, after_id, limit + 1)).fetchall()
+    return [(r[0], r[1], r[3], r[4], r[5], r[6]) for r in rows[:limit]], len(rows) > limit, len(rows)
+
+
+def _drain(page_fn: Callable, conn: sqlite3.Connection, batch_id: str, limit: int, max_pages: int) -> dict[str, Any]:
+    cursor, pages, delivered, fetched, samples = None, 0, 0, 0, []
+    seen: set[str] = set()
+    while pages < max_pages:
+        started = time.perf_counter()
+        items, has_more, rows = page_fn(conn, batch_id, cursor, limit)
+        samples.append((time.perf_counter() - started) * 1000)
+        pages += 1
+        fetched += rows
+        delivered += len(items)
+        seen.update(item[0] for item in items)
+        if items:
+            cursor = f"{items[-1][4]}|{items[-1][0]}"
+        if not has_more:
+            break
+    tail_samples = []
+    for _ in range(20):  # steady-state viewer poll at the tail of the feed
+        started = time.perf_counter()
+        page_fn(conn, batch_id, cursor, limit)
+        tail_samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "pages": pages,
+        "events_delivered": delivered,
+        "unique_events": len(seen),
+        "rows_fetched": fetched,
+        "page_p50_ms": round(statistics.median(samples), 3),
+        "drain_total_ms": round(sum(samples), 1),
+        "tail_poll_p50_ms": round(statistics.median(tail_samples), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the batch event feed: legacy IN()+Python cursor vs keyset (created_at, id)."
+    )
+    parser.add_argument("--documents", type=int, default=10000, help="Documents in the watched batch")
+    parser.add_argument("--events-per-doc", type=int, default=5)
+    parser.add_argument("--noise-batches", type=int, default=1, help="Other batches of the same size")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--max-pages", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Optional output JSON path")
+    args = parser.parse_args()
+
+    conn, batch_id = _build_db(args.documents, args.events_per_doc, args.noise_batches, args.seed)
+    expected = conn.execute(
+        "SELECT COUNT(*) FROM ingestion_events e JOIN source_documents d ON d.id = e.source_document_id "
+        "WHERE d.batch_id = ?",
+        (batch_id,),
+    ).fetchone()[0]
+    report: dict[str, Any] = {
+        "documents": args.documents,
+        "batch_events": expected,
+        "limit": args.limit,
+        "legacy": _drain(_legacy_page, conn, batch_id, args.limit, args.max_pages),
+        "keyset": _drain(_keyset_page, conn, batch_id, args.limit, args.max_pages),
+    }
+    report["tail_poll_speedup"] = round(
+        report["legacy"]["tail_poll_p50_ms"] / max(report["keyset"]["tail_poll_p50_ms"], 1e-9), 1
+    )
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+PROJECT_ROOT = _project_root()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _synthetic_pages(edges: int, avg_degree: float, page_size: int, seed: int) -> tuple[list, list]:
+    """Entity and relation pages shaped like PostgREST rows (uuid-like string ids)."""
+    rng = random.Random(seed)
+    nodes = max(2, int(2 * edges / max(avg_degree, 1.0)))
+    node_ids = [f"{rng.getrandbits(128):032x}" for _ in range(nodes)]
+    entity_rows = [{"id": node_id} for node_id in sorted(node_ids)]
+    relation_rows = []
+    for i in range(edges):
+        # Preferential-ish attachment: a heavy head of hub entities plus a long tail.
+        source = node_ids[min(int(rng.paretovariate(1.2)) - 1, nodes - 1)] if i % 4 == 0 else rng.choice(node_ids)
+        relation_rows.append(
+            {
+                "id": f"{i:032x}",
+                "source_entity_id": source,
+                "target_entity_id": rng.choice(node_ids),
+                "weight": round(rng.uniform(0.1, 2.0), 3),
+            }
+        )
+
+    def _paged(rows: list[dict]) -> list[list[dict]]:
+        return [rows[i : i + page_size] for i in range(0, len(rows), page_size)]
+
+    return _paged(entity_rows), _paged(relation_rows)
+
+
+def _build_legacy(entity_pages: list, relation_pages: list) -> Any:
+    """Previous path: NetworkX graph, then a second pass into igraph-style edge tuples."""
+    import networkx as nx
+
+    graph = nx.Graph()
+    for page in entity_pages:
+        for row in page:
+            graph.add_node(str(row.get("id")))
+    for page in relation_pages:
+        for row in page:
+            source = str(row.get("source_entity_id"))
+            target = str(row.get("target_entity_id"))
+            if not source or not target or source == target:
+                continue
+            try:
+                weight = float(row.get("weight", 1.0) or 1.0)
+            except Exception:
+                weight = 1.0
+            graph.add_edge(source, target, weight=max(weight, 0.0001))
+
+    nodes = list(graph.nodes())
+    node_to_index = {node_id: idx for idx, node_id in enumerate(nodes)}
+    edge_tuples = []
+    weights = []
+    for source, target, attrs in graph.edges(data=True):
+        edge_tuples.append((node_to_index[source], node_to_index[target]))
+        weights.append(float(attrs.get("weight", 1.0)))
+    return _maybe_igraph(len(nodes), edge_tuples, weights)
+
+
+def _build_streamed(entity_pages: list, relation_pages: list) -> Any:
+    from app.domain.ingestion.knowledge.community_graph import TenantGraphBuilder
+
+    builder = TenantGraphBuilder()
+    for page in entity_pages:
+        builder.add_nodes(row.get("id") for row in page)
+    for page in relation_pages:
+        builder.add_relations(page)
+    graph = builder.build()
+    return _maybe_igraph(graph.number_of_nodes, graph.edges, graph.weights.tolist())
+
+
+def _maybe_igraph(nodes: int, edges: Any, weights: list[float]) -> Any:
+    try:
+        import igraph as ig
+    except ImportError:
+        return nodes, len(edges)
+    graph_ig = ig.Graph(n=nodes, edges=edges, directed=False)
+    graph_ig.es["weight"] = weights
+    return graph_ig.vcount(), graph_ig.ecount()
+
+
+def _measure(fn: Any, args: tuple, repeats: int, trace_memory: bool) -> dict[str, Any]:
+    samples_ms: list[float] = []
+    result = None
+    for _ in range(max(1, repeats)):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn(*args)
+        samples_ms.append((time.perf_counter() - started) * 1000)
+    report: dict[str, Any] = {
+        "p50_ms": round(statistics.median(samples_ms), 1),
+        "min_ms": round(min(samples_ms), 1),
+        "nodes_edges": list(result) if isinstance(result, tuple) else None,
+    }
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        fn(*args)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["peak_mb"] = round(peak / (1024 * 1024), 1)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark community graph assembly: NetworkX+igraph conversion vs streamed int32 arrays."
+    )
+    parser.add_argument("--edges", default="100000,1000000", help="Comma-separated synthetic edge counts")
+    parser.add_argument("--avg-degree", type=float, default=8.0)
+    parser.add_argument("--page-size", type=int, default=1000, help="Rows per keyset page")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--memory", action="store_true", help="Also report tracemalloc peak (slow)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Optional output JSON path")
+    args = parser.parse_args()
+
+    report: dict[str, Any] = {"page_size": args.page_size, "avg_degree": args.avg_degree, "graphs": {}}
+    for token in args.edges.split(","):
+        edges = int(token.strip())
+        entity_pages, relation_pages = _synthetic_pages(edges, args.avg_degree, args.page_size, args.seed)
+        legacy = _measure(_build_legacy, (entity_pages, relation_pages), args.repeats, args.memory)
+        streamed = _measure(_build_streamed, (entity_pages, relation_pages), args.repeats, args.memory)
+        report["graphs"][str(edges)] = {
+            "relation_pages": len(relation_pages),
+            "legacy_networkx": legacy,
+            "streamed_arrays": streamed,
+            "speedup": round(legacy["p50_ms"] / max(streamed["p50_ms"], 1e-9), 2),
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
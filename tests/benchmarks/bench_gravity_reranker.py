@@ -0,0 +1,91 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+PROJECT_ROOT = _project_root()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _candidates(count: int, seed: int) -> list[Any]:
+    from app.domain.ingestion.chunking.text_normalization import extract_section_path
+    from app.domain.schemas.knowledge_schemas import RAGSearchResult
+
+    rng = random.Random(seed)
+    sections = ["0 Introducción > 0.1 Generalidades", "5 Liderazgo", "8 Operación", "Anexo A"]
+    levels = ["administrative", "policy", "canonical", "supplementary", None]
+    rows = []
+    for i in range(count):
+        section = rng.choice(sections)
+        content = (
+            f"[PARENT_CONTEXT]\nDOC_TITLE: ISO 9001\nSECTION_PATH: {section}\n[/PARENT_CONTEXT]\n\n"
+            + "Requisito del sistema de gestión. " * 40
+        )
+        rows.append(
+            RAGSearchResult(
+                id=f"c{i}",
+                content=content,
+                similarity=rng.random(),
+                score=0.0,
+                source_layer=rng.choice(["knowledge", "tenant", "personal"]),
+                metadata={
+                    "authority_level": rng.choice(levels),
+                    "section_path": extract_section_path(content),
+                    "source_id": f"s{i % 7}",
+                },
+            )
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark GravityReranker.rerank per candidate.")
+    parser.add_argument("--fetch-k", type=int, default=200, help="Candidates per rerank call")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed rerank calls per query")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Optional output JSON path")
+    args = parser.parse_args()
+
+    from app.ai.rerankers.gravity_reranker import GravityReranker
+    from app.domain.schemas.knowledge_schemas import AgentRole, RetrievalIntent, TaskType
+
+    reranker = GravityReranker()
+    candidates = _candidates(max(1, args.fetch_k), args.seed)
+    queries = {
+        "plain": "requisitos para el control de documentos",
+        "heading": "que dice la introducción sobre liderazgo",
+    }
+    report: dict[str, Any] = {"fetch_k": len(candidates), "repeats": args.repeats, "queries": {}}
+    for label, query in queries.items():
+        intent = RetrievalIntent(query=query, role=AgentRole.SOCRATIC_MENTOR, task=TaskType.EXPLANATION)
+        reranker.rerank(candidates, intent)  # warm-up
+        samples_ms: list[float] = []
+        for _ in range(max(1, args.repeats)):
+            started = time.perf_counter()
+            reranker.rerank(candidates, intent)
+            samples_ms.append((time.perf_counter() - started) * 1000)
+        p50 = statistics.median(samples_ms)
+        report["queries"][label] = {
+            "p50_ms": round(p50, 4),
+            "p95_ms": round(sorted(samples_ms)[int(0.95 * (len(samples_ms) - 1))], 4),
+            "per_candidate_us": round(p50 * 1000 / len(candidates), 3),
+        }
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
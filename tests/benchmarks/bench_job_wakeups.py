@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+PROJECT_ROOT = _project_root()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.infrastructure.queue.base_worker import BaseWorkerProcessor  # noqa: E402
+from app.infrastructure.queue.job_lease_dispatcher import JobLeaseDispatcher  # noqa: E402
+from app.infrastructure.queue.job_notifications import (  # noqa: E402
+    InMemoryJobNotificationSource,
+    JobWakeupHub,
+)
+
+
+class _SimulatedJobStore:
+    """In-memory job_queue with a fixed per-RPC latency; counts fetch_next_job calls."""
+
+    def __init__(self, rpc_latency_ms: float) -> None:
+        self.rpc_latency = rpc_latency_ms / 1000.0
+        self.heartbeats: dict[str, int] = {}
+        self.pending: list[dict[str, Any]] = []
+        self.fetches = 0
+        self.empty_fetches = 0
+        self.pickup_ms: list[float] = []
+
+    async def fetch_next_job(self, job_type: str) -> Optional[dict[str, Any]]:
+        self.fetches += 1
+        await asyncio.sleep(self.rpc_latency)
+        if not self.pending:
+            self.empty_fetches += 1
+            return None
+        job = self.pending.pop(0)
+        self.pickup_ms.append((time.perf_counter() - job["enqueued_at"]) * 1000.0)
+        return job
+
+    async def fetch_next_jobs(self, job_type: str, n: int, lease_seconds: Optional[int] = None) -> list[dict[str, Any]]:
+        self.fetches += 1
+        await asyncio.sleep(self.rpc_latency)
+        if not self.pending:
+            self.empty_fetches += 1
+            return []
+        claimed, self.pending = self.pending[:n], self.pending[n:]
+        now = time.perf_counter()
+        self.pickup_ms.extend((now - job["enqueued_at"]) * 1000.0 for job in claimed)
+        return claimed
+
+    def track_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] = self.heartbeats.get(job_id, 0) + 1
+
+    def untrack_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] -= 1
+
+    async def mark_job_final(self, job_id: str, status: str, **_: Any) -> None:
+        return None
+
+
+async def _run(mode: str, args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    store = _SimulatedJobStore(args.rpc_latency_ms)
+    hub: Optional[JobWakeupHub] = None
+    source: Optional[InMemoryJobNotificationSource] = None
+    if mode in ("notify", "lease"):
+        hub = JobWakeupHub(safety_poll_interval_seconds=args.safety_poll_seconds)
+        source = InMemoryJobNotificationSource(hub)
+        await source.start()
+
+    async def handler(job: dict[str, Any]) -> dict[str, Any]:
+        await asyncio.sleep(args.job_ms / 1000.0)
+        return {"ok": True}
+
+    if mode == "lease":
+        dispatcher = JobLeaseDispatcher(
+            store, "ingest_document", args.pollers, wakeup_hub=hub, poll_interval=args.poll_interval
+        )
+        pollers = [asyncio.create_task(dispatcher.run())] + [
+            asyncio.create_task(
+                BaseWorkerProcessor(store, poller_id=i + 1).run_queue_loop("ingest_document", handler, dispatcher)
+            )
+            for i in range(args.pollers)
+        ]
+    else:
+        pollers = [
+            asyncio.create_task(
+                BaseWorkerProcessor(store, poller_id=i + 1, wakeup_hub=hub).run_job_loop(
+                    "ingest_document", handler, args.poll_interval
+                )
+            )
+            for i in range(args.pollers)
+        ]
+    started = time.perf_counter()
+    total_jobs = args.backlog + args.jobs
+    for i in range(total_jobs):
+        if i >= args.backlog:
+            await asyncio.sleep(rng.expovariate(1.0 / args.mean_gap_seconds))
+        store.pending.append({"id": f"job-{i}", "payload": {}, "enqueued_at": time.perf_counter()})
+        if source is not None:
+            source.publish("ingest_document")
+    while store.pending or len(store.pickup_ms) < total_jobs:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    idle_baseline = store.empty_fetches
+    await asyncio.sleep(args.idle_seconds)
+    idle_fetches = store.empty_fetches - idle_baseline
+    for task in pollers:
+        task.cancel()
+    await asyncio.gather(*pollers, return_exceptions=True)
+
+    pickups = sorted(store.pickup_ms)
+    return {
+        "fetch_rpcs": store.fetches,
+        "empty_fetch_rpcs": store.empty_fetches,
+        "empty_fetch_rpcs_per_min": round(idle_baseline * 60.0 / elapsed, 1),
+        "idle_window_fetch_rpcs_per_min": round(idle_fetches * 60.0 / max(args.idle_seconds, 1e-9), 1),
+        "pickup_p50_ms": round(statistics.median(pickups), 1),
+        "pickup_p95_ms": round(pickups[int(0.95 * (len(pickups) - 1))], 1),
+        "elapsed_s": round(elapsed, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark worker job pickup: fixed-interval polling vs LISTEN/NOTIFY wakeups "
+            "vs one notify-driven lease dispatcher claiming batches."
+        )
+    )
+    parser.add_argument("--pollers", type=int, default=8, help="WORKER_CONCURRENCY + ENRICHMENT_WORKER_CONCURRENCY")
+    parser.add_argument("--backlog", type=int, default=200, help="Jobs already queued when workers start")
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs enqueued one by one after the backlog")
+    parser.add_argument("--mean-gap-seconds", type=float, default=1.0, help="Mean time between enqueues")
+    parser.add_argument("--job-ms", type=float, default=50.0)
+    parser.add_argument("--rpc-latency-ms", type=float, default=15.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--safety-poll-seconds", type=float, default=30.0)
+    parser.add_argument("--idle-seconds", type=float, default=10.0, help="Quiet window measured after the last job")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=None, help="Optional output JSON path")
+    args = parser.parse_args()
+
+    report: dict[str, Any] = {
+        "pollers": args.pollers,
+        "backlog": args.backlog,
+        "jobs": args.jobs,
+        "polling": asyncio.run(_run("polling", args)),
+        "notify": asyncio.run(_run("notify", args)),
+        "lease": asyncio.run(_run("lease", args)),
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -141,6 +141,16 @@ async def main() -> int:
         default="default",
         help="Override ATOMIC_ENABLE_FTS for this run",
     )
+    parser.add_argument(
+        "--local-snapshot",
+        default=None,
+        help="Serve retrieval from an in-process index snapshot instead of Supabase RPCs",
+    )
+    parser.add_argument(
+        "--local-ann",
+        action="store_true",
+        help="Build an HNSW index for --local-snapshot (requires hnswlib)",
+    )
     parser.add_argument(
         "--enable-graph",
         choices=["default", "on", "off"],
@@ -155,7 +165,7 @@ async def main() -> int:
 
     from app.infrastructure.settings import settings
     from app.infrastructure.observability.retrieval_metrics import retrieval_metrics_store
-    from app.services.retrieval.atomic_engine import AtomicRetrievalEngine
+    from app.infrastructure.supabase.repositories.atomic_engine import AtomicRetrievalEngine
 
     if args.hybrid_rpc != "default":
         settings.ATOMIC_USE_HYBRID_RPC = args.hybrid_rpc == "on"
@@ -171,7 +181,17 @@ async def main() -> int:
     if args.collection_id:
         scope_context["collection_id"] = args.collection_id
 
-    engine = AtomicRetrievalEngine()
+    local_repository = None
+    if args.local_snapshot:
+        from app.infrastructure.local_index.repository import LocalRetrievalRepository
+
+        local_repository = LocalRetrievalRepository.from_snapshot(
+            args.local_snapshot, ann=bool(args.local_ann)
+        )
+        if args.enable_graph == "default":
+            settings.ATOMIC_ENABLE_GRAPH_HOP = False
+
+    engine = AtomicRetrievalEngine(retrieval_repository=local_repository)
     runs: list[dict[str, Any]] = []
 
     bench_started = time.perf_counter()
@@ -207,6 +227,7 @@ async def main() -> int:
         "k": args.k,
         "fetch_k": args.fetch_k,
         "repeats": args.repeats,
+        "local_snapshot": args.local_snapshot,
         "settings": {
             "ATOMIC_USE_HYBRID_RPC": bool(settings.ATOMIC_USE_HYBRID_RPC),
             "ATOMIC_ENABLE_FTS": bool(settings.ATOMIC_ENABLE_FTS),
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+PROJECT_ROOT = _project_root()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+_PAGE_SIZE = 500
+
+
+def _parse_embedding(value: Any) -> list[float] | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    return [float(x) for x in value] if value else None
+
+
+async def _fetch_all(query_factory: Any) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    start = 0
+    while True:
+        response = await query_factory().range(start, start + _PAGE_SIZE - 1).execute()
+        page = [row for row in (response.data or []) if isinstance(row, dict)]
+        rows.extend(page)
+        if len(page) < _PAGE_SIZE:
+            return rows
+        start += _PAGE_SIZE
+
+
+def _scope_of(metadata: dict[str, Any]) -> str:
+    for key in ("source_standard", "standard", "scope", "norma"):
+        value = str(metadata.get(key) or "").strip()
+        if value:
+            return value
+    return ""
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Dump a tenant's chunks and RAPTOR summaries into a local index snapshot."
+    )
+    parser.add_argument("--tenant-id", required=True, help="Tenant UUID to export")
+    parser.add_argument("--collection-id", default=None, help="Optional collection_id filter")
+    parser.add_argument("--out", default=".cache/local_index.npz", help="Snapshot output path")
+    args = parser.parse_args()
+
+    from app.infrastructure.local_index.repository import LocalRetrievalRepository
+    from app.infrastructure.supabase.client import get_async_supabase_client
+
+    client = await get_async_supabase_client()
+    started = time.perf_counter()
+
+    def _documents() -> Any:
+        query = (
+            client.table("source_documents")
+            .select("id,metadata,institution_id,is_global,collection_id")
+            .eq("institution_id", args.tenant_id)
+        )
+        if args.collection_id:
+            query = query.eq("collection_id", args.collection_id)
+        return query.order("id")
+
+    documents = {str(row["id"]): row for row in await _fetch_all(_documents)}
+
+    chunks: list[dict[str, Any]] = []
+    source_ids = list(documents)
+    for offset in range(0, len(source_ids), 50):
+        batch = source_ids[offset : offset + 50]
+        rows = await _fetch_all(
+            lambda: client.table("content_chunks")
+            .select("id,content,semantic_context,file_page_number,source_id,metadata,embedding")
+            .in_("source_id", batch)
+            .order("id")
+        )
+        for row in rows:
+            doc = documents.get(str(row.get("source_id")), {})
+            doc_metadata = doc.get("metadata") if isinstance(doc.get("metadata"), dict) else {}
+            chunks.append(
+                {
+                    **row,
+                    "tenant_id": doc.get("institution_id"),
+                    "is_global": bool(doc.get("is_global")),
+                    "collection_id": doc.get("collection_id"),
+                    "source_standard": _scope_of(doc_metadata),
+                    "embedding": _parse_embedding(row.get("embedding")),
+                }
+            )
+
+    def _summaries() -> Any:
+        query = (
+            client.table("regulatory_nodes")
+            .select("id,content,title,level,tenant_id,collection_id,properties,children_ids,embedding")
+            .eq("tenant_id", args.tenant_id)
+            .gt("level", 0)
+        )
+        if args.collection_id:
+            query = query.eq("collection_id", args.collection_id)
+        return query.order("id")
+
+    summaries = [
+        {**row, "embedding": _parse_embedding(row.get("embedding"))}
+        for row in await _fetch_all(_summaries)
+    ]
+
+    repository = LocalRetrievalRepository(chunks, summaries)
+    repository.save_snapshot(args.out)
+    print(
+        f"Wrote {args.out}: documents={len(documents)} chunks={len(chunks)} "
+        f"summaries={len(summaries)} in {round(time.perf_counter() - started, 2)}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,124 @@
+"""Runs the job_queue migrations against a real Postgres.
+
+Set ``TEST_DATABASE_URL`` to a disposable database (the tests create and drop
+their own schema objects); the module is skipped otherwise.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+MIGRATIONS = Path(__file__).resolve().parents[2] / "supabase" / "migrations"
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+# Minimal stand-in for the Supabase-side job_queue schema (auth.uid(), RLS policies omitted).
+BASE_SCHEMA = """
+DROP TABLE IF EXISTS public.job_queue CASCADE;
+DROP TYPE IF EXISTS public.job_status CASCADE;
+DO $$ BEGIN
+    CREATE ROLE service_role;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+CREATE TYPE public.job_status AS ENUM ('pending', 'processing', 'completed', 'failed');
+CREATE TABLE public.job_queue (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type VARCHAR(255) NOT NULL,
+    status public.job_status NOT NULL DEFAULT 'pending',
+    payload JSONB NOT NULL,
+    result JSONB,
+    error_message TEXT,
+    tenant_id UUID NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+"""
+
+
+@pytest.fixture()
+def conn():
+    with psycopg.connect(DATABASE_URL, autocommit=True) as connection:
+        connection.execute(BASE_SCHEMA)
+        for name in (
+            "20261016030000_job_queue_notify_trigger.sql",
+            "20261016040000_job_queue_batch_lease.sql",
+        ):
+            connection.execute((MIGRATIONS / name).read_text(encoding="utf-8"))
+        yield connection
+        connection.execute("DROP TABLE IF EXISTS public.job_queue CASCADE")
+
+
+def _enqueue(conn, job_type: str, count: int) -> list[str]:
+    tenant = str(uuid.uuid4())
+    ids = []
+    for i in range(count):
+        row = conn.execute(
+            "INSERT INTO public.job_queue (job_type, payload, tenant_id, created_at) "
+            "VALUES (%s, '{}'::jsonb, %s, NOW() - make_interval(secs => %s)) RETURNING id",
+            (job_type, tenant, count - i),
+        ).fetchone()
+        ids.append(str(row[0]))
+    return ids
+
+
+def test_fetch_next_jobs_claims_oldest_pending_rows_with_a_lease(conn) -> None:
+    ids = _enqueue(conn, "ingest_document", 5)
+    _enqueue(conn, "enrich_document", 2)
+
+    rows = conn.execute("SELECT id, job_type, lease_expires_at FROM public.fetch_next_jobs('ingest_document', 3, 60)").fetchall()
+
+    assert [str(r[0]) for r in rows] == ids[:3]
+    assert {r[1] for r in rows} == {"ingest_document"}
+    assert all(r[2] is not None for r in rows)
+    statuses = dict(conn.execute("SELECT id::text, status::text FROM public.job_queue").fetchall())
+    assert [statuses[i] for i in ids] == ["processing"] * 3 + ["pending"] * 2
+
+
+def test_fetch_next_jobs_reclaims_expired_leases_but_not_live_ones(conn) -> None:
+    expired, live = _enqueue(conn, "ingest_document", 2)
+    conn.execute(
+        "UPDATE public.job_queue SET status = 'processing', lease_expires_at = NOW() - interval '1 minute' WHERE id = %s",
+        (expired,),
+    )
+    conn.execute(
+        "UPDATE public.job_queue SET status = 'processing', lease_expires_at = NOW() + interval '1 minute' WHERE id = %s",
+        (live,),
+    )
+
+    rows = conn.execute("SELECT id FROM public.fetch_next_jobs('ingest_document', 10, 60)").fetchall()
+
+    assert [str(r[0]) for r in rows] == [expired]
+
+
+def test_concurrent_claims_skip_locked_rows(conn) -> None:
+    ids = _enqueue(conn, "ingest_document", 4)
+    with psycopg.connect(DATABASE_URL) as other:
+        first = other.execute("SELECT id FROM public.fetch_next_jobs('ingest_document', 2, 60)").fetchall()
+        # ``other`` keeps its transaction open, so its rows stay locked.
+        second = conn.execute("SELECT id FROM public.fetch_next_jobs('ingest_document', 4, 60)").fetchall()
+        other.commit()
+
+    claimed_first = {str(r[0]) for r in first}
+    claimed_second = {str(r[0]) for r in second}
+    assert claimed_first == set(ids[:2])
+    assert claimed_second == set(ids[2:])
+
+
+def test_pending_transitions_notify_listeners(conn) -> None:
+    with psycopg.connect(DATABASE_URL, autocommit=True) as listener:
+        listener.execute("LISTEN job_queue_pending")
+        (job_id,) = _enqueue(conn, "enrich_document", 1)
+        conn.execute("UPDATE public.job_queue SET status = 'processing' WHERE id = %s", (job_id,))
+        conn.execute("UPDATE public.job_queue SET status = 'pending' WHERE id = %s", (job_id,))
+
+        payloads = [n.payload for n in listener.notifies(timeout=1.0, stop_after=2)]
+
+    assert len(payloads) == 2
+    assert all(payload.startswith("enrich_document|") for payload in payloads)
@@ -25,7 +25,7 @@ class TestChunkingServiceLateChunking(unittest.IsolatedAsyncioTestCase):
                 },
             ]
         )
-        mock_embedding_service.embed_texts = AsyncMock(return_value=[])
+        mock_embedding_service.embed_vectors = AsyncMock(return_value=[])
         service = ChunkingService(parser, embedding_service=mock_embedding_service)
 
         text = "## Capitulo 1\nRegla principal.\n\n## Capitulo 2\nExcepcion operativa."
@@ -38,7 +38,7 @@ class TestChunkingServiceLateChunking(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(len(chunks), 2)
         mock_embedding_service.chunk_and_encode.assert_awaited_once()
-        mock_embedding_service.embed_texts.assert_not_awaited()
+        mock_embedding_service.embed_vectors.assert_not_awaited()
         self.assertTrue(chunks[0].get("heading_path"))
 
     async def test_falls_back_to_contextual_chunking(self):
@@ -47,7 +47,7 @@ class TestChunkingServiceLateChunking(unittest.IsolatedAsyncioTestCase):
         mock_embedding_service.chunk_and_encode = AsyncMock(
             side_effect=RuntimeError("late chunking down")
         )
-        mock_embedding_service.embed_texts = AsyncMock(return_value=[[0.1, 0.2], [0.3, 0.4]])
+        mock_embedding_service.embed_vectors = AsyncMock(return_value=[[0.1, 0.2], [0.3, 0.4]])
         service = ChunkingService(parser, embedding_service=mock_embedding_service)
 
         text = "## Seccion A\nContenido A.\n\n## Seccion B\nContenido B."
@@ -59,7 +59,7 @@ class TestChunkingServiceLateChunking(unittest.IsolatedAsyncioTestCase):
         )
 
         self.assertGreaterEqual(len(chunks), 1)
-        mock_embedding_service.embed_texts.assert_awaited_once()
+        mock_embedding_service.embed_vectors.assert_awaited_once()
         self.assertTrue(chunks[0]["content"].startswith("[PARENT_CONTEXT]"))
 
 
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.supabase.queries import ingestion_query_service as module
+from app.infrastructure.supabase.queries.ingestion_query_service import ManualIngestionQueryService
+
+BATCH_ID = str(uuid4())
+
+
+def _events(docs: list[str]) -> list[dict[str, Any]]:
+    rows = []
+    for i in range(10):
+        # Pairs share a timestamp so the id tie-breaker matters.
+        rows.append(
+            {
+                "id": str(uuid4()),
+                "source_document_id": docs[i % len(docs)],
+                "message": f"m{i}",
+                "status": "INFO",
+                "created_at": f"2026-01-01T00:00:{i // 2:02d}+00:00",
+                "metadata": {},
+            }
+        )
+    return rows
+
+
+class _Query:
+    def __init__(self, client: "_Client", table: str) -> None:
+        self.client, self.table, self.filters = client, table, {}
+
+    def select(self, *_args: Any) -> "_Query":
+        return self
+
+    def eq(self, key: str, value: Any) -> "_Query":
+        self.filters[key] = value
+        return self
+
+    def in_(self, key: str, values: list[Any]) -> "_Query":
+        self.filters[key] = set(values)
+        return self
+
+    def gte(self, key: str, value: Any) -> "_Query":
+        return self
+
+    def order(self, *_args: Any, **_kwargs: Any) -> "_Query":
+        return self
+
+    def limit(self, *_args: Any) -> "_Query":
+        return self
+
+    def maybe_single(self) -> "_Query":
+        return self
+
+    async def execute(self) -> Any:
+        self.client.tables.append(self.table)
+        if self.table == "ingestion_batches":
+            return SimpleNamespace(data={"id": BATCH_ID, "tenant_id": "t1", "status": "processing"})
+        if self.table == "source_documents":
+            return SimpleNamespace(data=[{"id": d, "filename": f"{d[:4]}.pdf"} for d in self.client.docs])
+        return SimpleNamespace(data=list(self.client.events))
+
+
+class _Client:
+    def __init__(self, rpc_error: Exception | None = None) -> None:
+        self.docs = [str(uuid4()) for _ in range(3)]
+        self.events = _events(self.docs)
+        self.rpc_error = rpc_error
+        self.tables: list[str] = []
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: dict[str, Any]) -> Any:
+        assert name == "get_batch_events_page"
+
+        async def _execute() -> Any:
+            if self.rpc_error is not None:
+                raise self.rpc_error
+            key = lambda row: (datetime.fromisoformat(row["created_at"]), row["id"])  # noqa: E731
+            rows = sorted(self.events, key=key)
+            if params["p_after_created_at"]:
+                after = (datetime.fromisoformat(params["p_after_created_at"]), params["p_after_id"])
+                rows = [row for row in rows if key(row) > after]
+            return SimpleNamespace(data=[{**row, "filename": "x.pdf"} for row in rows[: params["p_limit"] + 1]])
+
+        return SimpleNamespace(execute=_execute)
+
+
+async def _drain(service: ManualIngestionQueryService, limit: int) -> tuple[list[str], int]:
+    cursor, seen, pages = None, [], 0
+    while True:
+        page = await service.get_batch_events(BATCH_ID, cursor=cursor, limit=limit)
+        pages += 1
+        seen.extend(item["event_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return seen, pages
+
+
+@pytest.mark.asyncio
+async def test_keyset_feed_pages_server_side_without_loading_documents(monkeypatch) -> None:
+    client = _Client()
+
+    async def _get_client():
+        return client
+
+    monkeypatch.setattr(module, "get_async_supabase_client", _get_client)
+    monkeypatch.setattr(ManualIngestionQueryService, "_batch_events_rpc_available", None)
+
+    seen, pages = await _drain(ManualIngestionQueryService(), limit=3)
+
+    expected = [row["id"] for row in sorted(client.events, key=lambda r: (r["created_at"], r["id"]))]
+    assert seen == expected
+    assert pages == 4
+    assert "source_documents" not in client.tables and "ingestion_events" not in client.tables
+
+    tail = await ManualIngestionQueryService().get_batch_events(BATCH_ID, cursor=f"2026-01-01T00:00:04+00:00|{expected[-1]}")
+    assert tail["items"] == [] and tail["has_more"] is False
+
+
+@pytest.mark.asyncio
+async def test_missing_rpc_falls_back_to_scan_and_is_remembered(monkeypatch) -> None:
+    client = _Client(rpc_error=RuntimeError("{'code': 'PGRST202', 'message': 'Could not find the function'}"))
+
+    async def _get_client():
+        return client
+
+    monkeypatch.setattr(module, "get_async_supabase_client", _get_client)
+    monkeypatch.setattr(ManualIngestionQueryService, "_batch_events_rpc_available", None)
+
+    page = await ManualIngestionQueryService().get_batch_events(BATCH_ID, limit=20)
+
+    assert len(page["items"]) == 10
+    assert page["items"][0]["filename"].endswith(".pdf")
+    assert ManualIngestionQueryService._batch_events_rpc_available is False
+    assert "source_documents" in client.tables
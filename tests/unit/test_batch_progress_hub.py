@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from app.workflows.ingestion.batch_progress_hub import BatchProgressHub
+
+TENANT = "tenant-1"
+
+
+def _event(i: int) -> dict[str, Any]:
+    return {"event_id": f"e{i:03d}", "created_at": f"2026-01-01T00:00:{i:02d}+00:00", "message": f"m{i}"}
+
+
+class _QueryService:
+    def __init__(self, feed: list[dict[str, Any]]) -> None:
+        self.feed = feed
+        self.visible = 0
+        self.calls = 0
+
+    async def get_batch_events(self, batch_id: str, cursor: str | None = None, limit: int = 100) -> dict:
+        self.calls += 1
+        visible = self.feed[: self.visible]
+        start = 0
+        if cursor:
+            ids = [f"{e['created_at']}|{e['event_id']}" for e in visible]
+            start = ids.index(cursor) + 1 if cursor in ids else 0
+        page = visible[start : start + limit]
+        next_cursor = f"{page[-1]['created_at']}|{page[-1]['event_id']}" if page else cursor
+        return {"items": page, "next_cursor": next_cursor, "has_more": start + limit < len(visible)}
+
+
+class _Orchestrator:
+    """Reveals three more events per status poll and completes after the fourth poll."""
+
+    def __init__(self, total_events: int = 12) -> None:
+        self.query_service = _QueryService([_event(i) for i in range(total_events)])
+        self.status_calls = 0
+
+    async def get_batch_status(self, batch_id: str) -> dict:
+        self.status_calls += 1
+        self.query_service.visible = min(len(self.query_service.feed), self.status_calls * 3)
+        status = "completed" if self.status_calls >= 4 else "processing"
+        return {"batch": {"id": batch_id, "tenant_id": TENANT, "status": status}, "observability": {}}
+
+
+async def _frames(hub: BatchProgressHub, channel: Any, orchestrator: _Orchestrator, cursor: str | None) -> list[dict]:
+    frames = []
+    async for raw in hub.stream(channel, orchestrator, cursor=cursor):
+        event, data = raw.split("\n")[:2]
+        frames.append({"event": event.removeprefix("event: "), **json.loads(data.removeprefix("data: "))})
+    return frames
+
+
+async def _collect(hub: BatchProgressHub, orchestrator: _Orchestrator, cursor: str | None = None) -> list[dict]:
+    channel = await hub.open("b1", TENANT, orchestrator)
+    return await _frames(hub, channel, orchestrator, cursor)
+
+
+def _event_ids(frames: list[dict]) -> list[str]:
+    return [e["event_id"] for f in frames if f["event"] == "delta" for e in f["events"]]
+
+
+@pytest.mark.asyncio
+async def test_viewers_share_one_poller_and_receive_every_event_once() -> None:
+    hub = BatchProgressHub(poll_interval_seconds=0.01)
+    orchestrator = _Orchestrator()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*[_collect(hub, orchestrator) for _ in range(5)]), timeout=2
+    )
+
+    assert orchestrator.status_calls == 4  # O(active batches), not O(viewers)
+    for frames in results:
+        assert _event_ids(frames) == [f"e{i:03d}" for i in range(12)]
+        assert frames[-1]["event"] == "terminal" and frames[-1]["status"] == "completed"
+        assert frames[-1]["cursor"].endswith("|e011")
+    assert hub.stats()["active_batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cursor_resume_and_catch_up_past_the_ring() -> None:
+    orchestrator = _Orchestrator()
+    resume = f"{_event(4)['created_at']}|e004"
+
+    frames = await asyncio.wait_for(
+        _collect(BatchProgressHub(poll_interval_seconds=0.01), orchestrator, cursor=resume), timeout=2
+    )
+    assert _event_ids(frames) == [f"e{i:03d}" for i in range(5, 12)]
+
+    # A ring of 2 forces viewers that start from scratch to be caught up from the feed once.
+    tiny = BatchProgressHub(poll_interval_seconds=0.01, event_buffer_size=2)
+    orchestrator = _Orchestrator()
+    channel = await tiny.open("b1", TENANT, orchestrator)
+    while not channel.closed:
+        await asyncio.sleep(0.01)
+    frames = await _frames(tiny, channel, orchestrator, None)
+    assert _event_ids(frames) == [f"e{i:03d}" for i in range(12)]
+
+
+@pytest.mark.asyncio
+async def test_slow_viewer_overflowed_by_the_ring_is_caught_up_from_the_feed() -> None:
+    hub = BatchProgressHub(poll_interval_seconds=0.01, event_buffer_size=3)
+    orchestrator = _Orchestrator()
+    channel = await hub.open("b1", TENANT, orchestrator)
+
+    frames = []
+    stalled = False
+    async for raw in hub.stream(channel, orchestrator):
+        event, data = raw.split("\n")[:2]
+        frames.append({"event": event.removeprefix("event: "), **json.loads(data.removeprefix("data: "))})
+        if frames[-1]["event"] == "delta" and not stalled:
+            # Viewer stalls while the poller pushes the rest of the batch through the 3-slot ring.
+            stalled = True
+            while not channel.closed:
+                await asyncio.sleep(0.01)
+
+    assert channel.evicted_key is not None
+    assert _event_ids(frames) == [f"e{i:03d}" for i in range(12)]
+    assert frames[-1]["event"] == "terminal"
+
+
+@pytest.mark.asyncio
+async def test_open_rejects_other_tenants() -> None:
+    hub = BatchProgressHub(poll_interval_seconds=0.01)
+    with pytest.raises(ValueError, match="TENANT_MISMATCH"):
+        await hub.open("b1", "tenant-2", _Orchestrator())
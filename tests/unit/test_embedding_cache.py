@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.ai import embeddings as embedding_service
+from app.infrastructure.caching.embedding_cache import (
+    TwoTierEmbeddingCache,
+    _SqliteEmbeddingCacheBackend,
+    build_embedding_cache_key,
+)
+from app.infrastructure.observability.embedding_metrics import EmbeddingMetricsStore
+
+
+class _DummyCloudProvider:
+    def __init__(self, model: str = "dummy-jina"):
+        self.calls = 0
+        self._model = model
+
+    async def embed(self, texts, task="retrieval.passage"):
+        self.calls += 1
+        return [[float(len(t)), 0.5] for t in texts]
+
+    async def chunk_and_encode(self, text):
+        return []
+
+    @property
+    def provider_name(self):
+        return "jina"
+
+    @property
+    def model_name(self):
+        return self._model
+
+    @property
+    def embedding_dimensions(self):
+        return 2
+
+    def profile(self):
+        return {"provider": "jina", "model": self._model, "dimensions": 2}
+
+
+class _DummySettings:
+    def __init__(self, l2_backend: str = "none"):
+        self.APP_ENV = "local"
+        self.ENVIRONMENT = "local"
+        self.JINA_MODE = "CLOUD"
+        self.JINA_API_KEY = "x"
+        self.COHERE_API_KEY = None
+        self.EMBEDDING_PROVIDER_DEFAULT = "jina"
+        self.INGEST_EMBED_PROVIDER_DEFAULT = None
+        self.EMBEDDING_PROVIDER_ALLOWLIST = "jina,cohere"
+        self.EMBEDDING_CONCURRENCY = 1
+        self.EMBEDDING_CACHE_MAX_SIZE = 100
+        self.EMBEDDING_CACHE_TTL_SECONDS = 300
+        self.EMBEDDING_CACHE_L2_BACKEND = l2_backend
+        self.is_deployed_environment = False
+
+
+def test_cache_key_separates_embedding_profiles() -> None:
+    base = dict(provider="jina", model="jina-embeddings-v3", dimensions=1024, text="hola")
+    key = build_embedding_cache_key(task="retrieval.query", **base)
+
+    assert key == build_embedding_cache_key(task="retrieval.query", **base)
+    assert key != build_embedding_cache_key(task="retrieval.passage", **base)
+    assert key != build_embedding_cache_key(
+        task="retrieval.query", **{**base, "provider": "cohere"}
+    )
+    assert key != build_embedding_cache_key(task="retrieval.query", **{**base, "dimensions": 512})
+
+
+@pytest.mark.asyncio
+async def test_sqlite_l2_survives_l1_loss(tmp_path) -> None:
+    metrics = EmbeddingMetricsStore()
+    path = str(tmp_path / "emb.sqlite3")
+    first = TwoTierEmbeddingCache(
+        max_size=10,
+        ttl_seconds=60,
+        l2=_SqliteEmbeddingCacheBackend(path, ttl_seconds=60, max_rows=100, metrics=metrics),
+        metrics=metrics,
+    )
+    await first.set_many({"k1": [0.25, 0.5]})
+
+    restarted = TwoTierEmbeddingCache(
+        max_size=10,
+        ttl_seconds=60,
+        l2=_SqliteEmbeddingCacheBackend(path, ttl_seconds=60, max_rows=100, metrics=metrics),
+        metrics=metrics,
+    )
+    found = await restarted.get_many(["k1", "k2"])
+    again = await restarted.get_many(["k1"])
+
+    assert found == {"k1": [0.25, 0.5]}
+    assert again == {"k1": [0.25, 0.5]}
+    stats = metrics.snapshot()
+    assert stats["cache_l2_hits"] == 1
+    assert stats["cache_l1_hits"] == 1
+    assert stats["cache_misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_l1_evictions_are_counted() -> None:
+    metrics = EmbeddingMetricsStore()
+    cache = TwoTierEmbeddingCache(max_size=2, ttl_seconds=60, metrics=metrics)
+
+    await cache.set_many({"a": [1.0], "b": [2.0], "c": [3.0]})
+
+    assert len(cache) == 2
+    assert metrics.snapshot()["cache_l1_evictions"] == 1
+    assert await cache.get_many(["a"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_service_query_cache_is_scoped_by_provider_profile(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cloud = _DummyCloudProvider()
+    monkeypatch.setattr(embedding_service, "settings", _DummySettings())
+    monkeypatch.setattr(embedding_service, "JinaCloudProvider", lambda api_key: cloud)
+    monkeypatch.setattr(embedding_service.JinaEmbeddingService, "_instance", None)
+
+    service = embedding_service.JinaEmbeddingService.get_instance()
+    out1 = await service.embed_texts(["hola", "hola"], task="retrieval.query")
+    out2 = await service.embed_texts(["hola"], task="retrieval.query")
+    assert out1 == [out2[0], out2[0]]
+    assert cloud.calls == 1
+
+    cloud._model = "other-model"
+    await service.embed_texts(["hola"], task="retrieval.query")
+    assert cloud.calls == 2
+
+
+class _SlowProvider(_DummyCloudProvider):
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def embed(self, texts, task="retrieval.passage"):
+        self.calls += 1
+        await self.release.wait()
+        return [[float(len(t)), 0.5] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_provider_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slow = _SlowProvider()
+    monkeypatch.setattr(embedding_service, "settings", _DummySettings())
+    monkeypatch.setattr(embedding_service, "JinaCloudProvider", lambda api_key: slow)
+    monkeypatch.setattr(embedding_service.JinaEmbeddingService, "_instance", None)
+    metrics = EmbeddingMetricsStore()
+    monkeypatch.setattr(embedding_service, "embedding_metrics_store", metrics)
+
+    service = embedding_service.JinaEmbeddingService.get_instance()
+    tasks = [
+        asyncio.create_task(service.embed_texts(["hola"], task="retrieval.query"))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    slow.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert slow.calls == 1
+    assert all(result == results[0] for result in results)
+    assert metrics.snapshot()["coalesced_calls"] == 4
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_waiter_recovers_when_coalesced_owner_is_cancelled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slow = _SlowProvider()
+    monkeypatch.setattr(embedding_service, "settings", _DummySettings())
+    monkeypatch.setattr(embedding_service, "JinaCloudProvider", lambda api_key: slow)
+    monkeypatch.setattr(embedding_service.JinaEmbeddingService, "_instance", None)
+
+    service = embedding_service.JinaEmbeddingService.get_instance()
+    owner = asyncio.create_task(service.embed_texts(["hola"], task="retrieval.query"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(service.embed_texts(["hola"], task="retrieval.query"))
+    await asyncio.sleep(0)
+    owner.cancel()
+    await asyncio.sleep(0)
+    slow.release.set()
+
+    assert await waiter == [[4.0, 0.5]]
+    assert slow.calls == 2
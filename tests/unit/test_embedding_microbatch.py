@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.ai.embedding_batcher import EmbeddingMicroBatcher
+from app.infrastructure.observability.embedding_metrics import EmbeddingMetricsStore
+
+
+class _BatchingProvider:
+    def __init__(self, max_batch_texts: int = 8):
+        self.max_batch_texts = max_batch_texts
+        self.provider_name = "jina"
+        self.calls: list[tuple[str, list[str]]] = []
+
+    async def embed(self, texts, task="retrieval.passage"):
+        self.calls.append(("embed", list(texts)))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    async def embed_independent(self, texts, task="retrieval.passage"):
+        self.calls.append(("embed_independent", list(texts)))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_small_requests_share_one_independent_call() -> None:
+    provider = _BatchingProvider(max_batch_texts=8)
+    metrics = EmbeddingMetricsStore()
+    batcher = EmbeddingMicroBatcher(
+        semaphore=asyncio.Semaphore(1), linger_ms=20, metrics=metrics
+    )
+
+    results = await asyncio.gather(
+        batcher.submit(provider, ["a"], "retrieval.query"),
+        batcher.submit(provider, ["bb", "a"], "retrieval.query"),
+        batcher.submit(provider, ["ccc"], "retrieval.query"),
+    )
+
+    assert provider.calls == [("embed_independent", ["a", "bb", "ccc"])]
+    assert results == [[[1.0, 1.0]], [[2.0, 1.0], [1.0, 1.0]], [[3.0, 1.0]]]
+    stats = metrics.snapshot()
+    assert stats["microbatches"] == 1
+    assert stats["microbatch_requests"] == 3
+    assert stats["microbatch_avg_fill_ratio"] == pytest.approx(3 / 8)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_for_linger() -> None:
+    provider = _BatchingProvider(max_batch_texts=2)
+    batcher = EmbeddingMicroBatcher(
+        semaphore=asyncio.Semaphore(1), linger_ms=10_000, metrics=EmbeddingMetricsStore()
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit(provider, ["a"], "retrieval.query"),
+            batcher.submit(provider, ["b"], "retrieval.query"),
+        ),
+        timeout=1.0,
+    )
+
+    assert len(results) == 2
+    assert provider.calls == [("embed_independent", ["a", "b"])]
+
+
+@pytest.mark.asyncio
+async def test_lone_pending_request_is_embedded_independently() -> None:
+    provider = _BatchingProvider(max_batch_texts=8)
+    batcher = EmbeddingMicroBatcher(
+        semaphore=asyncio.Semaphore(1), linger_ms=1, metrics=EmbeddingMetricsStore()
+    )
+
+    await batcher.submit(provider, ["solo"], "retrieval.query")
+    await batcher.submit(provider, [str(i) for i in range(8)], "retrieval.query")
+
+    assert [kind for kind, _ in provider.calls] == ["embed_independent", "embed"]
+
+
+@pytest.mark.asyncio
+async def test_text_gets_the_same_vector_alone_and_merged() -> None:
+    class _LateChunkingProvider(_BatchingProvider):
+        async def embed(self, texts, task="retrieval.passage"):
+            # late_chunking: every vector is pooled against the whole request.
+            context = float(sum(len(t) for t in texts))
+            return [[float(len(t)), context] for t in texts]
+
+    provider = _LateChunkingProvider(max_batch_texts=8)
+    batcher = EmbeddingMicroBatcher(
+        semaphore=asyncio.Semaphore(1), linger_ms=20, metrics=EmbeddingMetricsStore()
+    )
+
+    (alone,) = await batcher.submit(provider, ["query"], "retrieval.query")
+    merged, _ = await asyncio.gather(
+        batcher.submit(provider, ["query"], "retrieval.query"),
+        batcher.submit(provider, ["another longer query"], "retrieval.query"),
+    )
+
+    assert merged == [alone]
+
+
+@pytest.mark.asyncio
+async def test_provider_error_reaches_every_merged_caller() -> None:
+    class _Failing(_BatchingProvider):
+        async def embed_independent(self, texts, task="retrieval.passage"):
+            raise RuntimeError("upstream_down")
+
+    batcher = EmbeddingMicroBatcher(
+        semaphore=asyncio.Semaphore(1), linger_ms=5, metrics=EmbeddingMetricsStore()
+    )
+    provider = _Failing()
+
+    results = await asyncio.gather(
+        batcher.submit(provider, ["a"], "retrieval.query"),
+        batcher.submit(provider, ["b"], "retrieval.query"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
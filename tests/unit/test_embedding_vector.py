@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.domain.ingestion.chunking.facade import LateChunkResult
+from app.domain.schemas.embedding_vector import EmbeddingVector, to_float_list
+from app.infrastructure.caching.embedding_cache import TwoTierEmbeddingCache
+from app.infrastructure.observability.embedding_metrics import EmbeddingMetricsStore
+from app.infrastructure.supabase.mappers.persistence_mapper import PersistenceMapper
+
+
+def test_embedding_vector_is_compact_and_sequence_like() -> None:
+    vector = EmbeddingVector([0.5] * 1024)
+
+    assert vector.nbytes == 4096
+    assert len(vector) == 1024
+    assert vector[0] == 0.5
+    assert vector == [0.5] * 1024
+    assert np.asarray(vector).dtype == np.float32
+    assert not EmbeddingVector([])
+
+
+def test_late_chunk_result_keeps_compact_embedding_until_json_boundary() -> None:
+    chunk = LateChunkResult(content="x", embedding=[0.25, 0.75], char_start=0, char_end=1)
+
+    assert isinstance(chunk.embedding, EmbeddingVector)
+    assert isinstance(chunk.model_dump()["embedding"], EmbeddingVector)
+    assert chunk.model_dump(mode="json")["embedding"] == [0.25, 0.75]
+
+    with pytest.raises(ValueError):
+        LateChunkResult(content="x", embedding=[], char_start=0, char_end=1)
+
+
+def test_persistence_mapper_materializes_lists_for_supabase() -> None:
+    row = PersistenceMapper.map_to_sql(
+        {"content": "x", "embedding": EmbeddingVector([0.25, 0.75]), "metadata": {}},
+        "content_chunks",
+    )
+
+    assert row["embedding"] == [0.25, 0.75]
+    assert isinstance(row["embedding"], list)
+    assert to_float_list(None) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_can_store_float16_vectors() -> None:
+    cache = TwoTierEmbeddingCache(
+        max_size=10, ttl_seconds=60, dtype="float16", metrics=EmbeddingMetricsStore()
+    )
+    await cache.set_many({"k": [0.5, 0.25]})
+
+    found = (await cache.get_many(["k"]))["k"]
+
+    assert found.dtype == np.float16
+    assert found.to_list() == [0.5, 0.25]
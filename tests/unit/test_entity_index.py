@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.domain.ingestion.graph.entity_index import TenantEntityIndex
+from app.domain.ingestion.graph.graph_enricher import GraphEnrichmentService
+from app.domain.ingestion.graph.graph_extractor import ChunkGraphExtraction
+
+
+def _index_with(rows: list[dict[str, Any]]) -> TenantEntityIndex:
+    index = TenantEntityIndex("tenant-1")
+    for row in rows:
+        index.upsert(row)
+    return index
+
+
+def test_match_prefers_exact_name_then_vector_threshold() -> None:
+    index = _index_with(
+        [
+            {"id": "e1", "name": "ISO 9001", "embedding": [1.0, 0.0, 0.0]},
+            {"id": "e2", "name": "Auditoria", "embedding": "[0, 1, 0]"},
+        ]
+    )
+
+    matches = index.match(
+        ["iso 9001", "Norma ISO", "Otro", "Sin vector"],
+        {
+            "iso 9001": [0.0, 0.0, 1.0],
+            "norma iso": [0.99, 0.05, 0.0],
+            "otro": [0.7, 0.7, 0.0],
+        },
+    )
+
+    assert matches["iso 9001"]["id"] == "e1"
+    assert matches["norma iso"]["id"] == "e1"
+    assert "otro" not in matches
+    assert "sin vector" not in matches
+
+
+def test_upsert_grows_matrix_and_tracks_renames() -> None:
+    index = _index_with([])
+    for i in range(70):
+        vector = [0.0] * 70
+        vector[i] = 1.0
+        index.upsert({"id": f"e{i}", "name": f"Entity {i}"}, vector=vector)
+
+    index.upsert({"id": "e3", "name": "Renamed", "description": "updated"})
+
+    assert len(index) == 70
+    assert index.get("entity 3") is None
+    assert index.get("renamed")["description"] == "updated"
+    probe = [0.0] * 70
+    probe[69] = 1.0
+    assert index.match(["nuevo"], {"nuevo": probe})["nuevo"]["id"] == "e69"
+    probe = [0.0] * 70
+    probe[3] = 1.0
+    assert index.match(["x"], {"x": probe})["x"]["id"] == "e3"
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_reads_storage_once_until_invalidated() -> None:
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return [{"id": "e1", "name": "ISO 9001", "embedding": [1.0, 0.0]}]
+
+    index = TenantEntityIndex("tenant-1")
+    await index.ensure_loaded(loader)
+    index.upsert({"id": "e2", "name": "Auditoria", "embedding": [0.0, 1.0]})
+    await index.ensure_loaded(loader)
+
+    assert calls == 1
+    assert index.get("auditoria")["id"] == "e2"
+
+    index.invalidate()
+    await index.ensure_loaded(loader)
+    assert calls == 2
+    assert index.get("auditoria") is None
+
+
+class _Extractor:
+    async def extract_graph_batch_async(self, texts: list[str]) -> list[ChunkGraphExtraction]:
+        return [
+            ChunkGraphExtraction.model_validate(
+                {"entities": [{"name": "ISO 9001", "type": "Norma", "description": "d"}]}
+            )
+            for _ in texts
+        ]
+
+
+class _GraphRepo:
+    def __init__(self):
+        self.indexes: list[Any] = []
+
+    async def upsert_knowledge_subgraph(self, **kwargs):
+        self.indexes.append(kwargs.get("entity_index"))
+        return {"entities_extracted": 1}
+
+
+@pytest.mark.asyncio
+async def test_enrichment_shares_one_entity_index_across_chunks() -> None:
+    repo = _GraphRepo()
+    service = GraphEnrichmentService(
+        graph_repository=repo,
+        extractor=_Extractor(),
+        graph_batch_size=2,
+        graph_persist_window=1,
+    )
+    chunks = [{"id": str(uuid4()), "content": f"chunk {i}"} for i in range(3)]
+
+    totals = await service.run_enrichment(str(uuid4()), str(uuid4()), chunks)
+
+    assert totals["chunks_with_graph"] == 3
+    assert len(repo.indexes) == 3
+    assert isinstance(repo.indexes[0], TenantEntityIndex)
+    assert all(index is repo.indexes[0] for index in repo.indexes)
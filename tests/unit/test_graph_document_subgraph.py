@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.domain.ingestion.graph.entity_index import TenantEntityIndex
+from app.domain.ingestion.graph.graph_enricher import GraphEnrichmentService
+from app.domain.ingestion.graph.graph_extractor import ChunkGraphExtraction
+from app.domain.ingestion.graph.subgraph_aggregator import aggregate_chunk_extractions
+from app.infrastructure.supabase.repositories.supabase_graph_repository import (
+    SupabaseGraphRepository,
+)
+
+
+def _extraction(entities: list[tuple[str, str]], relations: list[tuple[str, str, str]] = ()):
+    return ChunkGraphExtraction.model_validate(
+        {
+            "entities": [
+                {"name": name, "type": "Concepto", "description": description}
+                for name, description in entities
+            ],
+            "relations": [
+                {
+                    "source": source,
+                    "target": target,
+                    "relation_type": relation_type,
+                    "description": f"{source} {relation_type} {target}",
+                    "weight": 3,
+                }
+                for source, target, relation_type in relations
+            ],
+        }
+    )
+
+
+def test_aggregate_dedupes_across_chunks_and_keeps_provenance() -> None:
+    c1, c2, c3 = uuid4(), uuid4(), uuid4()
+    subgraph = aggregate_chunk_extractions(
+        [
+            (c1, _extraction([("ISO 9001", "Norma"), ("Auditoria", "Proceso")], [("ISO 9001", "Auditoria", "requires")])),
+            (c2, _extraction([("iso 9001", "Sistema de gestion")], [("iso 9001", "auditoria", "REQUIRES")])),
+            (c3, ChunkGraphExtraction()),
+        ]
+    )
+
+    names = [entity.name for entity in subgraph.extraction.entities]
+    assert names == ["ISO 9001", "Auditoria"]
+    assert subgraph.extraction.entities[0].description == "Norma\n\nSistema de gestion"
+    assert subgraph.entity_chunks["iso 9001"] == [c1, c2]
+    assert subgraph.entity_chunks["auditoria"] == [c1]
+    assert len(subgraph.extraction.relations) == 1
+    assert subgraph.relation_occurrences[("iso 9001", "auditoria", "REQUIRES")] == 2
+    assert subgraph.chunk_ids == [c1, c2]
+    assert (subgraph.entities_extracted, subgraph.relations_extracted) == (3, 2)
+
+
+class _Extractor:
+    async def extract_graph_batch_async(self, texts: list[str]) -> list[ChunkGraphExtraction]:
+        return [_extraction([("ISO 9001", text)]) for text in texts]
+
+
+class _WindowRepo:
+    def __init__(self):
+        self.subgraphs: list[Any] = []
+        self.indexes: list[Any] = []
+
+    async def upsert_knowledge_subgraph(self, **kwargs):
+        raise AssertionError("per-chunk path must not be used with a persist window")
+
+    async def upsert_document_subgraph(self, **kwargs):
+        self.subgraphs.append(kwargs["subgraph"])
+        self.indexes.append(kwargs.get("entity_index"))
+        return {"entities_extracted": kwargs["subgraph"].entities_extracted, "links_upserted": 1}
+
+
+@pytest.mark.asyncio
+async def test_enrichment_persists_one_subgraph_per_window() -> None:
+    repo = _WindowRepo()
+    messages: list[str] = []
+
+    async def log_step(doc_id, message, level, tenant_id=None):
+        messages.append(message)
+
+    service = GraphEnrichmentService(
+        graph_repository=repo, extractor=_Extractor(), graph_batch_size=2, graph_persist_window=3
+    )
+    chunks = [{"id": str(uuid4()), "content": f"chunk {i}"} for i in range(5)]
+
+    totals = await service.run_enrichment(
+        str(uuid4()), str(uuid4()), chunks, log_step_callback=log_step
+    )
+
+    assert [len(subgraph.chunk_ids) for subgraph in repo.subgraphs] == [3, 2]
+    assert [len(subgraph.extraction.entities) for subgraph in repo.subgraphs] == [1, 1]
+    assert isinstance(repo.indexes[0], TenantEntityIndex)
+    assert repo.indexes[0] is repo.indexes[1]
+    assert totals["chunks_with_graph"] == 5
+    assert totals["entities_extracted"] == 5
+    # Per-chunk progress follows each extraction; window messages follow each write.
+    chunk_messages = [m for m in messages if m.startswith("Graph chunk ")]
+    assert chunk_messages == [f"Graph chunk {i}: entities=1 relations=0 (persist pending)" for i in range(1, 6)]
+    assert [m for m in messages if m.startswith("Graph chunks ")] == [
+        "Graph chunks 1-3: entities=3 provenance=1",
+        "Graph chunks 4-5: entities=2 provenance=1",
+    ]
+    assert messages.index("Graph chunk 3: entities=1 relations=0 (persist pending)") < messages.index(
+        "Graph chunks 1-3: entities=3 provenance=1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunk_progress_is_not_held_behind_a_slow_window_write() -> None:
+    messages: list[str] = []
+    all_extracted = asyncio.Event()
+
+    class _SlowRepo(_WindowRepo):
+        async def upsert_document_subgraph(self, **kwargs):
+            # Completes only once every chunk has reported its extraction.
+            await all_extracted.wait()
+            return await super().upsert_document_subgraph(**kwargs)
+
+    async def log_step(doc_id, message, level, tenant_id=None):
+        messages.append(message)
+        if message.startswith("Graph chunk 5:"):
+            all_extracted.set()
+
+    service = GraphEnrichmentService(
+        graph_repository=_SlowRepo(), extractor=_Extractor(), graph_batch_size=2, graph_persist_window=2
+    )
+    chunks = [{"id": str(uuid4()), "content": f"chunk {i}"} for i in range(5)]
+
+    await asyncio.wait_for(
+        service.run_enrichment(str(uuid4()), str(uuid4()), chunks, log_step_callback=log_step), timeout=2
+    )
+
+    assert messages.index("Graph chunk 5: entities=1 relations=0 (persist pending)") < messages.index(
+        "Graph chunks 1-2: entities=2 provenance=1"
+    )
+
+
+class _RpcResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _RpcCall:
+    def __init__(self, data):
+        self._data = data
+
+    async def execute(self):
+        return _RpcResponse(self._data)
+
+
+class _RpcClient:
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return _RpcCall([{"nodes_upserted": 2, "edges_upserted": 1, "links_upserted": 3}])
+
+
+@pytest.mark.asyncio
+async def test_document_subgraph_rpc_payload_carries_provenance_and_occurrences() -> None:
+    c1, c2 = uuid4(), uuid4()
+    subgraph = aggregate_chunk_extractions(
+        [
+            (c1, _extraction([("ISO 9001", "Norma"), ("Auditoria", "Proceso")], [("ISO 9001", "Auditoria", "requires")])),
+            (c2, _extraction([("ISO 9001", "Norma")], [("ISO 9001", "Auditoria", "requires")])),
+        ]
+    )
+    client = _RpcClient()
+    repo = SupabaseGraphRepository(supabase_client=client)
+
+    stats = await repo.upsert_document_subgraph(subgraph=subgraph, tenant_id=uuid4())
+
+    assert len(client.calls) == 1
+    name, params = client.calls[0]
+    assert name == "upsert_knowledge_document_subgraph_atomic"
+    assert params["p_entities"][0]["chunk_ids"] == [str(c1), str(c2)]
+    assert params["p_entities"][1]["chunk_ids"] == [str(c1)]
+    assert params["p_relations"][0]["relation_type"] == "REQUIRES"
+    assert params["p_relations"][0]["occurrences"] == 2
+    assert stats["links_upserted"] == 3
+    assert stats["entities_extracted"] == 3
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.domain.ingestion.graph.graph_enricher import GraphEnrichmentService
+from app.domain.ingestion.graph.graph_extractor import ChunkGraphExtraction
+
+
+class _SlowExtractor:
+    _max_concurrency = 4
+
+    def __init__(self) -> None:
+        self.active = 0
+
+    async def extract_graph_batch_async(self, texts: list[str]) -> list[ChunkGraphExtraction]:
+        self.active += 1
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        return [
+            ChunkGraphExtraction.model_validate(
+                {"entities": [{"name": text, "type": "Concepto", "description": "d"}]}
+            )
+            for text in texts
+        ]
+
+
+class _Repo:
+    def __init__(self, extractor: _SlowExtractor, fail_at: int | None = None) -> None:
+        self.extractor = extractor
+        self.fail_at = fail_at
+        self.names: list[str] = []
+        self.overlapped = 0
+
+    async def upsert_knowledge_subgraph(self, **kwargs: Any) -> dict[str, Any]:
+        if self.extractor.active:
+            self.overlapped += 1
+        if self.fail_at is not None and len(self.names) == self.fail_at:
+            raise RuntimeError("db down")
+        await asyncio.sleep(0.005)
+        self.names.append(kwargs["extraction"].entities[0].name)
+        return {"entities_extracted": 1}
+
+
+@pytest.mark.asyncio
+async def test_persistence_overlaps_extraction_and_keeps_chunk_order() -> None:
+    extractor = _SlowExtractor()
+    repo = _Repo(extractor)
+    service = GraphEnrichmentService(
+        graph_repository=repo, extractor=extractor, graph_batch_size=2, graph_persist_window=1
+    )
+    chunks = [{"id": str(uuid4()), "content": f"chunk {i}"} for i in range(12)]
+
+    totals = await service.run_enrichment(str(uuid4()), str(uuid4()), chunks)
+
+    assert repo.names == [f"chunk {i}" for i in range(12)]
+    assert repo.overlapped > 0
+    assert totals["chunks_with_graph"] == 12
+    assert totals["entities_extracted"] == 12
+    assert totals["graph_extract_batches"] == 6
+    assert totals["graph_persist_queue_max_depth"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_persistence_failure_cancels_pipeline() -> None:
+    extractor = _SlowExtractor()
+    repo = _Repo(extractor, fail_at=3)
+    service = GraphEnrichmentService(
+        graph_repository=repo,
+        extractor=extractor,
+        graph_batch_size=1,
+        graph_persist_window=1,
+        graph_persist_queue_size=1,
+    )
+    chunks = [{"id": str(uuid4()), "content": f"chunk {i}"} for i in range(20)]
+
+    with pytest.raises(RuntimeError, match="db down"):
+        await asyncio.wait_for(service.run_enrichment(str(uuid4()), str(uuid4()), chunks), timeout=2)
+    await asyncio.sleep(0.02)
+    assert extractor.active == 0
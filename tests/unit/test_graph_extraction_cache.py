@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.domain.ingestion.graph.extraction_cache import build_graph_extraction_cache_key
+from app.domain.ingestion.graph.graph_extractor import ChunkGraphExtraction, GraphExtractor
+from app.infrastructure.caching.graph_extraction_cache import build_graph_extraction_cache
+from app.infrastructure.settings import settings
+
+
+class _Engine:
+    _model = "model-a"
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls = 0
+        self.fail = fail
+
+    async def agenerate(self, *, prompt: str, schema: Any, system_prompt: str) -> Any:
+        self.calls += 1
+        if self.fail:
+            raise ValueError("bad request")
+        return ChunkGraphExtraction.model_validate(
+            {"entities": [{"name": "ISO 9001", "type": "Norma", "description": "d"}]}
+        )
+
+
+def test_cache_key_normalizes_text_and_separates_prompt_and_model() -> None:
+    key = build_graph_extraction_cache_key(text="Control  de\ndocumentos ", prompt_version="v1:x", model="M")
+    assert key == build_graph_extraction_cache_key(text="Control de documentos", prompt_version="v1:x", model="m")
+    assert key != build_graph_extraction_cache_key(text="Control de documentos", prompt_version="v2:x", model="m")
+    assert key != build_graph_extraction_cache_key(text="Control de documentos", prompt_version="v1:x", model="n")
+
+
+@pytest.mark.asyncio
+async def test_repeated_chunks_hit_the_cache_and_failures_are_not_stored(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "GRAPH_EXTRACTION_CACHE_SQLITE_PATH", str(tmp_path / "graph.sqlite3"))
+    cache = build_graph_extraction_cache("sqlite")
+    engine = _Engine()
+    extractor = GraphExtractor(strict_engine=engine, extraction_cache=cache)
+
+    first = await extractor.extract_graph_batch_async(["Texto  repetido", "otro"])
+    second = await extractor.extract_graph_batch_async(["Texto repetido\n", "otro"])
+
+    assert engine.calls == 2
+    assert [e.entities[0].name for e in second] == [e.entities[0].name for e in first]
+    stats = extractor.cache_stats.snapshot()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (2, 2, 2)
+    assert stats["hit_rate"] == 0.5
+    assert stats["prompt_tokens_avoided"] > 0
+
+    failing = _Engine(fail=True)
+    broken = GraphExtractor(strict_engine=failing, extraction_cache=cache, model_name="model-b")
+    assert (await broken.extract_graph_batch_async(["nuevo"]))[0].is_empty()
+    assert (await broken.extract_graph_batch_async(["nuevo"]))[0].is_empty()
+    assert failing.calls == 2
+    assert broken.cache_stats.snapshot()["stores"] == 0
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import random
+import re
+from typing import Any
+
+import pytest
+
+from app.ai.rerankers.gravity_reranker import (
+    _HEADING_KEYWORDS,
+    BALANCED_WEIGHTS,
+    GravityReranker,
+)
+from app.domain.ingestion.chunking.text_normalization import extract_section_path
+from app.domain.schemas.knowledge_schemas import AgentRole, RAGSearchResult, RetrievalIntent, TaskType
+
+
+def _legacy_rerank(reranker: GravityReranker, results: list[RAGSearchResult], intent: RetrievalIntent):
+    """Row-by-row reference (the pre-vectorization algorithm) used as the golden oracle."""
+
+    def heading_boost(query: str, content: str) -> float:
+        if not query or not content:
+            return 1.0
+        query_lower = query.lower()
+        targets = [a for kw, anchors in _HEADING_KEYWORDS.items() if kw in query_lower for a in anchors]
+        if not targets:
+            return 1.0
+        match = re.search(r"SECTION_PATH:\s*(.+?)(?:\n|$)", content)
+        section_path = match.group(1).strip() if match else ""
+        for anchor in targets:
+            if anchor in section_path:
+                return 5.0
+            if anchor.lower() in content[:400].lower():
+                return 3.0
+        return 1.0
+
+    config = reranker._resolve_config(intent.role, intent.task)  # noqa: SLF001
+    weights = config.get("weights", BALANCED_WEIGHTS)
+    exclude_zero = config.get("exclude_zero_weight", False)
+    scored: list[RAGSearchResult] = []
+    for result in results:
+        meta = dict(result.metadata or {})
+        level = reranker._parse_authority_level(meta.get("authority_level"))  # noqa: SLF001
+        weight = weights.get(level, 1.0)
+        constitutional = meta.get("is_constitutional") is True
+        summary = (meta.get("is_raptor_summary") is True) or (meta.get("is_summary") is True)
+        if exclude_zero and weight == 0.0 and not (constitutional or summary):
+            continue
+        layer = {"personal": 1.15, "tenant": 1.08}.get(result.source_layer or "global", 1.0)
+        c_boost = 3.0 if constitutional else 1.0
+        r_boost = 1.4 if summary else 1.0
+        h_boost = heading_boost(intent.query, result.content)
+        original = float(result.similarity or 0.0)
+        if original < 0.10 and h_boost <= 1.0:
+            continue
+        effective = max(original, 0.15) if h_boost > 1.0 else original
+        multiplier = weight * layer * c_boost * r_boost * h_boost
+        final = effective * multiplier
+        new_meta = dict(meta)
+        new_meta.update({
+            "original_similarity": original,
+            "gravity_weight": weight,
+            "layer_boost": layer,
+            "constitutional_boost": c_boost,
+            "raptor_boost": r_boost,
+            "heading_boost": h_boost,
+            "authority_level": level,
+            "final_multiplier": multiplier,
+        })
+        scored.append(
+            RAGSearchResult(
+                id=result.id, content=result.content, similarity=final, score=final,
+                source_layer=result.source_layer, metadata=new_meta, source_id=result.source_id,
+            )
+        )
+    scored.sort(key=lambda x: x.similarity, reverse=True)
+    if len(scored) > 1:
+        max_s = max(r.similarity for r in scored)
+        min_s = min(r.similarity for r in scored)
+        spread = max_s - min_s
+        for r in scored:
+            value = (r.similarity - min_s) / spread if spread > 0 else 1.0
+            r.similarity = r.score = value
+            if spread > 0:
+                r.metadata["gravity_normalized_score"] = value
+    elif len(scored) == 1:
+        scored[0].similarity = scored[0].score = 1.0
+    limit = config.get("max_results")
+    return scored[:limit] if limit else scored
+
+
+def _golden_candidates(seed: int, count: int = 200) -> list[RAGSearchResult]:
+    rng = random.Random(seed)
+    sections = ["0 Introducción > 0.1 Generalidades", "5 Liderazgo", "8 Operación", "Anexo A", "[none]"]
+    levels = [None, "administrative", "POLICY", "canonical", "supplementary", "constitution", "bogus"]
+    out: list[RAGSearchResult] = []
+    for i in range(count):
+        section = rng.choice(sections)
+        content = f"[PARENT_CONTEXT]\nDOC_TITLE: ISO\nSECTION_PATH: {section}\n[/PARENT_CONTEXT]\n\nTexto {i}"
+        if rng.random() < 0.1:
+            content = f"Introducción general del documento {i}"
+        metadata: dict[str, Any] = {"authority_level": rng.choice(levels), "n": i}
+        if rng.random() < 0.5:
+            metadata["section_path"] = extract_section_path(content)
+        if rng.random() < 0.05:
+            metadata["is_constitutional"] = True
+        if rng.random() < 0.05:
+            metadata["is_raptor_summary"] = True
+        # Coarse similarities produce ties that exercise stable ordering.
+        similarity = round(rng.random(), 1) if rng.random() < 0.3 else rng.random()
+        out.append(
+            RAGSearchResult(
+                id=f"c{i}", content=content, similarity=similarity, score=similarity,
+                source_layer=rng.choice(["knowledge", "personal", "tenant", "global"]), metadata=metadata,
+            )
+        )
+    return out
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize(
+    "query,role,task",
+    [
+        ("que dice la introducción", AgentRole.SOCRATIC_MENTOR, TaskType.EXPLANATION),
+        ("requisitos de liderazgo y operación", AgentRole.ACADEMIC_AUDITOR, TaskType.FACT_CHECKING),
+        ("control de documentos", AgentRole.CONTENT_DESIGNER, TaskType.IDEATION),
+        ("anexo de mejora", AgentRole.INTEGRITY_GUARD, TaskType.GRADING),
+    ],
+)
+def test_vectorized_rerank_matches_golden_reference(seed: int, query: str, role: AgentRole, task: TaskType) -> None:
+    reranker = GravityReranker()
+    candidates = _golden_candidates(seed)
+    intent = RetrievalIntent(query=query, role=role, task=task)
+
+    expected = _legacy_rerank(reranker, candidates, intent)
+    actual = reranker.rerank(candidates, intent)
+
+    assert [r.id for r in actual] == [r.id for r in expected]
+    assert [(r.similarity, r.score) for r in actual] == [(r.similarity, r.score) for r in expected]
+    assert [r.metadata for r in actual] == [r.metadata for r in expected]
+    assert all("gravity_weight" not in c.metadata for c in candidates)
+
+
+def test_single_and_empty_results() -> None:
+    reranker = GravityReranker()
+    intent = RetrievalIntent(query="x", role=AgentRole.SOCRATIC_MENTOR, task=TaskType.EXPLANATION)
+    one = RAGSearchResult(id="a", content="t", similarity=0.5, score=0.5, source_layer="knowledge", metadata={})
+    low = RAGSearchResult(id="b", content="t", similarity=0.01, score=0.01, source_layer="knowledge", metadata={})
+
+    assert reranker.rerank([], intent) == []
+    assert reranker.rerank([low], intent) == []
+    ranked = reranker.rerank([one, low], intent)
+    assert [(r.id, r.score) for r in ranked] == [("a", 1.0)]
+    assert "gravity_normalized_score" not in ranked[0].metadata
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.ingestion.knowledge import clustering_service as module
+from app.domain.ingestion.knowledge.community_graph import TenantGraphBuilder
+from app.domain.ingestion.knowledge.clustering_service import (
+    ClusteringService,
+    _align_communities,
+    _seed_membership,
+)
+from app.domain.retrieval.result_cache import index_generations
+
+
+class _Query:
+    def __init__(self, client: "_Client", table: str) -> None:
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.payload: Any = None
+        self.filters: dict[str, Any] = {}
+        self.after: Any = None
+        self.page: int | None = None
+        self.order_by: tuple[str, bool] = ("id", False)
+
+    def select(self, *_args: Any) -> "_Query":
+        return self
+
+    def eq(self, key: str, value: Any) -> "_Query":
+        self.filters[key] = value
+        return self
+
+    def in_(self, key: str, values: list[Any]) -> "_Query":
+        self.filters[key] = list(values)
+        return self
+
+    def gt(self, key: str, value: Any) -> "_Query":
+        self.after = value
+        return self
+
+    def order(self, key: str, desc: bool = False) -> "_Query":
+        self.order_by = (key, desc)
+        return self
+
+    def limit(self, count: int) -> "_Query":
+        self.page = count
+        return self
+
+    def upsert(self, rows: list[dict], on_conflict: str) -> "_Query":
+        self.op, self.payload = "upsert", rows
+        return self
+
+    def insert(self, rows: list[dict]) -> "_Query":
+        self.op, self.payload = "insert", rows
+        return self
+
+    def delete(self) -> "_Query":
+        self.op = "delete"
+        return self
+
+    async def execute(self) -> Any:
+        self.client.calls.append((self.table, self.op, self.payload, dict(self.filters)))
+        if self.op in {"upsert", "insert"}:
+            return SimpleNamespace(data=self.payload)
+        rows = self.client.rows.get(self.table, [])
+        if self.page is not None:
+            key, desc = self.order_by
+            rows = sorted(rows, key=lambda row: row[key], reverse=desc)
+            rows = [row for row in rows if self.after is None or row["id"] > self.after][: self.page]
+        return SimpleNamespace(data=rows)
+
+
+class _Client:
+    def __init__(self, rows: dict[str, list[dict]]) -> None:
+        self.rows = rows
+        self.calls: list[tuple] = []
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+
+class _Llm:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def ainvoke(self, messages: list[dict]) -> Any:
+        self.calls += 1
+        return SimpleNamespace(content="Resumen")
+
+
+class _Embedder:
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [[0.1, 0.2] for _ in texts]
+
+
+def test_seed_and_align_keep_previous_ids_stable() -> None:
+    previous = {7: {"a", "b"}, 9: {"c", "d"}}
+    seeded = _seed_membership(["a", "c", "b", "x", "d"], {"a": 7, "b": 7, "c": 9, "d": 9})
+    assert seeded == [0, 1, 0, 2, 1]
+
+    aligned = _align_communities([["c", "d", "x"], ["a", "b"], ["e"]], previous)
+    assert aligned == {9: ["c", "d", "x"], 7: ["a", "b"], 10: ["e"]}
+    # Fresh ids also clear the stored maximum, even if that row was not loaded.
+    aligned = _align_communities([["a", "b"], ["e"]], previous, max_previous_id=41)
+    assert aligned == {7: ["a", "b"], 42: ["e"]}
+
+
+def test_graph_builder_matches_simple_graph_semantics() -> None:
+    builder = TenantGraphBuilder()
+    builder.add_nodes(["a", "b", "c", None])
+    builder.add_relations(
+        [
+            {"source_entity_id": "a", "target_entity_id": "b", "weight": 2.0},
+            {"source_entity_id": "a", "target_entity_id": "a", "weight": 1.0},
+        ]
+    )
+    builder.add_relations(
+        [
+            {"source_entity_id": "b", "target_entity_id": "a", "weight": 0.0},
+            {"source_entity_id": "c", "target_entity_id": "z", "weight": "bad"},
+        ]
+    )
+    graph = builder.build()
+
+    assert graph.node_ids == ["a", "b", "c", "z"]
+    assert graph.edges.dtype == np.int32 and graph.weights.dtype == np.float32
+    assert graph.edges.tolist() == [[0, 1], [2, 3]]
+    assert graph.weights.tolist() == [1.0, 1.0]  # later duplicate wins; 0/invalid -> 1.0
+
+
+@pytest.mark.asyncio
+async def test_incremental_rebuild_only_resummarizes_changed_communities(monkeypatch) -> None:
+    monkeypatch.setattr(module, "leidenalg", SimpleNamespace())
+    ids = [str(uuid4()) for _ in range(6)]
+    a, b, c, d, e, f = ids
+    client = _Client(
+        {
+            # e was deleted from the tenant since the last rebuild.
+            "knowledge_entities": [
+                {"id": i, "name": i[:4], "description": "d"} for i in ids if i != e
+            ],
+            "knowledge_relations": [
+                {"id": "r1", "source_entity_id": a, "target_entity_id": b, "weight": 1.0},
+                {"id": "r2", "source_entity_id": c, "target_entity_id": d, "weight": 1.0},
+                {"id": "r3", "source_entity_id": d, "target_entity_id": f, "weight": 1.0},
+            ],
+            "knowledge_communities": [
+                {"id": "k0", "community_id": 0, "members": [a, b]},
+                {"id": "k1", "community_id": 1, "members": [c, d]},
+                {"id": "k2", "community_id": 2, "members": [e]},
+            ],
+        }
+    )
+    llm = _Llm()
+    service = ClusteringService(
+        supabase_client=client,
+        embedding_service=_Embedder(),
+        llm=llm,
+        incremental=True,
+        graph_page_size=2,
+    )
+    seeds: list[list[int]] = []
+
+    def _fake_partition(graph, initial_membership=None):
+        seeds.append(list(initial_membership))
+        nodes = graph.node_ids
+        # New entity f joins {c, d}; {a, b} is unchanged.
+        groups = {a: 5, b: 5, c: 3, d: 3, f: 3}
+        return [groups[n] for n in nodes]
+
+    monkeypatch.setattr(service, "_partition", _fake_partition)
+
+    tenant_id = uuid4()
+    monkeypatch.setattr(index_generations, "shared", None)
+    generation = await index_generations.current(tenant_id)
+    result = await service.rebuild_communities(tenant_id)
+
+    # Cached retrieval results for the tenant stop matching after the rebuild.
+    assert await index_generations.current(tenant_id) == generation + 1
+    assert seeds and len(set(seeds[0])) == 3  # {a,b}, {c,d}, singleton f
+    assert result["communities_changed"] == 1
+    assert result["communities_unchanged"] == 1
+    assert result["communities_removed"] == 1
+    assert llm.calls == 1
+
+    writes = [call for call in client.calls if call[0] == "knowledge_communities" and call[1] != "select"]
+    assert [op for _table, op, _payload, _filters in writes] == ["upsert", "delete"]
+    upserted = writes[0][2]
+    assert [(row["community_id"], set(row["members"])) for row in upserted] == [(1, {c, d, f})]
+    assert writes[1][3]["community_id"] == [2]
+    pages = [call for call in client.calls if call[0] == "knowledge_entities" and "id" not in call[3]]
+    assert len(pages) == 3  # 5 entities at page size 2, keyset-paginated
+    community_reads = [
+        call for call in client.calls if call[0] == "knowledge_communities" and call[1] == "select"
+    ]
+    assert len(community_reads) == 3  # two keyset pages of previous communities + the max(id) probe
+    assert all(call[3]["level"] == 0 for call in community_reads)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.queue.base_worker import BaseWorkerProcessor
+from app.infrastructure.queue.job_lease_dispatcher import JobLeaseDispatcher
+from app.infrastructure.queue.job_notifications import JobWakeupHub
+
+
+class _JobStore:
+    def __init__(self, jobs: int) -> None:
+        self.pending = [{"id": f"job-{i}", "payload": {}} for i in range(jobs)]
+        self.claim_sizes: list[int] = []
+        self.heartbeats: dict[str, int] = {}
+        self.finals: list[str] = []
+        self.requeued: list[str] = []
+
+    async def fetch_next_jobs(self, job_type: str, n: int, lease_seconds: int | None = None) -> list[dict]:
+        self.claim_sizes.append(n)
+        claimed, self.pending = self.pending[:n], self.pending[n:]
+        return claimed
+
+    def track_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] = self.heartbeats.get(job_id, 0) + 1
+
+    def untrack_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] -= 1
+
+    async def mark_job_final(self, job_id: str, status: str, **_: Any) -> None:
+        self.finals.append(job_id)
+
+    async def requeue_job_for_retry(self, *, job_id: str, error_message: str) -> None:
+        self.requeued.append(job_id)
+
+@pytest.mark.asyncio
+async def test_dispatcher_claims_batches_and_never_exceeds_local_concurrency() -> None:
+    store = _JobStore(jobs=20)
+    hub = JobWakeupHub()
+    dispatcher = JobLeaseDispatcher(store, "ingest_document", 4, wakeup_hub=hub, poll_interval=0.05)
+    in_flight = 0
+    peak = 0
+
+    async def handler(job: dict[str, Any]) -> dict[str, Any]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"ok": True}
+
+    tasks = [asyncio.create_task(dispatcher.run())] + [
+        asyncio.create_task(
+            BaseWorkerProcessor(store, poller_id=i + 1).run_queue_loop("ingest_document", handler, dispatcher)
+        )
+        for i in range(4)
+    ]
+    for _ in range(200):
+        if len(store.finals) == 20:
+            break
+        await asyncio.sleep(0.01)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert sorted(store.finals) == sorted(f"job-{i}" for i in range(20))
+    assert set(store.heartbeats.values()) == {0}
+    assert peak <= 4
+    assert store.claim_sizes[:2] == [4, 4]
+    assert hub.snapshot()["jobs_picked"] == 20
+    # Batches are claimed once a batch worth of slots frees up, not one RPC per job.
+    assert len(store.claim_sizes) <= 7
+
+
+@pytest.mark.asyncio
+async def test_queued_jobs_stay_on_the_process_heartbeat_until_handed_to_a_worker() -> None:
+    store = _JobStore(jobs=4)
+    dispatcher = JobLeaseDispatcher(store, "ingest_document", 2, poll_interval=1)
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0.02)
+    assert store.heartbeats == {f"job-{i}": 1 for i in range(4)}
+
+    job = await dispatcher.next_job()
+    store.track_job_heartbeat(job["id"])
+    assert store.heartbeats[job["id"]] == 1
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert await dispatcher.release_unstarted() == 3
+    assert store.heartbeats == {"job-0": 1, "job-1": 0, "job-2": 0, "job-3": 0}
+
+
+@pytest.mark.asyncio
+async def test_batch_size_caps_claims_below_concurrency() -> None:
+    store = _JobStore(jobs=10)
+    dispatcher = JobLeaseDispatcher(store, "enrich_document", 6, batch_size=2, poll_interval=0.05)
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0.02)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    # Capacity is concurrency + one batch of queued jobs: 8 slots, claimed 2 at a time.
+    assert store.claim_sizes == [2, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_release_unstarted_requeues_claimed_jobs() -> None:
+    store = _JobStore(jobs=3)
+    dispatcher = JobLeaseDispatcher(store, "ingest_document", 3, poll_interval=0.05)
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0.02)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert await dispatcher.release_unstarted() == 3
+    assert store.requeued == ["job-0", "job-1", "job-2"]
+
+
+class _RpcResponse:
+    def __init__(self, data: list[dict]) -> None:
+        self.data = data
+
+
+class _RpcCall:
+    def __init__(self, client: "_Client", name: str, params: dict) -> None:
+        self.client, self.name, self.params = client, name, params
+
+    async def execute(self) -> _RpcResponse:
+        self.client.calls.append(self.name)
+        if self.name == "fetch_next_jobs" and self.client.batch_error:
+            raise RuntimeError(self.client.batch_error)
+        return _RpcResponse([{"id": "job-1", "payload": {}}])
+
+
+class _Update:
+    def __init__(self, client: "_Client", values: dict) -> None:
+        self.client, self.values = client, values
+
+    def eq(self, column: str, value: Any) -> "_Update":
+        return self
+
+    def in_(self, column: str, values: list) -> "_Update":
+        return self
+
+    async def execute(self) -> _RpcResponse:
+        self.client.updates.append(self.values)
+        return _RpcResponse([])
+
+
+class _Table:
+    def __init__(self, client: "_Client") -> None:
+        self.client = client
+
+    def update(self, values: dict) -> _Update:
+        return _Update(self.client, values)
+
+
+class _Client:
+    def __init__(self, batch_error: str = "") -> None:
+        self.batch_error = batch_error
+        self.calls: list[str] = []
+        self.updates: list[dict] = []
+
+    def rpc(self, name: str, params: dict) -> _RpcCall:
+        return _RpcCall(self, name, params)
+
+    def table(self, name: str) -> _Table:
+        return _Table(self)
+
+
+@pytest.fixture
+def fresh_claim_state(monkeypatch):
+    monkeypatch.setattr(SupabaseJobStore, "_batch_claim_rpc_available", None)
+    monkeypatch.setattr(SupabaseJobStore, "_lease_column_available", False)
+    monkeypatch.setattr(SupabaseJobStore, "_batch_claim_retry_at", 0.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("batch_error", "available"),
+    [
+        ("{'code': 'PGRST202', 'message': 'Could not find the function'}", False),
+        ("{'code': '0A000', 'message': 'FOR UPDATE is not allowed with UNION/INTERSECT/EXCEPT'}", None),
+    ],
+)
+async def test_fetch_next_jobs_falls_back_to_single_claim_when_rpc_fails(
+    fresh_claim_state, batch_error: str, available: bool | None
+) -> None:
+    store = SupabaseJobStore()
+    store._client = _Client(batch_error)
+
+    first = await store.fetch_next_jobs("ingest_document", 4)
+    second = await store.fetch_next_jobs("ingest_document", 4)
+
+    assert first == second == [{"id": "job-1", "payload": {}}]
+    assert store._client.calls == ["fetch_next_jobs", "fetch_next_job", "fetch_next_job"]
+    assert SupabaseJobStore._batch_claim_rpc_available is available
+
+
+@pytest.mark.asyncio
+async def test_unclassified_rpc_error_only_backs_off_batch_claims(fresh_claim_state, monkeypatch) -> None:
+    store = SupabaseJobStore()
+    store._client = _Client("{'code': '57014', 'message': 'canceling statement due to statement timeout'}")
+    await store.fetch_next_jobs("ingest_document", 4)
+
+    store._client.batch_error = ""
+    monkeypatch.setattr(SupabaseJobStore, "_batch_claim_retry_at", 0.0)
+    await store.fetch_next_jobs("ingest_document", 4)
+
+    assert store._client.calls == ["fetch_next_jobs", "fetch_next_job", "fetch_next_jobs"]
+    assert SupabaseJobStore._batch_claim_rpc_available is True
+
+
+@pytest.mark.asyncio
+async def test_leases_are_renewed_after_the_batch_rpc_starts_failing(fresh_claim_state) -> None:
+    store = SupabaseJobStore()
+    store._client = _Client()
+    (job,) = await store.fetch_next_jobs("ingest_document", 4)
+
+    store._client.batch_error = "{'code': 'XX000', 'message': 'internal error'}"
+    await store.fetch_next_jobs("ingest_document", 4)
+    await store.renew_job_leases([job["id"]])
+
+    assert store._client.calls == ["fetch_next_jobs", "fetch_next_jobs", "fetch_next_job"]
+    assert "lease_expires_at" in store._client.updates[-1]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from app.infrastructure.queue.base_worker import BaseWorkerProcessor
+from app.infrastructure.queue.job_notifications import (
+    InMemoryJobNotificationSource,
+    JobWakeupHub,
+    PostgresJobNotificationListener,
+)
+
+
+class _JobStore:
+    def __init__(self) -> None:
+        self.pending: list[dict[str, Any]] = []
+        self.fetches = 0
+        self.heartbeats: dict[str, int] = {}
+        self.finals: list[tuple[str, str]] = []
+
+    async def fetch_next_job(self, job_type: str) -> dict[str, Any] | None:
+        self.fetches += 1
+        return self.pending.pop(0) if self.pending else None
+
+    def track_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] = self.heartbeats.get(job_id, 0) + 1
+
+    def untrack_job_heartbeat(self, job_id: str) -> None:
+        self.heartbeats[job_id] -= 1
+
+    async def mark_job_final(self, job_id: str, status: str, **_: Any) -> None:
+        self.finals.append((job_id, status))
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_notified_after_generation_read() -> None:
+    hub = JobWakeupHub(safety_poll_interval_seconds=30)
+    since = hub.generation("ingest_document")
+    hub.notify("ingest_document")
+
+    assert await hub.wait("ingest_document", since, fallback_interval_seconds=30) is True
+
+
+@pytest.mark.asyncio
+async def test_wait_uses_fallback_interval_until_a_listener_is_connected() -> None:
+    hub = JobWakeupHub(safety_poll_interval_seconds=30)
+
+    assert await hub.wait("ingest_document", hub.generation("ingest_document"), 0.01) is False
+
+    source = InMemoryJobNotificationSource(hub)
+    await source.start()
+    waiter = asyncio.create_task(hub.wait("ingest_document", hub.generation("ingest_document"), 0.01))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    source.publish("ingest_document")
+    assert await asyncio.wait_for(waiter, timeout=1) is True
+
+
+@pytest.mark.asyncio
+async def test_notify_for_other_job_type_does_not_wake_waiter() -> None:
+    hub = JobWakeupHub()
+    hub.listening = True
+    waiter = asyncio.create_task(hub.wait("enrich_document", hub.generation("enrich_document"), 0.01))
+    await asyncio.sleep(0)
+    hub.notify("ingest_document")
+    await asyncio.sleep(0.02)
+    assert not waiter.done()
+
+    hub.notify(None)
+    assert await asyncio.wait_for(waiter, timeout=1) is True
+
+
+@pytest.mark.asyncio
+async def test_typed_notify_wakes_a_single_idle_poller() -> None:
+    hub = JobWakeupHub()
+    hub.listening = True
+    since = hub.generation("ingest_document")
+    waiters = [asyncio.create_task(hub.wait("ingest_document", since, 0.01)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    hub.notify("ingest_document")
+    await asyncio.sleep(0.01)
+    assert sum(task.done() for task in waiters) == 1
+
+    hub.notify(None)
+    assert await asyncio.wait_for(asyncio.gather(*waiters), timeout=1) == [True, True, True]
+
+
+@pytest.mark.asyncio
+async def test_idle_poller_wakes_on_publish_without_extra_fetches() -> None:
+    hub = JobWakeupHub(safety_poll_interval_seconds=30)
+    source = InMemoryJobNotificationSource(hub)
+    await source.start()
+    store = _JobStore()
+    handled = asyncio.Event()
+
+    async def handler(job: dict[str, Any]) -> dict[str, Any]:
+        handled.set()
+        return {"ok": True}
+
+    processor = BaseWorkerProcessor(store, poller_id=1, wakeup_hub=hub)
+    loop_task = asyncio.create_task(processor.run_job_loop("ingest_document", handler, poll_interval=30))
+    await asyncio.sleep(0.05)
+    idle_fetches = store.fetches
+
+    store.pending.append({"id": "job-1", "payload": {}})
+    source.publish("ingest_document")
+    await asyncio.wait_for(handled.wait(), timeout=1)
+    await asyncio.sleep(0.02)
+    loop_task.cancel()
+
+    assert idle_fetches == 1
+    assert store.finals == [("job-1", "completed")]
+    snapshot = hub.snapshot()
+    assert snapshot["jobs_picked"] == 1
+    assert snapshot["idle_fetch_rpcs"] == store.fetches - 1
+    assert "pickup_latency_p50_ms" in snapshot
+
+
+def test_record_fetch_measures_pickup_latency_from_payload_epoch() -> None:
+    hub = JobWakeupHub()
+    job_type, enqueued_at = PostgresJobNotificationListener.parse_payload(f"ingest_document|{time.time() - 0.25}")
+    hub.notify(job_type, enqueued_at=enqueued_at)
+    hub.record_fetch("ingest_document", picked=True)
+
+    assert job_type == "ingest_document"
+    assert hub.snapshot()["pickup_latency_p50_ms"] >= 250.0
+
+
+def test_parse_payload_tolerates_missing_or_bad_epoch() -> None:
+    assert PostgresJobNotificationListener.parse_payload("enrich_document") == ("enrich_document", None)
+    assert PostgresJobNotificationListener.parse_payload("enrich_document|x") == ("enrich_document", None)
+    assert PostgresJobNotificationListener.parse_payload("") == (None, None)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pytest
+
+from app.infrastructure.local_index.bm25 import SPANISH_STOPWORDS, BM25Index, WebSearchQuery
+from app.infrastructure.local_index.repository import LocalRetrievalRepository
+
+TENANT = "11111111-1111-1111-1111-111111111111"
+OTHER = "22222222-2222-2222-2222-222222222222"
+
+
+def _chunk(chunk_id: str, content: str, embedding, **overrides):
+    row = {
+        "id": chunk_id,
+        "content": content,
+        "semantic_context": "",
+        "file_page_number": 1,
+        "source_id": "doc-a",
+        "tenant_id": TENANT,
+        "is_global": False,
+        "collection_id": None,
+        "source_standard": "ISO 9001",
+        "metadata": {"source_id": "doc-a"},
+        "embedding": embedding,
+    }
+    row.update(overrides)
+    return row
+
+
+def _repository() -> LocalRetrievalRepository:
+    chunks = [
+        _chunk("c1", "Control de documentos y registros de calidad", [1.0, 0.0, 0.0]),
+        _chunk("c2", "Auditoria interna del sistema de gestion", [0.8, 0.6, 0.0]),
+        _chunk(
+            "c3",
+            "Requisitos legales ambientales aplicables",
+            [0.0, 1.0, 0.0],
+            source_id="doc-b",
+            source_standard="ISO 14001",
+        ),
+        _chunk("c4", "Control de documentos de otro tenant", [1.0, 0.0, 0.0], tenant_id=OTHER),
+        _chunk("c5", "Fragmento sin embedding sobre la clausula 7.5.3", None),
+    ]
+    summaries = [
+        {"id": "s2", "content": "Resumen raiz", "level": 2, "tenant_id": TENANT,
+         "children_ids": ["s1", "c3"], "embedding": [0.0, 0.0, 1.0]},
+        {"id": "s1", "content": "Resumen calidad", "level": 1, "tenant_id": TENANT,
+         "children_ids": ["c1", "c2"], "embedding": [0.9, 0.1, 0.0]},
+    ]
+    return LocalRetrievalRepository(chunks, summaries)
+
+
+def test_bm25_websearch_semantics() -> None:
+    index = BM25Index(
+        ["control de documentos", "documentos externos", "registro de auditoria"],
+        stopwords=SPANISH_STOPWORDS,
+    )
+
+    matched, scores = index.search(WebSearchQuery.parse("documentos -externos", SPANISH_STOPWORDS))
+    assert matched.tolist() == [True, False, False]
+
+    matched, _ = index.search(WebSearchQuery.parse("control or auditoria", SPANISH_STOPWORDS))
+    assert matched.tolist() == [True, False, True]
+    assert scores[0] > 0
+
+
+@pytest.mark.asyncio
+async def test_hybrid_respects_tenant_and_standard_scope() -> None:
+    repo = _repository()
+
+    rows = await repo.retrieve_hybrid_optimized(
+        {
+            "query_embedding": [1.0, 0.0, 0.0],
+            "query_text": "control de documentos",
+            "match_threshold": 0.25,
+            "match_count": 10,
+            "tenant_id": TENANT,
+            "source_standards": ["iso 9001"],
+        }
+    )
+
+    ids = [row["id"] for row in rows]
+    assert ids[0] == "c1"
+    assert "c4" not in ids and "c3" not in ids
+    assert rows[0]["metadata"]["source_standard"] == "iso 9001"
+    assert rows[0]["source_layer"] == "hybrid"
+    assert all(rows[i]["score"] >= rows[i + 1]["score"] for i in range(len(rows) - 1))
+
+
+@pytest.mark.asyncio
+async def test_hybrid_identifier_query_uses_literal_leg() -> None:
+    repo = _repository()
+
+    rows = await repo.retrieve_hybrid_optimized(
+        {
+            "query_embedding": [0.0, 0.0, 1.0],
+            "query_text": "7.5.3",
+            "match_count": 5,
+            "tenant_id": TENANT,
+        }
+    )
+
+    assert [row["id"] for row in rows] == ["c5"]
+
+
+@pytest.mark.asyncio
+async def test_atomic_primitives_filter_by_source_ids() -> None:
+    repo = _repository()
+
+    vectors = await repo.search_vectors_only(
+        {"query_embedding": [1.0, 0.0, 0.0], "match_threshold": 0.1, "match_count": 5,
+         "source_ids": ["doc-a"]}
+    )
+    fts = await repo.search_fts_only(
+        {"query_text": "requisitos legales", "match_count": 5, "source_ids": ["doc-b"]}
+    )
+
+    assert [row["id"] for row in vectors] == ["c1", "c4", "c2"]
+    assert [row["id"] for row in fts] == ["c3"]
+    assert (await repo.fetch_chunks_by_ids(["c2", "missing"]))[0]["source_id"] == "doc-a"
+
+
+@pytest.mark.asyncio
+async def test_match_knowledge_requires_tenant_and_paginates() -> None:
+    repo = _repository()
+
+    with pytest.raises(ValueError, match="TENANT_CONTEXT_REQUIRED"):
+        await repo.match_knowledge([1.0, 0.0, 0.0], {}, limit=5)
+
+    first = await repo.match_knowledge_paginated([1.0, 0.0, 0.0], {"tenant_id": TENANT}, limit=1)
+    rest = await repo.match_knowledge_paginated(
+        [1.0, 0.0, 0.0],
+        {"tenant_id": TENANT},
+        limit=5,
+        cursor_score=first[0]["similarity"],
+        cursor_id=first[0]["id"],
+    )
+
+    assert first[0]["id"] == "c1"
+    assert [row["id"] for row in rest] == ["c2"]
+
+
+@pytest.mark.asyncio
+async def test_summaries_and_snapshot_round_trip(tmp_path) -> None:
+    repo = _repository()
+    path = tmp_path / "index.npz"
+    repo.save_snapshot(path)
+    restored = LocalRetrievalRepository.from_snapshot(path)
+
+    summaries = await restored.match_summaries([1.0, 0.0, 0.0], TENANT, limit=5)
+    leaves = await restored.resolve_summaries_to_chunk_ids(["s2"])
+
+    assert [row["id"] for row in summaries] == ["s1"]
+    assert sorted(leaves) == ["c1", "c2", "c3"]
+    assert await restored.retrieve_hybrid_optimized(
+        {"query_embedding": [0.0, 1.0, 0.0], "match_count": 3, "tenant_id": TENANT}
+    ) == await repo.retrieve_hybrid_optimized(
+        {"query_embedding": [0.0, 1.0, 0.0], "match_count": 3, "tenant_id": TENANT}
+    )
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+import pytest
+
+from app.domain.ingestion.orchestration.router import DocumentStructureRouter
+from app.infrastructure.document_parsers.cpu_executor import PdfCpuExecutor, shard_page_ranges
+from app.infrastructure.document_parsers.pdf_parser import PdfParserService
+
+
+def _write_pdf(path: Path, pages: int) -> str:
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), "Norma Internacional ISO 9001")
+        page.insert_text((72, 200), f"Capitulo {number}: requisitos del sistema de gestion.")
+        if number % 3 == 0:
+            page.insert_text((72, 140), "Tabla de indicadores")
+            for row in range(10):
+                page.draw_line((72, 300 + row * 20), (500, 300 + row * 20))
+            for col in range(5):
+                page.draw_line((72 + col * 100, 300), (72 + col * 100, 480))
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_shard_page_ranges_are_contiguous_and_bounded() -> None:
+    assert shard_page_ranges(0, 4) == []
+    assert shard_page_ranges(10, 4, min_pages=16) == [(0, 10)]
+    assert shard_page_ranges(10, 3, min_pages=2) == [(0, 4), (4, 8), (8, 10)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [0, 2])
+async def test_sharded_routing_and_text_match_sequential(tmp_path: Path, workers: int) -> None:
+    file_path = _write_pdf(tmp_path / "doc.pdf", pages=9)
+    router = DocumentStructureRouter()
+    parser = PdfParserService()
+    executor = PdfCpuExecutor(max_workers=workers, shard_min_pages=2)
+    try:
+        sequential_tasks = router.route_document(file_path, temp_image_dir=str(tmp_path / "seq"))
+        sharded_tasks = await executor.route_document(router, file_path)
+        sequential_text = parser.extract_text_with_page_map(file_path)
+        sharded_text = await executor.extract_text_with_page_map(parser, file_path)
+    finally:
+        executor.shutdown()
+
+    def _shape(tasks):
+        return [
+            (t.page_number, t.strategy, t.content_type, t.metadata)
+            if t.strategy.value == "visual_complex"
+            else (t.page_number, t.strategy, t.raw_content, t.metadata)
+            for t in tasks
+        ]
+
+    assert [t.page_number for t in sharded_tasks] == list(range(1, 10))
+    assert [t.page_number for t in sharded_tasks if t.strategy.value == "visual_complex"] == [3, 6, 9]
+    assert _shape(sharded_tasks) == _shape(sequential_tasks)
+    assert sharded_text == sequential_text
+    assert "Norma Internacional" not in sharded_text["full_text"]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+import pytest
+
+from app.domain.ingestion.orchestration.router import DocumentStructureRouter
+from app.domain.ingestion.structure.pdf_context import PdfDocumentContext, PdfPageView
+from app.domain.ingestion.structure.toc_discovery import TocDiscoveryService
+from app.infrastructure.document_parsers.cpu_executor import PdfCpuExecutor
+from app.infrastructure.document_parsers.pdf_parser import PdfParserService
+
+
+def _write_pdf(path: Path, pages: int = 4) -> str:
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((72, 140), "Tabla de resultados" if number == 2 else "Introduccion")
+        page.insert_text((72, 300), f"Clausula {number}: contexto de la organizacion.")
+        if number == 2:
+            for row in range(10):
+                page.draw_line((72, 340 + row * 20), (500, 340 + row * 20))
+            for col in range(5):
+                page.draw_line((72 + col * 100, 340), (72 + col * 100, 520))
+    doc.set_toc([[1, "Alcance", 1], [1, "Requisitos", 3]])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_context_parses_each_page_text_layer_once(tmp_path: Path, monkeypatch) -> None:
+    file_path = _write_pdf(tmp_path / "doc.pdf")
+    calls = {"textpage": 0}
+    original = fitz.Page.get_textpage
+
+    def counting_get_textpage(self, *args, **kwargs):
+        calls["textpage"] += 1
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_textpage", counting_get_textpage)
+
+    with PdfDocumentContext.open(file_path) as context:
+        tasks = DocumentStructureRouter().route_document(context, temp_image_dir=str(tmp_path))
+        extraction = PdfParserService().extract_text_with_page_map(context)
+        toc = TocDiscoveryService().discover_toc(context)
+
+    assert len(tasks) == 4
+    assert [task.strategy.value for task in tasks][1] == "visual_complex"
+    assert extraction["total_pages"] == 4
+    assert [entry.title for entry in toc.entries] == ["Alcance", "Requisitos"]
+    # Router signals, router text and parser text share one TextPage per page;
+    # PyMuPDF's table finder builds its own.
+    assert calls["textpage"] == 2 * 4
+
+
+def test_context_results_match_path_based_calls(tmp_path: Path) -> None:
+    file_path = _write_pdf(tmp_path / "doc.pdf")
+    router = DocumentStructureRouter()
+    parser = PdfParserService()
+
+    by_path = router.route_document(file_path, temp_image_dir=str(tmp_path / "a"))
+    text_by_path = parser.extract_text_with_page_map(file_path)
+    with PdfDocumentContext.open(file_path) as context:
+        by_context = router.route_document(context, temp_image_dir=str(tmp_path / "b"))
+        text_by_context = parser.extract_text_with_page_map(context)
+
+    assert [(t.page_number, t.strategy, t.metadata) for t in by_context] == [
+        (t.page_number, t.strategy, t.metadata) for t in by_path
+    ]
+    assert text_by_context == text_by_path
+
+
+def test_text_within_matches_get_text_clip_and_skips_straddling_words() -> None:
+    doc = fitz.open()
+    page = doc.new_page()
+    # Content order differs from top-to-bottom order on purpose.
+    page.insert_text((72, 200), "Clausula fuera del encabezado")
+    page.insert_text((300, 90), "Figura 3")
+    page.insert_text((72, 60), "Tabla de resultados")
+    page.insert_text((72, 150), "Linea cortada")
+    view = PdfPageView(page)
+
+    for clip in (fitz.Rect(0, 0, page.rect.width, 120), fitz.Rect(0, 0, 200, 100), page.rect):
+        assert view.text_within(clip) == " ".join(page.get_text(clip=clip).split())
+    # The last line's words straddle y=146; get_text would return character fragments.
+    assert view.text_within(fitz.Rect(0, 0, page.rect.width, 146)) == "Figura 3 Tabla de resultados"
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_executor_routes_and_reads_toc_in_one_pass(tmp_path: Path, monkeypatch) -> None:
+    file_path = _write_pdf(tmp_path / "doc.pdf", pages=6)
+    executor = PdfCpuExecutor(max_workers=0)
+    opens = {"count": 0}
+    original_open = PdfDocumentContext.open.__func__
+
+    def counting_open(cls, source, **kwargs):
+        opens["count"] += 1
+        return original_open(cls, source, **kwargs)
+
+    monkeypatch.setattr(PdfDocumentContext, "open", classmethod(counting_open))
+
+    tasks, toc = await executor.route_and_discover_toc(
+        DocumentStructureRouter(), TocDiscoveryService(), file_path
+    )
+    extraction = await executor.extract_text_with_page_map(PdfParserService(), file_path)
+
+    assert [task.page_number for task in tasks] == [1, 2, 3, 4, 5, 6]
+    assert toc is not None and toc.has_structure
+    assert extraction is not None and extraction["total_pages"] == 6
+    # Page count, routing, rendering and ToC share one open; text extraction another.
+    assert opens["count"] == 2
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+
+from app.domain.ingestion.knowledge import clustering_service
+from app.domain.ingestion.knowledge.clustering_service import GMMClusteringService
+
+
+def _blobs(seed: int = 0, per_blob: int = 20, dims: int = 256) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=4.0, size=(3, dims))
+    return np.vstack([center + rng.normal(scale=0.3, size=(per_blob, dims)) for center in centers])
+
+
+def _partition(result) -> list[list[str]]:
+    return sorted(sorted(str(cid) for cid in members) for members in result.cluster_contents.values())
+
+
+def test_gmm_clustering_is_reproducible_and_reuses_winning_model(monkeypatch) -> None:
+    embeddings = _blobs()
+    chunk_ids = [uuid4() for _ in range(len(embeddings))]
+    fits: list[int] = []
+    original = clustering_service._fit_gmm_bic
+
+    def counting_fit(reduced, n_components, random_state, max_iter):
+        fits.append(n_components)
+        return original(reduced, n_components, random_state, max_iter)
+
+    monkeypatch.setattr(clustering_service, "_fit_gmm_bic", counting_fit)
+    service = GMMClusteringService(max_clusters=10, early_stop_patience=2)
+
+    first = service.cluster(chunk_ids, embeddings)
+    fits_first = list(fits)
+    second = service.cluster(chunk_ids, embeddings)
+
+    assert _partition(first) == _partition(second)
+    assert first.num_clusters == 3
+    # k=3 wins, k=4 and k=5 do not improve: the sweep stops without a final refit.
+    assert fits_first == [2, 3, 4, 5]
+
+
+def test_gmm_parallel_sweep_matches_sequential_and_runs_off_loop() -> None:
+    embeddings = _blobs(seed=3)
+    chunk_ids = [uuid4() for _ in range(len(embeddings))]
+
+    sequential = GMMClusteringService(max_workers=0, early_stop_patience=0).cluster(chunk_ids, embeddings)
+    pooled_service = GMMClusteringService(max_workers=2, early_stop_patience=0)
+    try:
+        pooled = asyncio.run(pooled_service.acluster(chunk_ids, embeddings))
+        children = list(pooled_service._pool._processes.values())  # noqa: SLF001
+    finally:
+        pooled_service.shutdown()
+
+    assert children and not any(child.is_alive() for child in children)
+
+    assert pooled.cluster_contents == sequential.cluster_contents
+    assert [(a.chunk_id, a.cluster_id) for a in pooled.assignments] == [
+        (a.chunk_id, a.cluster_id) for a in sequential.assignments
+    ]
+
+
+def test_gmm_small_inputs_keep_legacy_shape() -> None:
+    service = GMMClusteringService()
+    one = service.cluster([uuid4()], np.ones((1, 8)))
+    two = service.cluster([uuid4(), uuid4()], np.array([[0.0, 1.0], [1.0, 0.0]]))
+
+    assert one.num_clusters == 1
+    assert two.num_clusters == 1
+    assert len(two.assignments) == 2
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.ingestion.knowledge.raptor_incremental import ClusterStats
+from app.domain.ingestion.knowledge.raptor_processor import RaptorProcessor
+from app.domain.schemas.raptor_schemas import BaseChunk, SummaryNode
+
+TENANT = uuid4()
+COLLECTION = uuid4()
+
+
+def _axis(index: int, noise: float = 0.0, seed: int = 0) -> list[float]:
+    vector = np.zeros(8, dtype=np.float32)
+    vector[index] = 1.0
+    if noise:
+        vector += np.random.default_rng(seed).normal(scale=noise, size=8).astype(np.float32)
+    return vector.tolist()
+
+
+def _summary(level: int, content: str, children: list[Any], vectors: list[list[float]], **extra: Any) -> SummaryNode:
+    stats = ClusterStats.from_vectors(vectors)
+    return SummaryNode(
+        id=uuid4(),
+        content=content,
+        title=content,
+        embedding=stats.centroid.tolist(),
+        level=level,
+        children_ids=children,
+        tenant_id=TENANT,
+        collection_id=COLLECTION,
+        cluster_stats=stats.as_dict(),
+        **extra,
+    )
+
+
+class _Repo:
+    def __init__(self, existing: list[SummaryNode]) -> None:
+        self.existing = existing
+        self.saved: list[SummaryNode] = []
+
+    async def get_collection_summary_nodes(self, tenant_id, collection_id):
+        return list(self.existing)
+
+    async def save_summary_nodes(self, nodes):
+        self.saved.extend(nodes)
+
+
+class _Embedder:
+    async def embed_texts(self, texts, mode=None, task=None, provider=None):
+        return [_axis(0) if "alpha" in text else _axis(5) for text in texts]
+
+
+class _Summarizer:
+    def __init__(self) -> None:
+        self.inputs: list[list[str]] = []
+
+    async def asummarize(self, cluster_texts):
+        self.inputs.append(list(cluster_texts))
+        return ("T", "S " + " ".join(cluster_texts))
+
+
+class _OneCluster:
+    def cluster(self, chunk_ids, embeddings):
+        return type("Result", (), {"num_clusters": 1, "cluster_contents": {0: list(chunk_ids)}})()
+
+
+def _chunk(content: str, embedding: list[float]) -> BaseChunk:
+    return BaseChunk(id=uuid4(), content=content, embedding=embedding, tenant_id=TENANT)
+
+
+@pytest.mark.asyncio
+async def test_update_tree_resummarizes_only_touched_branch_and_creates_drift_cluster() -> None:
+    alpha_vectors = [_axis(0, 0.05, seed) for seed in range(4)]
+    beta_vectors = [_axis(3, 0.05, seed) for seed in range(4)]
+    alpha = _summary(1, "alpha old", [uuid4() for _ in alpha_vectors], alpha_vectors)
+    beta = _summary(1, "beta old", [uuid4() for _ in beta_vectors], beta_vectors)
+    root = _summary(2, "root old", [alpha.id, beta.id], [alpha_vectors[0], beta_vectors[0]],
+                    children_summary_ids=[alpha.id, beta.id])
+    repo = _Repo([alpha, beta, root])
+    summarizer = _Summarizer()
+    processor = RaptorProcessor(
+        repository=repo,
+        embedding_service=_Embedder(),
+        summarization_service=summarizer,
+        clustering_service=_OneCluster(),
+        structural_mode_enabled=False,
+        incremental_enabled=True,
+    )
+
+    near_alpha = _chunk("alpha new", _axis(0, 0.05, 11))
+    far = [_chunk("gamma one", _axis(6, 0.01, 1)), _chunk("gamma two", _axis(6, 0.01, 2))]
+    result = await processor.update_tree([near_alpha, *far], TENANT, COLLECTION)
+
+    saved = {node.id: node for node in repo.saved}
+    assert beta.id not in saved
+    assert ["alpha old", "alpha new"] in summarizer.inputs
+    assert ["gamma one", "gamma two"] in summarizer.inputs
+    assert near_alpha.id in saved[alpha.id].children_ids
+    assert saved[alpha.id].cluster_stats["count"] == 5
+    # The root gained the new gamma cluster and was refreshed from its old summary.
+    assert saved[root.id].content.startswith("S root old")
+    assert len(saved[root.id].children_ids) == 3
+    assert result.total_nodes_created == 1
+    assert len(summarizer.inputs) == 3
+    assert result.root_node_id == root.id and result.top_level_ids == [root.id]
+
+
+@pytest.mark.asyncio
+async def test_update_tree_reports_every_top_level_node_when_there_is_no_single_root() -> None:
+    alpha_vectors = [_axis(0, 0.05, seed) for seed in range(4)]
+    beta_vectors = [_axis(3, 0.05, seed) for seed in range(4)]
+    alpha = _summary(1, "alpha old", [uuid4() for _ in alpha_vectors], alpha_vectors)
+    beta = _summary(1, "beta old", [uuid4() for _ in beta_vectors], beta_vectors)
+    processor = RaptorProcessor(
+        repository=_Repo([alpha, beta]),
+        embedding_service=_Embedder(),
+        summarization_service=_Summarizer(),
+        clustering_service=_OneCluster(),
+        structural_mode_enabled=False,
+        max_depth=1,
+    )
+
+    result = await processor.update_tree([_chunk("alpha new", _axis(0, 0.05, 11))], TENANT, COLLECTION)
+
+    assert result.max_depth == 1
+    assert result.top_level_ids == [alpha.id, beta.id]
+    assert result.root_node_id == alpha.id
+
+
+@pytest.mark.asyncio
+async def test_update_tree_falls_back_to_full_build_for_new_collection() -> None:
+    repo = _Repo([])
+    processor = RaptorProcessor(
+        repository=repo,
+        embedding_service=_Embedder(),
+        summarization_service=_Summarizer(),
+        clustering_service=_OneCluster(),
+        structural_mode_enabled=False,
+    )
+    result = await processor.update_tree(
+        [_chunk("alpha a", _axis(0)), _chunk("alpha b", _axis(0))], TENANT, COLLECTION
+    )
+    assert result.total_nodes_created == 0  # single-cluster convergence, as in build_tree
+    assert repo.saved == []
+
+
+@pytest.mark.asyncio
+async def test_parents_absorbing_another_document_become_collection_scoped() -> None:
+    doc_a, doc_b = uuid4(), uuid4()
+    alpha_vectors = [_axis(0, 0.05, seed) for seed in range(4)]
+    beta_vectors = [_axis(3, 0.05, seed) for seed in range(4)]
+    alpha = _summary(1, "alpha old", [uuid4() for _ in alpha_vectors], alpha_vectors, source_document_id=doc_a)
+    beta = _summary(1, "beta old", [uuid4() for _ in beta_vectors], beta_vectors, source_document_id=doc_a)
+    root = _summary(2, "root old", [alpha.id, beta.id], [alpha_vectors[0], beta_vectors[0]],
+                    children_summary_ids=[alpha.id, beta.id], source_document_id=doc_a)
+    repo = _Repo([alpha, beta, root])
+    processor = RaptorProcessor(
+        repository=repo,
+        embedding_service=_Embedder(),
+        summarization_service=_Summarizer(),
+        clustering_service=_OneCluster(),
+        structural_mode_enabled=False,
+        incremental_enabled=True,
+    )
+
+    near_alpha = _chunk("alpha new", _axis(0, 0.05, 11))
+    far = [_chunk("gamma one", _axis(6, 0.01, 1)), _chunk("gamma two", _axis(6, 0.01, 2))]
+    await processor.update_tree([near_alpha, *far], TENANT, COLLECTION, source_document_id=doc_b)
+
+    saved = {node.id: node for node in repo.saved}
+    assert saved[alpha.id].source_document_id is None
+    assert saved[root.id].source_document_id is None
+    (gamma,) = [node for node in repo.saved if node.id not in {alpha.id, root.id}]
+    assert gamma.source_document_id == doc_b
+
+    # Purging document A's nodes keeps every summary that covers document B.
+    tree = {node.id: node for node in repo.existing} | saved
+    remaining = {node_id for node_id, node in tree.items() if node.source_document_id != doc_a}
+    assert remaining == {alpha.id, root.id, gamma.id}
+    assert near_alpha.id in tree[alpha.id].children_ids
+    assert gamma.id in tree[root.id].children_ids
+
+
+@pytest.mark.asyncio
+async def test_cluster_stats_are_not_stored_without_incremental_updates() -> None:
+    repo = _Repo([])
+    processor = RaptorProcessor(
+        repository=repo,
+        embedding_service=_Embedder(),
+        summarization_service=_Summarizer(),
+        clustering_service=_OneCluster(),
+        structural_mode_enabled=True,
+    )
+    chunks = [
+        BaseChunk(id=uuid4(), content=f"alpha {i}", embedding=_axis(0, 0.05, i), tenant_id=TENANT,
+                  section_ref="1" if i < 2 else "2")
+        for i in range(4)
+    ]
+    await processor.build_tree(chunks, TENANT, collection_id=COLLECTION)
+
+    assert repo.saved
+    assert all(node.cluster_stats == {} for node in repo.saved)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.domain.ingestion.knowledge.raptor_processor import RaptorProcessor
+
+
+class _Repo:
+    def __init__(self) -> None:
+        self.batches: list[list[Any]] = []
+
+    async def save_summary_nodes(self, nodes: list[Any]) -> None:
+        self.batches.append(list(nodes))
+
+
+class _Embedder:
+    def __init__(self, fail: bool = False, fail_after: int | None = None) -> None:
+        self.calls: list[list[str]] = []
+        self.fail = fail
+        self.fail_after = fail_after
+
+    async def embed_texts(self, texts, mode=None, task=None, provider=None):
+        if self.fail or (self.fail_after is not None and len(self.calls) >= self.fail_after):
+            raise RuntimeError("embedding down")
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.0] for text in texts]
+
+
+class _Summarizer:
+    def __init__(self, slow_text: str) -> None:
+        self.slow_text = slow_text
+        self.slow_release = asyncio.Event()
+
+    async def asummarize(self, cluster_texts):
+        if cluster_texts[0] == self.slow_text:
+            await self.slow_release.wait()
+        return (f"T {cluster_texts[0]}", f"S {cluster_texts[0]}")
+
+
+def _items(count: int) -> list[dict[str, Any]]:
+    return [
+        {"cluster_id": i, "cluster_texts": [f"c{i}"], "children_ids": [uuid4()]} for i in range(count)
+    ]
+
+
+def _processor(repo: _Repo, embedder: _Embedder, summarizer: Any, **kwargs: Any) -> RaptorProcessor:
+    return RaptorProcessor(
+        repository=repo,
+        embedding_service=embedder,
+        summarization_service=summarizer,
+        structural_mode_enabled=False,
+        **kwargs,
+    )
+
+
+async def _build(processor: RaptorProcessor, items: list[dict[str, Any]], metrics: dict) -> list[Any]:
+    return await processor._build_summary_nodes_for_level(  # noqa: SLF001
+        level_items=items,
+        current_level=1,
+        tenant_id=uuid4(),
+        source_document_id=None,
+        collection_id=None,
+        level_source_standard=None,
+        embedding_mode=None,
+        level_metrics=metrics,
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_summary_does_not_block_embedding_and_order_is_kept() -> None:
+    repo, embedder = _Repo(), _Embedder()
+    summarizer = _Summarizer(slow_text="c0")
+    processor = _processor(repo, embedder, summarizer, embed_batch_size=2, save_batch_size=3)
+    metrics: dict = {}
+
+    build = asyncio.create_task(_build(processor, _items(5), metrics))
+    for _ in range(50):
+        await asyncio.sleep(0)
+    # The four fast clusters were embedded while c0 was still summarizing.
+    assert sum(len(call) for call in embedder.calls) == 4
+    summarizer.slow_release.set()
+    nodes = await build
+
+    assert [node.content for node in nodes] == [f"S c{i}" for i in range(5)]
+    assert [len(batch) for batch in repo.batches] == [3, 2]
+    assert all(len(call) <= 2 for call in embedder.calls)
+    level = metrics[1].as_dict()
+    assert level["summarized"] == 5 and level["save_batches"] == 2
+    assert level["embed_batches"] == len(embedder.calls)
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_propagates_without_hanging() -> None:
+    repo = _Repo()
+    summarizer = _Summarizer(slow_text="none")
+    processor = _processor(repo, _Embedder(fail=True), summarizer, pipeline_queue_size=1)
+
+    with pytest.raises(RuntimeError, match="embedding down"):
+        await asyncio.wait_for(_build(processor, _items(6), {}), timeout=2)
+    assert repo.batches == []
+
+
+@pytest.mark.asyncio
+async def test_level_is_not_saved_when_a_later_embedding_batch_fails() -> None:
+    repo = _Repo()
+    embedder = _Embedder(fail_after=2)
+    processor = _processor(
+        repo, embedder, _Summarizer(slow_text="none"), embed_batch_size=1, save_batch_size=1
+    )
+
+    with pytest.raises(RuntimeError, match="embedding down"):
+        await asyncio.wait_for(_build(processor, _items(6), {}), timeout=2)
+    assert len(embedder.calls) == 2
+    assert repo.batches == []
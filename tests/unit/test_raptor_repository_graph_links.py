@@ -58,3 +58,23 @@ def test_save_summary_node_mirrors_into_knowledge_graph() -> None:
     assert "regulatory_nodes" in tables
     assert "knowledge_entities" in tables
     assert "knowledge_relations" in tables
+
+
+def test_collection_scoped_parent_clears_its_previous_owner() -> None:
+    fake = _FakeClient()
+    repo = SupabaseRaptorRepository(supabase_client=fake)
+    node = SummaryNode(
+        id=uuid4(),
+        content="Merged summary",
+        title="Merged",
+        embedding=[0.1, 0.2],
+        level=2,
+        children_ids=[uuid4()],
+        tenant_id=uuid4(),
+        source_document_id=None,
+    )
+
+    asyncio.run(repo.save_summary_nodes([node]))
+
+    (rows,) = [call["payload"] for call in fake.calls if call["table"] == "regulatory_nodes"]
+    assert rows[0]["source_document_id"] is None
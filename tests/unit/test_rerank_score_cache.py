@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.ai.rerankers.jina_reranker import JinaReranker
+from app.ai.rerankers.score_cache import RerankScoreCache
+
+_SCORES = {"a": 0.9, "b": 0.1, "c": 0.6, "d": 0.4}
+
+
+def _reranker(cache: RerankScoreCache) -> tuple[JinaReranker, list[list[str]]]:
+    reranker = JinaReranker(api_key="k", model_name="m", rerank_url="http://rerank", score_cache=cache)
+    sent: list[list[str]] = []
+
+    async def fake_fetch(query: str, documents: list[str]) -> list[dict[str, Any]]:
+        sent.append(list(documents))
+        rows = [{"index": i, "relevance_score": _SCORES[doc]} for i, doc in enumerate(documents)]
+        return sorted(rows, key=lambda row: -row["relevance_score"])
+
+    reranker._fetch_scores = fake_fetch  # type: ignore[method-assign]
+    return reranker, sent
+
+
+@pytest.mark.asyncio
+async def test_only_uncached_documents_are_sent_and_order_is_preserved() -> None:
+    reranker, sent = _reranker(RerankScoreCache())
+
+    first = await reranker.rerank_documents("q", ["a", "b", "c"], top_n=3)
+    second = await reranker.rerank_documents("q", ["d", "c", "a", "b"], top_n=2)
+
+    # b (0.1) falls under the default relevance floor.
+    assert first == [{"index": 0, "relevance_score": 0.9}, {"index": 2, "relevance_score": 0.6}]
+    assert second == [{"index": 2, "relevance_score": 0.9}, {"index": 1, "relevance_score": 0.6}]
+    assert sent == [["a", "b", "c"], ["d"]]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_query_and_model() -> None:
+    cache = RerankScoreCache()
+    reranker, sent = _reranker(cache)
+    await reranker.rerank_documents("q1", ["a", "a"], top_n=2)
+    await reranker.rerank_documents("q2", ["a"], top_n=1)
+
+    other, other_sent = _reranker(cache)
+    other._model_name = "other-model"
+    await other.rerank_documents("q1", ["a"], top_n=1)
+
+    assert sent == [["a"], ["a"]]
+    assert other_sent == [["a"]]
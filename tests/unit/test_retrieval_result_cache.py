@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from app.domain.retrieval.result_cache import (
+    CachedRetrieval,
+    IndexGenerationRegistry,
+    build_result_cache_key,
+    index_generations,
+)
+from app.infrastructure.settings import settings
+from app.workflows.retrieval.retrieval_broker import RetrievalBroker
+
+
+class _SharedGenerations:
+    """In-memory stand-in for the Redis generation counters shared across processes."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, int] = {}
+        self.fail_reads = False
+
+    async def incr(self, key: str) -> int:
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def get_many(self, keys: list[str]) -> list[int]:
+        if self.fail_reads:
+            raise ConnectionError("redis down")
+        return [self.values.get(key, 0) for key in keys]
+
+
+class _DummyRepository:
+    async def match_knowledge(self, *args: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        return []
+
+
+class _ChunkStore:
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.rows = {row["id"]: row for row in rows}
+        self.fetched: list[list[str]] = []
+
+    async def fetch_chunks_by_ids(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
+        self.fetched.append(list(chunk_ids))
+        return [dict(self.rows[cid]) for cid in chunk_ids if cid in self.rows]
+
+
+class _AtomicEngine:
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.rows = rows
+        self.calls = 0
+        self.last_trace: dict[str, Any] = {}
+        self.chunk_store = _ChunkStore(rows)
+
+    async def retrieve_context(self, **kwargs: Any) -> list[dict[str, Any]]:
+        self.calls += 1
+        return [dict(row) for row in self.rows]
+
+    async def fetch_chunks_by_ids(self, chunk_ids: list[str]) -> list[dict[str, Any]]:
+        return await self.chunk_store.fetch_chunks_by_ids(chunk_ids)
+
+
+def _rows() -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"c{i}",
+            "content": f"texto {i}",
+            "metadata": {"source_id": "s1"},
+            "similarity": 0.9 - i * 0.1,
+            "score": 0.9 - i * 0.1,
+            "source_type": "content_chunk",
+        }
+        for i in range(3)
+    ]
+
+
+def test_cache_key_ignores_query_case_whitespace_and_filter_order() -> None:
+    base = dict(k=5, fetch_k=20, rerank_mode="hybrid", generation=1)
+    key_a = build_result_cache_key(
+        query="Que exige  ISO 9001?",
+        scope={"tenant_id": "t1", "source_standards": ["ISO 9001", "ISO 14001"]},
+        **base,
+    )
+    key_b = build_result_cache_key(
+        query="  que exige iso 9001?",
+        scope={"source_standards": ["ISO 14001", "ISO 9001"], "tenant_id": "t1"},
+        **base,
+    )
+    assert key_a == key_b
+    assert key_a != build_result_cache_key(
+        query="que exige iso 9001?",
+        scope={"tenant_id": "t1", "source_standards": ["ISO 9001", "ISO 14001"]},
+        **{**base, "generation": 2},
+    )
+
+
+def test_cached_entry_drops_chunk_payload_and_keeps_inline_rows() -> None:
+    rows = _rows() + [{"id": "g1", "content": "entidad", "source_type": "knowledge_entity_ungrounded"}]
+    entry = CachedRetrieval.from_rows(rows, {"engine_mode": "atomic"}, generation=3)
+
+    assert entry.payload_ids() == ["c0", "c1", "c2"]
+    assert entry.rehydrate({"c0": {"content": "x"}}) is None
+    restored = entry.rehydrate({row["id"]: row for row in _rows()})
+    assert [row["content"] for row in restored] == ["texto 0", "texto 1", "texto 2", "entidad"]
+
+
+@pytest.mark.asyncio
+async def test_bump_in_one_process_invalidates_generation_read_by_another() -> None:
+    shared = _SharedGenerations()
+    worker = IndexGenerationRegistry(shared=shared)
+    api = IndexGenerationRegistry(shared=shared)
+
+    before = await api.current("t1")
+    await worker.bump("t1")
+    assert await api.current("t1") == before + 1
+    await worker.bump_all()
+    assert await api.current("t2") == 1
+
+    shared.fail_reads = True
+    assert await api.current("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_broker_serves_repeated_query_from_cache_until_generation_bump(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RETRIEVAL_RESULT_CACHE_ENABLED", True)
+    engine = _AtomicEngine(_rows())
+    broker = RetrievalBroker(repository=_DummyRepository(), atomic_engine=engine)
+    scope = {"type": "institutional", "tenant_id": "tenant-cache", "filters": {}}
+
+    first = await broker.retrieve("Requisitos de auditoria", scope, k=2, enable_reranking=False, return_trace=True)
+    second = await broker.retrieve("requisitos  de AUDITORIA", scope, k=2, enable_reranking=False, return_trace=True)
+
+    assert engine.calls == 1
+    assert first["trace"]["cache_hit"] is False
+    assert second["trace"]["cache_hit"] is True
+    assert engine.chunk_store.fetched == [["c0", "c1"]]
+    assert [(r["id"], r["score"], r["content"]) for r in second["items"]] == [
+        (r["id"], r["score"], r["content"]) for r in first["items"]
+    ]
+
+    await index_generations.bump("tenant-cache")
+    third = await broker.retrieve("Requisitos de auditoria", scope, k=2, enable_reranking=False, return_trace=True)
+    assert engine.calls == 2
+    assert third["trace"]["cache_hit"] is False
+
+
+@pytest.mark.asyncio
+async def test_broker_bypasses_cache_when_shared_generation_is_unreadable(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RETRIEVAL_RESULT_CACHE_ENABLED", True)
+    shared = _SharedGenerations()
+    shared.fail_reads = True
+    monkeypatch.setattr(index_generations, "shared", shared)
+    engine = _AtomicEngine(_rows())
+    broker = RetrievalBroker(repository=_DummyRepository(), atomic_engine=engine)
+    scope = {"type": "institutional", "tenant_id": "tenant-down", "filters": {}}
+
+    await broker.retrieve("Requisitos de auditoria", scope, k=2, enable_reranking=False)
+    await broker.retrieve("Requisitos de auditoria", scope, k=2, enable_reranking=False)
+
+    assert engine.calls == 2
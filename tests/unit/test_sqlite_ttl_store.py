@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import time
+
+from app.infrastructure.caching.sqlite_ttl_store import SqliteTtlStore
+
+
+def test_prune_drops_expired_rows_then_the_oldest_above_max_rows(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(SqliteTtlStore, "PRUNE_EVERY_N_WRITES", 4)
+    store = SqliteTtlStore(str(tmp_path / "kv.sqlite3"), table="kv", ttl_seconds=60, max_rows=2)
+
+    assert store.set_many({"a": b"1", "b": b"2", "c": b"3"}) == 0
+    assert store.get_many(["a", "b", "c", "missing"]) == {"a": b"1", "b": b"2", "c": b"3"}
+
+    assert store.set_many({"d": b"4"}) == 2
+    remaining = store.get_many(["a", "b", "c", "d"])
+    assert len(remaining) == 2 and remaining["d"] == b"4"
+
+
+def test_expired_rows_are_not_returned(tmp_path, monkeypatch) -> None:
+    store = SqliteTtlStore(str(tmp_path / "kv.sqlite3"), table="kv", ttl_seconds=60, max_rows=10)
+    store.set_many({"a": b"1"})
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert store.get_many(["a"]) == {}
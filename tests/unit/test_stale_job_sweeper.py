@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.infrastructure.background_jobs.job_store import SupabaseJobStore
+from app.infrastructure.queue.stale_job_sweeper import InMemoryLeaderLock, StaleJobSweeper
+
+
+class _Response:
+    def __init__(self, data: list[dict]) -> None:
+        self.data = data
+
+
+class _Query:
+    def __init__(self, client: "_Client", payload: dict[str, Any]) -> None:
+        self.client = client
+        self.payload = payload
+        self.filters: list[tuple[str, str, Any]] = []
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        self.filters.append(("eq", column, value))
+        return self
+
+    def in_(self, column: str, values: list[str]) -> "_Query":
+        self.filters.append(("in", column, list(values)))
+        return self
+
+    def lt(self, column: str, value: Any) -> "_Query":
+        self.filters.append(("lt", column, value))
+        return self
+
+    async def execute(self) -> _Response:
+        self.client.updates.append(self)
+        return _Response([{"id": "stale-1"}] if self.payload.get("status") == "pending" else [])
+
+
+class _Table:
+    def __init__(self, client: "_Client") -> None:
+        self.client = client
+
+    def update(self, payload: dict[str, Any]) -> _Query:
+        return _Query(self.client, payload)
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.updates: list[_Query] = []
+
+    def table(self, name: str) -> _Table:
+        assert name == "job_queue"
+        return _Table(self)
+
+
+def _store(heartbeat_seconds: float = 0.02) -> SupabaseJobStore:
+    store = SupabaseJobStore()
+    store._client = _Client()
+    store.worker_job_heartbeat_seconds = heartbeat_seconds
+    return store
+
+
+@pytest.mark.asyncio
+async def test_process_heartbeat_renews_all_tracked_jobs_in_one_update() -> None:
+    store = _store()
+    for i in range(6):
+        store.track_job_heartbeat(f"job-{i}")
+    store.untrack_job_heartbeat("job-5")
+
+    await asyncio.sleep(0.03)
+    await store.close_heartbeat()
+
+    updates = store._client.updates
+    assert len(updates) == 1
+    assert ("in", "id", [f"job-{i}" for i in range(5)]) in updates[0].filters
+    assert ("eq", "status", "processing") in updates[0].filters
+    assert "updated_at" in updates[0].payload
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_jobs_tracked_by_dispatcher_and_worker_until_both_release() -> None:
+    store = _store(heartbeat_seconds=60)
+    store.track_job_heartbeat("job-1")
+    store.track_job_heartbeat("job-1")
+    store.untrack_job_heartbeat("job-1")
+    assert list(store._heartbeat_refs) == ["job-1"]
+
+    store.untrack_job_heartbeat("job-1")
+    assert store._heartbeat_refs == {}
+    await store.close_heartbeat()
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_sweeps_stale_jobs() -> None:
+    store = _store()
+    lock = InMemoryLeaderLock()
+    sweepers = [StaleJobSweeper(store, leader_lock=lock, interval_seconds=0.01, swept_by=f"w{i}") for i in range(3)]
+
+    tasks = [asyncio.create_task(sweeper.run()) for sweeper in sweepers]
+    await asyncio.sleep(0.05)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    active = [sweeper for sweeper in sweepers if sweeper.sweeps]
+    assert len(active) == 1
+    assert active[0].requeued == active[0].sweeps
+    # One UPDATE across all job types per sweep, no job_type filter.
+    assert all(("eq", "status", "processing") in query.filters for query in store._client.updates)
+    assert not any(column == "job_type" for query in store._client.updates for _, column, _ in query.filters)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import pytest
+
+from app.domain.retrieval.strategies.graph_retrieval_strategies import LocalGraphSearch
+from app.domain.retrieval.vector_similarity import (
+    EmbeddingMatrix,
+    TenantEmbeddingMatrixCache,
+    cosine_similarity,
+    entity_matrix_cache,
+)
+
+
+def test_cosine_similarity_keeps_legacy_sentinels() -> None:
+    assert cosine_similarity([1.0, 0.0], [1.0, 0.0]) == pytest.approx(1.0)
+    assert cosine_similarity("[0, 1]", [0.0, 2.0]) == pytest.approx(1.0)
+    assert cosine_similarity([1.0, 0.0], [1.0, 0.0, 0.0]) == -1.0
+    assert cosine_similarity(None, [1.0]) == -1.0
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == -1.0
+
+
+def test_embedding_matrix_batches_best_and_top_k() -> None:
+    matrix = EmbeddingMatrix(
+        [
+            {"id": "a", "embedding": "[1, 0, 0]"},
+            {"id": "b", "embedding": [0.0, 1.0, 0.0]},
+            {"id": "missing", "embedding": None},
+            {"id": "bad-dim", "embedding": [1.0, 0.0]},
+            {"id": "c", "embedding": [0.7, 0.7, 0.0]},
+        ]
+    )
+
+    best = matrix.best_matches([[1.0, 0.05, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0]])
+    top = matrix.top_k([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], k=5, threshold=0.5)
+
+    assert best[0][0] == 0 and best[0][1] > 0.99
+    assert best[1][1] == pytest.approx(0.0)
+    assert best[2] == (-1, -1.0)
+    assert [matrix.rows[idx]["id"] for idx, _ in top] == ["a", "b", "c"]
+    assert all("embedding" not in row for row in matrix.rows)
+
+
+def test_tenant_cache_invalidation_and_lru() -> None:
+    cache = TenantEmbeddingMatrixCache(max_tenants=1, ttl_seconds=60)
+    first = EmbeddingMatrix([{"embedding": [1.0]}])
+    cache.put("t1", first)
+    assert cache.get("t1") is first
+
+    cache.invalidate("t1")
+    assert cache.get("t1") is None
+
+    cache.put("t1", first)
+    cache.put("t2", first)
+    assert cache.get("t1") is None
+    assert cache.get("t2") is first
+
+
+def test_tenant_cache_evicts_by_matrix_bytes() -> None:
+    small = EmbeddingMatrix([{"embedding": [1.0, 0.0]}])  # 8 bytes
+    big = EmbeddingMatrix([{"embedding": [1.0] * 8}] * 2)  # 64 bytes
+    cache = TenantEmbeddingMatrixCache(max_tenants=10, ttl_seconds=60, max_bytes=24)
+
+    cache.put("t1", small)
+    cache.put("t2", small)
+    cache.put("t3", small)
+    assert cache.nbytes == 24
+    cache.get("t1")
+    cache.put("t4", small)
+    assert cache.get("t2") is None and cache.get("t1") is small
+    assert cache.nbytes == 24
+
+    cache.put("t5", big)
+    assert cache.get("t5") is None
+    cache.invalidate("t1")
+    assert cache.nbytes == 16
+
+
+class _Repo:
+    def __init__(self):
+        self.list_calls = 0
+
+    async def match_entities_by_vector_rpc(self, **kwargs):
+        raise RuntimeError("rpc_unavailable")
+
+    async def list_entities_with_embeddings(self, tenant_id):
+        self.list_calls += 1
+        return [
+            {"id": "e1", "name": "ISO 9001", "embedding": [1.0, 0.0]},
+            {"id": "e2", "name": "Auditoria", "embedding": [0.0, 1.0]},
+        ]
+
+
+class _Embedder:
+    async def embed_texts(self, texts, task="retrieval.passage", mode=None, provider=None):
+        return [[1.0, 0.1] for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_vector_anchor_fallback_reuses_cached_tenant_matrix() -> None:
+    entity_matrix_cache.clear()
+    repo = _Repo()
+    search = LocalGraphSearch(
+        graph_repository=repo, llm_provider=None, embedding_service=_Embedder()
+    )
+
+    first = await search._match_vector_anchors("tenant-1", ["iso"])
+    second = await search._match_vector_anchors("tenant-1", ["iso"])
+    entity_matrix_cache.invalidate("tenant-1")
+    await search._match_vector_anchors("tenant-1", ["iso"])
+
+    assert [row["id"] for row in first] == ["e1"]
+    assert second == first
+    assert repo.list_calls == 2
+    entity_matrix_cache.clear()